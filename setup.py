@@ -10,10 +10,12 @@ setup(
     # an out-of-band: sudo apt-get install python-dev
     setup_requires   = ['nose>=1.1.2'],
     install_requires = ['networkx>=2.0',
-                        'numpy>=1.13.3',
+                        'numpy>=1.17',
                         'configparser>=3.3.0r2', 
                         'argparse>=1.2.1', 
                         ],
+    # Optional: Parquet/Arrow export (columnar.py):
+    extras_require   = {'columnar' : ['pyarrow>=1.0']},
     tests_require    = ['sentinels>=0.0.6', 'nose>=1.0'],
 
     # Unit tests; they are initiated via 'python setup.py test'
@@ -0,0 +1,497 @@
+#!/usr/bin/env python
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Benchmark suite for the Networker pipeline.
+
+Synthetic nodes and links files are generated in
+one of GRAPH_SHAPES:
+
+    erdos_renyi:  links between uniformly random node pairs
+    scale_free:   power-law degrees (Chung-Lu model: end points
+                  drawn with probability ~ rank^(-1/(exponent-1)))
+    components:   many small connected components of
+                  component_size nodes each
+
+For each case, the stages in STAGES are timed:
+
+    ingest:    CSV parsing and node name interning
+    build:     CSR graph store construction
+    layout:    Networker.compute_layout()
+    zipcodes:  Networker.assign_zipcodes()
+    export:    Networker.export_converted_input()
+
+A synthetic zip code database is generated as well,
+so that the suite runs without the real one. Graphs
+with more nodes than there are zip codes
+(zipcodes.ZIPCODE_SPACE) skip the zipcodes and export
+stages; their cases say so in 'skipped'.
+
+Results are written as JSON. Given a baseline report
+from an earlier run, stages that got slower by more
+than a tolerance are listed as regressions, and the
+command exits with status 1.
+
+Example:
+
+    python -m netlayout.benchmark -n 10000 100000 -o now.json -b baseline.json
+'''
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.initial import INITIAL_METHODS
+from netlayout.layout import LAYOUT_METHODS
+from netlayout.profiling import StageProfiler
+from netlayout.zipcodes import ZIPCODE_SPACE
+
+
+GRAPH_SHAPES = ('erdos_renyi', 'scale_free', 'components')
+STAGES = ('ingest', 'build', 'layout', 'zipcodes', 'export')
+
+DEFAULT_NODES = (10000,)
+DEFAULT_DEGREE = 5
+DEFAULT_ITERATIONS = 20
+DEFAULT_SCALE_FREE_EXPONENT = 2.5
+DEFAULT_COMPONENT_SIZE = 10
+
+# A stage regressed if it is this much slower than
+# in the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and by at least this many seconds, which keeps
+# timer noise on very fast stages from counting:
+MIN_REGRESSION_SECONDS = 0.05
+
+# Lines written to the synthetic files per write:
+WRITE_CHUNK_ROWS = 500000
+
+REPORT_FORMAT_VERSION = 1
+
+#-----------------------------
+# generate_links
+#-----------------------
+
+def generate_links(shape, num_nodes, num_links,
+                   seed=None,
+                   exponent=DEFAULT_SCALE_FREE_EXPONENT,
+                   component_size=DEFAULT_COMPONENT_SIZE):
+    '''
+    Random links of a graph of the given shape, without
+    self loops.
+
+    @param shape: one of GRAPH_SHAPES
+    @type shape: str
+    @param num_nodes: number of nodes; at least 2
+    @type num_nodes: int
+    @param num_links: number of links. For 'components', at
+        least the num_nodes - num_components links of one
+        random spanning tree per component are generated.
+    @type num_links: int
+    @param seed: random seed
+    @type seed: {int | None}
+    @param exponent: degree exponent of 'scale_free' graphs
+    @type exponent: float
+    @param component_size: nodes per component of 'components'
+        graphs; the last component may be smaller
+    @type component_size: int
+    @return: source and destination node ids
+    @rtype: (np.ndarray, np.ndarray)
+    '''
+    if shape not in GRAPH_SHAPES:
+        raise ValueError("Graph shape must be one of %s; got '%s'" % (GRAPH_SHAPES, shape))
+    if num_nodes < 2:
+        raise ValueError("Graphs need at least two nodes; got %s" % num_nodes)
+    rng = np.random.default_rng(seed)
+
+    if shape == 'erdos_renyi':
+        src = rng.integers(0, num_nodes, num_links)
+        dst = (src + rng.integers(1, num_nodes, num_links)) % num_nodes
+
+    elif shape == 'scale_free':
+        chances = np.arange(1, num_nodes + 1) ** (-1.0 / (exponent - 1.0))
+        chances /= chances.sum()
+        src = rng.choice(num_nodes, num_links, p=chances)
+        dst = rng.choice(num_nodes, num_links, p=chances)
+        loops = src == dst
+        dst[loops] = (dst[loops] + 1) % num_nodes
+        # Hubs at random ids, not at the lowest ones:
+        relabel = rng.permutation(num_nodes)
+        (src, dst) = (relabel[src], relabel[dst])
+
+    else:
+        nodes = np.arange(num_nodes)
+        block_start = nodes - nodes % component_size
+        block_size = np.minimum(block_start + component_size, num_nodes) - block_start
+        # Random spanning trees: every node but the first of
+        # its component links to an earlier node of it:
+        tree_nodes = np.flatnonzero(nodes != block_start)
+        tree_dst = block_start[tree_nodes] + (rng.random(len(tree_nodes)) *
+                                              (tree_nodes - block_start[tree_nodes])).astype(np.int64)
+        num_extra = max(num_links - len(tree_nodes), 0)
+        extra_src = rng.integers(0, num_nodes, num_extra)
+        offsets = (rng.random(num_extra) * (block_size[extra_src] - 1)).astype(np.int64) + 1
+        extra_dst = block_start[extra_src] + (extra_src - block_start[extra_src] + offsets) % block_size[extra_src]
+        src = np.concatenate([tree_nodes, extra_src])
+        dst = np.concatenate([tree_dst, extra_dst])
+        # Single-node components have no links:
+        keep = src != dst
+        (src, dst) = (src[keep], dst[keep])
+        order = rng.permutation(len(src))
+        (src, dst) = (src[order], dst[order])
+
+    return (src.astype(np.int64), dst.astype(np.int64))
+
+#-----------------------------
+# write_graph_files
+#-----------------------
+
+def write_graph_files(directory, shape, num_nodes, num_links, seed=None, **shape_args):
+    '''
+    Write a nodes file and a links file of a random
+    graph, in the format Networker reads:
+
+        nodeID,role            src,dst,weight,kind
+        n0,student             n17,n3,0.412,emails
+
+    @param directory: where to put the files
+    @type directory: str
+    @param shape: one of GRAPH_SHAPES
+    @type shape: str
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param num_links: number of links
+    @type num_links: int
+    @param seed: random seed
+    @type seed: {int | None}
+    @param shape_args: passed on to generate_links()
+    @return: paths of the nodes file and the links file
+    @rtype: (str, str)
+    '''
+    rng = np.random.default_rng(seed)
+    (src, dst) = generate_links(shape, num_nodes, num_links, seed=seed, **shape_args)
+    nodes_file = os.path.join(directory, '%s_%s_nodes.csv' % (shape, num_nodes))
+    links_file = os.path.join(directory, '%s_%s_links.csv' % (shape, num_nodes))
+
+    roles = np.array(['instructor', 'student'])
+    with open(nodes_file, 'w') as fd:
+        fd.write('nodeID,role\n')
+        for start in range(0, num_nodes, WRITE_CHUNK_ROWS):
+            ids = np.arange(start, min(start + WRITE_CHUNK_ROWS, num_nodes))
+            role = roles[(rng.random(len(ids)) < 0.9).astype(int)]
+            fd.write(''.join('n%d,%s\n' % row for row in zip(ids.tolist(), role.tolist())))
+
+    kinds = np.array(['emails', 'responds_to', 'upvotes'])
+    with open(links_file, 'w') as fd:
+        fd.write('src,dst,weight,kind\n')
+        for start in range(0, len(src), WRITE_CHUNK_ROWS):
+            rows = slice(start, start + WRITE_CHUNK_ROWS)
+            count = len(src[rows])
+            weight = np.round(rng.random(count), 3)
+            kind = kinds[rng.integers(0, len(kinds), count)]
+            fd.write(''.join('n%d,n%d,%s,%s\n' % row
+                             for row in zip(src[rows].tolist(), dst[rows].tolist(),
+                                            weight.tolist(), kind.tolist())))
+    return (nodes_file, links_file)
+
+#-----------------------------
+# write_zipcode_database
+#-----------------------
+
+def write_zipcode_database(path, num_zipcodes, num_states=20, seed=None):
+    '''
+    Write a synthetic zip code database in the format
+    of zipcodes.ZIPCODE_SOURCE: zip codes spread over
+    num_states made-up states, at random contiguous-US
+    coordinates.
+    '''
+    rng = np.random.default_rng(seed)
+    zipcodes = np.sort(rng.choice(ZIPCODE_SPACE, num_zipcodes, replace=False))
+    states = rng.integers(0, num_states, num_zipcodes)
+    lat = np.round(rng.uniform(25.0, 49.0, num_zipcodes), 4)
+    long = np.round(rng.uniform(-124.0, -67.0, num_zipcodes), 4)
+    with open(path, 'w') as fd:
+        fd.write('zip,type,decommissioned,primary_city,acceptable_cities,unacceptable_cities,' +
+                 'state,county,timezone,area_codes,world_region,country,latitude,longitude,' +
+                 'irs_estimated_population\n')
+        fd.write(''.join('%05d,STANDARD,0,City,,,S%02d,County %d,,,NA,US,%s,%s,1000\n' %
+                         (zipcode, state, zipcode % 7, the_lat, the_long)
+                         for (zipcode, state, the_lat, the_long) in zip(zipcodes.tolist(), states.tolist(),
+                                                                        lat.tolist(), long.tolist())))
+
+#-----------------------------
+# run_benchmark
+#-----------------------
+
+def run_benchmark(nodes_file, links_file, zipcode_source, work_dir,
+                  layout='barnes_hut',
+                  iterations=DEFAULT_ITERATIONS,
+                  initial=None,
+                  seed=None):
+    '''
+    Run the pipeline once on the given files, timing
+    each of STAGES with a profiling.StageProfiler.
+    Without a zip code database, the zipcodes and
+    export stages are skipped.
+
+    @param nodes_file: nodes CSV
+    @type nodes_file: str
+    @param links_file: links CSV
+    @type links_file: str
+    @param zipcode_source: zip code database CSV with
+        at least as many zip codes as there are nodes,
+        or None
+    @type zipcode_source: {str | None}
+    @param work_dir: directory for the zip code table
+        and the exported files
+    @type work_dir: str
+    @param layout: one of layout.LAYOUT_METHODS
+    @type layout: str
+    @param iterations: layout iterations; per level for 'multilevel'
+    @type iterations: int
+    @param initial: one of initial.INITIAL_METHODS, or None
+    @type initial: {str | None}
+    @param seed: random seed for layout and zip codes
+    @type seed: {int | None}
+    @return: the profiler, with one record per stage
+    @rtype: profiling.StageProfiler
+    '''
+    profiler = StageProfiler()
+    networker = Networker(nodes_file, links_file, streaming=True, profiler=profiler)
+    iterations_arg = 'refine_iterations' if layout == 'multilevel' else 'iterations'
+    networker.compute_layout(layout, initial=initial, seed=seed, **{iterations_arg : iterations})
+    if zipcode_source is None:
+        return profiler
+    # Compiling the zip code table is a one-time cost,
+    # recorded as 'zipcode_table' rather than 'zipcodes':
+    networker.internalize_zipcodes(zipcode_source, os.path.join(work_dir, 'zipcodes'))
+    networker.assign_zipcodes(seed=seed)
+    networker.export_converted_input(os.path.join(work_dir, 'export.csv'))
+    return profiler
+
+#-----------------------------
+# run_suite
+#-----------------------
+
+def run_suite(shapes=GRAPH_SHAPES,
+              node_counts=DEFAULT_NODES,
+              degree=DEFAULT_DEGREE,
+              layout='barnes_hut',
+              iterations=DEFAULT_ITERATIONS,
+              initial=None,
+              repeat=1,
+              seed=0,
+              work_dir=None,
+              log=None):
+    '''
+    Benchmark every combination of shape and node count.
+    With repeat > 1, each stage's fastest run counts.
+
+    @param shapes: graph shapes to run
+    @type shapes: sequence
+    @param node_counts: graph sizes to run
+    @type node_counts: sequence
+    @param degree: average number of links per node
+    @type degree: float
+    @param layout: one of layout.LAYOUT_METHODS
+    @type layout: str
+    @param iterations: layout iterations
+    @type iterations: int
+    @param initial: starting positions; one of initial.INITIAL_METHODS
+    @type initial: {str | None}
+    @param repeat: runs per case
+    @type repeat: int
+    @param seed: random seed for graphs, layouts, and zip codes
+    @type seed: int
+    @param work_dir: directory for generated files; None
+        for a temporary one that is removed afterwards
+    @type work_dir: {str | None}
+    @param log: file to print progress to, or None
+    @type log: {file | None}
+    @return: the report, ready for json.dump()
+    @rtype: dict
+    '''
+    if layout not in LAYOUT_METHODS:
+        raise ValueError("Layout method must be one of %s; got '%s'" % (LAYOUT_METHODS, layout))
+    tmp_dir = tempfile.mkdtemp(prefix='netlayout_benchmark_') if work_dir is None else None
+    work_dir = work_dir or tmp_dir
+    try:
+        zipcode_source = os.path.join(work_dir, 'zip_code_database.csv')
+        write_zipcode_database(zipcode_source, min(max(node_counts), ZIPCODE_SPACE), seed=seed)
+        cases = []
+        for shape in shapes:
+            for num_nodes in node_counts:
+                num_links = int(num_nodes * degree)
+                (nodes_file, links_file) = write_graph_files(work_dir, shape, num_nodes, num_links, seed=seed)
+                # Every node gets its own zip code, and there
+                # are only so many:
+                skipped = ('zipcodes', 'export') if num_nodes > ZIPCODE_SPACE else ()
+                runs = [run_benchmark(nodes_file, links_file, None if skipped else zipcode_source, work_dir,
+                                      layout=layout, iterations=iterations, initial=initial, seed=seed)
+                        for _i in range(repeat)]
+                stages = [stage for stage in STAGES if stage not in skipped]
+                seconds = {stage : min(run.seconds(stage) for run in runs) for stage in stages}
+                if initial not in (None, 'random'):
+                    seconds['initial'] = min(run.seconds('initial') for run in runs)
+                layout_record = [record for record in runs[-1].records if record.stage == 'layout'][0]
+                case = {'name'       : '%s_%s' % (shape, num_nodes),
+                        'shape'      : shape,
+                        'num_nodes'  : num_nodes,
+                        'num_links'  : num_links,
+                        'seconds'    : seconds,
+                        'links_per_second'  : num_links / max(seconds['ingest'], 1e-9),
+                        'layout_iterations' : layout_record.iterations,
+                        'final_energy'      : layout_record.energies[-1] if layout_record.energies else None,
+                        'process_peak_rss_bytes' : runs[-1].report()['process_peak_rss_bytes']}
+                if skipped:
+                    case['skipped'] = {'stages' : list(skipped),
+                                       'reason' : 'more nodes than the %s possible zip codes' % ZIPCODE_SPACE}
+                cases.append(case)
+                if log is not None:
+                    log.write('%-24s %s%s\n' % (case['name'],
+                                                '  '.join('%s %.3fs' % (stage, seconds[stage]) for stage in stages),
+                                                '  (%s skipped: %s)' % (', '.join(skipped), case['skipped']['reason'])
+                                                if skipped else ''))
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {'format_version' : REPORT_FORMAT_VERSION,
+            'created'        : time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python'         : platform.python_version(),
+            'numpy'          : np.__version__,
+            'cpus'           : os.cpu_count(),
+            'layout'         : layout,
+            'iterations'     : iterations,
+            'initial'        : initial or 'random',
+            'degree'         : degree,
+            'cases'          : cases}
+
+#-----------------------------
+# find_regressions
+#-----------------------
+
+def find_regressions(report, baseline,
+                     tolerance=DEFAULT_TOLERANCE,
+                     min_seconds=MIN_REGRESSION_SECONDS):
+    '''
+    Stages of the report's cases that are slower than
+    in the baseline's case of the same name by more than
+    the fraction tolerance, and by more than min_seconds.
+    Cases missing from the baseline are ignored.
+
+    @param report: result of run_suite()
+    @type report: dict
+    @param baseline: earlier result of run_suite()
+    @type baseline: dict
+    @param tolerance: allowed slowdown, as a fraction
+    @type tolerance: float
+    @param min_seconds: allowed slowdown in seconds
+    @type min_seconds: float
+    @return: one {case, stage, baseline, current, ratio}
+        dict per regression
+    @rtype: [dict]
+    '''
+    baseline_cases = {case['name'] : case for case in baseline['cases']}
+    regressions = []
+    for case in report['cases']:
+        baseline_case = baseline_cases.get(case['name'])
+        if baseline_case is None:
+            continue
+        for (stage, current) in case['seconds'].items():
+            before = baseline_case['seconds'].get(stage)
+            if before is None:
+                continue
+            if current > before * (1.0 + tolerance) and current - before > min_seconds:
+                regressions.append({'case'     : case['name'],
+                                    'stage'    : stage,
+                                    'baseline' : before,
+                                    'current'  : current,
+                                    'ratio'    : current / before if before > 0 else float('inf')})
+    return regressions
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(prog=os.path.basename(sys.argv[0]), formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-s', '--shapes',
+                        help='Graph shapes to run; default: all',
+                        nargs='+',
+                        choices=GRAPH_SHAPES,
+                        default=list(GRAPH_SHAPES))
+    parser.add_argument('-n', '--nodes',
+                        help='Graph sizes in nodes; default: %s' % ' '.join(str(num) for num in DEFAULT_NODES),
+                        nargs='+',
+                        type=int,
+                        default=list(DEFAULT_NODES))
+    parser.add_argument('--degree',
+                        help='Average links per node; default: %s' % DEFAULT_DEGREE,
+                        type=float,
+                        default=DEFAULT_DEGREE)
+    parser.add_argument('-l', '--layout',
+                        help='Layout method; default: barnes_hut',
+                        choices=LAYOUT_METHODS,
+                        default='barnes_hut')
+    parser.add_argument('-i', '--iterations',
+                        help='Layout iterations; default: %s' % DEFAULT_ITERATIONS,
+                        type=int,
+                        default=DEFAULT_ITERATIONS)
+    parser.add_argument('--initial',
+                        help='Starting positions of the layout; default: random',
+                        choices=INITIAL_METHODS,
+                        default=None)
+    parser.add_argument('-r', '--repeat',
+                        help='Runs per case; the fastest counts. Default: 1',
+                        type=int,
+                        default=1)
+    parser.add_argument('-o', '--outfile',
+                        help='JSON report file; default: print to stdout',
+                        default=None)
+    parser.add_argument('-b', '--baseline',
+                        help='Earlier JSON report to check for regressions against.',
+                        default=None)
+    parser.add_argument('-t', '--tolerance',
+                        help='Allowed slowdown against the baseline, as a fraction;\n' +\
+                             'default: %s' % DEFAULT_TOLERANCE,
+                        type=float,
+                        default=DEFAULT_TOLERANCE)
+    parser.add_argument('--work_dir',
+                        help='Keep generated files in this directory; default: a temporary one',
+                        default=None)
+    parser.add_argument('--seed',
+                        help='Random seed; default: 0',
+                        type=int,
+                        default=0)
+    args = parser.parse_args();
+
+    report = run_suite(shapes=args.shapes,
+                       node_counts=args.nodes,
+                       degree=args.degree,
+                       layout=args.layout,
+                       iterations=args.iterations,
+                       initial=args.initial,
+                       repeat=args.repeat,
+                       seed=args.seed,
+                       work_dir=args.work_dir,
+                       log=sys.stderr)
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as fd:
+            report['regressions'] = find_regressions(report, json.load(fd), args.tolerance)
+    if args.outfile is None:
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+    else:
+        with open(args.outfile, 'w') as fd:
+            json.dump(report, fd, indent=1)
+    for regression in report.get('regressions', []):
+        sys.stderr.write('REGRESSION %(case)s %(stage)s: %(baseline).3fs -> %(current).3fs (x%(ratio).2f)\n' %
+                         regression)
+    sys.exit(1 if report.get('regressions') else 0)
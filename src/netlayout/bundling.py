@@ -0,0 +1,344 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Force-directed edge bundling (Holten and van Wijk,
+2009) of a laid out graph, for drawing large graphs
+as bundled paths rather than millions of straight
+lines.
+
+Every link becomes a polyline between its end points.
+Interior points of compatible links attract each
+other, and springs along each polyline resist the
+pull. The bundling runs in cycles: each cycle doubles
+the interior points of every link, by inserting the
+midpoint of each segment, and runs fewer iterations
+with a smaller step than the cycle before.
+
+Two links P and Q are compatible to the degree
+
+    C = angle * scale * position * visibility
+
+each in [0, 1]: how parallel they are, how similar
+their lengths, how near their midpoints are relative
+to their lengths, and how much of each one's
+projection onto the other overlaps it. Only pairs
+with C of at least a threshold attract each other.
+
+Compatible pairs are found without comparing all
+pairs. Links are sorted into length classes by powers
+of two; the midpoints of each class go into a grid
+whose cells are twice as wide as the class's longest
+possible link, and each link is only compared with
+links of its own and the next class in the same or a
+neighboring cell. Pairs farther apart are too distant,
+relative to their lengths, to pass the default
+threshold. Dense cells are sampled down to a fixed
+number of candidates, and each link keeps its
+max_partners most compatible partners, so the work is
+linear in the number of links.
+
+Bundled paths are returned as a num_links x points x 2
+array, ordered like the links of the graph, with the
+end points in the first and last columns; see
+export.write_path_table() and columnar.write_edge_paths()
+for the Tableau path tables written from it.
+'''
+import numpy as np
+
+
+DEFAULT_CYCLES = 5
+DEFAULT_ITERATIONS = 40
+# Iterations of each cycle, as a fraction of the cycle before:
+ITERATION_RATE = 2.0 / 3
+# Step size, as a fraction of the median link length:
+DEFAULT_STEP = 0.04
+DEFAULT_STIFFNESS = 0.1
+DEFAULT_COMPATIBILITY = 0.6
+DEFAULT_MAX_PARTNERS = 16
+# Largest move of a point towards its path neighbors in
+# one step, as a fraction of the distance; beyond 0.5,
+# springs of very short links would oscillate and diverge:
+SPRING_STEP_LIMIT = 0.25
+
+# Candidates taken from one grid cell for one link:
+DEFAULT_MAX_CELL_CANDIDATES = 32
+
+# Links whose candidates are scored at a time, and
+# pair-point rows whose forces are computed at a time:
+CANDIDATE_CHUNK_LINKS = 1 << 14
+FORCE_CHUNK_ROWS = 1 << 20
+
+#-----------------------------
+# compatibility
+#-----------------------
+
+def compatibility(p0, p1, q0, q1):
+    '''
+    Compatibility of links p0-p1 and q0-q1, row by row;
+    see the module docstring. Links of zero length are
+    compatible with nothing.
+
+    @param p0: n x 2 start points of the first links
+    @type p0: np.ndarray
+    @param p1: n x 2 end points of the first links
+    @type p1: np.ndarray
+    @param q0: n x 2 start points of the second links
+    @type q0: np.ndarray
+    @param q1: n x 2 end points of the second links
+    @type q1: np.ndarray
+    @rtype: np.ndarray
+    '''
+    (vp, vq) = (p1 - p0, q1 - q0)
+    (lp, lq) = (np.hypot(vp[:, 0], vp[:, 1]), np.hypot(vq[:, 0], vq[:, 1]))
+    valid = (lp > 0) & (lq > 0)
+    (lp, lq) = (np.where(valid, lp, 1.0), np.where(valid, lq, 1.0))
+
+    angle = np.abs((vp * vq).sum(axis=1)) / (lp * lq)
+    mean_length = 0.5 * (lp + lq)
+    scale = 2.0 / (mean_length / np.minimum(lp, lq) + np.maximum(lp, lq) / mean_length)
+    apart = np.hypot(*(0.5 * (p0 + p1 - q0 - q1)).T)
+    position = mean_length / (mean_length + apart)
+    visibility = np.minimum(_visibility(p0, vp, lp, q0, q1), _visibility(q0, vq, lq, p0, p1))
+    return np.where(valid, angle * scale * position * visibility, 0.0)
+
+def _visibility(p0, vp, lp, q0, q1):
+    '''
+    How centered the projection of q0-q1 onto the line
+    through p0 is on p0-p1: 1 if their midpoints coincide,
+    0 if the midpoint of p is half the projection's length
+    or more away from the projection's midpoint.
+    '''
+    direction = vp / lp[:, None]
+    t0 = ((q0 - p0) * direction).sum(axis=1)
+    t1 = ((q1 - p0) * direction).sum(axis=1)
+    span = np.abs(t1 - t0)
+    off_center = np.abs(0.5 * (t0 + t1) - 0.5 * lp)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        visible = np.where(span > 0, 1.0 - 2.0 * off_center / span, 0.0)
+    return np.maximum(visible, 0.0)
+
+#-----------------------------
+# compatible_pairs
+#-----------------------
+
+def compatible_pairs(p0, p1,
+                     threshold=DEFAULT_COMPATIBILITY,
+                     max_partners=DEFAULT_MAX_PARTNERS,
+                     max_cell_candidates=DEFAULT_MAX_CELL_CANDIDATES,
+                     seed=None):
+    '''
+    The compatible partners of every link, found through
+    length-class grids; see the module docstring.
+
+    @param p0: num_links x 2 start points
+    @type p0: np.ndarray
+    @param p1: num_links x 2 end points
+    @type p1: np.ndarray
+    @param threshold: least compatibility of partners
+    @type threshold: float
+    @param max_partners: most partners kept per link, the
+        most compatible ones
+    @type max_partners: int
+    @param max_cell_candidates: most candidates taken from
+        one grid cell for one link; a random run of them
+        if the cell holds more
+    @type max_cell_candidates: int
+    @param seed: random seed for sampling dense cells
+    @type seed: {int | None}
+    @return: link, partner, and compatibility of each pair,
+        sorted by link; every pair appears in both directions,
+        unless one side has more than max_partners partners
+    @rtype: (np.ndarray, np.ndarray, np.ndarray)
+    '''
+    rng = np.random.default_rng(seed)
+    lengths = np.hypot(*(p1 - p0).T)
+    midpoints = 0.5 * (p0 + p1)
+    linked = np.flatnonzero(lengths > 0)
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0))
+    if len(linked) < 2:
+        return empty
+
+    unit = np.median(lengths[linked])
+    classes = np.full(len(lengths), -1, dtype=np.int64)
+    classes[linked] = np.maximum(np.floor(np.log2(lengths[linked] / unit)), 0).astype(np.int64)
+    origin = midpoints[linked].min(axis=0)
+
+    (links, partners, scores) = ([], [], [])
+    for link_class in np.unique(classes[linked]):
+        # Cells twice as wide as the longest link of the class:
+        cell_size = 2.0 ** (link_class + 2) * unit
+        primary = np.flatnonzero(classes == link_class)
+        candidates = np.flatnonzero((classes == link_class) | (classes == link_class + 1))
+        cells = np.floor((midpoints - origin) / cell_size).astype(np.int64)
+        width = cells[linked, 0].max() + 3
+        cell_ids = (cells[:, 1] + 1) * width + cells[:, 0] + 1
+        order = np.argsort(cell_ids[candidates], kind='stable')
+        (candidates, sorted_cells) = (candidates[order], cell_ids[candidates][order])
+
+        for start in range(0, len(primary), CANDIDATE_CHUNK_LINKS):
+            chunk = primary[start:start + CANDIDATE_CHUNK_LINKS]
+            for (dx, dy) in [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]:
+                target = cell_ids[chunk] + dy * width + dx
+                first = np.searchsorted(sorted_cells, target, side='left')
+                counts = np.searchsorted(sorted_cells, target, side='right') - first
+                crowded = counts > max_cell_candidates
+                first[crowded] += (rng.random(crowded.sum()) *
+                                   (counts[crowded] - max_cell_candidates + 1)).astype(np.int64)
+                counts = np.minimum(counts, max_cell_candidates)
+                (link, partner) = _expand_ranges(chunk, first, counts)
+                partner = candidates[partner]
+                # Pairs within the class are found from both
+                # sides; keep one:
+                keep = (classes[partner] != link_class) | (link < partner)
+                (link, partner) = (link[keep], partner[keep])
+                score = compatibility(p0[link], p1[link], p0[partner], p1[partner])
+                keep = score >= threshold
+                links.append(link[keep])
+                partners.append(partner[keep])
+                scores.append(score[keep])
+
+    if not links:
+        return empty
+    (link, partner, score) = (np.concatenate(links), np.concatenate(partners), np.concatenate(scores))
+    (link, partner, score) = (np.concatenate([link, partner]),
+                              np.concatenate([partner, link]),
+                              np.concatenate([score, score]))
+    # Pairs met from more than one sampled run count once:
+    (_keys, unique_rows) = np.unique(link * len(lengths) + partner, return_index=True)
+    (link, partner, score) = (link[unique_rows], partner[unique_rows], score[unique_rows])
+    # Most compatible partners first, then cut each link's list:
+    order = np.lexsort((-score, link))
+    (link, partner, score) = (link[order], partner[order], score[order])
+    group_starts = np.flatnonzero(np.concatenate([[True], link[1:] != link[:-1]]))
+    rank = np.arange(len(link)) - np.repeat(group_starts, np.diff(np.append(group_starts, len(link))))
+    keep = rank < max_partners
+    return (link[keep], partner[keep], score[keep])
+
+def _expand_ranges(owners, first, counts):
+    '''
+    For each owner i, the pairs (owners[i], first[i] + k)
+    for k in 0..counts[i]-1.
+    '''
+    owner_rows = np.repeat(np.arange(len(owners)), counts)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    within = np.arange(len(owner_rows)) - starts[owner_rows]
+    return (owners[owner_rows], first[owner_rows] + within)
+
+#-----------------------------
+# bundle_edges
+#-----------------------
+
+def bundle_edges(src, dst, pos,
+                 cycles=DEFAULT_CYCLES,
+                 iterations=DEFAULT_ITERATIONS,
+                 step=DEFAULT_STEP,
+                 stiffness=DEFAULT_STIFFNESS,
+                 threshold=DEFAULT_COMPATIBILITY,
+                 max_partners=DEFAULT_MAX_PARTNERS,
+                 seed=None,
+                 callback=None):
+    '''
+    Bundled polylines of the given links; see the module
+    docstring. Links get 2^cycles - 1 interior points.
+    Self loops and links whose compatibility with every
+    other link is below threshold stay straight.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param pos: num_nodes x 2 layout positions
+    @type pos: np.ndarray
+    @param cycles: number of subdivision cycles
+    @type cycles: int
+    @param iterations: iterations of the first cycle
+    @type iterations: int
+    @param step: step size of the first cycle, as a fraction
+        of the median link length; halved every cycle
+    @type step: float
+    @param stiffness: spring constant along each link
+    @type stiffness: float
+    @param threshold: least compatibility of attracting links
+    @type threshold: float
+    @param max_partners: most partners attracting one link
+    @type max_partners: int
+    @param seed: random seed for sampling dense grid cells
+    @type seed: {int | None}
+    @param callback: function(cycle, iteration) called
+        after every iteration, or None
+    @type callback: {callable | None}
+    @return: num_links x (2^cycles + 1) x 2 path points
+    @rtype: np.ndarray
+    '''
+    if cycles < 1:
+        raise ValueError("Bundling needs at least one cycle; got %s" % cycles)
+    pos = np.asarray(pos, dtype=np.float64)
+    (p0, p1) = (pos[np.asarray(src)], pos[np.asarray(dst)])
+    (link, partner, score) = compatible_pairs(p0, p1, threshold, max_partners, seed=seed)
+    lengths = np.hypot(*(p1 - p0).T)
+    unit = np.median(lengths[lengths > 0]) if (lengths > 0).any() else 1.0
+
+    # Partners running the other way meet point by point
+    # in reverse order:
+    reverse = ((p1[link] - p0[link]) * (p1[partner] - p0[partner])).sum(axis=1) < 0
+    group_starts = np.flatnonzero(np.concatenate([[True], link[1:] != link[:-1]])) if len(link) else \
+                   np.empty(0, dtype=np.int64)
+    spring_scale = stiffness / np.where(lengths > 0, lengths, 1.0)
+
+    # Path points in float32: end points, plus one midpoint:
+    paths = np.stack([p0, 0.5 * (p0 + p1), p1], axis=1).astype(np.float32)
+    cycle_iterations = float(iterations)
+    cycle_step = step * unit
+    for cycle in range(cycles):
+        if cycle > 0:
+            paths = _subdivide(paths)
+        num_interior = paths.shape[1] - 2
+        # Capped so that steps cannot overshoot on short links:
+        link_spring = np.minimum(spring_scale * (num_interior + 1), SPRING_STEP_LIMIT / cycle_step)
+        link_spring = link_spring.astype(np.float32)[:, None, None]
+        for iteration in range(max(int(round(cycle_iterations)), 1)):
+            interior = paths[:, 1:-1]
+            force = link_spring * (paths[:, :-2] + paths[:, 2:] - 2 * interior)
+            force += _attraction(interior, link, partner, score, reverse, group_starts)
+            interior += cycle_step * force
+            if callback is not None:
+                callback(cycle, iteration)
+        cycle_iterations *= ITERATION_RATE
+        cycle_step *= 0.5
+    return paths
+
+def _subdivide(paths):
+    '''
+    Insert the midpoint of every segment of every path.
+    '''
+    (num_links, num_points, _) = paths.shape
+    divided = np.empty((num_links, 2 * num_points - 1, 2), dtype=paths.dtype)
+    divided[:, ::2] = paths
+    divided[:, 1::2] = 0.5 * (paths[:, :-1] + paths[:, 1:])
+    return divided
+
+def _attraction(interior, link, partner, score, reverse, group_starts):
+    '''
+    Sum over each link's partners of compatibility times
+    the unit vector from each interior point towards the
+    partner's corresponding point.
+    '''
+    force = np.zeros_like(interior)
+    if len(link) == 0:
+        return force
+    rows = max(FORCE_CHUNK_ROWS // interior.shape[1], 1)
+    # Chunks end on group starts, so that each chunk
+    # holds whole groups of partners:
+    bounds = np.append(group_starts[::max(len(group_starts) * rows // max(len(link), 1), 1)], len(link))
+    for (start, stop) in zip(bounds[:-1], bounds[1:]):
+        others = interior[partner[start:stop]]
+        flipped = reverse[start:stop]
+        others[flipped] = others[flipped, ::-1]
+        toward = others - interior[link[start:stop]]
+        distance = np.sqrt((toward ** 2).sum(axis=2, keepdims=True))
+        toward *= (score[start:stop, None, None] / np.maximum(distance, 1e-12)).astype(np.float32)
+        starts = group_starts[(group_starts >= start) & (group_starts < stop)]
+        force[link[starts]] += np.add.reduceat(toward, starts - start, axis=0)
+    return force
@@ -0,0 +1,321 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Columnar export of an interned graph as Parquet or
+Arrow IPC files, for Tableau and other column stores
+that would otherwise re-parse the CSV export.
+
+Three tables, with proper column types:
+
+    <base>_nodes:  node_id, node, [zipcode, latitude, longitude],
+                   [x, y], node properties
+    <base>_links:  link_id, src, dst, weight, link properties,
+                   in input file order; weights the input did
+                   not give are null
+    <base>_paths:  two rows per link, one for each end point:
+                   link_id, path_order (1 or 2), node_id, x, y
+
+The paths table is the shape Tableau's line mark
+needs to draw links: the rows of a link share its
+link_id, and path_order gives the drawing order.
+Links bundled by bundling.bundle_edges() get one row
+per path point instead, with node_id null between
+the end points.
+
+Numeric columns are handed to Arrow as views of
+the GraphStore arrays, without copying; string
+property columns stay dictionary encoded, reusing
+their int32 codes as the dictionary indices. Rows
+go out in record batches of chunk_rows rows, so the
+paths table, which must be interleaved, never exists
+in memory as a whole.
+
+Requires the optional pyarrow package.
+'''
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from netlayout.export import MaskedColumn, chunk_values, path_rows
+from netlayout.graph_store import CategoricalColumn, MISSING_CODE, TypedColumn
+from netlayout.ingest import DEFAULT_CHUNK_ROWS, WEIGHT_COLUMN
+
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+FILE_EXTENSIONS = {'parquet' : '.parquet', 'arrow' : '.arrow'}
+
+#-----------------------------
+# require_pyarrow
+#-----------------------
+
+def require_pyarrow():
+    if pa is None:
+        raise ImportError("Columnar export needs the pyarrow package; " +
+                          "install it with 'pip install pyarrow'.")
+
+#-----------------------------
+# to_arrow
+#-----------------------
+
+def to_arrow(column, rows=slice(None)):
+    '''
+    Arrow array of the given rows of a column: a NumPy
+    array, a property column of a GraphStore, or an
+    export.GatheredColumn or export.MaskedColumn. Numeric
+    arrays are wrapped without copying, with NaN as null. Categorical
+    columns become dictionary arrays, with MISSING_CODE
+    rows null; typed columns become int64 or float64
+    arrays, with missing values null.
+
+    @param column: column to convert
+    @type column: {np.ndarray | NumericColumn | CategoricalColumn | TypedColumn | GatheredColumn | MaskedColumn}
+    @param rows: range of rows, or row indexes
+    @type rows: {slice | np.ndarray}
+    @rtype: pyarrow.Array
+    '''
+    if isinstance(column, TypedColumn):
+        chunk = column.take(rows)
+        return pa.array(chunk.to_array(), mask=chunk.missing())
+    if isinstance(column, CategoricalColumn):
+        codes = column.codes[rows]
+        indices = pa.array(codes, mask=codes == MISSING_CODE)
+        dictionary = pa.array(np.asarray(column.categories, dtype=object), type=pa.string())
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+    values = chunk_values(column, rows)
+    if values.dtype == object or values.dtype.kind == 'U':
+        return pa.array(values, type=pa.string())
+    return pa.array(values, from_pandas=values.dtype.kind == 'f')
+
+# ---------------------------- TableWriter -----------
+
+class TableWriter(object):
+    '''
+    Writes record batches to one Parquet or Arrow
+    IPC file. Use as a context manager.
+    '''
+
+    def __init__(self, path, schema, file_format='parquet'):
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError("Columnar format must be one of %s; got '%s'" % (COLUMNAR_FORMATS, file_format))
+        self.path = path
+        self.schema = schema
+        self.file_format = file_format
+        self.writer = None
+
+    def __enter__(self):
+        if self.file_format == 'parquet':
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(self.path, self.schema)
+        return self
+
+    def write(self, arrays):
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self.file_format == 'parquet':
+            self.writer.write_batch(batch)
+        else:
+            self.writer.write(batch)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.writer.close()
+        return False
+
+#-----------------------------
+# write_columns
+#-----------------------
+
+def write_columns(path, names, columns, file_format='parquet', chunk_rows=DEFAULT_CHUNK_ROWS, order=None):
+    '''
+    Write equal-length columns as one table, in record
+    batches of chunk_rows rows.
+
+    @param path: file to (over)write
+    @type path: str
+    @param names: column names
+    @type names: [str]
+    @param columns: one column per name; see to_arrow()
+    @type columns: list
+    @param file_format: one of COLUMNAR_FORMATS
+    @type file_format: str
+    @param chunk_rows: rows per record batch
+    @type chunk_rows: int
+    @param order: row of the columns for each output row,
+        or None to write the rows in column order
+    @type order: {np.ndarray | None}
+    @return: number of rows written
+    @rtype: int
+    '''
+    require_pyarrow()
+    if chunk_rows < 1:
+        raise ValueError("Chunk size must be at least one row; got %s" % chunk_rows)
+    if len(names) != len(columns):
+        raise ValueError("Got %s column names for %s columns." % (len(names), len(columns)))
+    num_rows = len(columns[0])
+    # Schema from a zero-row slice of each column:
+    schema = pa.schema([(name, to_arrow(column, slice(0, 0)).type)
+                        for (name, column) in zip(names, columns)])
+    with TableWriter(path, schema, file_format) as writer:
+        for start in range(0, max(num_rows, 1), chunk_rows):
+            rows = slice(start, min(start + chunk_rows, num_rows))
+            if order is not None:
+                rows = order[rows]
+            writer.write([to_arrow(column, rows) for column in columns])
+    return num_rows
+
+#-----------------------------
+# write_edge_paths
+#-----------------------
+
+def write_edge_paths(path, graph, positions,
+                     paths=None,
+                     file_format='parquet',
+                     chunk_rows=DEFAULT_CHUNK_ROWS):
+    '''
+    Write the paths table: for every link, one row for
+    its source and one for its destination, with the
+    position of that end point; or, given bundled paths,
+    one row per path point.
+
+    @param path: file to (over)write
+    @type path: str
+    @param graph: the interned graph
+    @type graph: graph_store.GraphStore
+    @param positions: num_nodes x 2 layout positions
+    @type positions: np.ndarray
+    @param paths: num_links x points x 2 bundled path points, or None
+    @type paths: {np.ndarray | None}
+    @param file_format: one of COLUMNAR_FORMATS
+    @type file_format: str
+    @param chunk_rows: links per record batch
+    @type chunk_rows: int
+    @return: number of rows written
+    @rtype: int
+    '''
+    require_pyarrow()
+    if paths is not None:
+        return _write_bundled_paths(path, graph, paths, file_format, chunk_rows)
+    schema = pa.schema([('link_id', pa.int64()),
+                        ('path_order', pa.int8()),
+                        ('node_id', pa.int32()),
+                        ('x', pa.float64()),
+                        ('y', pa.float64())])
+    num_links = graph.num_edges
+    with TableWriter(path, schema, file_format) as writer:
+        for start in range(0, max(num_links, 1), chunk_rows):
+            stop = min(start + chunk_rows, num_links)
+            # Source and destination of each link side by side:
+            node_ids = np.stack([graph.src[start:stop], graph.dst[start:stop]], axis=1).ravel()
+            coords = positions[node_ids]
+            writer.write([pa.array(np.repeat(np.arange(start, stop, dtype=np.int64), 2)),
+                          pa.array(np.tile(np.array([1, 2], dtype=np.int8), stop - start)),
+                          pa.array(node_ids),
+                          pa.array(coords[:, 0]),
+                          pa.array(coords[:, 1])])
+    return 2 * num_links
+
+def _write_bundled_paths(path, graph, paths, file_format, chunk_rows):
+    num_points = paths.shape[1]
+    schema = pa.schema([('link_id', pa.int64()),
+                        ('path_order', pa.int16()),
+                        ('node_id', pa.int32()),
+                        ('x', pa.float64()),
+                        ('y', pa.float64())])
+    num_links = graph.num_edges
+    with TableWriter(path, schema, file_format) as writer:
+        for start in range(0, max(num_links, 1), chunk_rows):
+            stop = min(start + chunk_rows, num_links)
+            (link_ids, path_order, x, y) = path_rows(paths, start, stop)
+            # End point node ids; interior points have none:
+            node_ids = np.zeros((stop - start, num_points), dtype=np.int32)
+            (node_ids[:, 0], node_ids[:, -1]) = (graph.src[start:stop], graph.dst[start:stop])
+            interior = np.zeros((stop - start, num_points), dtype=bool)
+            interior[:, 1:-1] = True
+            writer.write([pa.array(link_ids),
+                          pa.array(path_order),
+                          pa.array(node_ids.ravel(), mask=interior.ravel()),
+                          pa.array(x.astype(np.float64)),
+                          pa.array(y.astype(np.float64))])
+    return num_links * num_points
+
+#-----------------------------
+# export_columnar
+#-----------------------
+
+def export_columnar(base, graph,
+                    positions=None,
+                    paths=None,
+                    zipcodes=None,
+                    lat=None,
+                    long=None,
+                    file_format='parquet',
+                    chunk_rows=DEFAULT_CHUNK_ROWS):
+    '''
+    Write the nodes, links, and, given positions, the
+    paths table; see the module docstring.
+
+    @param base: output path without extension; table
+        names and extension are appended
+    @type base: str
+    @param graph: the interned graph
+    @type graph: graph_store.GraphStore
+    @param positions: num_nodes x 2 layout positions, or None
+    @type positions: {np.ndarray | None}
+    @param paths: bundled link paths for the paths table, or None
+    @type paths: {np.ndarray | None}
+    @param zipcodes: zip code string of each node id, or None
+    @type zipcodes: {np.ndarray | None}
+    @param lat: latitude of each node's zip code, or None
+    @type lat: {np.ndarray | export.GatheredColumn | None}
+    @param long: longitude of each node's zip code, or None
+    @type long: {np.ndarray | export.GatheredColumn | None}
+    @param file_format: one of COLUMNAR_FORMATS
+    @type file_format: str
+    @param chunk_rows: rows per record batch
+    @type chunk_rows: int
+    @return: paths written
+    @rtype: [str]
+    '''
+    require_pyarrow()
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError("Columnar format must be one of %s; got '%s'" % (COLUMNAR_FORMATS, file_format))
+    extension = FILE_EXTENSIONS[file_format]
+    written = []
+
+    names = ['node_id', 'node']
+    columns = [np.arange(graph.num_nodes, dtype=np.int32), graph.node_names]
+    if zipcodes is not None:
+        names.append('zipcode')
+        columns.append(zipcodes)
+    if lat is not None and long is not None:
+        names += ['latitude', 'longitude']
+        columns += [lat, long]
+    if positions is not None:
+        names += ['x', 'y']
+        columns += [positions[:, 0], positions[:, 1]]
+    names += list(graph.node_properties)
+    columns += list(graph.node_properties.values())
+    written.append(base + '_nodes' + extension)
+    write_columns(written[-1], names, columns, file_format, chunk_rows)
+
+    # Rows in input order, each with the link_id of
+    # its rows in the paths table:
+    names = ['link_id', 'src', 'dst', WEIGHT_COLUMN] + list(graph.link_properties)
+    columns = [np.arange(graph.num_edges, dtype=np.int64),
+               graph.src,
+               graph.dst,
+               graph.weight if graph.missing_weight is None
+               else MaskedColumn(graph.weight, graph.missing_weight)] + list(graph.link_properties.values())
+    written.append(base + '_links' + extension)
+    write_columns(written[-1], names, columns, file_format, chunk_rows, order=graph.input_order)
+
+    if positions is not None:
+        written.append(base + '_paths' + extension)
+        write_edge_paths(written[-1], graph, positions, paths, file_format, chunk_rows)
+    return written
@@ -0,0 +1,402 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Community detection on the interned link arrays, and
+a hierarchy of community-collapsed views of the graph
+for level-of-detail dashboards.
+
+Communities are found Louvain style (Blondel et al.,
+2008): nodes repeatedly move to the neighboring
+community that most increases modularity, then each
+community is collapsed into one super-node, and the
+moves repeat on the collapsed graph. Each collapse
+is one level of the hierarchy; levels stop once a
+collapse no longer shrinks the graph by a tenth.
+
+The moves are made in vectorized rounds rather than
+node by node: in each round every node picks its best
+community at once, given the community volumes at the
+start of the round, and a random half of the nodes
+that would gain from a move make it. Moving only half
+keeps neighbors from swapping communities back and
+forth.
+
+Links are taken as undirected. Collapsed graphs have
+a link between two communities whose weight is the
+sum of the weights of all links between their
+members; links within a community disappear, but
+count in its volume.
+
+Each level of a CommunityHierarchy gives every
+original node its community, so that positions of
+communities are the centroids of their members in
+the detailed layout, and a level can be drawn on
+top of it. write_views() exports the levels as
+tables; see there.
+'''
+import numpy as np
+
+from netlayout.columnar import COLUMNAR_FORMATS, FILE_EXTENSIONS, write_columns
+from netlayout.export import write_table
+from netlayout.ingest import DEFAULT_CHUNK_ROWS
+from netlayout.multilevel import coarsen
+
+
+DEFAULT_RESOLUTION = 1.0
+DEFAULT_MAX_LEVELS = 10
+DEFAULT_MAX_ROUNDS = 15
+
+# Stop moving nodes once fewer than this fraction
+# of them would gain from a move:
+MIN_MOVED_FRACTION = 0.01
+
+# Keep collapsing only while a level has at most this
+# fraction of the nodes of the level below; views that
+# barely differ are not worth a dashboard sheet:
+MAX_LEVEL_RATIO = 0.9
+
+# Chance of each node to move in one round:
+MOVE_PROBABILITY = 0.5
+
+VIEW_FORMATS = ('csv',) + COLUMNAR_FORMATS
+
+#-----------------------------
+# node_volumes
+#-----------------------
+
+def node_volumes(src, dst, weight, num_nodes):
+    '''
+    Weighted degree of every node, counting links in
+    either direction; self loops count twice.
+
+    @rtype: np.ndarray
+    '''
+    return (np.bincount(src, weight, minlength=num_nodes) +
+            np.bincount(dst, weight, minlength=num_nodes))
+
+#-----------------------------
+# modularity
+#-----------------------
+
+def modularity(src, dst, weight, membership, resolution=DEFAULT_RESOLUTION):
+    '''
+    Modularity of a partition of an undirected graph:
+    the fraction of link weight within communities,
+    minus the fraction expected at random given the
+    node volumes.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param weight: link weights; None for all 1.0
+    @type weight: {np.ndarray | None}
+    @param membership: community of each node
+    @type membership: np.ndarray
+    @param resolution: weight of the expected fraction;
+        higher values favor smaller communities
+    @type resolution: float
+    @rtype: float
+    '''
+    weight = np.ones(len(src)) if weight is None else np.asarray(weight, dtype=np.float64)
+    total = 2.0 * weight.sum()
+    if total == 0:
+        return 0.0
+    num_communities = membership.max() + 1 if len(membership) else 0
+    inside = membership[src] == membership[dst]
+    community_volumes = np.bincount(membership,
+                                    node_volumes(src, dst, weight, len(membership)),
+                                    minlength=num_communities)
+    return float(2.0 * weight[inside].sum() / total -
+                 resolution * ((community_volumes / total) ** 2).sum())
+
+#-----------------------------
+# move_nodes
+#-----------------------
+
+def move_nodes(src, dst, weight, num_nodes,
+               volume=None,
+               resolution=DEFAULT_RESOLUTION,
+               max_rounds=DEFAULT_MAX_ROUNDS,
+               seed=None):
+    '''
+    The local moving phase of Louvain, in vectorized
+    rounds; see the module docstring.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param weight: link weights
+    @type weight: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param volume: volume of each node, if it includes
+        weight not among the links, as for collapsed
+        communities; default: node_volumes()
+    @type volume: {np.ndarray | None}
+    @param resolution: see modularity()
+    @type resolution: float
+    @param max_rounds: most rounds of moves
+    @type max_rounds: int
+    @param seed: random seed for picking movers and breaking ties
+    @type seed: {int | None}
+    @return: community of each node, numbered 0..c-1,
+        and the number c of communities
+    @rtype: (np.ndarray, int)
+    '''
+    rng = np.random.default_rng(seed)
+    if volume is None:
+        volume = node_volumes(src, dst, weight, num_nodes)
+    total = volume.sum()
+    labels = np.arange(num_nodes)
+    not_loop = src != dst
+    ends  = np.concatenate([src[not_loop], dst[not_loop]]).astype(np.int64)
+    peers = np.concatenate([dst[not_loop], src[not_loop]]).astype(np.int64)
+    heft  = np.concatenate([weight[not_loop], weight[not_loop]])
+    if total == 0 or len(ends) == 0:
+        return (labels, num_nodes)
+
+    for _round in range(max_rounds):
+        community_volume = np.bincount(labels, volume, minlength=num_nodes)
+        # Link weight from each node to each neighboring community:
+        keys = ends * num_nodes + labels[peers]
+        (keys, inverse) = np.unique(keys, return_inverse=True)
+        link_weight = np.bincount(inverse, heft, minlength=len(keys))
+        (nodes, candidates) = (keys // num_nodes, keys % num_nodes)
+
+        # Gain of joining each candidate, and of staying:
+        own = labels[nodes] == candidates
+        others_volume = community_volume[candidates] - np.where(own, volume[nodes], 0.0)
+        gain = link_weight - resolution * volume[nodes] * others_volume / total
+        stay = -resolution * volume * (community_volume[labels] - volume) / total
+        stay[nodes[own]] = gain[own]
+
+        best = _best_per_node(nodes, gain, rng)
+        best_nodes = nodes[best]
+        willing = gain[best] > stay[best_nodes] + 1e-12 * total
+        if willing.sum() < MIN_MOVED_FRACTION * num_nodes or not willing.any():
+            break
+        moving = willing & (rng.random(len(best)) < MOVE_PROBABILITY)
+        labels[best_nodes[moving]] = candidates[best[moving]]
+
+    (_labels, membership) = np.unique(labels, return_inverse=True)
+    return (membership, len(_labels))
+
+def _best_per_node(nodes, gain, rng):
+    '''
+    Row of the highest gain of each node, given rows
+    sorted by node; ties are broken at random.
+    '''
+    starts = np.flatnonzero(np.concatenate([[True], nodes[1:] != nodes[:-1]]))
+    counts = np.diff(np.append(starts, len(nodes)))
+    highest = np.repeat(np.maximum.reduceat(gain, starts), counts)
+    priority = np.where(gain == highest, rng.random(len(gain)), -1.0)
+    chosen = priority == np.repeat(np.maximum.reduceat(priority, starts), counts)
+    rows = np.flatnonzero(chosen)
+    # Equal random priorities are next to impossible; keep one:
+    first = np.concatenate([[True], nodes[rows[1:]] != nodes[rows[:-1]]])
+    return rows[first]
+
+#-----------------------------
+# detect_communities
+#-----------------------
+
+def detect_communities(src, dst, num_nodes,
+                       weight=None,
+                       resolution=DEFAULT_RESOLUTION,
+                       max_levels=DEFAULT_MAX_LEVELS,
+                       max_rounds=DEFAULT_MAX_ROUNDS,
+                       seed=None):
+    '''
+    Build the community hierarchy of a graph; see the
+    module docstring.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param weight: link weights; None for all 1.0
+    @type weight: {np.ndarray | None}
+    @param resolution: see modularity()
+    @type resolution: float
+    @param max_levels: most levels of collapsed views
+    @type max_levels: int
+    @param max_rounds: most rounds of moves per level
+    @type max_rounds: int
+    @param seed: random seed
+    @type seed: {int | None}
+    @rtype: CommunityHierarchy
+    '''
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    weight = np.ones(len(src)) if weight is None else np.asarray(weight, dtype=np.float64)
+    volume = node_volumes(src, dst, weight, num_nodes)
+    membership = np.arange(num_nodes)
+    levels = []
+    (level_src, level_dst, level_weight, level_nodes) = (src, dst, weight, num_nodes)
+    while len(levels) < max_levels:
+        (mapping, num_communities) = move_nodes(level_src, level_dst, level_weight, level_nodes,
+                                                volume=volume,
+                                                resolution=resolution,
+                                                max_rounds=max_rounds,
+                                                seed=None if seed is None else seed + len(levels))
+        if num_communities > MAX_LEVEL_RATIO * level_nodes:
+            break
+        membership = mapping[membership]
+        volume = np.bincount(mapping, volume, minlength=num_communities)
+        (level_src, level_dst, level_weight) = coarsen(level_src, level_dst, level_weight,
+                                                       mapping, num_communities)
+        level_nodes = num_communities
+        levels.append({'membership'      : membership,
+                       'parent_of_finer' : mapping,
+                       'num_communities' : num_communities,
+                       'src'             : level_src,
+                       'dst'             : level_dst,
+                       'weight'          : level_weight,
+                       'size'            : np.bincount(membership, minlength=num_communities),
+                       'volume'          : volume})
+    return CommunityHierarchy(levels, num_nodes)
+
+# ---------------------------- CommunityHierarchy -----------
+
+class CommunityHierarchy(object):
+    '''
+    Levels of community-collapsed views of one graph,
+    finest first. Level k is a dict with:
+
+       - membership:       community of each original node
+       - parent_of_finer:  community of each node of level k-1,
+                           the original nodes for k = 0
+       - num_communities
+       - src, dst, weight: summed links between communities
+       - size:             original nodes in each community
+       - volume:           weighted degree of each community
+    '''
+
+    def __init__(self, levels, num_nodes):
+        self.levels = levels
+        self.num_nodes = num_nodes
+
+    @property
+    def num_levels(self):
+        return len(self.levels)
+
+    def membership(self, level):
+        return self.levels[level]['membership']
+
+    def parents(self, level):
+        '''
+        Community at level+1 of each community of the
+        given level; -1 for the coarsest level.
+        '''
+        if level + 1 < self.num_levels:
+            return self.levels[level + 1]['parent_of_finer']
+        return np.full(self.levels[level]['num_communities'], -1, dtype=np.int64)
+
+    #-----------------------------
+    # positions
+    #-----------------------
+
+    def positions(self, level, pos):
+        '''
+        Centroid of each community's members in the given
+        layout, and the root mean square distance of the
+        members from it, for sizing the community's mark.
+
+        @param level: level number
+        @type level: int
+        @param pos: num_nodes x 2 positions of the original nodes
+        @type pos: np.ndarray
+        @return: num_communities x 2 centroids, and radii
+        @rtype: (np.ndarray, np.ndarray)
+        '''
+        membership = self.membership(level)
+        num_communities = self.levels[level]['num_communities']
+        size = np.maximum(self.levels[level]['size'], 1)
+        centroids = np.column_stack([np.bincount(membership, pos[:, axis], minlength=num_communities)
+                                     for axis in range(2)]) / size[:, None]
+        spread = ((pos - centroids[membership]) ** 2).sum(axis=1)
+        radii = np.sqrt(np.bincount(membership, spread, minlength=num_communities) / size)
+        return (centroids, radii)
+
+    #-----------------------------
+    # write_views
+    #-----------------------
+
+    def write_views(self, base, node_names,
+                    pos=None,
+                    file_format='csv',
+                    delimiter=',',
+                    chunk_rows=DEFAULT_CHUNK_ROWS):
+        '''
+        Write one pair of tables per level, plus the
+        membership of every original node:
+
+            <base>_level<k>_nodes:  community, parent (community at
+                                    level k+1, or -1), size, volume,
+                                    and, given positions, x, y, radius
+            <base>_level<k>_links:  src, dst, weight between communities
+            <base>_membership:      node_id, node, and community_<k>
+                                    for every level
+
+        Levels are numbered from 1, the first collapse; the
+        detailed graph is level 0. A dashboard sheet per level
+        loads only that level's marks, and filters on parent
+        to drill down into one community of the level above.
+
+        @param base: output path without extension
+        @type base: str
+        @param node_names: node name of each original node
+        @type node_names: np.ndarray
+        @param pos: num_nodes x 2 positions of the original
+            nodes, or None
+        @type pos: {np.ndarray | None}
+        @param file_format: one of VIEW_FORMATS
+        @type file_format: str
+        @param delimiter: CSV column delimiter
+        @type delimiter: str
+        @param chunk_rows: rows per chunk
+        @type chunk_rows: int
+        @return: paths written
+        @rtype: [str]
+        '''
+        if file_format not in VIEW_FORMATS:
+            raise ValueError("View format must be one of %s; got '%s'" % (VIEW_FORMATS, file_format))
+        extension = '.csv' if file_format == 'csv' else FILE_EXTENSIONS[file_format]
+        def write(path, names, columns):
+            if file_format == 'csv':
+                write_table(path, names, columns, delimiter, chunk_rows)
+            else:
+                write_columns(path, names, columns, file_format, chunk_rows)
+            written.append(path)
+
+        written = []
+        for (number, level) in enumerate(self.levels):
+            name = '%s_level%s' % (base, number + 1)
+            names = ['community', 'parent', 'size', 'volume']
+            columns = [np.arange(level['num_communities']),
+                       self.parents(number),
+                       level['size'],
+                       level['volume']]
+            if pos is not None:
+                (centroids, radii) = self.positions(number, pos)
+                names += ['x', 'y', 'radius']
+                columns += [centroids[:, 0], centroids[:, 1], radii]
+            write(name + '_nodes' + extension, names, columns)
+            write(name + '_links' + extension,
+                  ['src', 'dst', 'weight'],
+                  [level['src'], level['dst'], level['weight']])
+
+        names = ['node_id', 'node'] + ['community_%s' % (number + 1) for number in range(self.num_levels)]
+        columns = [np.arange(self.num_nodes), node_names] + [level['membership'] for level in self.levels]
+        write(base + '_membership' + extension, names, columns)
+        return written
+
+    def __repr__(self):
+        return '<CommunityHierarchy %s>' % ' > '.join([str(self.num_nodes)] +
+                                                      [str(level['num_communities']) for level in self.levels])
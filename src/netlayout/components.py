@@ -0,0 +1,277 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Layout of disconnected networks one connected
+component at a time.
+
+Components are found with a vectorized union-find
+(hooking roots onto smaller roots, then pointer
+jumping). Each component is laid out on its own,
+in parallel across a process pool. Node order, link
+arrays and the output positions live in shared memory
+blocks, so workers receive only a range of component
+numbers per task instead of pickled link data. Small
+components are batched into tasks of at least
+batch_nodes nodes to keep per-task overhead low.
+
+The per-component layouts are finally packed, largest
+first, onto rows ("shelves") of a roughly square canvas.
+'''
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from netlayout.layout import rescale_layout, spring_layout
+
+
+# Components are batched until a task holds this many nodes:
+DEFAULT_BATCH_NODES = 5000
+
+# Gap between packed components, relative to the
+# extent of a single-node component:
+PACKING_PADDING = 1.0
+
+#-----------------------------
+# connected_components
+#-----------------------
+
+def connected_components(src, dst, num_nodes):
+    '''
+    Weakly connected components. Components are
+    numbered by decreasing size.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @return: component number of every node, and
+        the number of nodes in every component
+    @rtype: (np.ndarray, np.ndarray)
+    '''
+    parent = np.arange(num_nodes)
+    src = np.asarray(src, dtype=np.intp)
+    dst = np.asarray(dst, dtype=np.intp)
+    while True:
+        src_root = parent[src]
+        dst_root = parent[dst]
+        differ = src_root != dst_root
+        if not differ.any():
+            break
+        # Hook each larger root onto the smaller one:
+        low  = np.minimum(src_root[differ], dst_root[differ])
+        high = np.maximum(src_root[differ], dst_root[differ])
+        np.minimum.at(parent, high, low)
+        # Pointer jumping until every node points at its root:
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    (_roots, labels, sizes) = np.unique(parent, return_inverse=True, return_counts=True)
+    # Renumber by decreasing size:
+    by_size = np.argsort(-sizes, kind='stable')
+    rank = np.empty_like(by_size)
+    rank[by_size] = np.arange(len(by_size))
+    return (rank[labels], sizes[by_size])
+
+#-----------------------------
+# layout_components
+#-----------------------
+
+def layout_components(src, dst, num_nodes,
+                      weight=None,
+                      layout_func=spring_layout,
+                      processes=None,
+                      batch_nodes=DEFAULT_BATCH_NODES,
+                      scale=1.0,
+                      seed=None,
+                      **layout_args):
+    '''
+    Lay out every connected component separately,
+    in parallel, and pack the results.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param weight: link weights; None for all 1.0
+    @type weight: {np.ndarray | None}
+    @param layout_func: module-level layout function with the
+        signature of spring_layout(), such as multilevel_layout
+    @type layout_func: callable
+    @param processes: number of worker processes; None for one
+        per CPU, 1 to work in the calling process
+    @type processes: {int | None}
+    @param batch_nodes: minimum number of nodes per task
+    @type batch_nodes: int
+    @param scale: packed positions are rescaled to [-scale, scale]
+    @type scale: float
+    @param seed: random seed; component c uses seed + c
+    @type seed: {int | None}
+    @param layout_args: further arguments to layout_func; must
+        be picklable when processes is not 1
+    @return: num_nodes x 2 array of positions
+    @rtype: np.ndarray
+    '''
+    if num_nodes == 0:
+        return np.zeros((0, 2))
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    weight = np.ones(len(src)) if weight is None else np.asarray(weight, dtype=np.float64)
+    (labels, sizes) = connected_components(src, dst, num_nodes)
+    num_components = len(sizes)
+
+    # Nodes and links grouped by component, with
+    # node ids renumbered within each component:
+    node_order = np.argsort(labels, kind='stable')
+    node_offsets = np.zeros(num_components + 1, dtype=np.int64)
+    np.cumsum(sizes, out=node_offsets[1:])
+    local_id = np.empty(num_nodes, dtype=np.int32)
+    local_id[node_order] = np.arange(num_nodes) - node_offsets[labels[node_order]]
+
+    link_order = np.argsort(labels[src], kind='stable')
+    link_offsets = np.zeros(num_components + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels[src], minlength=num_components), out=link_offsets[1:])
+
+    arrays = {'node_offsets' : node_offsets,
+              'link_offsets' : link_offsets,
+              'local_src'    : local_id[src[link_order]],
+              'local_dst'    : local_id[dst[link_order]],
+              'weight'       : weight[link_order],
+              'positions'    : np.zeros((num_nodes, 2))}
+    tasks = [(first, last, layout_func, seed, layout_args)
+             for (first, last) in _batch_components(sizes, batch_nodes)]
+
+    if processes == 1 or len(tasks) <= 1:
+        _worker_arrays.update(arrays)
+        try:
+            for task in tasks:
+                _layout_batch(task)
+            local_positions = arrays['positions']
+        finally:
+            _worker_arrays.clear()
+    else:
+        blocks = {}
+        try:
+            specs = {}
+            for (name, array) in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks[name] = block
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+                specs[name] = (block.name, array.shape, array.dtype.str)
+            with multiprocessing.Pool(processes, initializer=_attach_shared, initargs=(specs,)) as pool:
+                for _done in pool.imap_unordered(_layout_batch, tasks):
+                    pass
+            local_positions = np.ndarray(arrays['positions'].shape, np.float64,
+                                         buffer=blocks['positions'].buf).copy()
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+
+    positions = np.empty((num_nodes, 2))
+    positions[node_order] = pack_components(local_positions, node_offsets)
+    return rescale_layout(positions, scale) if scale is not None else positions
+
+#-----------------------------
+# pack_components
+#-----------------------
+
+def pack_components(positions, node_offsets, padding=PACKING_PADDING):
+    '''
+    Shelf-pack component layouts onto a canvas of
+    roughly square shape. Components must be ordered
+    by decreasing size, as produced by connected_components().
+
+    @param positions: positions grouped by component
+    @type positions: np.ndarray
+    @param node_offsets: start of each component in positions,
+        plus the total number of nodes
+    @type node_offsets: np.ndarray
+    @param padding: gap between components
+    @type padding: float
+    @return: packed positions, in the same order
+    @rtype: np.ndarray
+    '''
+    starts = node_offsets[:-1]
+    lower = np.column_stack([np.minimum.reduceat(positions[:, 0], starts),
+                             np.minimum.reduceat(positions[:, 1], starts)])
+    upper = np.column_stack([np.maximum.reduceat(positions[:, 0], starts),
+                             np.maximum.reduceat(positions[:, 1], starts)])
+    boxes = upper - lower + padding
+    canvas_width = max(np.sqrt((boxes[:, 0] * boxes[:, 1]).sum()), boxes[:, 0].max())
+
+    corners = np.empty_like(boxes)
+    (x, y, shelf_height) = (0.0, 0.0, 0.0)
+    for (component, (width, height)) in enumerate(boxes):
+        if x > 0 and x + width > canvas_width:
+            (x, y, shelf_height) = (0.0, y + shelf_height, 0.0)
+        corners[component] = (x, y)
+        x += width
+        shelf_height = max(shelf_height, height)
+
+    shift = np.repeat(corners - lower, np.diff(node_offsets), axis=0)
+    return positions + shift
+
+#-----------------------------
+# _batch_components
+#-----------------------
+
+def _batch_components(sizes, batch_nodes):
+    '''
+    Ranges [first, last) of component numbers that
+    together hold at least batch_nodes nodes, or
+    whatever is left at the end.
+    '''
+    first = 0
+    total = 0
+    for (component, size) in enumerate(sizes):
+        total += size
+        if total >= batch_nodes:
+            yield (first, component + 1)
+            (first, total) = (component + 1, 0)
+    if first < len(sizes):
+        yield (first, len(sizes))
+
+# ------------------------- Worker Side --------------
+
+# Arrays of the current layout_components() call, by name;
+# in worker processes views onto the shared memory blocks:
+_worker_arrays = {}
+_worker_blocks = []
+
+def _attach_shared(specs):
+    for (name, (block_name, shape, dtype)) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        _worker_arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+def _layout_batch(task):
+    (first, last, layout_func, seed, layout_args) = task
+    node_offsets = _worker_arrays['node_offsets']
+    link_offsets = _worker_arrays['link_offsets']
+    positions = _worker_arrays['positions']
+    for component in range(first, last):
+        (node_start, node_end) = (node_offsets[component], node_offsets[component + 1])
+        num_nodes = node_end - node_start
+        if num_nodes == 1:
+            positions[node_start] = 0.0
+            continue
+        links = slice(link_offsets[component], link_offsets[component + 1])
+        pos = layout_func(_worker_arrays['local_src'][links],
+                          _worker_arrays['local_dst'][links],
+                          num_nodes,
+                          weight=_worker_arrays['weight'][links],
+                          seed=None if seed is None else seed + component,
+                          scale=None,
+                          **layout_args)
+        # Give components an area proportional to their size:
+        positions[node_start:node_end] = rescale_layout(pos, 0.5 * np.sqrt(num_nodes))
+    return last - first
@@ -10,14 +10,42 @@ Inputs to graph constructor:
     
 '''
 import argparse
-import collections
+import contextlib
 import csv
+import functools
+import json
 import os
-import random
 import sys
 import networkx as nx
+import numpy as np
 
-class Networker(collections.MutableMapping):
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+from netlayout.barnes_hut import DEFAULT_THETA, barnes_hut_displacement
+from netlayout.bundling import DEFAULT_COMPATIBILITY, DEFAULT_CYCLES, bundle_edges
+from netlayout.columnar import COLUMNAR_FORMATS, export_columnar
+from netlayout.communities import DEFAULT_RESOLUTION, detect_communities
+from netlayout.components import layout_components
+from netlayout.export import GatheredColumn, export_graph
+from netlayout.graph_cache import DEFAULT_CACHE_DIR, GraphCache, file_fingerprint
+from netlayout.graph_store import MERGE_MODES, GraphStore
+from netlayout.incremental import LayoutSnapshot, incremental_layout
+from netlayout.initial import INITIAL_METHODS, initial_positions
+from netlayout.ingest import DEFAULT_CHUNK_ROWS, WEIGHT_COLUMN, EdgeListBuilder, NodeInterner, read_header, stream_inputs
+from netlayout.layout import LAYOUT_METHODS, spring_layout
+from netlayout.metrics import DEFAULT_CHECK_EVERY, DEFAULT_MIN_IMPROVEMENT, METRICS, EarlyStopping, layout_metrics
+from netlayout.multilevel import multilevel_layout
+from netlayout.parallel_ingest import parallel_stream_inputs
+from netlayout.placement import FIT_MODES, PLACEMENT_MODES, place_on_zipcodes
+from netlayout.profiling import STAGES, StageProfiler, StageRecord
+from netlayout.schema import SCHEMA_TYPES, apply_schema, check_schema, infer_schema, parse_schema, skipped_columns
+from netlayout.subgraph import DIRECTIONS, ego_nodes, extract_subgraph, parse_link_filter, select_links
+from netlayout.zipcodes import DEFAULT_TABLE_DIR, ZIPCODE_SOURCE, ZIPCODE_SPACE, ZipcodeSampler, ZipcodeTable
+
+class Networker(MutableMapping):
     '''
     Expects two files:
        - nodex.csv: first line is list of properties. Names and
@@ -33,10 +61,21 @@ class Networker(collections.MutableMapping):
             user2,student,2005-10-1
     '''
     
+    # Default zip code database CSV; none is shipped,
+    # see zipcodes.py:
+    ZIPCODE_SOURCE = ZIPCODE_SOURCE
+    
     def __init__(self, nodes_file,
                        links_file, 
-                       columns=[0], 
-                       delimiter=','
+                       delimiter=',',
+                       streaming=False,
+                       chunk_rows=DEFAULT_CHUNK_ROWS,
+                       merge=None,
+                       cache_dir=None,
+                       parse_processes=1,
+                       schema=None,
+                       infer_types=False,
+                       profiler=None
                        ):
 
         '''
@@ -44,10 +83,38 @@ class Networker(collections.MutableMapping):
         
         @param node_file:
         @type node_file:
-        @param columns:
-        @type columns:
         @param delimiter:
         @type delimiter:
+        @param streaming: if True, read both files in chunks
+            straight into the graph store instead of via
+            nested dicts.
+        @type streaming: bool
+        @param chunk_rows: rows per chunk in streaming mode
+        @type chunk_rows: int
+        @param merge: how to collapse parallel links between
+            the same two nodes: 'sum' or 'max' of their weights,
+            or 'count' of the links. None keeps every link.
+        @type merge: {str | None}
+        @param cache_dir: directory of a graph_cache.GraphCache;
+            if given, unchanged input files are not re-parsed,
+            but mapped from the cache. None disables caching.
+        @type cache_dir: {str | None}
+        @param parse_processes: in streaming mode, parse byte
+            ranges of both files in this many worker processes;
+            None for one per CPU, 1 to parse in this process
+        @type parse_processes: {int | None}
+        @param schema: property column types, as {name : type}
+            with types from schema.SCHEMA_TYPES; columns not
+            given are strings. 'skip' columns are not parsed.
+        @type schema: {dict | None}
+        @param infer_types: infer the types of property columns
+            from the first rows of both files; schema entries
+            take precedence
+        @type infer_types: bool
+        @param profiler: collects time, rows, and memory of
+            every stage that runs, starting with parsing;
+            see profiling.py. None to skip all instrumentation.
+        @type profiler: {profiling.StageProfiler | None}
         '''
         
         super(Networker, self).__init__()
@@ -62,14 +129,101 @@ class Networker(collections.MutableMapping):
         self.nodes_file = nodes_file
         self.links_file = links_file
         self.delimiter = delimiter
+        self.chunk_rows = chunk_rows
+        self.parse_processes = parse_processes
+        self.profiler = profiler
+        if merge is not None and merge not in MERGE_MODES:
+            raise ValueError("Merge mode must be one of %s; got '%s'" % (MERGE_MODES, merge))
+        self.merge = merge
         
         self.node_property_name = None
         self.src_property_name  = None
         self.dst_property_name  = None
         
         
-        (self.links_dict,self.nodes_dict) = self.import_inputs()
-        self.flatten_link_table(self.links_dict)
+        # Filled in by assign_zipcodes(): five-digit zip code
+        # strings, and zipcode table rows, indexed by node id
+        # of self.graph; and the node id of every zip code
+        # number (-1 where unassigned):
+        self.node_to_zipcode = None
+        self.node_zipcode_rows = None
+        self.zipcode_to_node = None
+        
+        # Set by internalize_zipcodes():
+        self.zipcode_table = None
+        self.zipcode_sampler = None
+        
+        # num_nodes x 2 array filled in by compute_layout():
+        self.positions = None
+        
+        # num_links x points x 2 array filled in by
+        # bundle_edges(); reset by every new layout:
+        self.edge_paths = None
+        
+        # communities.CommunityHierarchy filled in by
+        # detect_communities():
+        self.communities = None
+        
+        # Set by select_subgraph(): the graph as parsed,
+        # while self.graph holds the selected part; and the
+        # full graph's node id of each node of self.graph:
+        self.full_graph = None
+        self.subgraph_nodes = None
+        
+        # Node properties by node name; only set when
+        # parsing without streaming:
+        self.nodes_dict = None
+        
+        # Property column types; see schema.py:
+        self.schema = {}
+        if infer_types:
+            self.schema.update(infer_schema(links_file, delimiter, num_name_columns=2))
+            self.schema.update(infer_schema(nodes_file, delimiter, num_name_columns=1))
+        self.schema.update(schema or {})
+        # Property columns follow the name columns:
+        check_schema(self.schema, read_header(nodes_file, delimiter)[1:] + read_header(links_file, delimiter)[2:])
+        
+        input_files = [nodes_file, links_file]
+        cache_options = {'delimiter' : delimiter,
+                         'merge'     : merge,
+                         'streaming' : streaming,
+                         'skip'      : sorted(skipped_columns(self.schema))}
+        cache = None if cache_dir is None else GraphCache(cache_dir)
+        cached = None
+        if cache is not None:
+            with self.stage('cache_load') as record:
+                cached = cache.load(input_files, cache_options)
+                record.rows = None if cached is None else cached[0].num_edges
+        if cached is not None:
+            (self.graph, attributes) = cached
+            self.node_property_name = attributes['node_property_name']
+            self.src_property_name  = attributes['src_property_name']
+            self.dst_property_name  = attributes['dst_property_name']
+        else:
+            if cache is not None:
+                # Fingerprint before parsing, so later edits invalidate the entry:
+                fingerprints = [file_fingerprint(path) for path in input_files]
+            if streaming:
+                self.graph = self.import_inputs_streaming()
+            else:
+                with self.stage('ingest') as record:
+                    (link_builder, self.nodes_dict) = self.import_inputs()
+                    record.rows = len(self.nodes_dict) + link_builder.num_edges
+                with self.stage('build', rows=link_builder.num_edges):
+                    self.graph = self.flatten_link_table(link_builder)
+            if cache is not None:
+                cache.save(input_files,
+                           cache_options,
+                           self.graph,
+                           attributes={'node_property_name' : self.node_property_name,
+                                       'src_property_name'  : self.src_property_name,
+                                       'dst_property_name'  : self.dst_property_name},
+                           fingerprints=fingerprints)
+        
+        # Typing only wraps the columns; values are
+        # decoded when first read:
+        self.graph.node_properties = apply_schema(self.graph.node_properties, self.schema)
+        self.graph.link_properties = apply_schema(self.graph.link_properties, self.schema)
         
     # ------------------------- Output in Various Forms --------------
             
@@ -77,60 +231,179 @@ class Networker(collections.MutableMapping):
     # export_converted_input 
     #-----------------------    
             
-    def export_converted_input(self, outfile):
+    def export_converted_input(self, outfile, chunk_rows=None):
         '''
-        Output a copy of the input file, with all
-        nodes replaced by their zip codes. Example:
-        Each line of the form:
+        Output the links with all nodes replaced by
+        their zip codes. Example: each link of the form:
         
-          node1,father_of,node2
+          node1,node2,1.0,father_of
         
         is turned into:
         
-          zipcode1,father_of,zipcode2
+          zipcode1,zipcode2,1.0,father_of
+        
+        Also written, next to outfile: the nodes with
+        their properties and layout positions, keyed by
+        zip code, in <outfile base>_nodes.csv, and the
+        latitude and longitude of each zip code in
+        <outfile base>_geo.csv, and, after bundle_edges(),
+        the bundled link paths in <outfile base>_paths.csv.
+        Links keep the order and columns of the links
+        file; a weight column is written only if it has
+        one, or if links were merged. All tables are streamed
+        from the interned arrays in chunks; see export.py.
         
         @param outfile: full path to output file
         @type outfile: str
+        @param chunk_rows: rows written per chunk; default:
+            the chunk size given to the constructor
+        @type chunk_rows: {int | None}
+        @return: paths written
+        @rtype: [str]
         '''
+        if self.node_to_zipcode is None:
+            raise ValueError("No zip codes to export; call assign_zipcodes() or place_zipcodes() first.")
+        table = self.zipcode_table
+        with self.stage('export', rows=self.graph.num_edges + 2 * self.graph.num_nodes):
+            return export_graph(outfile,
+                                self.graph,
+                                self.node_to_zipcode,
+                                lat=GatheredColumn(table.lat, self.node_zipcode_rows),
+                                long=GatheredColumn(table.long, self.node_zipcode_rows),
+                                positions=self.positions,
+                                paths=self.edge_paths,
+                                node_column=self.node_property_name or 'node',
+                                link_columns=(self.src_property_name or 'src',
+                                              self.dst_property_name or 'dst'),
+                                weight_column=self.weight_column(),
+                                delimiter=self.delimiter,
+                                chunk_rows=chunk_rows or self.chunk_rows)
 
-        coded_source = []
-        with open(self.node_file) as source_fd:
-            nodes_file_reader = csv.reader(source_fd,
-                                           delimiter=self.delimiter,
-                                           quotechar='"')
-            # Copy header unchanged, if present:
-            if self.first_line_is_col_header:
-                coded_source.append(nodes_file_reader.next())
-                
-            for source_line in nodes_file_reader: 
-                for col in self.columns:
-                    source_line[col] = self.node_to_zipcode[source_line[col]]
-                coded_source.append(source_line)
-                
-        with open(outfile, 'w') as out_fd:
-            nodes_file_writer = csv.writer(out_fd,
-                                           delimiter=self.delimiter,
-                                           quotechar='"')
-            nodes_file_writer.writerows(coded_source)
-            
-        # Export second table mapping zipcodes to lat/long:
-        geo_outputfile = os.path.splitext(outfile)[0] + '_geo.csv'
-        with open(geo_outputfile, 'w') as geo_fd:
-            geo_writer = csv.writer(geo_fd,
-                                    delimiter=self.delimiter,
-                                    quotechar='"')
-            geo_writer.writerow(['zipcode', 'latitude', 'longitude'])
-            for zipcode in self.zipcodes:
-                geo_writer.writerow([zipcode,
-                                     self.zipcodes[zipcode]['lat'],
-                                     self.zipcodes[zipcode]['long']])
+    #-----------------------------
+    # export_columnar
+    #-----------------------    
+
+    def export_columnar(self, base, file_format='parquet', chunk_rows=None):
+        '''
+        Write nodes, links, and layout positions as typed
+        Parquet or Arrow IPC tables, including the two-rows-
+        per-link paths table from which Tableau draws the
+        links, or, after bundle_edges(), the bundled paths;
+        see columnar.py. Zip codes and their
+        locations are included once assigned. Requires
+        the pyarrow package.
+        
+        @param base: output path without extension
+        @type base: str
+        @param file_format: one of columnar.COLUMNAR_FORMATS
+        @type file_format: str
+        @param chunk_rows: rows per record batch; default:
+            the chunk size given to the constructor
+        @type chunk_rows: {int | None}
+        @return: paths written
+        @rtype: [str]
+        '''
+        (lat, long) = (None, None)
+        if self.node_zipcode_rows is not None:
+            lat = GatheredColumn(self.zipcode_table.lat, self.node_zipcode_rows)
+            long = GatheredColumn(self.zipcode_table.long, self.node_zipcode_rows)
+        with self.stage('export', rows=3 * self.graph.num_edges + self.graph.num_nodes):
+            return export_columnar(base,
+                                   self.graph,
+                                   positions=self.positions,
+                                   paths=self.edge_paths,
+                                   zipcodes=self.node_to_zipcode,
+                                   lat=lat,
+                                   long=long,
+                                   file_format=file_format,
+                                   chunk_rows=chunk_rows or self.chunk_rows)
+
+    #-----------------------------
+    # export_community_views
+    #-----------------------    
+
+    def export_community_views(self, base, file_format='csv', chunk_rows=None):
+        '''
+        Write the levels of self.communities as aggregated
+        views: per level, the communities as super-nodes, at
+        the centroids of their members in self.positions if
+        there is a layout, and the summed links between
+        them; plus every node's community at each level.
+        See communities.CommunityHierarchy.write_views().
+        
+        @param base: output path without extension
+        @type base: str
+        @param file_format: one of communities.VIEW_FORMATS
+        @type file_format: str
+        @param chunk_rows: rows written per chunk; default:
+            the chunk size given to the constructor
+        @type chunk_rows: {int | None}
+        @return: paths written
+        @rtype: [str]
+        '''
+        if self.communities is None:
+            raise ValueError("No communities to export; call detect_communities() first.")
+        with self.stage('export', rows=self.graph.num_nodes):
+            return self.communities.write_views(base,
+                                                self.graph.node_names,
+                                                pos=self.positions,
+                                                file_format=file_format,
+                                                delimiter=self.delimiter,
+                                                chunk_rows=chunk_rows or self.chunk_rows)
 
     #-----------------------------
     # get_overlay_reverser
     #-----------------------    
     
     def get_overlay_reverser(self):
-        return Networker.OverlayReverser(self.zipcode_to_node)
+        return Networker.OverlayReverser(self.zipcode_to_node, self.graph.node_names)
+
+    #-----------------------------
+    # zipcodes_of
+    #-----------------------    
+
+    def zipcodes_of(self, nodes, missing=None):
+        '''
+        Batch form of self[node]: zip code strings of a
+        sequence of node names, looked up in one vectorized
+        pass over the graph's node index.
+        
+        @param nodes: node names
+        @type nodes: sequence
+        @param missing: value for unknown nodes; None to
+            raise KeyError instead
+        @type missing: {str | None}
+        @return: zip code string of each node
+        @rtype: np.ndarray
+        '''
+        if self.node_to_zipcode is None:
+            raise ValueError("No zip codes yet; call assign_zipcodes() or place_zipcodes() first.")
+        ids = self.graph.node_ids(nodes, missing=None if missing is None else -1)
+        zipcodes = self.node_to_zipcode[ids]
+        if missing is not None:
+            zipcodes = np.where(ids < 0, missing, zipcodes)
+        return zipcodes
+
+    #-----------------------------
+    # weight_column
+    #-----------------------    
+
+    def weight_column(self):
+        '''
+        Position of the weight column among the parsed
+        columns of the links file, or None if it has none.
+        Merged weights are computed for every link, so
+        they go right after the end points if the links
+        file has no weight column.
+        
+        @rtype: {int | None}
+        '''
+        skip = skipped_columns(self.schema)
+        link_property_names = [name for name in read_header(self.links_file, self.delimiter)[2:]
+                               if name not in skip]
+        if WEIGHT_COLUMN in link_property_names:
+            return 2 + link_property_names.index(WEIGHT_COLUMN)
+        return None if self.merge is None else 2
 
     # ------------------------- Computations --------------
     
@@ -140,20 +413,13 @@ class Networker(collections.MutableMapping):
         
     def import_inputs(self):
         '''
-        Given the node file and link file, create a
-        structure like this:
-        
-        d = {'itk9yewjclq6bu' : {'gt38kh0h8oo' : {
-                                    'weight' : 1.0,
-                                    'type'   : 'responds_to'}
-                                 },
-             'itl3pttnro646k' : {'gx8ijxirqgy3ln' : {
-                                    'weight' : 6.0,
-                                    'type'   : 'responds_to'}},
-             'itk9yewjclq6bu' : {'itezjr7i18ahx' : {
-                                    'weight' : '4.0',
-                                    'type'   : 'upvotes'}}
-             }
+        Given the node file and link file, collect every
+        link, including repeated links between the same
+        two nodes, into an EdgeListBuilder. Node names are
+        interned to dense ids, nodes file order first.
+        Each link costs amortized O(1) to append; the
+        builder is later turned into the flat link table
+        by flatten_link_table().
              
         Also: set instance variables:
         
@@ -164,7 +430,7 @@ class Networker(collections.MutableMapping):
         	from information found in the input files.
         
         First, input nodes file, and create dicts with each node's properties.
-        Then input links and complete this datastructure.
+        Then input links.
         
         The nodes properties input file is like this:
         
@@ -183,19 +449,22 @@ class Networker(collections.MutableMapping):
             itl3pttnro646k,gx8ijxirqgy3ln,6.0,responds_to
                 ...
         
-        @return: tuple of two dicts:
+        @return: tuple of the link builder and a dict:
                      {'node1' : {prop1 : prop1Val,
                                  prop2 : prop2Val},
                       'node2' : {prop1 : prop1Val,
                                  prop2 : prop2Val}
                      }
-                 and the one above.
+        @rtype: (ingest.EdgeListBuilder, dict)
           
         '''
+        interner = NodeInterner()
         with open(self.nodes_file, 'r') as node_fd:
             nodes_file_reader = csv.reader(node_fd, delimiter=self.delimiter)
             # Get node properties:
-            node_property_names = nodes_file_reader.next()
+            node_property_names = next(nodes_file_reader)
+            self.node_property_name = node_property_names[0]
+            skip = skipped_columns(self.schema)
             
             all_nodes_dict = {}
 
@@ -203,12 +472,16 @@ class Networker(collections.MutableMapping):
             # Every line in the input may have 
             # multiple property columns:
             for node_info in nodes_file_reader:
+                if not node_info:
+                    continue
                 # Get the node name:
                 node_name = node_info[0]
+                interner.intern(node_name)
                 properties_dict = {}
                 
                 for (property_name, property_val) in zip(node_property_names[1:], node_info[1:]):
-                    properties_dict[property_name] = property_val
+                    if property_name not in skip:
+                        properties_dict[property_name] = property_val
                     
                 # Note: if nodes are repeated in the input file,
                 # the latest will win:
@@ -217,24 +490,395 @@ class Networker(collections.MutableMapping):
         with open(self.links_file, 'r') as link_fd:
             links_file_reader = csv.reader(link_fd, delimiter=self.delimiter)
             # Get link properties:
-            link_property_names = links_file_reader.next()
+            link_property_names = next(links_file_reader)
+            (self.src_property_name, self.dst_property_name) = link_property_names[:2]
             
-            all_links_dict = {}
+            link_builder = EdgeListBuilder([name for name in link_property_names[2:] if name not in skip],
+                                           interner=interner)
             
             for link_info in links_file_reader:
-                # Get the end points:
-                src_node_name = link_info[0]
-                dst_node_name = link_info[1]
-
+                if not link_info:
+                    continue
                 # Link properties:
                 properties_dict = {}
                 
                 for (property_name, property_val) in zip(link_property_names[2:], link_info[2:]):
-                    properties_dict[property_name] = property_val
+                    if property_name not in skip:
+                        properties_dict[property_name] = property_val
+
+                # Every link is kept, even if the same
+                # two nodes were linked before:
+                link_builder.add_edge(link_info[0], link_info[1], properties_dict)
 
-                all_links_dict[src_node_name] = {dst_node_name : properties_dict}
+        return (link_builder, all_nodes_dict)
 
-        return (all_links_dict, all_nodes_dict)
+    #-----------------------------
+    # flatten_link_table
+    #-----------------------    
+
+    def flatten_link_table(self, link_builder):
+        '''
+        Turn the links collected by import_inputs() into
+        the flat, CSR-ordered link table of a GraphStore:
+        one row per link with source id, destination id,
+        weight, and property columns. If self.merge is set,
+        parallel links are collapsed on the way.
+        
+        @param link_builder: links from import_inputs()
+        @type link_builder: ingest.EdgeListBuilder
+        @return: the interned graph
+        @rtype: graph_store.GraphStore
+        '''
+        return GraphStore.from_edge_list(link_builder, self.nodes_dict, merge=self.merge)
+
+    #-----------------------------
+    # import_inputs_streaming
+    #-----------------------    
+
+    def import_inputs_streaming(self):
+        '''
+        Same inputs as import_inputs(), but read in chunks
+        of self.chunk_rows rows straight into columnar
+        buffers, which are then turned into a GraphStore.
+        Node names are interned to dense integers,
+        link end points become int32 arrays, the 'weight'
+        column a float64 array, and all other property
+        columns are dictionary encoded. No per-row dicts
+        are built, so peak memory depends on the chunk
+        size and the number of nodes, plus a few bytes
+        per link.
+        
+        With self.parse_processes other than 1, the files
+        are parsed in parallel; see parallel_ingest.py.
+        
+        Also sets self.node_property_name, self.src_property_name,
+        and self.dst_property_name from the file headers.
+        
+        @return: the interned, CSR-ordered graph
+        @rtype: graph_store.GraphStore
+        '''
+        with self.stage('ingest') as record:
+            if self.parse_processes == 1:
+                buffers = stream_inputs(self.nodes_file,
+                                        self.links_file,
+                                        delimiter=self.delimiter,
+                                        chunk_rows=self.chunk_rows,
+                                        skip=skipped_columns(self.schema))
+            else:
+                buffers = parallel_stream_inputs(self.nodes_file,
+                                                 self.links_file,
+                                                 delimiter=self.delimiter,
+                                                 chunk_rows=self.chunk_rows,
+                                                 processes=self.parse_processes,
+                                                 skip=skipped_columns(self.schema))
+            record.rows = len(buffers.node_rows) + buffers.num_edges
+        self.node_property_name = buffers.node_property_names[0]
+        (self.src_property_name, self.dst_property_name) = buffers.link_property_names[:2]
+        with self.stage('build', rows=buffers.num_edges):
+            return GraphStore.from_ingest(buffers, merge=self.merge)
+
+    #-----------------------------
+    # compute_layout
+    #-----------------------    
+
+    def compute_layout(self, method='spring', 
+                             theta=DEFAULT_THETA,
+                             components=False,
+                             processes=None,
+                             initial=None,
+                             stop_metric=None,
+                             check_every=DEFAULT_CHECK_EVERY,
+                             min_improvement=DEFAULT_MIN_IMPROVEMENT,
+                             **layout_args):
+        '''
+        Compute 2D positions of all nodes from the link
+        arrays of self.graph, and store them in
+        self.positions, indexed by node id.
+        
+        Method 'spring' computes exact all-pairs repulsion;
+        'barnes_hut' approximates it with a quadtree that
+        is rebuilt every iteration, which is what makes
+        very large graphs feasible. 'multilevel' lays out
+        a coarsened version of the graph first, and refines
+        it level by level with Barnes-Hut repulsion; it
+        takes coarsest_iterations and refine_iterations
+        in place of iterations.
+        
+        With components=True, each connected component is
+        laid out on its own, in parallel worker processes,
+        and the results are packed onto one canvas.
+        
+        With a profiler, the energy of every iteration is
+        recorded, except for iterations in worker processes.
+        
+        An initial placement other than 'random' starts
+        'spring' and 'barnes_hut' layouts from a pivot MDS
+        or spectral embedding of the graph; see initial.py.
+        
+        With a stop_metric, the layout stops early once that
+        metric improves by less than min_improvement between
+        checks; see metrics.EarlyStopping. For multilevel
+        layouts, this applies to the finest level.
+        
+        @param method: one of layout.LAYOUT_METHODS
+        @type method: str
+        @param theta: Barnes-Hut accuracy threshold; smaller
+            is slower and more exact
+        @type theta: float
+        @param components: lay out connected components separately
+        @type components: bool
+        @param processes: worker processes for components=True;
+            None for one per CPU
+        @type processes: {int | None}
+        @param initial: one of initial.INITIAL_METHODS; None
+            for random starting positions
+        @type initial: {str | None}
+        @param stop_metric: one of metrics.METRICS, or None to
+            run all iterations
+        @type stop_metric: {str | None}
+        @param check_every: iterations between metric checks
+        @type check_every: int
+        @param min_improvement: smallest improvement, as a
+            fraction of the metric, to keep iterating
+        @type min_improvement: float
+        @param layout_args: keyword arguments passed on to
+            the layout function, such as iterations, cooling,
+            tolerance, or seed.
+        @return: num_nodes x 2 array of positions
+        @rtype: np.ndarray
+        '''
+        if method not in LAYOUT_METHODS:
+            raise ValueError("Layout method must be one of %s; got '%s'" % (LAYOUT_METHODS, method))
+        if method in ('barnes_hut', 'multilevel'):
+            layout_args['repulsion'] = functools.partial(barnes_hut_displacement, theta=theta)
+        layout_func = multilevel_layout if method == 'multilevel' else spring_layout
+        graph = self.graph
+        if initial is not None and initial != 'random':
+            if components or method == 'multilevel':
+                raise ValueError("Initial placement is only available for whole-graph spring and barnes_hut layouts.")
+            with self.stage('initial', rows=graph.num_nodes):
+                layout_args['pos'] = initial_positions(initial,
+                                                       graph.src,
+                                                       graph.dst,
+                                                       graph.num_nodes,
+                                                       weight=graph.weight,
+                                                       seed=layout_args.get('seed'))
+        if stop_metric is not None:
+            if components:
+                raise ValueError("Early stopping is not available for separately laid out components.")
+            layout_args['stop'] = EarlyStopping(graph.src,
+                                                graph.dst,
+                                                graph.num_nodes,
+                                                metric=stop_metric,
+                                                check_every=check_every,
+                                                min_improvement=min_improvement,
+                                                seed=layout_args.get('seed'))
+        self.edge_paths = None
+        with self.stage('layout', rows=graph.num_nodes) as record:
+            if self.profiler is not None and (not components or processes == 1):
+                layout_args.setdefault('callback', self.profiler.iteration_callback(record))
+            if components:
+                self.positions = layout_components(graph.src,
+                                                   graph.dst,
+                                                   graph.num_nodes,
+                                                   weight=graph.weight,
+                                                   layout_func=layout_func,
+                                                   processes=processes,
+                                                   **layout_args)
+            else:
+                self.positions = layout_func(graph.src,
+                                             graph.dst,
+                                             graph.num_nodes,
+                                             weight=graph.weight,
+                                             **layout_args)
+        return self.positions
+
+    #-----------------------------
+    # layout_metrics
+    #-----------------------    
+
+    def layout_metrics(self, metrics=METRICS, seed=None):
+        '''
+        Quality metrics of self.positions; see metrics.py.
+        
+        @param metrics: names from metrics.METRICS
+        @type metrics: sequence
+        @param seed: random seed for the metrics' samples
+        @type seed: {int | None}
+        @rtype: {str : float}
+        '''
+        if self.positions is None:
+            raise ValueError("No layout to measure; call compute_layout() first.")
+        graph = self.graph
+        return layout_metrics(graph.src, graph.dst, graph.num_nodes, self.positions,
+                              metrics=metrics,
+                              seed=seed)
+
+    #-----------------------------
+    # bundle_edges
+    #-----------------------    
+
+    def bundle_edges(self, **bundle_args):
+        '''
+        Bundle the links of the current layout into curved
+        paths by force-directed edge bundling, and store
+        them in self.edge_paths, from which both exports
+        write their path tables; see bundling.py.
+        
+        @param bundle_args: keyword arguments passed on to
+            bundling.bundle_edges(), such as cycles, threshold,
+            or seed
+        @return: num_links x points x 2 array of path points
+        @rtype: np.ndarray
+        '''
+        if self.positions is None:
+            raise ValueError("No layout to bundle; call compute_layout() first.")
+        graph = self.graph
+        with self.stage('bundle', rows=graph.num_edges):
+            self.edge_paths = bundle_edges(graph.src, graph.dst, self.positions, **bundle_args)
+        return self.edge_paths
+
+    #-----------------------------
+    # detect_communities
+    #-----------------------    
+
+    def detect_communities(self, resolution=DEFAULT_RESOLUTION, **community_args):
+        '''
+        Find communities of self.graph, and collapse them
+        level by level into a hierarchy of aggregated
+        graphs, stored in self.communities; see
+        communities.py. Links count as undirected.
+        
+        @param resolution: higher values give smaller communities
+        @type resolution: float
+        @param community_args: keyword arguments passed on to
+            communities.detect_communities(), such as
+            max_levels or seed
+        @rtype: communities.CommunityHierarchy
+        '''
+        graph = self.graph
+        with self.stage('communities', rows=graph.num_edges):
+            self.communities = detect_communities(graph.src,
+                                                  graph.dst,
+                                                  graph.num_nodes,
+                                                  weight=graph.weight,
+                                                  resolution=resolution,
+                                                  **community_args)
+        return self.communities
+
+    #-----------------------------
+    # select_subgraph
+    #-----------------------    
+
+    def select_subgraph(self, centers=None,
+                              hops=1,
+                              direction='both',
+                              link_filter=None,
+                              window=None):
+        '''
+        Narrow self.graph down to part of the parsed graph,
+        so that only that part is laid out and exported:
+        the ego networks of the given center nodes, the
+        links that pass the given filters, or the ego
+        networks along those links only. See subgraph.py.
+        
+        Every call selects from the full parsed graph,
+        which stays in self.full_graph. Layouts, bundled
+        paths, communities, and zip codes of the previous
+        graph are dropped.
+        
+        @param centers: names of the center nodes of ego
+            networks; None to select by links alone
+        @type centers: {[str] | None}
+        @param hops: largest number of links from a center
+        @type hops: int
+        @param direction: one of subgraph.DIRECTIONS
+        @type direction: str
+        @param link_filter: {link property : values}; keep
+            links with one of the values
+        @type link_filter: {dict | None}
+        @param window: (link property, start, end); keep links
+            with start <= value < end. None for an open bound.
+        @type window: {(str, object, object) | None}
+        @return: the selected subgraph
+        @rtype: graph_store.GraphStore
+        '''
+        if self.full_graph is None:
+            self.full_graph = self.graph
+        graph = self.full_graph
+        with self.stage('subgraph', rows=graph.num_edges):
+            links = select_links(graph, link_filter=link_filter, window=window)
+            nodes = None
+            if centers is not None:
+                nodes = ego_nodes(graph, graph.node_ids(centers), hops=hops, direction=direction, links=links)
+            (self.graph, self.subgraph_nodes) = extract_subgraph(graph, nodes=nodes, links=links)
+        self.positions = None
+        self.edge_paths = None
+        self.communities = None
+        self.node_to_zipcode = None
+        self.node_zipcode_rows = None
+        self.zipcode_to_node = None
+        return self.graph
+
+    #-----------------------------
+    # update_layout
+    #-----------------------    
+
+    def update_layout(self, snapshot_file,
+                            hops=1,
+                            pin=True,
+                            theta=DEFAULT_THETA,
+                            **layout_args):
+        '''
+        Warm-start the layout from a previous run's snapshot,
+        written by save_layout_snapshot(). Nodes that are
+        new, or whose links changed, are refined together
+        with their neighbors up to the given number of hops;
+        all other nodes keep their old positions. The result
+        is stored in self.positions.
+        
+        @param snapshot_file: file written by save_layout_snapshot()
+        @type snapshot_file: str
+        @param hops: size of the refined neighborhoods
+        @type hops: int
+        @param pin: keep nodes outside the refined
+            neighborhoods fixed
+        @type pin: bool
+        @param theta: Barnes-Hut accuracy threshold
+        @type theta: float
+        @param layout_args: keyword arguments passed on to
+            incremental.incremental_layout(), such as iterations or seed
+        @return: num_nodes x 2 array of positions
+        @rtype: np.ndarray
+        '''
+        snapshot = LayoutSnapshot.load(snapshot_file)
+        layout_args.setdefault('repulsion', functools.partial(barnes_hut_displacement, theta=theta))
+        self.edge_paths = None
+        with self.stage('layout', rows=self.graph.num_nodes) as record:
+            if self.profiler is not None:
+                layout_args.setdefault('callback', self.profiler.iteration_callback(record))
+            (self.positions, _diff) = incremental_layout(self.graph,
+                                                         snapshot,
+                                                         hops=hops,
+                                                         pin=pin,
+                                                         **layout_args)
+        return self.positions
+
+    #-----------------------------
+    # save_layout_snapshot
+    #-----------------------    
+
+    def save_layout_snapshot(self, snapshot_file):
+        '''
+        Save the graph and self.positions for later
+        update_layout() calls.
+        
+        @param snapshot_file: file to (over)write
+        @type snapshot_file: str
+        '''
+        if self.positions is None:
+            raise ValueError("No layout to save; call compute_layout() first.")
+        LayoutSnapshot.from_graph(self.graph, self.positions).save(snapshot_file)
 
                 
             
@@ -245,22 +889,73 @@ class Networker(collections.MutableMapping):
         
         
     #-----------------------------
-    # get_next_nodes
+    # assign_zipcodes
     #-----------------------    
+
+    def assign_zipcodes(self, state=None, state_weights=None, seed=None):
+        '''
+        Give every node of self.graph its own, randomly
+        drawn zip code, in one vectorized step. Fills
+        self.node_to_zipcode, self.node_zipcode_rows, and
+        self.zipcode_to_node.
         
-    def get_next_node(self, nodes_file_reader):
-        if self.first_line_is_col_header:
-            # Nodes file's first line are the column
-            # headers. Discard them:
-            nodes_file_reader.next()
-        for source_line in nodes_file_reader: 
-            for col in self.columns:
-                try:
-                    yield source_line[col]
-                except IndexError:
-                    raise ValueError("At least one column number in %s is beyond width of source file %s" %\
-                                      (self.columns, self.node_file))
-    
+        @param state: draw only zip codes of this state, such as 'CA'
+        @type state: {str | None}
+        @param state_weights: relative chance of each state, as
+            {state : weight}; None for all states alike
+        @type state_weights: {dict | None}
+        @param seed: random seed for reproducible assignments
+        @type seed: {int | None}
+        @return: zip code string of each node id
+        @rtype: np.ndarray
+        '''
+        if self.zipcode_table is None:
+            self.internalize_zipcodes()
+        with self.stage('zipcodes', rows=self.graph.num_nodes):
+            self.zipcode_sampler = ZipcodeSampler(self.zipcode_table, seed=seed)
+            rows = self.zipcode_sampler.draw(self.graph.num_nodes,
+                                             state=state,
+                                             weights=state_weights)
+            return self._set_zipcode_rows(rows)
+
+    #-----------------------------
+    # place_zipcodes
+    #-----------------------    
+
+    def place_zipcodes(self, state=None, fit='quantile'):
+        '''
+        Give every node the nearest zip code to its layout
+        position that no other node took, so that the map
+        view mirrors the layout. Requires compute_layout()
+        or update_layout() to have run. Fills the same
+        attributes as assign_zipcodes().
+        
+        @param state: place only onto zip codes of this state
+        @type state: {str | None}
+        @param fit: how layout coordinates are fitted onto
+            the zip code area; one of placement.FIT_MODES
+        @type fit: str
+        @return: zip code string of each node id
+        @rtype: np.ndarray
+        '''
+        if self.positions is None:
+            raise ValueError("No layout to place; call compute_layout() first.")
+        if self.zipcode_table is None:
+            self.internalize_zipcodes()
+        rows = None if state is None else self.zipcode_table.state_rows(state)
+        with self.stage('zipcodes', rows=self.graph.num_nodes):
+            return self._set_zipcode_rows(place_on_zipcodes(self.positions,
+                                                            self.zipcode_table,
+                                                            rows=rows,
+                                                            fit=fit))
+
+    def _set_zipcode_rows(self, rows):
+        self.node_zipcode_rows = rows
+        self.node_to_zipcode = self.zipcode_table.zipcode_strings(rows)
+        self.graph.index.set_zipcodes(self.zipcode_table.zipcodes[rows], ZIPCODE_SPACE)
+        self.zipcode_to_node = self.graph.index.zipcode_to_node
+        return self.node_to_zipcode
+
     #-----------------------------
     # get_next_zipcode 
     #-----------------------    
@@ -272,76 +967,64 @@ class Networker(collections.MutableMapping):
         that successive calls never return
         the same zip code.
         '''
-        # Pick a random US state:
-        rand_us_state       = random.choice(self.state_zips.keys())
-        # Pick a random zip code within that state:
-        rand_zip_from_state = random.choice(self.state_zips[rand_us_state])
-        # Ensure that each zip code is only used once:
-        self.state_zips[rand_us_state].remove(rand_zip_from_state)
-        # If we used all of this state's zipcodes, remove
-        # the state from consideration:
-        if len(self.state_zips[rand_us_state]) == 0:
-            del self.state_zips[rand_us_state]
-            # If this was the last state at our disposal,
-            # complain:
-            if len(self.state_zips.keys()) == 0:
-                raise ValueError("Not enough zipcodes in the US to cover this dataset.")
-        return rand_zip_from_state
+        if self.zipcode_sampler is None:
+            self.internalize_zipcodes()
+        row = self.zipcode_sampler.draw(1)
+        return self.zipcode_table.zipcode_strings(row)[0]
 
     #-----------------------------
     # internalize_zipcodes
     #-----------------------    
 
-    def internalize_zipcodes(self):
+    def internalize_zipcodes(self, source=None, table_dir=DEFAULT_TABLE_DIR, seed=None):
         '''
-        Read all zip codes from file into memory.
-        Build three dicts: 
-            self.zipcodes: {'state'  : ...,
-                            'county' : ...,
-                            'lat'    : ...,
-                            'long'   : ...
-                            }
-            self.county_zips: {county : [zip1,zip2,...]}
-            self.state_zips:  {state  : [zip1,zip2,...]}
+        Map the compiled zip code table into memory,
+        compiling it from the zip code source CSV on
+        first use, or when the source changed. Sets:
+        
+            self.zipcode_table:   zipcodes.ZipcodeTable
+            self.zipcode_sampler: zipcodes.ZipcodeSampler over it
+        
+        @param source: zip code database CSV; default:
+            Networker.ZIPCODE_SOURCE
+        @type source: {str | None}
+        @param table_dir: directory of the compiled table
+        @type table_dir: str
+        @param seed: random seed for drawing zip codes
+        @type seed: {int | None}
         '''
-        with open(Networker.ZIPCODE_SOURCE) as source_fd:
-            reader = csv.reader(source_fd,
-                                delimiter=self.delimiter,
-                                quotechar='"')
-            # Discard header of zip codes dataset:
-            reader.next()
-            for line in reader:
-                the_zip   = line[Networker.ZIP_INDEX]
-                zip_type  = line[Networker.ZIP_TYPE]
-                if zip_type == 'MILITARY':
-                    # No lat/long for military zip codes:
-                    continue
-                state     = line[Networker.STATE_INDEX]
-                county    = line[Networker.COUNTY_INDEX]
-                lat       = line[Networker.LAT_INDEX]
-                longitute = line[Networker.LONG_INDEX]
-                
-                self.zipcodes[the_zip] = {'state' : state,
-                                          'county' : county,
-                                          'lat' : lat,
-                                          'long' : longitute
-                                          }  
-                try:
-                    self.county_zips[county].append(the_zip)
-                except KeyError:
-                    self.county_zips[county] = [the_zip]
-                    
-                try:
-                    self.state_zips[state].append(the_zip)
-                except KeyError:
-                    self.state_zips[state] = [the_zip]
-                
-        self.all_zipcodes = self.zipcodes.keys()
+        with self.stage('zipcode_table') as record:
+            self.zipcode_table = ZipcodeTable.open(source or Networker.ZIPCODE_SOURCE, table_dir)
+            self.zipcode_sampler = ZipcodeSampler(self.zipcode_table, seed=seed)
+            record.rows = len(self.zipcode_table.zipcodes)
+
+    #-----------------------------
+    # stage
+    #-----------------------    
+
+    def stage(self, name, rows=None):
+        '''
+        Context manager around one run of a pipeline stage:
+        timed and recorded by self.profiler if there is one,
+        and otherwise doing nothing. Either way, it yields a
+        profiling.StageRecord, whose rows may be set inside.
+        
+        @param name: one of profiling.STAGES
+        @type name: str
+        @param rows: rows processed, if known up front
+        @type rows: {int | None}
+        '''
+        if self.profiler is None:
+            return contextlib.nullcontext(StageRecord(name, rows))
+        return self.profiler.stage(name, rows)
 
     # --------- Dict Capabilities -----------
         
     def __getitem__(self, key):
-        return self.node_to_zipcode[key]
+        if self.node_to_zipcode is None:
+            # So that 'in' answers False rather than failing:
+            raise KeyError("No zip code for node %s yet; call assign_zipcodes() or place_zipcodes() first." % key)
+        return self.node_to_zipcode[self.graph.node_id(key)]
 
     def __setitem__(self, key, value):
         raise NotImplemented("Zip overlays are read-only")
@@ -350,17 +1033,17 @@ class Networker(collections.MutableMapping):
         raise NotImplemented("Zip overlays are read-only")            
 
     def __iter__(self, zipOrNode='node'):
-        return iter(self.node_to_zipcode)
+        return iter(self.graph.node_names)
 
     def __len__(self, zipOrNode='node'):
-        return len(self.node_to_zipcode)
+        return self.graph.num_nodes
 
     def __keytransform__(self, key):
         return key
     
 # ---------------------------- OverlayReverse -----------    
 
-    class OverlayReverser(collections.MutableMapping):
+    class OverlayReverser(MutableMapping):
         '''
         Dictionary to complement an instance of 
         Networker. Provides zipcode-to-node
@@ -370,13 +1053,52 @@ class Networker(collections.MutableMapping):
         Instantiated via Networker.get_reverse_dict()
         '''
         
-        def __init__(self, zipToNodeDict):
-    
+        def __init__(self, zipToNodeArray, nodeNames):
+            '''
+            @param zipToNodeArray: node id of each zip code
+                number, -1 for unassigned zip codes
+            @type zipToNodeArray: np.ndarray
+            @param nodeNames: node name of each node id
+            @type nodeNames: np.ndarray
+            '''
             super(Networker.OverlayReverser, self).__init__()
-            self.zip_to_node = zipToNodeDict
+            self.zip_to_node = zipToNodeArray
+            self.node_names  = nodeNames
                 
         def __getitem__(self, key):
-            return self.zip_to_node[key]
+            try:
+                number = int(key)
+            except (ValueError, TypeError):
+                raise KeyError(key)
+            # No negative indexing from the end:
+            if number < 0 or number >= len(self.zip_to_node):
+                raise KeyError(key)
+            node_id = self.zip_to_node[number]
+            if node_id < 0:
+                raise KeyError(key)
+            return self.node_names[node_id]
+
+        def nodes_of(self, zipcodes, missing=None):
+            '''
+            Batch form of self[zipcode]: node names of a
+            sequence of zip codes, as numbers or strings.
+            
+            @param missing: value for zip codes without a node;
+                None to raise KeyError instead
+            @type missing: {str | None}
+            @rtype: np.ndarray
+            '''
+            zipcodes = np.asarray(zipcodes)
+            numbers = zipcodes.astype(np.int64) if zipcodes.dtype.kind in 'USO' else zipcodes
+            outside = (numbers < 0) | (numbers >= len(self.zip_to_node))
+            ids = np.where(outside, -1, self.zip_to_node[np.where(outside, 0, numbers)])
+            unassigned = ids < 0
+            if missing is None and unassigned.any():
+                raise KeyError(zipcodes.ravel()[np.argmax(unassigned)])
+            names = np.asarray(self.node_names)[np.where(unassigned, 0, ids)]
+            if unassigned.any():
+                names = np.where(unassigned, missing, names)
+            return names
     
         def __setitem__(self, key, value):
             raise NotImplemented("Zip overlays are read-only")
@@ -385,10 +1107,11 @@ class Networker(collections.MutableMapping):
             raise NotImplemented("Zip overlays are read-only")            
     
         def __iter__(self):
-            return iter(self.zip_to_node)
+            assigned = np.flatnonzero(self.zip_to_node >= 0)
+            return iter(np.char.zfill(assigned.astype(str), 5))
     
         def __len__(self):
-            return len(self.zip_to_node)            
+            return int((self.zip_to_node >= 0).sum())
     
         def __keytransform__(self, key):
             return key
@@ -402,7 +1125,176 @@ if __name__ == '__main__':
                         help='Column delimiter; default: ","',
                         default=',')
     parser.add_argument('-o', '--outfile',
-                        help='Full output CSV file name if result output desired.',
+                        help='Full output CSV file name if result output desired; nodes and\n' +\
+                             'zip code locations go to <name>_nodes.csv and <name>_geo.csv.',
+                        default=None)
+    parser.add_argument('-f', '--format',
+                        help='Output format for --outfile: CSV tables, or typed Parquet or\n' +\
+                             'Arrow tables <name>_nodes, _links and _paths (needs pyarrow);\n' +\
+                             'default: csv',
+                        choices=('csv',) + COLUMNAR_FORMATS,
+                        default='csv')
+    parser.add_argument('-s', '--streaming',
+                        help='Read inputs in chunks into compact columnar buffers.',
+                        action='store_true')
+    parser.add_argument('--chunk_rows',
+                        help='Rows per chunk when streaming; default: %s' % DEFAULT_CHUNK_ROWS,
+                        type=int,
+                        default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--parse_processes',
+                        help='Parse the input files in this many worker processes;\n' +\
+                             'implies --streaming. 0 for one per CPU; default: 1',
+                        type=int,
+                        default=1)
+    parser.add_argument('--schema',
+                        help='Types of property columns, as name:type,name:type,...\n' +\
+                             'with types %s; skipped columns are not parsed.' % ', '.join(SCHEMA_TYPES),
+                        default=None)
+    parser.add_argument('--infer_types',
+                        help='Infer property column types from the first rows of the input files.',
+                        action='store_true')
+    parser.add_argument('--cache_dir',
+                        help='Cache parsed inputs in this directory, such as %s,\n' % DEFAULT_CACHE_DIR +\
+                             'so that later runs on unchanged files skip parsing;\n' +\
+                             'default: no caching',
+                        default=None)
+    parser.add_argument('-m', '--merge',
+                        help='Collapse parallel links: sum or max of weights, or count of links;\n' +\
+                             'default: keep all links',
+                        choices=MERGE_MODES,
+                        default=None)
+    parser.add_argument('-l', '--layout',
+                        help='Compute node positions with the given layout method.',
+                        choices=LAYOUT_METHODS,
+                        default=None)
+    parser.add_argument('-i', '--iterations',
+                        help='Maximum number of layout iterations; for multilevel layouts\n' +\
+                             'the iterations per refinement level; default: 50, or 10 per level',
+                        type=int,
+                        default=None)
+    parser.add_argument('--theta',
+                        help='Barnes-Hut accuracy threshold; default: %s' % DEFAULT_THETA,
+                        type=float,
+                        default=DEFAULT_THETA)
+    parser.add_argument('--initial',
+                        help='Starting positions for spring and barnes_hut layouts;\n' +\
+                             'default: random',
+                        choices=INITIAL_METHODS,
+                        default=None)
+    parser.add_argument('--stop_metric',
+                        help='Stop the layout early once this quality metric stops improving.',
+                        choices=METRICS,
+                        default=None)
+    parser.add_argument('--check_every',
+                        help='Iterations between --stop_metric checks; default: %s' % DEFAULT_CHECK_EVERY,
+                        type=int,
+                        default=DEFAULT_CHECK_EVERY)
+    parser.add_argument('--min_improvement',
+                        help='Keep iterating while --stop_metric improves by at least this\n' +\
+                             'fraction between checks; default: %s' % DEFAULT_MIN_IMPROVEMENT,
+                        type=float,
+                        default=DEFAULT_MIN_IMPROVEMENT)
+    parser.add_argument('--metrics',
+                        help='Write the quality metrics of the final layout to this JSON file.',
+                        default=None)
+    parser.add_argument('--bundle',
+                        help='Bundle the links of the layout into curved paths, written\n' +\
+                             'to the paths table of --outfile.',
+                        action='store_true')
+    parser.add_argument('--bundle_cycles',
+                        help='Bundling cycles; links get 2^cycles - 1 bend points;\n' +\
+                             'default: %s' % DEFAULT_CYCLES,
+                        type=int,
+                        default=DEFAULT_CYCLES)
+    parser.add_argument('--compatibility',
+                        help='Least compatibility of links that bundle together, in [0, 1];\n' +\
+                             'default: %s' % DEFAULT_COMPATIBILITY,
+                        type=float,
+                        default=DEFAULT_COMPATIBILITY)
+    parser.add_argument('--communities',
+                        help='Detect communities, and write a level-of-detail view per\n' +\
+                             'level of collapsed communities next to --outfile.',
+                        action='store_true')
+    parser.add_argument('--resolution',
+                        help='Community resolution; higher values give smaller\n' +\
+                             'communities; default: %s' % DEFAULT_RESOLUTION,
+                        type=float,
+                        default=DEFAULT_RESOLUTION)
+    parser.add_argument('--ego',
+                        help='Keep only the ego networks of these nodes: the nodes up to\n' +\
+                             '--ego_hops links away, and the links between them.',
+                        nargs='+',
+                        default=None)
+    parser.add_argument('--ego_hops',
+                        help='Size of --ego networks in links; default: 1',
+                        type=int,
+                        default=1)
+    parser.add_argument('--direction',
+                        help='Links that --ego networks grow along; default: both',
+                        choices=DIRECTIONS,
+                        default='both')
+    parser.add_argument('--link_filter',
+                        help='Keep only links with one of the given property values, as\n' +\
+                             'name=value,value,...; may be repeated.',
+                        action='append',
+                        default=[])
+    parser.add_argument('--window',
+                        help='Keep only links whose property lies in [START, END), such as\n' +\
+                             'a timestamp; numbers compare as numbers, and ISO dates\n' +\
+                             'compare correctly as strings.\n' +\
+                             'Give an empty START or END for an open bound.',
+                        nargs=3,
+                        metavar=('PROPERTY', 'START', 'END'),
+                        default=None)
+    parser.add_argument('-c', '--components',
+                        help='Lay out connected components separately, in parallel, and pack them.',
+                        action='store_true')
+    parser.add_argument('-p', '--processes',
+                        help='Worker processes for --components; default: one per CPU',
+                        type=int,
+                        default=None)
+    parser.add_argument('--snapshot',
+                        help='Layout snapshot file: if it exists, only the parts of the layout\n' +\
+                             'around changed nodes and links are recomputed; the new layout\n' +\
+                             'is saved to it in either case.',
+                        default=None)
+    parser.add_argument('--hops',
+                        help='With --snapshot: refine changed nodes and neighbors up to\n' +\
+                             'this many links away; default: 1',
+                        type=int,
+                        default=1)
+    parser.add_argument('--unpinned',
+                        help='With --snapshot: let all nodes move, not just the refined ones.',
+                        action='store_true')
+    parser.add_argument('-z', '--zipcodes',
+                        help='Assign zip codes to nodes: at random, or near their\n' +\
+                             'layout positions (needs --layout or --snapshot).',
+                        choices=PLACEMENT_MODES,
+                        default=None)
+    parser.add_argument('--state',
+                        help='Use only zip codes of this state, such as CA.',
+                        default=None)
+    parser.add_argument('--fit',
+                        help='How layout positions are fitted onto the zip code area;\n' +\
+                             'default: quantile',
+                        choices=FIT_MODES,
+                        default='quantile')
+    parser.add_argument('--zipcode_source',
+                        help='Zip code database CSV; needed for --zipcodes and for CSV --outfile\n' +\
+                             'output, as none is shipped with the package.',
+                        default=ZIPCODE_SOURCE)
+    parser.add_argument('--seed',
+                        help='Random seed for reproducible layouts.',
+                        type=int,
+                        default=None)
+    parser.add_argument('--profile',
+                        help='Write time, rows/sec, peak memory, and layout energies\n' +\
+                             'of every stage to this JSON file.',
+                        default=None)
+    parser.add_argument('--profile_stage',
+                        help='Run this stage under cProfile; statistics go to\n' +\
+                             '<stage>.prof, or next to the --profile file.',
+                        choices=STAGES,
                         default=None)
     parser.add_argument('node_file',
                         help='Fully qualified name of file with nodes and their properties.',
@@ -411,10 +1303,83 @@ if __name__ == '__main__':
                         help='Fully qualified name of file with edges and their properties.',
                         default=None)
     args = parser.parse_args();
+    if args.zipcode_source is None and (args.zipcodes is not None or
+                                        (args.outfile is not None and args.format == 'csv')):
+        parser.error('--zipcodes and CSV --outfile output need a zip code database; ' +
+                     'give its path with --zipcode_source.')
+    profiler = None
+    if args.profile is not None or args.profile_stage is not None:
+        profile_file = None
+        if args.profile is not None and args.profile_stage is not None:
+            profile_file = '%s_%s.prof' % (os.path.splitext(args.profile)[0], args.profile_stage)
+        profiler = StageProfiler(profile_stage=args.profile_stage, profile_file=profile_file)
     networker = Networker(args.node_file,
                           args.edge_file,
-                          delimiter=args.delimiter
+                          delimiter=args.delimiter,
+                          streaming=args.streaming or args.parse_processes != 1,
+                          chunk_rows=args.chunk_rows,
+                          merge=args.merge,
+                          cache_dir=args.cache_dir,
+                          parse_processes=args.parse_processes or None,
+                          schema=None if args.schema is None else parse_schema(args.schema),
+                          infer_types=args.infer_types,
+                          profiler=profiler
                           )
+    if args.ego is not None or args.link_filter or args.window is not None:
+        window = None
+        if args.window is not None:
+            window = [args.window[0]] + [bound or None for bound in args.window[1:]]
+        networker.select_subgraph(centers=args.ego,
+                                  hops=args.ego_hops,
+                                  direction=args.direction,
+                                  link_filter=parse_link_filter(args.link_filter),
+                                  window=window)
+    if args.snapshot is not None and os.path.exists(args.snapshot):
+        layout_args = {} if args.iterations is None else {'iterations' : args.iterations}
+        networker.update_layout(args.snapshot,
+                                hops=args.hops,
+                                pin=not args.unpinned,
+                                theta=args.theta,
+                                seed=args.seed,
+                                **layout_args)
+    elif args.layout is not None:
+        # Multilevel layouts take their iteration count per level:
+        iterations_arg = 'refine_iterations' if args.layout == 'multilevel' else 'iterations'
+        layout_args = {} if args.iterations is None else {iterations_arg : args.iterations}
+        networker.compute_layout(args.layout,
+                                 theta=args.theta,
+                                 components=args.components,
+                                 processes=args.processes,
+                                 initial=args.initial,
+                                 stop_metric=args.stop_metric,
+                                 check_every=args.check_every,
+                                 min_improvement=args.min_improvement,
+                                 seed=args.seed,
+                                 **layout_args)
+    if args.snapshot is not None and networker.positions is not None:
+        networker.save_layout_snapshot(args.snapshot)
+    if args.bundle and networker.positions is not None:
+        networker.bundle_edges(cycles=args.bundle_cycles, threshold=args.compatibility, seed=args.seed)
+    if args.communities:
+        networker.detect_communities(resolution=args.resolution, seed=args.seed)
+    if args.metrics is not None and networker.positions is not None:
+        with open(args.metrics, 'w') as fd:
+            json.dump(networker.layout_metrics(seed=args.seed), fd, indent=1)
+    if args.zipcodes is not None:
+        networker.internalize_zipcodes(args.zipcode_source)
+        if args.zipcodes == 'layout':
+            networker.place_zipcodes(state=args.state, fit=args.fit)
+        else:
+            networker.assign_zipcodes(state=args.state, seed=args.seed)
 
-    if args.outfile is not None:
-        networker.export_converted_input(args.outfile)
\ No newline at end of file
+    if args.outfile is not None and args.format != 'csv':
+        networker.export_columnar(os.path.splitext(args.outfile)[0], file_format=args.format)
+    elif args.outfile is not None:
+        if networker.node_to_zipcode is None:
+            networker.internalize_zipcodes(args.zipcode_source)
+            networker.assign_zipcodes(state=args.state, seed=args.seed)
+        networker.export_converted_input(args.outfile)
+    if args.outfile is not None and networker.communities is not None:
+        networker.export_community_views(os.path.splitext(args.outfile)[0], file_format=args.format)
+    if args.profile is not None:
+        profiler.write_report(args.profile)
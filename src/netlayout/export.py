@@ -0,0 +1,316 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Streaming CSV export of an interned graph.
+
+Tables are written straight from the arrays of a
+graph_store.GraphStore: rows are produced chunk by
+chunk, by slicing and gathering the columns for one
+range of node ids or link positions at a time, and
+go out through a large write buffer. Nothing is
+re-read from the input files, and no table is held
+in memory as a whole; peak memory is a few chunks'
+worth of rows, regardless of the output size.
+
+export_graph() writes, in one pass over the arrays:
+
+    <outfile>:           links in input file order and with its
+                         columns, end points replaced by zip codes;
+                         weights the input did not give stay empty
+    <base>_nodes.csv:    nodes by zip code, with properties and x/y
+    <base>_geo.csv:      latitude and longitude of every used zip code
+    <base>_paths.csv:    bundled link paths, if any; see write_path_table()
+'''
+import csv
+import os
+
+import numpy as np
+
+from netlayout.graph_store import CategoricalColumn, NumericColumn, TypedColumn
+from netlayout.ingest import DEFAULT_CHUNK_ROWS, WEIGHT_COLUMN
+
+
+# Bytes buffered by each output file before it is flushed:
+WRITE_BUFFER_BYTES = 1 << 22
+
+# ---------------------------- GatheredColumn -----------
+
+class GatheredColumn(object):
+    '''
+    Column whose row i is values[indices[i]], such as
+    the zip code of each link's source node. Only the
+    rows of one chunk are ever gathered at a time.
+    '''
+
+    def __init__(self, values, indices):
+        self.values = values
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def chunk(self, start, stop):
+        return chunk_values(self.values, self.indices[start:stop])
+
+# ---------------------------- MaskedColumn -----------
+
+class MaskedColumn(object):
+    '''
+    Float column whose rows are missing where mask is
+    True, such as the weights of links that had none in
+    the input. Missing rows come out as NaN, which is
+    written as an empty field.
+    '''
+
+    def __init__(self, values, mask):
+        self.values = values
+        self.mask = mask
+
+    def __len__(self):
+        return len(self.values)
+
+#-----------------------------
+# chunk_values
+#-----------------------
+
+def chunk_values(column, rows):
+    '''
+    Values of the given rows of a column, as an array.
+    The column may be a NumPy array, a property column
+    of a GraphStore, or a GatheredColumn. Missing values
+    of typed columns are None.
+
+    @param column: column to read from
+    @type column: {np.ndarray | NumericColumn | CategoricalColumn | TypedColumn | GatheredColumn | MaskedColumn}
+    @param rows: row indexes, or a slice
+    @type rows: {np.ndarray | slice}
+    @rtype: np.ndarray
+    '''
+    if isinstance(column, GatheredColumn):
+        if isinstance(rows, slice):
+            return column.chunk(rows.start, rows.stop)
+        return chunk_values(column.values, column.indices[rows])
+    if isinstance(column, MaskedColumn):
+        values = np.array(column.values[rows], dtype=np.float64)
+        values[column.mask[rows]] = np.nan
+        return values
+    if isinstance(column, TypedColumn):
+        chunk = column.take(rows)
+        values = chunk.to_array()
+        missing = chunk.missing()
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+        return values
+    if isinstance(column, (NumericColumn, CategoricalColumn)):
+        return column.take(rows).to_array()
+    return np.asarray(column[rows])
+
+#-----------------------------
+# to_cells
+#-----------------------
+
+def to_cells(values):
+    '''
+    List of Python values for the CSV writer. NaN
+    becomes None, which is written as an empty field.
+    '''
+    if values.dtype.kind == 'f':
+        missing = np.isnan(values)
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+    return values.tolist()
+
+#-----------------------------
+# write_table
+#-----------------------
+
+def write_table(path, header, columns,
+                delimiter=',',
+                chunk_rows=DEFAULT_CHUNK_ROWS,
+                buffer_bytes=WRITE_BUFFER_BYTES,
+                order=None):
+    '''
+    Write equal-length columns as a CSV table, chunk_rows
+    rows at a time.
+
+    @param path: file to (over)write
+    @type path: str
+    @param header: column names
+    @type header: [str]
+    @param columns: one column per header entry; see chunk_values()
+    @type columns: list
+    @param delimiter: CSV column delimiter
+    @type delimiter: str
+    @param chunk_rows: rows formatted per chunk
+    @type chunk_rows: int
+    @param buffer_bytes: size of the output buffer
+    @type buffer_bytes: int
+    @param order: row of the columns for each output row,
+        or None to write the rows in column order
+    @type order: {np.ndarray | None}
+    @return: number of rows written
+    @rtype: int
+    '''
+    if chunk_rows < 1:
+        raise ValueError("Chunk size must be at least one row; got %s" % chunk_rows)
+    if len(header) != len(columns):
+        raise ValueError("Got %s column names for %s columns." % (len(header), len(columns)))
+    num_rows = len(columns[0]) if columns else 0
+    with open(path, 'w', newline='', buffering=buffer_bytes) as out_fd:
+        writer = csv.writer(out_fd, delimiter=delimiter, quotechar='"')
+        writer.writerow(header)
+        for start in range(0, num_rows, chunk_rows):
+            rows = slice(start, min(start + chunk_rows, num_rows))
+            if order is not None:
+                rows = order[rows]
+            writer.writerows(zip(*[to_cells(chunk_values(column, rows)) for column in columns]))
+    return num_rows
+
+#-----------------------------
+# path_rows
+#-----------------------
+
+def path_rows(paths, start, stop):
+    '''
+    Rows of the path table for links start..stop-1 of
+    bundled paths: link_id, path_order (1 for the source
+    end), and x, y of each path point.
+
+    @param paths: num_links x points x 2 path points, as
+        from bundling.bundle_edges()
+    @type paths: np.ndarray
+    @rtype: (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+    '''
+    num_points = paths.shape[1]
+    points = paths[start:stop].reshape(-1, 2)
+    link_ids = np.repeat(np.arange(start, stop, dtype=np.int64), num_points)
+    path_order = np.tile(np.arange(1, num_points + 1, dtype=np.int16), stop - start)
+    return (link_ids, path_order, points[:, 0], points[:, 1])
+
+#-----------------------------
+# write_path_table
+#-----------------------
+
+def write_path_table(path, paths,
+                     delimiter=',',
+                     chunk_rows=DEFAULT_CHUNK_ROWS,
+                     buffer_bytes=WRITE_BUFFER_BYTES):
+    '''
+    Write bundled link paths as the table Tableau's line
+    mark draws from: one row per path point, with the
+    link_id on the detail shelf and path_order on path.
+
+    @param path: file to (over)write
+    @type path: str
+    @param paths: num_links x points x 2 path points
+    @type paths: np.ndarray
+    @param delimiter: CSV column delimiter
+    @type delimiter: str
+    @param chunk_rows: links formatted per chunk
+    @type chunk_rows: int
+    @param buffer_bytes: size of the output buffer
+    @type buffer_bytes: int
+    @return: number of rows written
+    @rtype: int
+    '''
+    if chunk_rows < 1:
+        raise ValueError("Chunk size must be at least one row; got %s" % chunk_rows)
+    num_links = len(paths)
+    with open(path, 'w', newline='', buffering=buffer_bytes) as out_fd:
+        writer = csv.writer(out_fd, delimiter=delimiter, quotechar='"')
+        writer.writerow(['link_id', 'path_order', 'x', 'y'])
+        for start in range(0, num_links, chunk_rows):
+            columns = path_rows(paths, start, min(start + chunk_rows, num_links))
+            # float32 points as their shortest decimal form, not
+            # as the digits of the nearest float64:
+            writer.writerows(zip(*[(column.astype(str) if column.dtype == np.float32 else column).tolist()
+                                   for column in columns]))
+    return num_links * paths.shape[1]
+
+#-----------------------------
+# export_graph
+#-----------------------
+
+def export_graph(outfile, graph, zipcodes,
+                 lat=None,
+                 long=None,
+                 positions=None,
+                 paths=None,
+                 node_column='node',
+                 link_columns=('src', 'dst'),
+                 weight_column=2,
+                 delimiter=',',
+                 chunk_rows=DEFAULT_CHUNK_ROWS):
+    '''
+    Write the links, nodes, and geo tables of a graph
+    whose nodes have zip codes; see the module docstring
+    for the file names. Node names are replaced by zip
+    codes throughout.
+
+    @param outfile: path of the links table
+    @type outfile: str
+    @param graph: the interned graph
+    @type graph: graph_store.GraphStore
+    @param zipcodes: zip code string of each node id
+    @type zipcodes: np.ndarray
+    @param lat: latitude of each node id's zip code;
+        no geo table if None
+    @type lat: {np.ndarray | GatheredColumn | None}
+    @param long: longitude of each node id's zip code
+    @type long: {np.ndarray | GatheredColumn | None}
+    @param positions: num_nodes x 2 layout positions, or None
+    @type positions: {np.ndarray | None}
+    @param paths: bundled link paths, or None; see write_path_table()
+    @type paths: {np.ndarray | None}
+    @param node_column: header of the zip code column of the nodes table
+    @type node_column: str
+    @param link_columns: headers of the two end point columns
+    @type link_columns: (str, str)
+    @param weight_column: position of the weight column in the
+        links table, as in the links file; None to leave it out,
+        such as when the links file has none
+    @type weight_column: {int | None}
+    @param delimiter: CSV column delimiter
+    @type delimiter: str
+    @param chunk_rows: rows formatted per chunk
+    @type chunk_rows: int
+    @return: paths written
+    @rtype: [str]
+    '''
+    base = os.path.splitext(outfile)[0]
+    written = []
+
+    header = list(link_columns) + list(graph.link_properties)
+    columns = [GatheredColumn(zipcodes, graph.src),
+               GatheredColumn(zipcodes, graph.dst)] + list(graph.link_properties.values())
+    if weight_column is not None:
+        header.insert(weight_column, WEIGHT_COLUMN)
+        columns.insert(weight_column, graph.weight if graph.missing_weight is None
+                                      else MaskedColumn(graph.weight, graph.missing_weight))
+    write_table(outfile, header, columns, delimiter, chunk_rows, order=graph.input_order)
+    written.append(outfile)
+
+    header = [node_column] + list(graph.node_properties)
+    columns = [zipcodes] + list(graph.node_properties.values())
+    if positions is not None:
+        header += ['x', 'y']
+        columns += [positions[:, 0], positions[:, 1]]
+    write_table(base + '_nodes.csv', header, columns, delimiter, chunk_rows)
+    written.append(base + '_nodes.csv')
+
+    if lat is not None and long is not None:
+        write_table(base + '_geo.csv',
+                    ['zipcode', 'latitude', 'longitude'],
+                    [zipcodes, lat, long],
+                    delimiter,
+                    chunk_rows)
+        written.append(base + '_geo.csv')
+
+    if paths is not None:
+        write_path_table(base + '_paths.csv', paths, delimiter, chunk_rows)
+        written.append(base + '_paths.csv')
+    return written
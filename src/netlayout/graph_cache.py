@@ -0,0 +1,251 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+On-disk cache of parsed graphs, so that repeated runs
+on unchanged input files skip CSV parsing.
+
+Each cache entry is a directory holding one .npy file
+per array of a GraphStore (node names, src, dst, weight,
+indptr, property codes and categories, the reverse
+index of its links, the missing weights and input
+order of its links if any, and the arrays of its
+node_index.NodeIndex), plus a JSON
+manifest. Arrays are loaded with mmap_mode='r', so a
+cache hit maps the files rather than reading them.
+
+Entries are found by the absolute input file paths
+and the parse options (delimiter, merge mode, ...).
+An entry is valid if, for every input file, the size
+matches the manifest, and either the modification time
+matches as well, or the content hash does. Files that
+were merely touched therefore cost one hashing pass,
+not a re-parse.
+'''
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from netlayout.graph_store import CategoricalColumn, GraphStore, NumericColumn
+from netlayout.node_index import NodeIndex
+
+
+# Bump when the entry layout changes; older entries are ignored:
+CACHE_FORMAT_VERSION = 4
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'netlayout')
+
+MANIFEST_NAME = 'manifest.json'
+
+# Bytes read at a time while hashing input files:
+HASH_BLOCK_SIZE = 1 << 20
+
+#-----------------------------
+# file_fingerprint
+#-----------------------
+
+def file_fingerprint(path):
+    '''
+    Size, modification time, and content hash of a file.
+
+    @return: {'size' : int, 'mtime_ns' : int, 'sha1' : str}
+    @rtype: dict
+    '''
+    stat = os.stat(path)
+    return {'size'     : stat.st_size,
+            'mtime_ns' : stat.st_mtime_ns,
+            'sha1'     : content_hash(path)}
+
+def content_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fd:
+        for block in iter(lambda: fd.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# ---------------------------- GraphCache -----------
+
+class GraphCache(object):
+    '''
+    Directory of cached graphs. Usage:
+
+        cache = GraphCache(cache_dir)
+        cached = cache.load(input_files, options)
+        if cached is None:
+            fingerprints = [file_fingerprint(path) for path in input_files]
+            graph = <parse>
+            cache.save(input_files, options, graph, attributes, fingerprints)
+        else:
+            (graph, attributes) = cached
+
+    The options dict holds everything besides the files
+    that determines the parse result; attributes is a
+    dict of JSON-serializable values kept alongside the
+    graph, such as the column header names.
+    '''
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def entry_dir(self, input_files, options):
+        key = json.dumps([[os.path.abspath(path) for path in input_files], options], sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    #-----------------------------
+    # load
+    #-----------------------
+
+    def load(self, input_files, options):
+        '''
+        Map the cached graph for the given inputs, if
+        there is a valid one.
+
+        @param input_files: paths of the parsed files
+        @type input_files: [str]
+        @param options: parse options
+        @type options: dict
+        @return: (graph, attributes), or None on a miss
+        @rtype: {(graph_store.GraphStore, dict) | None}
+        '''
+        entry = self.entry_dir(input_files, options)
+        try:
+            with open(os.path.join(entry, MANIFEST_NAME), 'r') as fd:
+                manifest = json.load(fd)
+        except (IOError, OSError, ValueError):
+            return None
+        if manifest.get('version') != CACHE_FORMAT_VERSION:
+            return None
+
+        touched = False
+        for (path, fingerprint) in zip(input_files, manifest['fingerprints']):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            if stat.st_size != fingerprint['size']:
+                return None
+            if stat.st_mtime_ns != fingerprint['mtime_ns']:
+                if content_hash(path) != fingerprint['sha1']:
+                    return None
+                fingerprint['mtime_ns'] = stat.st_mtime_ns
+                touched = True
+        if touched:
+            # Same content, new mtime: skip hashing next time:
+            self._write_manifest(entry, manifest)
+
+        load = lambda name: np.load(os.path.join(entry, name + '.npy'), mmap_mode='r')
+        node_properties = self._load_columns(load, 'node', manifest['node_properties'])
+        link_properties = self._load_columns(load, 'link', manifest['link_properties'])
+        # Arrays that not every graph has:
+        (missing_weight, input_order) = [load(name) if name in manifest['optional'] else None
+                                         for name in ('missing_weight', 'input_order')]
+        graph = GraphStore.from_csr(np.array(load('node_names').tolist(), dtype=object),
+                                    load('src'),
+                                    load('dst'),
+                                    load('weight'),
+                                    load('indptr'),
+                                    node_properties=node_properties,
+                                    link_properties=link_properties,
+                                    node_index=NodeIndex.load(lambda name: load('index_' + name)),
+                                    in_csr=(load('in_order'), load('in_indptr')),
+                                    missing_weight=missing_weight,
+                                    input_order=input_order)
+        return (graph, manifest['attributes'])
+
+    #-----------------------------
+    # save
+    #-----------------------
+
+    def save(self, input_files, options, graph, attributes=None, fingerprints=None):
+        '''
+        Write a cache entry for the given inputs, replacing
+        any earlier one.
+
+        @param input_files: paths of the parsed files
+        @type input_files: [str]
+        @param options: parse options
+        @type options: dict
+        @param graph: the parse result
+        @type graph: graph_store.GraphStore
+        @param attributes: JSON-serializable extras
+        @type attributes: {dict | None}
+        @param fingerprints: file_fingerprint() of each input,
+            taken before parsing; computed now if None
+        @type fingerprints: {[dict] | None}
+        '''
+        if fingerprints is None:
+            fingerprints = [file_fingerprint(path) for path in input_files]
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        # Build the entry next to its final place, then swap it in:
+        tmp_entry = tempfile.mkdtemp(prefix='.entry_', dir=self.cache_dir)
+        try:
+            save = lambda name, array: np.save(os.path.join(tmp_entry, name + '.npy'), array)
+            save('node_names', np.asarray(graph.node_names, dtype=str))
+            save('src', graph.src)
+            save('dst', graph.dst)
+            save('weight', graph.weight)
+            save('indptr', graph.indptr)
+            (in_order, in_indptr) = graph.in_csr
+            save('in_order', in_order)
+            save('in_indptr', in_indptr)
+            optional = []
+            for name in ('missing_weight', 'input_order'):
+                if getattr(graph, name) is not None:
+                    save(name, getattr(graph, name))
+                    optional.append(name)
+            graph.index.save(lambda name, array: save('index_' + name, array))
+            manifest = {'version'         : CACHE_FORMAT_VERSION,
+                        'fingerprints'    : fingerprints,
+                        'options'         : options,
+                        'attributes'      : attributes or {},
+                        'optional'        : optional,
+                        'node_properties' : self._save_columns(save, 'node', graph.node_properties),
+                        'link_properties' : self._save_columns(save, 'link', graph.link_properties)}
+            self._write_manifest(tmp_entry, manifest)
+            entry = self.entry_dir(input_files, options)
+            if os.path.exists(entry):
+                shutil.rmtree(entry)
+            os.rename(tmp_entry, entry)
+        except Exception:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            raise
+
+    # ------------------------- Utilities --------------
+
+    def _save_columns(self, save, prefix, columns):
+        '''
+        Save property columns; return their manifest
+        entries as [[name, kind], ...] in file order.
+        '''
+        entries = []
+        for (i, (name, column)) in enumerate(columns.items()):
+            stem = '%s_%s' % (prefix, i)
+            if isinstance(column, NumericColumn):
+                save(stem + '_values', column.values)
+                entries.append([name, 'numeric'])
+            else:
+                save(stem + '_codes', column.codes)
+                save(stem + '_categories', np.asarray(column.categories, dtype=str))
+                entries.append([name, 'categorical'])
+        return entries
+
+    def _load_columns(self, load, prefix, entries):
+        columns = {}
+        for (i, (name, kind)) in enumerate(entries):
+            stem = '%s_%s' % (prefix, i)
+            if kind == 'numeric':
+                columns[name] = NumericColumn(load(stem + '_values'))
+            else:
+                categories = np.array(load(stem + '_categories').tolist(), dtype=object)
+                columns[name] = CategoricalColumn(load(stem + '_codes'), categories)
+        return columns
+
+    def _write_manifest(self, entry, manifest):
+        with open(os.path.join(entry, MANIFEST_NAME), 'w') as fd:
+            json.dump(manifest, fd, indent=1)
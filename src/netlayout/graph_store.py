@@ -0,0 +1,590 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Compact, integer-indexed graph store.
+
+Node names are interned to dense ids 0..n-1. Links
+are kept as parallel NumPy arrays src/dst/weight,
+sorted by source node, with an indptr offsets array
+that turns them into a CSR (compressed sparse row)
+adjacency:
+
+    out-edges of node i are positions indptr[i]..indptr[i+1]-1
+    of src, dst, weight, and of every link property column.
+
+A reverse index, built on first use, does the same
+for the links arriving at each node, so that
+neighborhoods in either direction are found by
+slicing rather than by scanning all links.
+
+Property columns are either numeric arrays, or
+dictionary-encoded strings (int32 codes into a
+table of distinct values). Dictionary-encoded
+columns that a schema declares numeric decode
+their values lazily; see TypedColumn.
+
+Parallel links between the same pair of nodes are
+all kept, unless a merge mode is requested: 'sum'
+and 'max' combine their weights, 'count' replaces
+the weight by the number of parallel links.
+'''
+import numpy as np
+
+from netlayout.ingest import WEIGHT_COLUMN, CategoricalBuffer
+from netlayout.node_index import NodeIndex
+
+
+# Code of a missing value in a CategoricalColumn:
+MISSING_CODE = -1
+
+# Ways of collapsing parallel links:
+MERGE_MODES = ('sum', 'max', 'count')
+
+#-----------------------------
+# merge_parallel_edges
+#-----------------------
+
+def merge_parallel_edges(src, dst, weight, link_properties, num_nodes, merge):
+    '''
+    Collapse links that share source and destination
+    into one. Weights are combined as given by merge;
+    the other properties of the first link of each
+    group are kept. The result is sorted by source,
+    then destination.
+
+    @param src: source node ids
+    @type src: np.ndarray
+    @param dst: destination node ids
+    @type dst: np.ndarray
+    @param weight: link weights
+    @type weight: np.ndarray
+    @param link_properties: {name : column} aligned with src
+    @type link_properties: dict
+    @param num_nodes: number of nodes in the graph
+    @type num_nodes: int
+    @param merge: one of MERGE_MODES
+    @type merge: str
+    @return: merged (src, dst, weight, link_properties)
+    @rtype: tuple
+    '''
+    if merge not in MERGE_MODES:
+        raise ValueError("Merge mode must be one of %s; got '%s'" % (MERGE_MODES, merge))
+    keys = src.astype(np.int64) * num_nodes + dst
+    (unique_keys, first, inverse) = np.unique(keys, return_index=True, return_inverse=True)
+    num_groups = len(unique_keys)
+    if merge == 'sum':
+        weight = np.bincount(inverse, weights=weight, minlength=num_groups)
+    elif merge == 'max':
+        merged = np.full(num_groups, -np.inf)
+        np.maximum.at(merged, inverse, weight)
+        weight = merged
+    else:
+        weight = np.bincount(inverse, minlength=num_groups).astype(np.float64)
+    link_properties = {name : column.take(first) for (name, column) in link_properties.items()}
+    return ((unique_keys // num_nodes).astype(np.int32),
+            (unique_keys % num_nodes).astype(np.int32),
+            weight,
+            link_properties)
+
+# ---------------------------- NumericColumn -----------
+
+class NumericColumn(object):
+    '''
+    Property column of numbers. Missing values are NaN.
+    '''
+
+    def __init__(self, values):
+        self.values = np.asarray(values)
+
+    def __getitem__(self, i):
+        return self.values[i]
+
+    def __len__(self):
+        return len(self.values)
+
+    def take(self, indices):
+        return NumericColumn(self.values[indices])
+
+    def to_array(self):
+        return self.values
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+# ---------------------------- CategoricalColumn -----------
+
+class CategoricalColumn(object):
+    '''
+    Dictionary-encoded string property column.
+    Rows hold int32 codes into self.categories;
+    MISSING_CODE marks rows without a value.
+    '''
+
+    def __init__(self, codes, categories):
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.categories = categories
+
+    @classmethod
+    def from_buffer(cls, buf):
+        '''
+        Build from an ingest.CategoricalBuffer. None
+        values in the buffer become MISSING_CODE.
+        '''
+        codes = buf.codes.trim()
+        categories = buf.categories()
+        none_code = buf.lookup.get(None)
+        if none_code is not None:
+            categories = np.delete(categories, none_code)
+            is_none = codes == none_code
+            codes[codes > none_code] -= 1
+            codes[is_none] = MISSING_CODE
+        return cls(codes, categories)
+
+    @classmethod
+    def from_values(cls, values):
+        buf = CategoricalBuffer()
+        buf.extend(values)
+        return cls.from_buffer(buf)
+
+    def __getitem__(self, i):
+        code = self.codes[i]
+        return None if code == MISSING_CODE else self.categories[code]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def take(self, indices):
+        return CategoricalColumn(self.codes[indices], self.categories)
+
+    def to_array(self):
+        '''
+        Decode into an object array of strings,
+        with None for missing values.
+        '''
+        values = np.empty(len(self.codes), dtype=object)
+        present = self.codes != MISSING_CODE
+        values[present] = self.categories[self.codes[present]]
+        return values
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + sum(len(category) for category in self.categories)
+
+# ---------------------------- TypedColumn -----------
+
+class TypedColumn(CategoricalColumn):
+    '''
+    Dictionary-encoded column whose values are numbers,
+    as declared by a schema; see schema.py. Nothing is
+    converted until the values are first read: then the
+    distinct strings are parsed once, and the rows are
+    decoded into a typed array by one gather over the
+    codes. Columns that are never read cost only their
+    codes.
+
+    'float' columns decode to float64, with NaN where
+    values are missing or do not parse. 'int' columns
+    decode to int64, with 0 in those rows; missing()
+    tells them apart.
+    '''
+
+    DTYPES = {'int' : np.int64, 'float' : np.float64}
+
+    def __init__(self, codes, categories, column_type, parsed=None):
+        if column_type not in TypedColumn.DTYPES:
+            raise ValueError("Typed columns are one of %s; got '%s'" % (tuple(TypedColumn.DTYPES), column_type))
+        super(TypedColumn, self).__init__(codes, categories)
+        self.column_type = column_type
+        # (values, valid) of each category; shared with
+        # columns made by take():
+        self._parsed = parsed
+        self._values = None
+
+    @classmethod
+    def from_categorical(cls, column, column_type):
+        return cls(column.codes, column.categories, column_type)
+
+    def parsed_categories(self):
+        '''
+        Typed value of each category, and whether it
+        parsed, as a pair of arrays. Computed once.
+        '''
+        if self._parsed is None:
+            dtype = TypedColumn.DTYPES[self.column_type]
+            values = np.zeros(len(self.categories) + 1, dtype=dtype)
+            valid = np.zeros(len(self.categories) + 1, dtype=bool)
+            for (code, category) in enumerate(self.categories):
+                try:
+                    values[code] = float(category) if self.column_type == 'float' else int(category)
+                    valid[code] = True
+                except (ValueError, TypeError, OverflowError):
+                    pass
+            if self.column_type == 'float':
+                values[~valid] = np.nan
+            # The extra last entry is for MISSING_CODE (-1):
+            self._parsed = (values, valid)
+        return self._parsed
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = self.parsed_categories()[0][self.codes]
+        return self._values
+
+    def missing(self):
+        '''
+        Boolean array of rows without a valid value.
+        '''
+        return ~self.parsed_categories()[1][self.codes]
+
+    def __getitem__(self, i):
+        return self.parsed_categories()[0][self.codes[i]]
+
+    def take(self, indices):
+        return TypedColumn(self.codes[indices], self.categories, self.column_type, self.parsed_categories())
+
+    def to_array(self):
+        return self.values
+
+    @property
+    def nbytes(self):
+        decoded = 0 if self._values is None else self._values.nbytes
+        return super(TypedColumn, self).nbytes + decoded
+
+# ---------------------------- GraphStore -----------
+
+class GraphStore(object):
+    '''
+    Interned, CSR-ordered graph. Attributes:
+
+       - node_names:      object array, node id -> node name
+       - src, dst:        int32 node ids of each link, sorted by src
+       - weight:          float64 link weights (1.0 where none given)
+       - missing_weight:  bool, True where the input gave no weight;
+                          None if every link has one
+       - input_order:     int64 link positions in input file order;
+                          None if that is the CSR order
+       - indptr:          int64 CSR offsets, length num_nodes + 1
+       - in_csr:          (in_order, in_indptr) reverse index; see in_csr
+       - node_properties: {name : NumericColumn or CategoricalColumn}, by node id
+       - link_properties: {name : NumericColumn or CategoricalColumn}, by link position
+
+    Not usually instantiated directly; see from_ingest()
+    and from_edge_list().
+    '''
+
+    def __init__(self, node_names, src, dst,
+                 weight=None,
+                 node_properties=None,
+                 link_properties=None,
+                 node_index=None,
+                 merge=None):
+        '''
+        @param node_names: node name of each node id
+        @type node_names: np.ndarray
+        @param src: source node id of each link
+        @type src: np.ndarray
+        @param dst: destination node id of each link
+        @type dst: np.ndarray
+        @param weight: weight of each link; None for all 1.0
+        @type weight: {np.ndarray | None}
+        @param node_properties: property columns indexed by node id
+        @type node_properties: dict
+        @param link_properties: property columns aligned with src/dst
+        @type link_properties: dict
+        @param node_index: index of node_names if already at hand;
+            built on first lookup otherwise
+        @type node_index: {NodeIndex | None}
+        @param merge: one of MERGE_MODES to collapse parallel
+            links, or None to keep them all
+        @type merge: {str | None}
+        '''
+        self.node_names = node_names
+        self._node_index = node_index
+        self._in_csr = None
+
+        src = np.asarray(src, dtype=np.int32)
+        dst = np.asarray(dst, dtype=np.int32)
+        if weight is None:
+            weight = np.ones(len(src), dtype=np.float64)
+            missing_weight = np.ones(len(src), dtype=bool)
+        else:
+            weight = np.asarray(weight, dtype=np.float64)
+            missing_weight = np.isnan(weight)
+            weight = np.where(missing_weight, 1.0, weight)
+        if not missing_weight.any():
+            missing_weight = None
+        link_properties = link_properties or {}
+
+        if merge is not None:
+            # Merged weights are computed for every link:
+            (src, dst, weight, link_properties) = merge_parallel_edges(src, dst, weight,
+                                                                       link_properties,
+                                                                       len(node_names),
+                                                                       merge)
+            missing_weight = None
+        # Stable sort keeps links of one source in input order:
+        order = np.argsort(src, kind='stable')
+        input_order = None
+        if not np.array_equal(order, np.arange(len(src))):
+            src = src[order]
+            dst = dst[order]
+            weight = weight[order]
+            if missing_weight is not None:
+                missing_weight = missing_weight[order]
+            link_properties = {name : column.take(order) for (name, column) in link_properties.items()}
+            # Where each input link went:
+            input_order = np.empty(len(order), dtype=np.int64)
+            input_order[order] = np.arange(len(order))
+
+        self.src = src
+        self.dst = dst
+        self.weight = weight
+        self.missing_weight = missing_weight
+        self.input_order = input_order
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=self.num_nodes), out=self.indptr[1:])
+
+        self.node_properties = node_properties or {}
+        self.link_properties = link_properties
+
+    #-----------------------------
+    # from_ingest
+    #-----------------------
+
+    @classmethod
+    def from_ingest(cls, buffers, merge=None):
+        '''
+        Build a store from the columnar buffers of a
+        streaming ingest. If a node appears more than
+        once in the nodes file, its last row wins.
+
+        @param buffers: result of ingest.stream_inputs()
+        @type buffers: ingest.IngestBuffers
+        @param merge: one of MERGE_MODES, or None
+        @type merge: {str | None}
+        @rtype: GraphStore
+        '''
+        node_names = buffers.interner.names()
+        num_nodes  = len(node_names)
+
+        # Node id and nodes-file row of each node's last row:
+        node_rows = buffers.node_rows.view()
+        reversed_rows = node_rows[::-1]
+        (node_ids, first_in_reversed) = np.unique(reversed_rows, return_index=True)
+        last_rows = len(node_rows) - 1 - first_in_reversed
+
+        node_properties = {}
+        for (name, buf) in buffers.node_columns.items():
+            codes = np.full(num_nodes, MISSING_CODE, dtype=np.int32)
+            codes[node_ids] = buf.codes.view()[last_rows]
+            node_properties[name] = CategoricalColumn(codes, buf.categories())
+
+        return cls._from_links(buffers, node_names, node_properties, merge)
+
+    #-----------------------------
+    # from_edge_list
+    #-----------------------
+
+    @classmethod
+    def from_edge_list(cls, builder, nodes_dict=None, merge=None):
+        '''
+        Build a store from links collected in an
+        ingest.EdgeListBuilder, and node properties
+        in the form produced by Networker.import_inputs():
+
+            nodes_dict: {node : {prop : val}}
+
+        @param builder: the collected links
+        @type builder: ingest.EdgeListBuilder
+        @param nodes_dict: node properties, or None
+        @type nodes_dict: {dict | None}
+        @param merge: one of MERGE_MODES, or None
+        @type merge: {str | None}
+        @rtype: GraphStore
+        '''
+        nodes_dict = nodes_dict or {}
+        builder.interner.intern_many(list(nodes_dict))
+        node_names = builder.interner.names()
+
+        node_properties = {}
+        # Properties in the order the nodes file lists them:
+        for name in dict.fromkeys(name for properties in nodes_dict.values() for name in properties):
+            values = [nodes_dict.get(node_name, {}).get(name) for node_name in node_names]
+            node_properties[name] = CategoricalColumn.from_values(values)
+
+        return cls._from_links(builder, node_names, node_properties, merge)
+
+    @classmethod
+    def _from_links(cls, builder, node_names, node_properties, merge):
+        weight = None
+        link_properties = {}
+        for (name, buf) in builder.link_columns.items():
+            if name == WEIGHT_COLUMN:
+                weight = buf.trim()
+            else:
+                link_properties[name] = CategoricalColumn.from_buffer(buf)
+
+        return cls(node_names,
+                   builder.src.trim(),
+                   builder.dst.trim(),
+                   weight=weight,
+                   node_properties=node_properties,
+                   link_properties=link_properties,
+                   merge=merge)
+
+    #-----------------------------
+    # from_csr
+    #-----------------------
+
+    @classmethod
+    def from_csr(cls, node_names, src, dst, weight, indptr,
+                 node_properties=None,
+                 link_properties=None,
+                 node_index=None,
+                 in_csr=None,
+                 missing_weight=None,
+                 input_order=None):
+        '''
+        Wrap arrays that already are in CSR order, such
+        as the memory-mapped ones of a graph_cache.GraphCache,
+        without sorting or copying them. The node_index,
+        if given, is a NodeIndex of node_names; in_csr, if
+        given, is the reverse index of the links;
+        missing_weight and input_order are as in the
+        class docstring.
+
+        @rtype: GraphStore
+        '''
+        store = cls.__new__(cls)
+        store.node_names = node_names
+        store._node_index = node_index
+        store._in_csr = in_csr
+        store.src = src
+        store.dst = dst
+        store.weight = weight
+        store.missing_weight = missing_weight
+        store.input_order = input_order
+        store.indptr = indptr
+        store.node_properties = node_properties or {}
+        store.link_properties = link_properties or {}
+        return store
+
+    # ------------------------- Lookups --------------
+
+    @property
+    def num_nodes(self):
+        return len(self.node_names)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    @property
+    def index(self):
+        '''
+        The NodeIndex of node_names, built on first use.
+        '''
+        if self._node_index is None:
+            self._node_index = NodeIndex.from_names(self.node_names)
+        return self._node_index
+
+    def node_id(self, name):
+        '''
+        Dense id of the given node name. Raises
+        KeyError for unknown nodes.
+        '''
+        return self.index.lookup_one(name)
+
+    def node_ids(self, names, missing=None):
+        '''
+        Dense ids of a sequence of node names as
+        an int32 array, looked up in one batch.
+
+        @param missing: id for unknown names; None to
+            raise KeyError instead
+        @type missing: {int | None}
+        '''
+        return self.index.lookup(names, missing=missing)
+
+    def has_node(self, name):
+        return name in self.index
+
+    def out_neighbors(self, node_id):
+        return self.dst[self.indptr[node_id]:self.indptr[node_id + 1]]
+
+    def out_edges(self, node_id):
+        '''
+        Slice of link positions that leave the given node.
+        '''
+        return slice(self.indptr[node_id], self.indptr[node_id + 1])
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    @property
+    def in_csr(self):
+        '''
+        Reverse CSR index, built on first use: link
+        positions sorted by destination, and offsets
+        into them, such that the links arriving at node
+        i are in_order[in_indptr[i]:in_indptr[i+1]].
+
+        @return: (in_order, in_indptr)
+        @rtype: (np.ndarray, np.ndarray)
+        '''
+        if self._in_csr is None:
+            in_order = np.argsort(self.dst, kind='stable').astype(np.int64)
+            in_indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.dst, minlength=self.num_nodes), out=in_indptr[1:])
+            self._in_csr = (in_order, in_indptr)
+        return self._in_csr
+
+    def out_links(self, node_ids):
+        '''
+        Positions of all links that leave any of the
+        given nodes, gathered from the CSR offsets.
+        '''
+        return _gather_ranges(self.indptr, node_ids)
+
+    def in_links(self, node_ids):
+        '''
+        Positions of all links that arrive at any of
+        the given nodes, gathered from the reverse index.
+        '''
+        (in_order, in_indptr) = self.in_csr
+        return in_order[_gather_ranges(in_indptr, node_ids)]
+
+    def degree(self):
+        '''
+        In plus out degree of every node.
+        '''
+        return (np.bincount(self.src, minlength=self.num_nodes) +
+                np.bincount(self.dst, minlength=self.num_nodes))
+
+    def node_property(self, node_id, name):
+        return self.node_properties[name][node_id]
+
+    @property
+    def nbytes(self):
+        '''
+        Approximate footprint of the array data,
+        excluding the node name strings.
+        '''
+        total = self.src.nbytes + self.dst.nbytes + self.weight.nbytes + self.indptr.nbytes
+        for column in list(self.node_properties.values()) + list(self.link_properties.values()):
+            total += column.nbytes
+        return total
+
+def _gather_ranges(indptr, node_ids):
+    '''
+    Concatenated ranges indptr[i]..indptr[i+1]-1 of
+    the given node ids.
+    '''
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    starts = indptr[node_ids]
+    counts = indptr[node_ids + 1] - starts
+    return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
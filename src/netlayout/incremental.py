@@ -0,0 +1,246 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Incremental (warm-start) layout for inputs that change
+a little between runs.
+
+After a run, a LayoutSnapshot of the graph (node names,
+links) and of the computed positions is saved. The next
+run diffs its freshly imported graph against the
+snapshot:
+
+   - nodes that survived start at their old positions
+   - new nodes start at the mean position of their
+     already placed neighbors, or at random if they have none
+   - nodes that are new, or that gained or lost links,
+     are 'changed'; they plus their neighbors up to a
+     given number of hops are 'affected'
+
+Only the affected nodes are then refined with a few cool
+spring_layout() iterations, while all others stay pinned
+to their old positions (unless pinning is turned off).
+The layout keeps its coordinate frame, so the picture
+stays stable from run to run.
+'''
+import numpy as np
+
+from netlayout.layout import spring_layout
+
+
+# Iterations spent refining the affected nodes:
+DEFAULT_UPDATE_ITERATIONS = 30
+
+# Refinement starts with steps of at most this
+# fraction of the layout's extent:
+UPDATE_TEMPERATURE_FRACTION = 0.05
+
+# Rounds of placing new nodes next to placed neighbors:
+PLACEMENT_ROUNDS = 3
+
+# ---------------------------- LayoutSnapshot -----------
+
+class LayoutSnapshot(object):
+    '''
+    Node names, links, and node positions of one run,
+    saved as a NumPy .npz archive.
+    '''
+
+    def __init__(self, node_names, src, dst, positions):
+        self.node_names = np.asarray(node_names, dtype=str)
+        self.src = np.asarray(src)
+        self.dst = np.asarray(dst)
+        self.positions = np.asarray(positions, dtype=np.float64)
+
+    @classmethod
+    def from_graph(cls, graph, positions):
+        '''
+        @param graph: the laid out graph
+        @type graph: graph_store.GraphStore
+        @param positions: its num_nodes x 2 positions
+        @type positions: np.ndarray
+        '''
+        return cls(graph.node_names, graph.src, graph.dst, positions)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as archive:
+            return cls(archive['node_names'], archive['src'], archive['dst'], archive['positions'])
+
+    def save(self, path):
+        # Pass a file object, so numpy does not append '.npz':
+        with open(path, 'wb') as fd:
+            np.savez(fd,
+                     node_names=self.node_names,
+                     src=self.src,
+                     dst=self.dst,
+                     positions=self.positions)
+
+# ---------------------------- GraphDiff -----------
+
+class GraphDiff(object):
+    '''
+    Differences between a snapshot and a current graph,
+    in terms of the current graph's node ids:
+
+       - old_id:        snapshot node id of each node; -1 for new nodes
+       - new_nodes:     boolean mask of nodes not in the snapshot
+       - changed:       boolean mask of new nodes, and of nodes
+                        that gained or lost links
+       - affected:      boolean mask of the nodes refined by
+                        incremental_layout(); None before
+       - num_removed_nodes, num_added_links, num_removed_links
+    '''
+
+    def __init__(self, snapshot, graph):
+        num_nodes = graph.num_nodes
+        new_id = graph.node_ids(snapshot.node_names, missing=-1).astype(np.int64)
+        survived = new_id >= 0
+        self.old_id = np.full(num_nodes, -1, dtype=np.int64)
+        self.old_id[new_id[survived]] = np.flatnonzero(survived)
+        self.new_nodes = self.old_id < 0
+        self.num_removed_nodes = int((~survived).sum())
+
+        # Links as src * num_nodes + dst in current ids:
+        current_keys = graph.src.astype(np.int64) * num_nodes + graph.dst
+        old_src = new_id[snapshot.src]
+        old_dst = new_id[snapshot.dst]
+        both_survived = (old_src >= 0) & (old_dst >= 0)
+        old_keys = old_src[both_survived] * num_nodes + old_dst[both_survived]
+
+        added = ~np.isin(current_keys, old_keys)
+        removed = ~np.isin(old_keys, current_keys)
+        self.num_added_links = int(added.sum())
+        self.num_removed_links = int(removed.sum() + (~both_survived).sum())
+
+        self.changed = self.new_nodes.copy()
+        self.changed[graph.src[added]] = True
+        self.changed[graph.dst[added]] = True
+        self.changed[old_keys[removed] // num_nodes] = True
+        self.changed[old_keys[removed] % num_nodes] = True
+        # Survivors that lost a link to a removed node:
+        lost_src = old_src[~both_survived]
+        lost_dst = old_dst[~both_survived]
+        self.changed[lost_src[lost_src >= 0]] = True
+        self.changed[lost_dst[lost_dst >= 0]] = True
+        self.affected = None
+
+#-----------------------------
+# expand_neighborhood
+#-----------------------
+
+def expand_neighborhood(src, dst, mask, hops):
+    '''
+    Grow a boolean node mask by the given number of
+    link hops, ignoring link direction.
+    '''
+    mask = mask.copy()
+    for _hop in range(hops):
+        reached = mask[src] | mask[dst]
+        grown = mask.copy()
+        grown[src[reached]] = True
+        grown[dst[reached]] = True
+        if np.array_equal(grown, mask):
+            break
+        mask = grown
+    return mask
+
+#-----------------------------
+# warm_start_positions
+#-----------------------
+
+def warm_start_positions(graph, snapshot, diff, seed=None):
+    '''
+    Starting positions for the current graph: old
+    positions for surviving nodes, positions next to
+    placed neighbors for new ones.
+
+    @return: num_nodes x 2 positions
+    @rtype: np.ndarray
+    '''
+    rng = np.random.default_rng(seed)
+    num_nodes = graph.num_nodes
+    pos = np.zeros((num_nodes, 2))
+    placed = ~diff.new_nodes
+    pos[placed] = snapshot.positions[diff.old_id[placed]]
+    if placed.any():
+        (low, high) = (pos[placed].min(axis=0), pos[placed].max(axis=0))
+    else:
+        (low, high) = (np.zeros(2), np.ones(2))
+    spread = max((high - low).max(), 1e-6)
+
+    # Links in both directions, so either end can pull the other:
+    link_from = np.concatenate([graph.src, graph.dst])
+    link_to   = np.concatenate([graph.dst, graph.src])
+    for _round in range(PLACEMENT_ROUNDS):
+        pulls = placed[link_from] & ~placed[link_to]
+        if not pulls.any():
+            break
+        (sources, targets) = (link_from[pulls], link_to[pulls])
+        counts = np.bincount(targets, minlength=num_nodes)
+        reached = counts > 0
+        for axis in (0, 1):
+            sums = np.bincount(targets, weights=pos[sources, axis], minlength=num_nodes)
+            pos[reached, axis] = sums[reached] / counts[reached]
+        # Keep newcomers next to, not on top of, their neighbors:
+        pos[reached] += (rng.random((reached.sum(), 2)) - 0.5) * 0.01 * spread
+        placed = placed | reached
+
+    unplaced = ~placed
+    pos[unplaced] = low + rng.random((unplaced.sum(), 2)) * (high - low + 1e-6)
+    return pos
+
+#-----------------------------
+# incremental_layout
+#-----------------------
+
+def incremental_layout(graph, snapshot,
+                       hops=1,
+                       pin=True,
+                       iterations=DEFAULT_UPDATE_ITERATIONS,
+                       seed=None,
+                       **layout_args):
+    '''
+    Update a previous layout for a changed graph.
+
+    @param graph: the current graph
+    @type graph: graph_store.GraphStore
+    @param snapshot: the previous run's graph and positions
+    @type snapshot: LayoutSnapshot
+    @param hops: how far around changed nodes to refine
+    @type hops: int
+    @param pin: keep nodes outside the affected
+        neighborhoods at their old positions
+    @type pin: bool
+    @param iterations: refinement iterations
+    @type iterations: int
+    @param seed: random seed for placing new nodes
+    @type seed: {int | None}
+    @param layout_args: further spring_layout() arguments,
+        such as repulsion
+    @return: positions in the snapshot's coordinate frame,
+        and the diff they were computed from
+    @rtype: (np.ndarray, GraphDiff)
+    '''
+    diff = GraphDiff(snapshot, graph)
+    pos = warm_start_positions(graph, snapshot, diff, seed=seed)
+    num_nodes = graph.num_nodes
+    if num_nodes < 2:
+        return (pos, diff)
+
+    affected = expand_neighborhood(graph.src, graph.dst, diff.changed, hops)
+    diff.affected = affected
+    extent = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1]), 1e-6)
+    # Ideal distance for this frame: sqrt(area per node)
+    k = extent / np.sqrt(num_nodes)
+    pos = spring_layout(graph.src, graph.dst, num_nodes,
+                        weight=graph.weight,
+                        pos=pos,
+                        fixed=~affected if pin else None,
+                        iterations=iterations,
+                        k=k,
+                        temperature=UPDATE_TEMPERATURE_FRACTION * extent,
+                        scale=None,
+                        **layout_args)
+    return (pos, diff)
@@ -0,0 +1,413 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Streaming ingest of the nodes and links files.
+
+Both files are read in bounded-size chunks of rows
+through a generator pipeline. Each chunk is interned
+and appended to compact columnar buffers right away,
+so no per-row Python dicts survive past the chunk.
+Memory is dominated by the node name table and by
+a few bytes per edge, not by the CSV text.
+'''
+import csv
+import itertools
+
+import numpy as np
+
+
+# Number of CSV rows handed down the pipeline at a time:
+DEFAULT_CHUNK_ROWS = 50000
+
+# Link column that is parsed as a float instead
+# of being dictionary encoded:
+WEIGHT_COLUMN = 'weight'
+
+#-----------------------------
+# read_header
+#-----------------------
+
+def read_header(path, delimiter=','):
+    '''
+    Return the list of column names on the first
+    line of the given CSV file.
+
+    @param path: file to read
+    @type path: str
+    @param delimiter: CSV column delimiter
+    @type delimiter: str
+    @return: column names
+    @rtype: [str]
+    '''
+    with open(path, 'r', newline='') as fd:
+        try:
+            return next(csv.reader(fd, delimiter=delimiter))
+        except StopIteration:
+            raise ValueError("File %s is empty; expected a header line." % path)
+
+#-----------------------------
+# iter_row_chunks
+#-----------------------
+
+def iter_row_chunks(path, delimiter=',', chunk_rows=DEFAULT_CHUNK_ROWS, skip_header=True):
+    '''
+    Generator over lists of at most chunk_rows
+    parsed CSV rows. Blank lines are dropped.
+
+    @param path: file to read
+    @type path: str
+    @param delimiter: CSV column delimiter
+    @type delimiter: str
+    @param chunk_rows: maximum number of rows per chunk
+    @type chunk_rows: int
+    @param skip_header: whether to discard the first line
+    @type skip_header: bool
+    '''
+    if chunk_rows < 1:
+        raise ValueError("Chunk size must be at least one row; got %s" % chunk_rows)
+    with open(path, 'r', newline='') as fd:
+        reader = csv.reader(fd, delimiter=delimiter)
+        if skip_header:
+            next(reader, None)
+        chunk = []
+        for row in reader:
+            if not row:
+                continue
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+#-----------------------------
+# iter_column_chunks
+#-----------------------
+
+def iter_column_chunks(row_chunks, width):
+    '''
+    Transpose each chunk of rows into a list of width
+    column tuples. Short rows are padded with empty
+    strings; columns beyond width are dropped.
+
+    @param row_chunks: iterable of lists of rows
+    @type row_chunks: iterable
+    @param width: number of columns to produce
+    @type width: int
+    '''
+    for chunk in row_chunks:
+        columns = list(itertools.zip_longest(*chunk, fillvalue=''))[:width]
+        while len(columns) < width:
+            columns.append(('',) * len(chunk))
+        yield columns
+
+#-----------------------------
+# parse_floats
+#-----------------------
+
+def parse_floats(values):
+    '''
+    Convert a sequence of strings to a float64 array.
+    Values that do not parse become NaN.
+
+    @param values: strings to convert
+    @type values: sequence
+    @rtype: np.ndarray
+    '''
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        result = np.empty(len(values), dtype=np.float64)
+        for (i, value) in enumerate(values):
+            try:
+                result[i] = float(value)
+            except ValueError:
+                result[i] = np.nan
+        return result
+
+# ---------------------------- GrowableArray -----------
+
+class GrowableArray(object):
+    '''
+    Append-only NumPy buffer with amortized O(1)
+    appends. Capacity doubles whenever it runs out.
+    '''
+
+    def __init__(self, dtype, capacity=1024):
+        self._data = np.empty(max(int(capacity), 1), dtype=dtype)
+        self._size = 0
+
+    def append(self, value):
+        if self._size == len(self._data):
+            self._reserve(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        new_size = self._size + len(values)
+        if new_size > len(self._data):
+            self._reserve(new_size)
+        self._data[self._size:new_size] = values
+        self._size = new_size
+
+    def view(self):
+        '''
+        Return the filled part of the buffer without
+        copying. Invalidated by the next append.
+        '''
+        return self._data[:self._size]
+
+    def trim(self):
+        '''
+        Return a right-sized copy of the contents.
+        '''
+        return self._data[:self._size].copy()
+
+    def _reserve(self, min_capacity):
+        capacity = len(self._data)
+        while capacity < min_capacity:
+            capacity *= 2
+        data = np.empty(capacity, dtype=self._data.dtype)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def __len__(self):
+        return self._size
+
+# ---------------------------- NodeInterner -----------
+
+class NodeInterner(object):
+    '''
+    Maps node names to dense integers 0..n-1 in
+    order of first appearance.
+    '''
+
+    def __init__(self):
+        self.index = {}
+
+    def intern(self, name):
+        return self.index.setdefault(name, len(self.index))
+
+    def intern_many(self, names):
+        '''
+        Intern a sequence of names, returning
+        their ids as an int32 array.
+        '''
+        index = self.index
+        return np.fromiter((index.setdefault(name, len(index)) for name in names),
+                           dtype=np.int32,
+                           count=len(names))
+
+    def names(self):
+        '''
+        Node names as an array indexed by node id.
+        '''
+        names = np.empty(len(self.index), dtype=object)
+        names[:] = list(self.index)
+        return names
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+# ---------------------------- CategoricalBuffer -----------
+
+class CategoricalBuffer(object):
+    '''
+    Dictionary-encoded string column: each distinct
+    string is stored once, and rows hold int32 codes.
+    '''
+
+    def __init__(self):
+        self.codes = GrowableArray(np.int32)
+        self.lookup = {}
+
+    def append(self, value):
+        self.codes.append(self.lookup.setdefault(value, len(self.lookup)))
+
+    def extend(self, values):
+        lookup = self.lookup
+        self.codes.extend(np.fromiter((lookup.setdefault(value, len(lookup)) for value in values),
+                                      dtype=np.int32,
+                                      count=len(values)))
+
+    def extend_encoded(self, codes, categories):
+        '''
+        Append rows that are already dictionary encoded
+        against another table of categories, such as
+        one built in a worker process.
+        '''
+        lookup = self.lookup
+        recode = np.fromiter((lookup.setdefault(value, len(lookup)) for value in categories),
+                             dtype=np.int32,
+                             count=len(categories))
+        self.codes.extend(recode[codes])
+
+    def categories(self):
+        categories = np.empty(len(self.lookup), dtype=object)
+        categories[:] = list(self.lookup)
+        return categories
+
+    def __len__(self):
+        return len(self.codes)
+
+# ---------------------------- EdgeListBuilder -----------
+
+class EdgeListBuilder(object):
+    '''
+    Collects links one at a time, or a chunk at a time,
+    with amortized O(1) cost per link. Every link is
+    kept, including parallel links between the same
+    pair of nodes; merging them, if wanted, happens
+    when the graph store is built.
+
+       - interner:       node name to node id
+       - src, dst:       node ids of each link's end points
+       - link_columns:   {property : GrowableArray or CategoricalBuffer}
+
+    The 'weight' property goes into a float64 buffer,
+    all others are dictionary encoded.
+    '''
+
+    def __init__(self, link_property_names=(), interner=None):
+        self.interner = interner if interner is not None else NodeInterner()
+        self.src = GrowableArray(np.int32)
+        self.dst = GrowableArray(np.int32)
+        self.link_columns = {}
+        for name in link_property_names:
+            self._add_column(name)
+
+    def add_edge(self, src_name, dst_name, properties=None):
+        '''
+        Append a single link.
+
+        @param src_name: name of source node
+        @type src_name: str
+        @param dst_name: name of destination node
+        @type dst_name: str
+        @param properties: {property : value}; properties
+            not given for this link are recorded as missing.
+        @type properties: {dict | None}
+        '''
+        properties = properties or {}
+        for name in properties:
+            if name not in self.link_columns:
+                self._add_column(name)
+        self.src.append(self.interner.intern(src_name))
+        self.dst.append(self.interner.intern(dst_name))
+        for (name, column) in self.link_columns.items():
+            value = properties.get(name)
+            if name == WEIGHT_COLUMN:
+                column.append(np.nan if value is None else parse_floats([value])[0])
+            else:
+                column.append(value)
+
+    def add_edges(self, src_names, dst_names, columns=None):
+        '''
+        Append a chunk of links given as columns.
+
+        @param src_names: source node names
+        @type src_names: sequence
+        @param dst_names: destination node names
+        @type dst_names: sequence
+        @param columns: {property : sequence of values}; must
+            cover every property column of this builder.
+        @type columns: {dict | None}
+        '''
+        self.src.extend(self.interner.intern_many(src_names))
+        self.dst.extend(self.interner.intern_many(dst_names))
+        columns = columns or {}
+        for (name, column) in self.link_columns.items():
+            values = columns[name]
+            if name == WEIGHT_COLUMN:
+                column.extend(parse_floats(values))
+            else:
+                column.extend(values)
+
+    def _add_column(self, name):
+        # Rows added before this column existed get missing values:
+        if name == WEIGHT_COLUMN:
+            column = GrowableArray(np.float64)
+            column.extend(np.full(len(self.src), np.nan))
+        else:
+            column = CategoricalBuffer()
+            column.extend([None] * len(self.src))
+        self.link_columns[name] = column
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+# ---------------------------- IngestBuffers -----------
+
+class IngestBuffers(EdgeListBuilder):
+    '''
+    Columnar result of a streaming ingest. In addition
+    to the EdgeListBuilder attributes:
+
+       - node_rows:      node id of each row in the nodes file
+       - node_columns:   {property : CategoricalBuffer} for nodes file rows
+
+    Property columns named in skip get no buffer.
+    '''
+
+    def __init__(self, node_property_names, link_property_names, skip=()):
+        super(IngestBuffers, self).__init__([name for name in link_property_names[2:] if name not in skip])
+        self.node_property_names = node_property_names
+        self.link_property_names = link_property_names
+
+        self.node_rows    = GrowableArray(np.int32)
+        self.node_columns = {name : CategoricalBuffer() for name in node_property_names[1:] if name not in skip}
+
+#-----------------------------
+# stream_inputs
+#-----------------------
+
+def stream_inputs(nodes_file, links_file, delimiter=',', chunk_rows=DEFAULT_CHUNK_ROWS, skip=()):
+    '''
+    Read the nodes file, then the links file, chunk
+    by chunk into an IngestBuffers instance. Nodes
+    listed in the nodes file receive the lowest ids,
+    in file order; link end points that are not in
+    the nodes file are interned as they are seen.
+
+    @param nodes_file: CSV with node name in first column
+    @type nodes_file: str
+    @param links_file: CSV with source and destination
+        node names in the first two columns
+    @type links_file: str
+    @param delimiter: CSV column delimiter
+    @type delimiter: str
+    @param chunk_rows: number of rows parsed per chunk
+    @type chunk_rows: int
+    @param skip: names of property columns to leave out
+    @type skip: {set | frozenset | tuple}
+    @rtype: IngestBuffers
+    '''
+    node_property_names = read_header(nodes_file, delimiter)
+    link_property_names = read_header(links_file, delimiter)
+    if len(link_property_names) < 2:
+        raise ValueError("Links file %s needs at least source and destination columns." % links_file)
+    buffers = IngestBuffers(node_property_names, link_property_names, skip)
+    interner = buffers.interner
+
+    node_chunks = iter_column_chunks(iter_row_chunks(nodes_file, delimiter, chunk_rows),
+                                     len(node_property_names))
+    for columns in node_chunks:
+        buffers.node_rows.extend(interner.intern_many(columns[0]))
+        for (name, values) in zip(node_property_names[1:], columns[1:]):
+            if name in buffers.node_columns:
+                buffers.node_columns[name].extend(values)
+
+    link_chunks = iter_column_chunks(iter_row_chunks(links_file, delimiter, chunk_rows),
+                                     len(link_property_names))
+    for columns in link_chunks:
+        buffers.add_edges(columns[0],
+                          columns[1],
+                          dict(zip(link_property_names[2:], columns[2:])))
+    return buffers
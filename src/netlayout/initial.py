@@ -0,0 +1,218 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Starting positions for the force-directed layouts,
+computed from the link arrays in O(links) memory, so
+that iterations are spent refining rather than
+untangling a random start. INITIAL_METHODS:
+
+    random:     uniform in the unit square, as spring_layout()
+                does on its own
+    pivot_mds:  pivot MDS (Brandes and Pich, 2006): hop distances
+                from a few pivots, chosen farthest-first by BFS,
+                are double centered, and nodes are projected onto
+                the two main axes of the n x pivots matrix. Costs
+                one BFS per pivot.
+    spectral:   degree-normalized eigenvectors (Koren, 2003): the
+                second and third eigenvectors of the random-walk
+                matrix D^-1 A, whose eigenvectors are those of the
+                generalized Laplacian problem L x = mu D x. Found
+                by orthogonal power iteration with sparse products
+                over the link arrays, started from the pivot MDS
+                positions, which it usually needs few rounds to
+                sharpen.
+
+There is no sparse eigensolver among the dependencies,
+so both methods use NumPy only. Results are scaled into
+the unit square, like random starting positions, and
+jittered slightly, so that nodes at the same point,
+such as unlinked ones, can push each other apart.
+'''
+import numpy as np
+
+from netlayout.metrics import bfs_distances, undirected_csr
+
+
+INITIAL_METHODS = ('random', 'pivot_mds', 'spectral')
+
+DEFAULT_PIVOTS = 50
+DEFAULT_POWER_ITERATIONS = 200
+DEFAULT_POWER_TOLERANCE = 1e-7
+
+# Jitter added to computed positions, as a fraction
+# of the unit square:
+JITTER = 1e-3
+
+#-----------------------------
+# maxmin_pivots
+#-----------------------
+
+def maxmin_pivots(src, dst, num_nodes, num_pivots=DEFAULT_PIVOTS, seed=None):
+    '''
+    Pick pivots farthest-first: a random first one, then
+    repeatedly the node farthest in hops from all pivots
+    so far. Nodes unreachable from a pivot count as one
+    hop farther than its farthest reachable node, so that
+    every component gets pivots.
+
+    @return: pivot node ids, and the num_nodes x num_pivots
+        matrix of hop distances from them
+    @rtype: (np.ndarray, np.ndarray)
+    '''
+    rng = np.random.default_rng(seed)
+    (indptr, indices) = undirected_csr(np.asarray(src), np.asarray(dst), num_nodes)
+    num_pivots = min(num_pivots, num_nodes)
+    pivots = np.empty(num_pivots, dtype=np.int64)
+    distances = np.empty((num_nodes, num_pivots))
+    nearest = np.full(num_nodes, np.inf)
+    pivot = rng.integers(num_nodes)
+    for i in range(num_pivots):
+        pivots[i] = pivot
+        hops = bfs_distances(indptr, indices, pivot).astype(np.float64)
+        hops[hops < 0] = hops.max() + 1
+        distances[:, i] = hops
+        np.minimum(nearest, hops, out=nearest)
+        pivot = np.argmax(nearest)
+    return (pivots, distances)
+
+#-----------------------------
+# pivot_mds_layout
+#-----------------------
+
+def pivot_mds_layout(src, dst, num_nodes, num_pivots=DEFAULT_PIVOTS, seed=None):
+    '''
+    Pivot MDS positions; see the module docstring.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param num_pivots: number of BFS pivots
+    @type num_pivots: int
+    @param seed: random seed for the first pivot and the jitter
+    @type seed: {int | None}
+    @return: num_nodes x 2 positions in the unit square
+    @rtype: np.ndarray
+    '''
+    if num_nodes < 3:
+        return np.random.default_rng(seed).random((num_nodes, 2))
+    (_pivots, distances) = maxmin_pivots(src, dst, num_nodes, num_pivots, seed)
+    squared = distances ** 2
+    centered = -0.5 * (squared
+                       - squared.mean(axis=0)[None, :]
+                       - squared.mean(axis=1)[:, None]
+                       + squared.mean())
+    # Main axes of the small pivots x pivots matrix:
+    (_values, vectors) = np.linalg.eigh(centered.T @ centered)
+    pos = centered @ vectors[:, [-1, -2]]
+    return _to_unit_square(pos, seed)
+
+#-----------------------------
+# spectral_layout
+#-----------------------
+
+def spectral_layout(src, dst, num_nodes,
+                    weight=None,
+                    pos=None,
+                    iterations=DEFAULT_POWER_ITERATIONS,
+                    tolerance=DEFAULT_POWER_TOLERANCE,
+                    seed=None):
+    '''
+    Degree-normalized spectral positions; see the module
+    docstring.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param weight: link weights; None for all 1.0
+    @type weight: {np.ndarray | None}
+    @param pos: num_nodes x 2 starting vectors; default:
+        pivot_mds_layout()
+    @type pos: {np.ndarray | None}
+    @param iterations: maximum number of power iterations
+    @type iterations: int
+    @param tolerance: stop once the vectors change by less
+        than this, in D-norm, in one iteration
+    @type tolerance: float
+    @param seed: random seed
+    @type seed: {int | None}
+    @return: num_nodes x 2 positions in the unit square
+    @rtype: np.ndarray
+    '''
+    if num_nodes < 3:
+        return np.random.default_rng(seed).random((num_nodes, 2))
+    src = np.asarray(src, dtype=np.intp)
+    dst = np.asarray(dst, dtype=np.intp)
+    weight = np.ones(len(src)) if weight is None else np.asarray(weight, dtype=np.float64)
+    keep = src != dst
+    (src, dst, weight) = (src[keep], dst[keep], weight[keep])
+    degree = (np.bincount(src, weight, minlength=num_nodes) +
+              np.bincount(dst, weight, minlength=num_nodes))
+    # Unlinked nodes are left where they start:
+    degree[degree == 0] = 1.0
+
+    if pos is None:
+        pos = pivot_mds_layout(src, dst, num_nodes, seed=seed)
+    vectors = _d_orthonormalize(np.array(pos, dtype=np.float64), degree)
+    for _iteration in range(iterations):
+        product = np.empty_like(vectors)
+        for column in range(2):
+            product[:, column] = (np.bincount(src, weight * vectors[dst, column], minlength=num_nodes) +
+                                  np.bincount(dst, weight * vectors[src, column], minlength=num_nodes))
+        # One step of x <- (I + D^-1 A) x / 2, which has the
+        # eigenvectors of D^-1 A, with eigenvalues in [0, 1]:
+        updated = _d_orthonormalize(0.5 * (vectors + product / degree[:, None]), degree)
+        change = np.sqrt((degree[:, None] * (updated - vectors) ** 2).sum(axis=0)).max()
+        vectors = updated
+        if change < tolerance:
+            break
+    return _to_unit_square(vectors, seed)
+
+#-----------------------------
+# initial_positions
+#-----------------------
+
+def initial_positions(method, src, dst, num_nodes, weight=None, seed=None):
+    '''
+    Starting positions by one of INITIAL_METHODS.
+
+    @rtype: np.ndarray
+    '''
+    if method not in INITIAL_METHODS:
+        raise ValueError("Initial placement must be one of %s; got '%s'" % (INITIAL_METHODS, method))
+    if method == 'pivot_mds':
+        return pivot_mds_layout(src, dst, num_nodes, seed=seed)
+    if method == 'spectral':
+        return spectral_layout(src, dst, num_nodes, weight=weight, seed=seed)
+    return np.random.default_rng(seed).random((num_nodes, 2))
+
+def _d_orthonormalize(vectors, degree):
+    '''
+    Make the columns D-orthogonal to the constant vector,
+    the trivial eigenvector, and to each other, with unit
+    D-norm, by Gram-Schmidt.
+    '''
+    basis = [np.ones(len(degree)) / np.sqrt(degree.sum())]
+    for column in range(vectors.shape[1]):
+        vector = vectors[:, column]
+        for other in basis:
+            vector = vector - np.dot(vector * degree, other) * other
+        norm = np.sqrt(np.dot(vector * degree, vector))
+        vector = vector / norm if norm > 0 else vector
+        vectors[:, column] = vector
+        basis.append(vector)
+    return vectors
+
+def _to_unit_square(pos, seed):
+    pos = pos - pos.min(axis=0)
+    extent = pos.max()
+    if extent > 0:
+        pos /= extent
+    return pos + JITTER * np.random.default_rng(seed).random(pos.shape)
@@ -0,0 +1,281 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Force-directed (Fruchterman-Reingold) layout that
+works directly on the integer link arrays of a
+GraphStore, without building a networkx graph or
+a dense adjacency matrix.
+
+Follows networkx's spring_layout():
+
+   - every pair of nodes repels with force k^2/d
+   - every link attracts its end points with force
+     weight * d^2/k
+   - each node moves along its net force by at most
+     the current temperature, which cools down from
+     10% of the layout's extent
+
+Attraction is computed per link in batched array
+operations. All-pairs repulsion is computed in tiles
+of rows, so that at most max_tile_pairs distances
+are in memory at any time. A different repulsion
+function, such as barnes_hut.barnes_hut_displacement(),
+may be passed in instead.
+
+Nodes may be pinned in place. Forces are then only
+computed for the free nodes, so refining a small part
+of a large layout costs in proportion to that part.
+'''
+import numpy as np
+
+
+# Layout methods offered by Networker.compute_layout():
+LAYOUT_METHODS = ('spring', 'barnes_hut', 'multilevel')
+
+# Ways of lowering the temperature between iterations:
+COOLING_SCHEDULES = ('linear', 'exponential')
+
+# Default number of node pairs per repulsion tile:
+DEFAULT_MAX_TILE_PAIRS = 2 ** 22
+
+# Distances are clipped from below to avoid
+# infinite forces between coinciding nodes:
+MIN_DISTANCE = 0.01
+
+#-----------------------------
+# spring_layout
+#-----------------------
+
+def spring_layout(src, dst, num_nodes,
+                  weight=None,
+                  pos=None,
+                  fixed=None,
+                  iterations=50,
+                  k=None,
+                  temperature=None,
+                  cooling='linear',
+                  cooling_factor=0.95,
+                  tolerance=1e-4,
+                  max_tile_pairs=DEFAULT_MAX_TILE_PAIRS,
+                  repulsion=None,
+                  scale=1.0,
+                  seed=None,
+                  callback=None,
+                  stop=None):
+    '''
+    Compute 2D positions for all nodes.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param num_nodes: number of nodes; ids are 0..num_nodes-1
+    @type num_nodes: int
+    @param weight: link weights; None for all 1.0
+    @type weight: {np.ndarray | None}
+    @param pos: num_nodes x 2 starting positions; None for random
+    @type pos: {np.ndarray | None}
+    @param fixed: boolean mask of nodes that keep their starting
+        position; None to move all nodes
+    @type fixed: {np.ndarray | None}
+    @param iterations: maximum number of iterations
+    @type iterations: int
+    @param k: optimal distance between nodes; default 1/sqrt(num_nodes)
+    @type k: {float | None}
+    @param temperature: largest step a node may take in the first
+        iteration; default: 10% of the starting layout's extent
+    @type temperature: {float | None}
+    @param cooling: one of COOLING_SCHEDULES. 'linear' lowers the
+        temperature by a fixed step so it reaches zero after the
+        last iteration; 'exponential' multiplies it by cooling_factor.
+    @type cooling: str
+    @param cooling_factor: temperature multiplier for 'exponential'
+    @type cooling_factor: float
+    @param tolerance: stop once the mean node movement in an
+        iteration drops below this value
+    @type tolerance: float
+    @param max_tile_pairs: bound on node pairs whose repulsion is
+        computed at once
+    @type max_tile_pairs: int
+    @param repulsion: function(pos, k, nodes=None) returning the
+        repulsive displacement of the given nodes (default: all);
+        default: exact, tiled repulsive_displacement()
+    @type repulsion: {callable | None}
+    @param scale: positions are rescaled to [-scale, scale];
+        None leaves them unscaled
+    @type scale: {float | None}
+    @param seed: random seed for the starting positions
+    @type seed: {int | None}
+    @param callback: function(iteration, energy) called after
+        every iteration, with energy the sum of squared net
+        forces on the moving nodes; None to skip computing it
+    @type callback: {callable | None}
+    @param stop: function(iteration, pos) called after every
+        iteration, returning True once the layout is good
+        enough, such as a metrics.EarlyStopping instance
+    @type stop: {callable | None}
+    @return: num_nodes x 2 array of positions
+    @rtype: np.ndarray
+    '''
+    if cooling not in COOLING_SCHEDULES:
+        raise ValueError("Cooling schedule must be one of %s; got '%s'" % (COOLING_SCHEDULES, cooling))
+    if num_nodes == 0:
+        return np.zeros((0, 2))
+    if num_nodes == 1:
+        return np.zeros((1, 2))
+
+    src = np.asarray(src, dtype=np.intp)
+    dst = np.asarray(dst, dtype=np.intp)
+    weight = np.ones(len(src)) if weight is None else np.asarray(weight, dtype=np.float64)
+    if pos is None:
+        pos = np.random.default_rng(seed).random((num_nodes, 2))
+    else:
+        pos = np.array(pos, dtype=np.float64)
+    if k is None:
+        k = np.sqrt(1.0 / num_nodes)
+
+    if temperature is None:
+        temperature = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1])) * 0.1
+        if temperature == 0:
+            temperature = 0.1
+    step = temperature / (iterations + 1)
+
+    if fixed is None:
+        free = None
+        num_free = num_nodes
+    else:
+        fixed = np.asarray(fixed, dtype=bool)
+        free = np.flatnonzero(~fixed)
+        num_free = len(free)
+        if num_free == 0:
+            iterations = 0
+        # Only links that touch a free node pull on anything that moves:
+        touches_free = ~fixed[src] | ~fixed[dst]
+        (src, dst, weight) = (src[touches_free], dst[touches_free], weight[touches_free])
+
+    for iteration in range(iterations):
+        if repulsion is None:
+            displacement = repulsive_displacement(pos, k, max_tile_pairs, nodes=free)
+        else:
+            displacement = repulsion(pos, k, nodes=free)
+        attraction = attractive_displacement(pos, src, dst, weight, k)
+        displacement += attraction if free is None else attraction[free]
+
+        length = np.sqrt((displacement ** 2).sum(axis=1))
+        if callback is not None:
+            callback(iteration, float(np.dot(length, length)))
+        np.maximum(length, MIN_DISTANCE, out=length)
+        delta_pos = displacement * (temperature / length)[:, None]
+        if free is None:
+            pos += delta_pos
+        else:
+            pos[free] += delta_pos
+
+        if cooling == 'linear':
+            temperature -= step
+        else:
+            temperature *= cooling_factor
+        if np.linalg.norm(delta_pos) / num_free < tolerance:
+            break
+        if stop is not None and stop(iteration, pos):
+            break
+
+    if scale is not None:
+        pos = rescale_layout(pos, scale)
+    return pos
+
+#-----------------------------
+# repulsive_displacement
+#-----------------------
+
+def repulsive_displacement(pos, k, max_tile_pairs=DEFAULT_MAX_TILE_PAIRS, nodes=None):
+    '''
+    Net all-pairs repulsion on every node, or on the
+    given nodes, computed a tile of rows at a time.
+
+    @param pos: n x 2 positions
+    @type pos: np.ndarray
+    @param k: optimal distance between nodes
+    @type k: float
+    @param max_tile_pairs: bound on pairs held in memory at once
+    @type max_tile_pairs: int
+    @param nodes: ids of the nodes to compute; None for all
+    @type nodes: {np.ndarray | None}
+    @return: len(nodes) x 2 displacement
+    @rtype: np.ndarray
+    '''
+    num_nodes = len(pos)
+    x = pos[:, 0]
+    y = pos[:, 1]
+    targets = pos if nodes is None else pos[nodes]
+    k_squared = k * k
+    displacement = np.empty_like(targets)
+    tile_rows = max(1, max_tile_pairs // max(num_nodes, 1))
+    for start in range(0, len(targets), tile_rows):
+        end = min(start + tile_rows, len(targets))
+        dx = targets[start:end, 0, None] - x[None, :]
+        dy = targets[start:end, 1, None] - y[None, :]
+        factor = dx * dx
+        factor += dy * dy
+        np.maximum(factor, MIN_DISTANCE * MIN_DISTANCE, out=factor)
+        # k^2/d in direction (dx, dy)/d:
+        np.divide(k_squared, factor, out=factor)
+        displacement[start:end, 0] = (dx * factor).sum(axis=1)
+        displacement[start:end, 1] = (dy * factor).sum(axis=1)
+    return displacement
+
+#-----------------------------
+# attractive_displacement
+#-----------------------
+
+def attractive_displacement(pos, src, dst, weight, k):
+    '''
+    Net pull of all links on their end points,
+    accumulated per node with bincount.
+
+    @param pos: n x 2 positions
+    @type pos: np.ndarray
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param weight: weight of each link
+    @type weight: np.ndarray
+    @param k: optimal distance between nodes
+    @type k: float
+    @return: n x 2 displacement
+    @rtype: np.ndarray
+    '''
+    num_nodes = len(pos)
+    delta = pos[src] - pos[dst]
+    distance = np.sqrt((delta ** 2).sum(axis=1))
+    # weight * d^2/k in direction delta/d:
+    pull = delta * (weight * distance / k)[:, None]
+    displacement = np.empty_like(pos)
+    for axis in (0, 1):
+        displacement[:, axis] = (np.bincount(dst, weights=pull[:, axis], minlength=num_nodes) -
+                                 np.bincount(src, weights=pull[:, axis], minlength=num_nodes))
+    return displacement
+
+#-----------------------------
+# rescale_layout
+#-----------------------
+
+def rescale_layout(pos, scale=1.0):
+    '''
+    Center positions at the origin, and scale them so
+    that the largest coordinate magnitude is scale.
+
+    @param pos: n x 2 positions
+    @type pos: np.ndarray
+    @param scale: target extent
+    @type scale: float
+    @rtype: np.ndarray
+    '''
+    pos = pos - pos.mean(axis=0)
+    extent = np.abs(pos).max() if len(pos) else 0
+    if extent > 0:
+        pos *= scale / extent
+    return pos
@@ -0,0 +1,470 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Layout quality metrics on the interned link arrays,
+at a cost that stays near linear in the graph size:
+
+    stress:        normalized stress between layout distances
+                   and hop distances, over the pairs of a
+                   few BFS source nodes and a sample of
+                   target nodes. Lower is better.
+    edge_length:   variance of link lengths over their squared
+                   mean. Lower is better.
+    crossings:     number of link crossings, counted by testing
+                   only links whose bounding boxes share a grid
+                   cell. Too many candidate pairs are thinned
+                   out by sampling links, and the count is
+                   scaled back up. Lower is better.
+    neighborhood:  for a sample of nodes with k graph neighbors,
+                   the fraction of those among their k nearest
+                   nodes in the layout. Higher is better.
+
+All metrics are invariant to scaling the layout, so
+unscaled positions from within a layout run can be
+measured. Samples are drawn once per StressSample or
+NeighborhoodSample, so that repeated measurements of
+one layout run are comparable.
+
+EarlyStopping turns one metric into a stop test for
+layout.spring_layout(): the layout ends once the metric
+stops improving by a minimum fraction between checks.
+'''
+import numpy as np
+
+from netlayout.layout import DEFAULT_MAX_TILE_PAIRS
+
+
+METRICS = ('stress', 'edge_length', 'crossings', 'neighborhood')
+
+# Metrics for which larger values are better:
+HIGHER_IS_BETTER = frozenset(['neighborhood'])
+
+DEFAULT_STRESS_SOURCES = 32
+DEFAULT_STRESS_TARGETS = 2000
+DEFAULT_NEIGHBORHOOD_SAMPLES = 200
+
+# Bounds on the work of counting crossings: grid
+# cell entries, and link pairs tested:
+DEFAULT_MAX_CELL_ENTRIES = 1 << 22
+DEFAULT_MAX_CROSSING_PAIRS = 1 << 22
+
+DEFAULT_CHECK_EVERY = 10
+DEFAULT_MIN_IMPROVEMENT = 0.01
+
+#-----------------------------
+# undirected_csr
+#-----------------------
+
+def undirected_csr(src, dst, num_nodes):
+    '''
+    Adjacency of the graph with link directions dropped,
+    as CSR arrays. Self loops are left out; parallel
+    links give repeated neighbors.
+
+    @return: indptr of length num_nodes + 1, and the
+        neighbors of node i in indices[indptr[i]:indptr[i+1]]
+    @rtype: (np.ndarray, np.ndarray)
+    '''
+    keep = src != dst
+    ends = np.concatenate([src[keep], dst[keep]])
+    peers = np.concatenate([dst[keep], src[keep]])
+    order = np.argsort(ends, kind='stable')
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=num_nodes), out=indptr[1:])
+    return (indptr, peers[order].astype(np.int64))
+
+#-----------------------------
+# gather_neighbors
+#-----------------------
+
+def gather_neighbors(indptr, indices, nodes):
+    '''
+    Neighbors of all the given nodes, concatenated.
+    '''
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = counts.sum()
+    if total == 0:
+        return np.zeros(0, dtype=indices.dtype)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    return indices[offsets + np.arange(total)]
+
+#-----------------------------
+# bfs_distances
+#-----------------------
+
+def bfs_distances(indptr, indices, source):
+    '''
+    Hop distance of every node from source, level by
+    level; -1 for unreachable nodes.
+
+    @rtype: np.ndarray
+    '''
+    dist = np.full(len(indptr) - 1, -1, dtype=np.int32)
+    dist[source] = 0
+    frontier = np.array([source])
+    level = 0
+    while len(frontier):
+        level += 1
+        reached = gather_neighbors(indptr, indices, frontier)
+        reached = np.unique(reached[dist[reached] < 0])
+        dist[reached] = level
+        frontier = reached
+    return dist
+
+# ---------------------------- StressSample -----------
+
+class StressSample(object):
+    '''
+    Hop distances between num_sources BFS source nodes
+    and num_targets target nodes, drawn at random, for
+    estimating the stress of layouts of one graph. Costs
+    num_sources breadth-first searches, once.
+    '''
+
+    def __init__(self, src, dst, num_nodes,
+                 num_sources=DEFAULT_STRESS_SOURCES,
+                 num_targets=DEFAULT_STRESS_TARGETS,
+                 seed=None):
+        rng = np.random.default_rng(seed)
+        (indptr, indices) = undirected_csr(np.asarray(src), np.asarray(dst), num_nodes)
+        self.sources = rng.choice(num_nodes, min(num_sources, num_nodes), replace=False)
+        self.targets = rng.choice(num_nodes, min(num_targets, num_nodes), replace=False)
+        self.hops = np.stack([bfs_distances(indptr, indices, source)[self.targets]
+                              for source in self.sources]) if num_nodes else np.zeros((0, 0))
+
+    def stress(self, pos):
+        '''
+        Normalized stress of the given positions: the mean of
+        ((s * |p_i - p_j| - d_ij) / d_ij)^2 over sampled pairs
+        i, j that are connected and distinct, with s the scale
+        that minimizes it. 0.0 if there are no such pairs.
+
+        @param pos: num_nodes x 2 positions
+        @type pos: np.ndarray
+        @rtype: float
+        '''
+        hops = self.hops.astype(np.float64)
+        valid = hops > 0
+        if not valid.any():
+            return 0.0
+        delta = pos[self.sources][:, None, :] - pos[self.targets][None, :, :]
+        apart = np.sqrt((delta ** 2).sum(axis=2))[valid]
+        hops = hops[valid]
+        # Minimize sum(((s*x - d)/d)^2) over s:
+        ratio = apart / hops
+        scale = ratio.sum() / max((ratio ** 2).sum(), 1e-300)
+        return float(((scale * ratio - 1.0) ** 2).mean())
+
+#-----------------------------
+# sampled_stress
+#-----------------------
+
+def sampled_stress(src, dst, num_nodes, pos,
+                   num_sources=DEFAULT_STRESS_SOURCES,
+                   num_targets=DEFAULT_STRESS_TARGETS,
+                   seed=None):
+    '''
+    Stress estimate of one layout; see StressSample.
+    '''
+    return StressSample(src, dst, num_nodes, num_sources, num_targets, seed).stress(pos)
+
+#-----------------------------
+# edge_length_variance
+#-----------------------
+
+def edge_length_variance(src, dst, pos):
+    '''
+    Variance of the link lengths divided by their squared
+    mean, so that uniform scaling does not change it. Self
+    loops are left out. 0.0 without links.
+
+    @rtype: float
+    '''
+    keep = src != dst
+    lengths = np.sqrt(((pos[src[keep]] - pos[dst[keep]]) ** 2).sum(axis=1))
+    if len(lengths) == 0 or lengths.mean() == 0:
+        return 0.0
+    return float(lengths.var() / lengths.mean() ** 2)
+
+#-----------------------------
+# count_crossings
+#-----------------------
+
+def count_crossings(src, dst, pos,
+                    max_cell_entries=DEFAULT_MAX_CELL_ENTRIES,
+                    max_pairs=DEFAULT_MAX_CROSSING_PAIRS,
+                    seed=None):
+    '''
+    Number of pairs of links that cross. Links are entered
+    into every cell of a grid that their bounding box
+    touches, and only links sharing a cell are tested.
+    Links that share an end point do not cross. If the
+    grid would take more than max_cell_entries entries, or
+    more than max_pairs pairs were to be tested, a random
+    fraction p of the links is used instead, and the count
+    is divided by p^2.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param pos: num_nodes x 2 positions
+    @type pos: np.ndarray
+    @param max_cell_entries: bound on link-cell entries
+    @type max_cell_entries: int
+    @param max_pairs: bound on candidate pairs
+    @type max_pairs: int
+    @param seed: random seed for sampling links
+    @type seed: {int | None}
+    @return: number of crossings; an estimate if links were sampled
+    @rtype: float
+    '''
+    keep = src != dst
+    (src, dst) = (np.asarray(src)[keep], np.asarray(dst)[keep])
+    if len(src) < 2:
+        return 0.0
+    rng = np.random.default_rng(seed)
+    lows = np.minimum(pos[src], pos[dst])
+    highs = np.maximum(pos[src], pos[dst])
+    origin = lows.min(axis=0)
+    extent = max((highs.max(axis=0) - origin).max(), 1e-300)
+
+    # About one link per cell, if the links were short:
+    grid = max(int(np.sqrt(len(src))), 1)
+    cell_size = extent / grid
+    low_cells = np.minimum(((lows - origin) / cell_size).astype(np.int64), grid - 1)
+    high_cells = np.minimum(((highs - origin) / cell_size).astype(np.int64), grid - 1)
+
+    # Links per cell, from a 2D difference array over the
+    # bounding boxes, without listing the entries; the
+    # sampling fraction follows from the totals, so it
+    # does not depend on the sample it is applied to:
+    counts = np.zeros((grid + 1, grid + 1), dtype=np.int64)
+    np.add.at(counts, (low_cells[:, 1], low_cells[:, 0]), 1)
+    np.add.at(counts, (low_cells[:, 1], high_cells[:, 0] + 1), -1)
+    np.add.at(counts, (high_cells[:, 1] + 1, low_cells[:, 0]), -1)
+    np.add.at(counts, (high_cells[:, 1] + 1, high_cells[:, 0] + 1), 1)
+    counts = counts.cumsum(axis=0).cumsum(axis=1)[:grid, :grid]
+    num_entries = counts.sum()
+    num_pairs = (counts * (counts - 1) // 2).sum()
+    fraction = min(1.0,
+                   max_cell_entries / max(num_entries, 1),
+                   np.sqrt(max_pairs / max(num_pairs, 1)))
+    links = np.arange(len(src))
+    if fraction < 1.0:
+        links = np.flatnonzero(rng.random(len(src)) < fraction)
+        if len(links) < 2:
+            return 0.0
+
+    spans = high_cells[links] - low_cells[links] + 1
+    (cells, entry_links) = _grid_entries(low_cells[links], spans, spans[:, 0] * spans[:, 1], grid)
+    order = np.argsort(cells, kind='stable')
+    cell_sizes = np.bincount(cells, minlength=grid * grid)
+
+    (first, second) = _cell_pairs(links[entry_links[order]], cell_sizes)
+    # Links sharing an end point meet, but do not cross:
+    disjoint = ((src[first] != src[second]) & (src[first] != dst[second]) &
+                (dst[first] != src[second]) & (dst[first] != dst[second]))
+    (first, second) = (first[disjoint], second[disjoint])
+    # Pairs that share more than one cell count once:
+    keys = np.unique(np.minimum(first, second) * len(src) + np.maximum(first, second))
+    (first, second) = (keys // len(src), keys % len(src))
+    crossing = _segments_cross(pos[src[first]], pos[dst[first]], pos[src[second]], pos[dst[second]])
+    return float(crossing.sum() / fraction ** 2)
+
+def _grid_entries(low_cells, spans, cells_per_link, grid):
+    '''
+    Cell number and link index of every cell of every
+    link's bounding box.
+    '''
+    entry_links = np.repeat(np.arange(len(spans)), cells_per_link)
+    first_entry = np.concatenate([[0], np.cumsum(cells_per_link)[:-1]])
+    within = np.arange(len(entry_links)) - first_entry[entry_links]
+    cell_x = low_cells[entry_links, 0] + within % spans[entry_links, 0]
+    cell_y = low_cells[entry_links, 1] + within // spans[entry_links, 0]
+    return (cell_y * grid + cell_x, entry_links)
+
+def _cell_pairs(grouped, cell_sizes):
+    '''
+    Every pair of entries that share a cell, given the
+    entries grouped by cell, and the size of each cell.
+    '''
+    sizes = cell_sizes[cell_sizes > 0]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    positions = np.arange(len(grouped))
+    # Each entry pairs with the later entries of its cell:
+    partners = np.repeat(starts + sizes - 1, sizes) - positions
+    first_pair = np.concatenate([[0], np.cumsum(partners)[:-1]])
+    left = np.repeat(positions, partners)
+    right = left + 1 + (np.arange(len(left)) - np.repeat(first_pair, partners))
+    return (grouped[left], grouped[right])
+
+def _segments_cross(a0, a1, b0, b1):
+    '''
+    Whether segment a0-a1 properly crosses segment b0-b1,
+    row by row. Touching and collinear segments do not.
+    '''
+    def orientation(p, q, r):
+        return np.sign((q[:, 0] - p[:, 0]) * (r[:, 1] - p[:, 1]) -
+                       (q[:, 1] - p[:, 1]) * (r[:, 0] - p[:, 0]))
+    return ((orientation(a0, a1, b0) * orientation(a0, a1, b1) < 0) &
+            (orientation(b0, b1, a0) * orientation(b0, b1, a1) < 0))
+
+# ---------------------------- NeighborhoodSample -----------
+
+class NeighborhoodSample(object):
+    '''
+    Graph neighbors of num_samples random nodes that have
+    any, for measuring how well layouts of one graph keep
+    neighbors near each other.
+    '''
+
+    def __init__(self, src, dst, num_nodes,
+                 num_samples=DEFAULT_NEIGHBORHOOD_SAMPLES,
+                 max_tile_pairs=DEFAULT_MAX_TILE_PAIRS,
+                 seed=None):
+        rng = np.random.default_rng(seed)
+        (indptr, indices) = undirected_csr(np.asarray(src), np.asarray(dst), num_nodes)
+        candidates = np.flatnonzero(np.diff(indptr) > 0)
+        self.nodes = rng.choice(candidates, min(num_samples, len(candidates)), replace=False)
+        self.neighbors = [np.unique(indices[indptr[node]:indptr[node + 1]]) for node in self.nodes]
+        self.max_tile_pairs = max_tile_pairs
+
+    def preservation(self, pos):
+        '''
+        Mean over the sampled nodes of the fraction of their
+        k graph neighbors that are among their k nearest
+        other nodes in the layout. 1.0 without samples.
+
+        @param pos: num_nodes x 2 positions
+        @type pos: np.ndarray
+        @rtype: float
+        '''
+        if len(self.nodes) == 0:
+            return 1.0
+        tile_rows = max(self.max_tile_pairs // len(pos), 1)
+        fractions = []
+        for start in range(0, len(self.nodes), tile_rows):
+            nodes = self.nodes[start:start + tile_rows]
+            apart = ((pos[nodes][:, None, :] - pos[None, :, :]) ** 2).sum(axis=2)
+            apart[np.arange(len(nodes)), nodes] = np.inf
+            for (row, neighbors) in enumerate(self.neighbors[start:start + tile_rows]):
+                k = len(neighbors)
+                nearest = np.argpartition(apart[row], k - 1)[:k] if k < len(pos) - 1 else \
+                          np.flatnonzero(np.isfinite(apart[row]))
+                fractions.append(len(np.intersect1d(nearest, neighbors, assume_unique=True)) / k)
+        return float(np.mean(fractions))
+
+#-----------------------------
+# neighborhood_preservation
+#-----------------------
+
+def neighborhood_preservation(src, dst, num_nodes, pos,
+                              num_samples=DEFAULT_NEIGHBORHOOD_SAMPLES,
+                              seed=None):
+    '''
+    Neighborhood preservation of one layout; see NeighborhoodSample.
+    '''
+    return NeighborhoodSample(src, dst, num_nodes, num_samples, seed=seed).preservation(pos)
+
+#-----------------------------
+# layout_metrics
+#-----------------------
+
+def layout_metrics(src, dst, num_nodes, pos, metrics=METRICS, seed=None):
+    '''
+    Compute the named metrics of one layout.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param pos: num_nodes x 2 positions
+    @type pos: np.ndarray
+    @param metrics: names from METRICS
+    @type metrics: sequence
+    @param seed: random seed for the samples
+    @type seed: {int | None}
+    @rtype: {str : float}
+    '''
+    results = {}
+    for metric in metrics:
+        if metric not in METRICS:
+            raise ValueError("Metric must be one of %s; got '%s'" % (METRICS, metric))
+        if metric == 'stress':
+            results[metric] = sampled_stress(src, dst, num_nodes, pos, seed=seed)
+        elif metric == 'edge_length':
+            results[metric] = edge_length_variance(src, dst, pos)
+        elif metric == 'crossings':
+            results[metric] = count_crossings(src, dst, pos, seed=seed)
+        else:
+            results[metric] = neighborhood_preservation(src, dst, num_nodes, pos, seed=seed)
+    return results
+
+# ---------------------------- EarlyStopping -----------
+
+class EarlyStopping(object):
+    '''
+    Stop test for layout.spring_layout(): every
+    check_every iterations, the metric is measured,
+    and the layout is stopped once it improved by less
+    than min_improvement, as a fraction of the previous
+    value, since the last check. Measurements are kept
+    in history as (iteration, value).
+    
+    Layouts of other graphs than the one given, such as
+    the coarse levels of a multilevel layout, are never
+    stopped.
+    '''
+
+    def __init__(self, src, dst, num_nodes,
+                 metric='stress',
+                 check_every=DEFAULT_CHECK_EVERY,
+                 min_improvement=DEFAULT_MIN_IMPROVEMENT,
+                 seed=0):
+        if metric not in METRICS:
+            raise ValueError("Metric must be one of %s; got '%s'" % (METRICS, metric))
+        if check_every < 1:
+            raise ValueError("Metric must be checked at least every iteration; got %s" % check_every)
+        (self.src, self.dst) = (np.asarray(src), np.asarray(dst))
+        self.num_nodes = num_nodes
+        self.metric = metric
+        self.check_every = check_every
+        self.min_improvement = min_improvement
+        self.seed = seed
+        self.history = []
+        # Drawn once, on the first check:
+        self._sample = None
+
+    def measure(self, pos):
+        if self.metric == 'stress':
+            if self._sample is None:
+                self._sample = StressSample(self.src, self.dst, self.num_nodes, seed=self.seed)
+            return self._sample.stress(pos)
+        if self.metric == 'neighborhood':
+            if self._sample is None:
+                self._sample = NeighborhoodSample(self.src, self.dst, self.num_nodes, seed=self.seed)
+            return self._sample.preservation(pos)
+        if self.metric == 'edge_length':
+            return edge_length_variance(self.src, self.dst, pos)
+        return count_crossings(self.src, self.dst, pos, seed=self.seed)
+
+    def __call__(self, iteration, pos):
+        '''
+        @return: whether the layout should stop after this iteration
+        @rtype: bool
+        '''
+        if len(pos) != self.num_nodes or (iteration + 1) % self.check_every:
+            return False
+        value = self.measure(pos)
+        previous = self.history[-1][1] if self.history else None
+        self.history.append((iteration, value))
+        if previous is None:
+            return False
+        gain = value - previous if self.metric in HIGHER_IS_BETTER else previous - value
+        return gain < self.min_improvement * max(abs(previous), 1e-12)
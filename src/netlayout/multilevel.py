@@ -0,0 +1,241 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Multilevel force-directed layout for large networks.
+
+The graph is coarsened repeatedly by heavy-edge
+matching: nodes are paired with the neighbor they
+share the heaviest link with, and each pair becomes
+one node of the next coarser graph, whose links are
+the sums of the links between the pairs. Coarsening
+stops once the graph is small, or stops shrinking.
+
+The coarsest graph is laid out from random positions.
+Its positions are then carried down level by level:
+every node starts at the position of the coarse node
+it was merged into, and a few cool spring_layout()
+iterations refine the result. Large-scale structure
+is settled on the small graphs, where iterations are
+cheap, so the full graph needs only a handful.
+'''
+import numpy as np
+
+from netlayout.graph_store import merge_parallel_edges
+from netlayout.layout import rescale_layout, spring_layout
+
+
+# Stop coarsening at this many nodes:
+DEFAULT_MIN_NODES = 100
+
+# Stop coarsening once a level keeps more
+# than this fraction of its parent's nodes:
+MAX_COARSENING_RATIO = 0.9
+
+# Iterations on the coarsest graph, and
+# per level on the way back up:
+DEFAULT_COARSEST_ITERATIONS = 50
+DEFAULT_REFINE_ITERATIONS = 10
+
+# Refinement starts with steps of at most this
+# fraction of the layout's extent:
+REFINE_TEMPERATURE_FRACTION = 0.02
+
+#-----------------------------
+# heavy_edge_matching
+#-----------------------
+
+def heavy_edge_matching(src, dst, weight, num_nodes, rounds=4, seed=None):
+    '''
+    Group nodes for coarsening. In each round, every
+    unmatched node picks the unmatched neighbor it
+    shares the heaviest link with (ties broken at
+    random), and nodes that picked each other are
+    matched. Nodes still unmatched after all rounds
+    join the group of their heaviest matched neighbor;
+    nodes without links stay on their own.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param weight: link weights
+    @type weight: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param rounds: number of matching rounds
+    @type rounds: int
+    @param seed: random seed for tie breaking
+    @type seed: {int | None}
+    @return: coarse node id of every node, and the
+        number of coarse nodes
+    @rtype: (np.ndarray, int)
+    '''
+    rng = np.random.default_rng(seed)
+    not_loop = src != dst
+    ends  = np.concatenate([src[not_loop], dst[not_loop]]).astype(np.intp)
+    peers = np.concatenate([dst[not_loop], src[not_loop]]).astype(np.intp)
+    heft  = np.concatenate([weight[not_loop], weight[not_loop]])
+    tie_breaker = rng.random(len(ends))
+
+    partner = np.full(num_nodes, -1, dtype=np.intp)
+    for _round in range(rounds):
+        free = (partner[ends] < 0) & (partner[peers] < 0)
+        if not free.any():
+            break
+        choice = _heaviest_peer(ends[free], peers[free], heft[free], tie_breaker[free], num_nodes)
+        choosers = np.flatnonzero(choice >= 0)
+        mutual = choosers[choice[choice[choosers]] == choosers]
+        if len(mutual) == 0:
+            break
+        partner[mutual] = choice[mutual]
+
+    node_ids = np.arange(num_nodes)
+    representative = np.where(partner >= 0, np.minimum(node_ids, partner), node_ids)
+
+    # Leftover nodes attach to a matched neighbor:
+    leftover = (partner[ends] < 0) & (partner[peers] >= 0)
+    if leftover.any():
+        choice = _heaviest_peer(ends[leftover], peers[leftover], heft[leftover],
+                                tie_breaker[leftover], num_nodes)
+        attached = np.flatnonzero(choice >= 0)
+        representative[attached] = representative[choice[attached]]
+
+    (_representatives, mapping) = np.unique(representative, return_inverse=True)
+    return (mapping, len(_representatives))
+
+def _heaviest_peer(ends, peers, heft, tie_breaker, num_nodes):
+    # Sort by node, then heaviest first; keep each node's first:
+    order = np.lexsort((tie_breaker, -heft, ends))
+    (heads, first) = np.unique(ends[order], return_index=True)
+    choice = np.full(num_nodes, -1, dtype=np.intp)
+    choice[heads] = peers[order][first]
+    return choice
+
+#-----------------------------
+# coarsen
+#-----------------------
+
+def coarsen(src, dst, weight, mapping, num_coarse):
+    '''
+    Links of the coarse graph: links inside a group
+    disappear, parallel links between groups are
+    summed.
+
+    @return: coarse (src, dst, weight)
+    @rtype: (np.ndarray, np.ndarray, np.ndarray)
+    '''
+    coarse_src = mapping[src]
+    coarse_dst = mapping[dst]
+    between = coarse_src != coarse_dst
+    (coarse_src, coarse_dst, coarse_weight, _props) = merge_parallel_edges(coarse_src[between],
+                                                                          coarse_dst[between],
+                                                                          weight[between],
+                                                                          {},
+                                                                          num_coarse,
+                                                                          'sum')
+    return (coarse_src, coarse_dst, coarse_weight)
+
+#-----------------------------
+# build_hierarchy
+#-----------------------
+
+def build_hierarchy(src, dst, weight, num_nodes,
+                    min_nodes=DEFAULT_MIN_NODES,
+                    max_levels=30,
+                    seed=None):
+    '''
+    Coarsen until the graph has at most min_nodes
+    nodes, or stops shrinking.
+
+    @return: list of levels, finest first. Each level is a
+        dict with keys src, dst, weight, num_nodes, and,
+        except for the coarsest, mapping: the node id of
+        each of its nodes in the next coarser level.
+    @rtype: [dict]
+    '''
+    weight = np.ones(len(src)) if weight is None else np.asarray(weight, dtype=np.float64)
+    levels = [{'src' : np.asarray(src), 'dst' : np.asarray(dst), 'weight' : weight, 'num_nodes' : num_nodes}]
+    while len(levels) < max_levels:
+        level = levels[-1]
+        if level['num_nodes'] <= min_nodes:
+            break
+        (mapping, num_coarse) = heavy_edge_matching(level['src'], level['dst'], level['weight'],
+                                                    level['num_nodes'], seed=seed)
+        if num_coarse > MAX_COARSENING_RATIO * level['num_nodes']:
+            break
+        level['mapping'] = mapping
+        (coarse_src, coarse_dst, coarse_weight) = coarsen(level['src'], level['dst'], level['weight'],
+                                                          mapping, num_coarse)
+        levels.append({'src' : coarse_src, 'dst' : coarse_dst, 'weight' : coarse_weight,
+                       'num_nodes' : num_coarse})
+    return levels
+
+#-----------------------------
+# multilevel_layout
+#-----------------------
+
+def multilevel_layout(src, dst, num_nodes,
+                      weight=None,
+                      coarsest_iterations=DEFAULT_COARSEST_ITERATIONS,
+                      refine_iterations=DEFAULT_REFINE_ITERATIONS,
+                      min_nodes=DEFAULT_MIN_NODES,
+                      scale=1.0,
+                      seed=None,
+                      **layout_args):
+    '''
+    Lay out the coarsest level of a coarsening hierarchy,
+    then expand and refine level by level.
+
+    @param src: source node id of each link
+    @type src: np.ndarray
+    @param dst: destination node id of each link
+    @type dst: np.ndarray
+    @param num_nodes: number of nodes
+    @type num_nodes: int
+    @param weight: link weights; None for all 1.0
+    @type weight: {np.ndarray | None}
+    @param coarsest_iterations: iterations on the coarsest graph
+    @type coarsest_iterations: int
+    @param refine_iterations: iterations on every finer level
+    @type refine_iterations: int
+    @param min_nodes: coarsen down to this many nodes
+    @type min_nodes: int
+    @param scale: final positions are rescaled to [-scale, scale];
+        None leaves them unscaled
+    @type scale: {float | None}
+    @param seed: random seed
+    @type seed: {int | None}
+    @param layout_args: further spring_layout() arguments, such
+        as repulsion, cooling, or tolerance
+    @return: num_nodes x 2 array of positions
+    @rtype: np.ndarray
+    '''
+    rng = np.random.default_rng(seed)
+    levels = build_hierarchy(src, dst, weight, num_nodes, min_nodes=min_nodes, seed=seed)
+
+    coarsest = levels[-1]
+    pos = spring_layout(coarsest['src'], coarsest['dst'], coarsest['num_nodes'],
+                        weight=coarsest['weight'],
+                        iterations=coarsest_iterations,
+                        scale=None,
+                        seed=seed,
+                        **layout_args)
+    for level in reversed(levels[:-1]):
+        level_nodes = level['num_nodes']
+        # Merged nodes start on top of each other;
+        # nudge them apart by a fraction of k:
+        k = np.sqrt(1.0 / level_nodes)
+        pos = pos[level['mapping']] + (rng.random((level_nodes, 2)) - 0.5) * 0.1 * k
+        extent = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1]))
+        pos = spring_layout(level['src'], level['dst'], level_nodes,
+                            weight=level['weight'],
+                            pos=pos,
+                            iterations=refine_iterations,
+                            temperature=REFINE_TEMPERATURE_FRACTION * extent,
+                            scale=None,
+                            **layout_args)
+    if scale is not None:
+        pos = rescale_layout(pos, scale)
+    return pos
@@ -0,0 +1,370 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Compact, array-backed index between node names, dense
+node ids, and zip codes, in place of Python dicts keyed
+by name strings.
+
+Names are looked up by two independent 64-bit hashes of
+their characters. The index holds, for every node:
+
+    hashes:        first hash of each name, sorted
+    check_hashes:  second hash of each name, in the same order
+    hash_ids:      node id of each name, in the same order
+
+plus, once zip codes are assigned:
+
+    zipcodes:         zip code number of each node id; -1 if none
+    zipcode_to_node:  node id of each zip code number; -1 if none
+
+That is 20 bytes per node, plus 4 bytes per number in
+the zip code space, with no per-name objects. Batches of names are
+hashed with vectorized NumPy operations over their
+characters, in chunks of names of similar length, so
+that one long name does not widen the whole batch;
+they are found with one searchsorted() call; a
+name matches only if both hashes agree, so a false
+match needs a 128-bit collision.
+
+All state is in plain arrays, so an index can be saved
+and memory-mapped, as by graph_cache.GraphCache, or
+placed in shared memory with share() and attached to
+from other processes with attach(), without copying.
+'''
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# FNV-1a parameters of the first hash:
+FNV_OFFSET = np.uint64(14695981039346656037)
+FNV_PRIME = np.uint64(1099511628211)
+# Multiplier of the second, multiply-rotate hash:
+CHECK_OFFSET = np.uint64(0x243F6A8885A308D3)
+CHECK_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+_MASK = (1 << 64) - 1
+
+# Characters hashed at a time, bounding the rows x width
+# character matrix of a chunk (8 bytes per character):
+HASH_CHUNK_CHARS = 1 << 20
+
+#-----------------------------
+# hash_names
+#-----------------------
+
+def hash_names(names):
+    '''
+    Both hashes of every name. Names that are not strings
+    are hashed by their str() form.
+
+    @param names: node names
+    @type names: sequence
+    @return: first and second hash of each name
+    @rtype: (np.ndarray, np.ndarray)
+    '''
+    if not (isinstance(names, np.ndarray) and names.dtype.kind == 'U'):
+        # Not as one fixed-width array, which is as wide
+        # as the longest name:
+        names = np.asarray(names, dtype=object)
+    names = names.ravel()
+    if names.dtype.kind == 'U':
+        lengths = np.char.str_len(names)
+    else:
+        lengths = np.fromiter((len(str(name)) for name in names), dtype=np.int64, count=len(names))
+    hashes = np.empty(len(names), dtype=np.uint64)
+    check_hashes = np.empty(len(names), dtype=np.uint64)
+    # Chunks of names of similar length, each at most
+    # HASH_CHUNK_CHARS wide in all, unless one name is longer:
+    order = np.argsort(lengths, kind='stable')
+    sorted_lengths = np.maximum(lengths[order], 1)
+    start = 0
+    while start < len(order):
+        stop = min(start + max(HASH_CHUNK_CHARS // sorted_lengths[start], 1), len(order))
+        while stop - start > 1 and (stop - start) * sorted_lengths[stop - 1] > HASH_CHUNK_CHARS:
+            stop = start + max(HASH_CHUNK_CHARS // sorted_lengths[stop - 1], 1)
+        rows = order[start:stop]
+        chunk = names[rows].astype('<U%s' % sorted_lengths[stop - 1])
+        (hashes[rows], check_hashes[rows]) = _hash_chunk(chunk)
+        start = stop
+    return (hashes, check_hashes)
+
+def _hash_chunk(names):
+    width = names.dtype.itemsize // 4
+    # UTF-32 code points, zero padded to the longest name:
+    codes = names.view(np.uint32).reshape(len(names), width).astype(np.uint64)
+    lengths = np.char.str_len(names)
+    first = np.full(len(names), FNV_OFFSET, dtype=np.uint64)
+    second = np.full(len(names), CHECK_OFFSET, dtype=np.uint64)
+    for column in range(width):
+        inside = lengths > column
+        code = codes[:, column]
+        first = np.where(inside, (first ^ code) * FNV_PRIME, first)
+        mixed = (second + code) * CHECK_MULTIPLIER
+        second = np.where(inside, (mixed << np.uint64(27)) | (mixed >> np.uint64(37)), second)
+    return (first, second ^ lengths.astype(np.uint64))
+
+def hash_name(name):
+    '''
+    Both hashes of one name, in plain Python; same
+    values as hash_names().
+
+    @rtype: (int, int)
+    '''
+    name = str(name)
+    (first, second) = (int(FNV_OFFSET), int(CHECK_OFFSET))
+    for char in name:
+        code = ord(char)
+        first = ((first ^ code) * int(FNV_PRIME)) & _MASK
+        mixed = ((second + code) * int(CHECK_MULTIPLIER)) & _MASK
+        second = ((mixed << 27) | (mixed >> 37)) & _MASK
+    return (first, second ^ len(name))
+
+# ---------------------------- NodeIndex -----------
+
+class NodeIndex(object):
+    '''
+    Bidirectional index between node names, node ids,
+    and zip codes; see the module docstring.
+    '''
+
+    # Arrays that index the names, and those that
+    # hold one zip code assignment:
+    NAME_ARRAYS = ('hashes', 'check_hashes', 'hash_ids')
+    ARRAY_NAMES = NAME_ARRAYS + ('zipcodes', 'zipcode_to_node')
+
+    def __init__(self, hashes, check_hashes, hash_ids, zipcodes=None, zipcode_to_node=None):
+        '''
+        Not usually called directly; see from_names(),
+        load(), and attach().
+        '''
+        self.hashes = hashes
+        self.check_hashes = check_hashes
+        self.hash_ids = hash_ids
+        if zipcodes is None:
+            zipcodes = np.full(len(hash_ids), -1, dtype=np.int32)
+        if zipcode_to_node is None:
+            zipcode_to_node = np.empty(0, dtype=np.int32)
+        self.zipcodes = zipcodes
+        self.zipcode_to_node = zipcode_to_node
+        # Shared memory blocks this index lives in, if any:
+        self._blocks = []
+
+    @classmethod
+    def from_names(cls, node_names):
+        '''
+        Index the names of node ids 0..n-1.
+
+        @param node_names: node name of each node id
+        @type node_names: sequence
+        @rtype: NodeIndex
+        '''
+        (hashes, check_hashes) = hash_names(node_names)
+        order = np.lexsort((check_hashes, hashes))
+        return cls(hashes[order], check_hashes[order], order.astype(np.int32))
+
+    @property
+    def num_nodes(self):
+        return len(self.hash_ids)
+
+    # ------------------------- Names to Ids --------------
+
+    def lookup(self, names, missing=None):
+        '''
+        Node ids of a batch of names, in one vectorized pass.
+
+        @param names: node names
+        @type names: sequence
+        @param missing: id to return for unknown names; None
+            to raise KeyError instead
+        @type missing: {int | None}
+        @return: node ids
+        @rtype: np.ndarray
+        '''
+        (hashes, check_hashes) = hash_names(names)
+        positions = self._find(hashes, check_hashes)
+        found = positions >= 0
+        if missing is None and not found.all():
+            raise KeyError(np.asarray(names, dtype=object).ravel()[np.argmin(found)])
+        ids = np.full(len(positions), -1 if missing is None else missing, dtype=np.int32)
+        ids[found] = self.hash_ids[positions[found]]
+        return ids
+
+    def lookup_one(self, name):
+        '''
+        Node id of one name, without building arrays for
+        it. Raises KeyError for unknown names.
+
+        @rtype: int
+        '''
+        (first, second) = hash_name(name)
+        (start, stop) = (np.searchsorted(self.hashes, np.uint64(first), side='left'),
+                         np.searchsorted(self.hashes, np.uint64(first), side='right'))
+        for position in range(start, stop):
+            if int(self.check_hashes[position]) == second:
+                return int(self.hash_ids[position])
+        raise KeyError(name)
+
+    def contains(self, names):
+        '''
+        Boolean array of which names are indexed.
+        '''
+        return self._find(*hash_names(names)) >= 0
+
+    def __contains__(self, name):
+        try:
+            self.lookup_one(name)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return self.num_nodes
+
+    def _find(self, hashes, check_hashes):
+        '''
+        Position in self.hashes of each (hash, check hash)
+        pair, or -1. Names whose first hashes collide sit
+        next to each other, ordered by check hash, and are
+        told apart by it.
+        '''
+        positions = np.searchsorted(self.hashes, hashes, side='left')
+        result = np.full(len(hashes), -1, dtype=np.int64)
+        pending = np.arange(len(hashes))
+        while len(pending):
+            at = positions[pending]
+            inside = at < len(self.hashes)
+            (pending, at) = (pending[inside], at[inside])
+            same_hash = self.hashes[at] == hashes[pending]
+            (pending, at) = (pending[same_hash], at[same_hash])
+            matched = self.check_hashes[at] == check_hashes[pending]
+            result[pending[matched]] = at[matched]
+            # Try the next name with the same first hash:
+            pending = pending[~matched]
+            positions[pending] += 1
+        return result
+
+    # ------------------------- Zip Codes --------------
+
+    def set_zipcodes(self, zipcodes, zipcode_space):
+        '''
+        Record the zip code number of every node id, and
+        the reverse mapping.
+
+        @param zipcodes: zip code of each node id; -1 for none
+        @type zipcodes: np.ndarray
+        @param zipcode_space: zip code numbers are below this,
+            such as zipcodes.ZIPCODE_SPACE
+        @type zipcode_space: int
+        '''
+        zipcodes = np.asarray(zipcodes, dtype=np.int32)
+        if len(zipcodes) != self.num_nodes:
+            raise ValueError("Expected %s zip codes, one per node; got %s" % (self.num_nodes, len(zipcodes)))
+        self.zipcodes = zipcodes
+        self.zipcode_to_node = np.full(zipcode_space, -1, dtype=np.int32)
+        assigned = np.flatnonzero(zipcodes >= 0)
+        self.zipcode_to_node[zipcodes[assigned]] = assigned
+
+    def zipcodes_of(self, names, missing=None):
+        '''
+        Zip code numbers of a batch of node names; -1
+        for nodes without one.
+        '''
+        return self.zipcodes[self.lookup(names, missing=missing)]
+
+    def nodes_of(self, zipcodes):
+        '''
+        Node ids of a batch of zip codes, given as numbers
+        or strings; -1 where no node has the zip code.
+
+        @rtype: np.ndarray
+        '''
+        zipcodes = np.asarray(zipcodes)
+        if zipcodes.dtype.kind in 'USO':
+            zipcodes = zipcodes.astype(np.int64)
+        outside = (zipcodes < 0) | (zipcodes >= len(self.zipcode_to_node))
+        ids = self.zipcode_to_node[np.where(outside, 0, zipcodes)]
+        return np.where(outside, -1, ids)
+
+    # ------------------------- Sharing --------------
+
+    def arrays(self):
+        return {name : getattr(self, name) for name in NodeIndex.ARRAY_NAMES}
+
+    def save(self, save):
+        '''
+        Write the name arrays through save(name, array),
+        such as a function that np.save()s into a directory.
+        Zip codes are not saved; they belong to one run.
+        '''
+        for name in NodeIndex.NAME_ARRAYS:
+            save(name, getattr(self, name))
+
+    @classmethod
+    def load(cls, load):
+        '''
+        Index over name arrays returned by load(name),
+        such as memory-mapped .npy files.
+        '''
+        return cls(*[load(name) for name in NodeIndex.NAME_ARRAYS])
+
+    def share(self):
+        '''
+        Copy the arrays into shared memory, once, and use
+        those copies from now on. Returns a small picklable
+        spec, from which other processes attach() to the
+        same memory. The blocks are freed by unlink().
+
+        @return: {array name : (block name, shape, dtype)}
+        @rtype: dict
+        '''
+        spec = {}
+        for (name, array) in self.arrays().items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared = np.ndarray(array.shape, array.dtype, buffer=block.buf)
+            shared[...] = array
+            setattr(self, name, shared)
+            self._blocks.append(block)
+            spec[name] = (block.name, array.shape, array.dtype.str)
+        return spec
+
+    @classmethod
+    def attach(cls, spec):
+        '''
+        Index over the shared memory of another process's
+        share() call. Call close() when done.
+
+        @rtype: NodeIndex
+        '''
+        blocks = [shared_memory.SharedMemory(name=spec[name][0]) for name in NodeIndex.ARRAY_NAMES]
+        arrays = [np.ndarray(spec[name][1], np.dtype(spec[name][2]), buffer=block.buf)
+                  for (name, block) in zip(NodeIndex.ARRAY_NAMES, blocks)]
+        index = cls(*arrays)
+        index._blocks = blocks
+        return index
+
+    def close(self):
+        '''
+        Detach from shared memory; the index is unusable
+        afterwards.
+        '''
+        for name in NodeIndex.ARRAY_NAMES:
+            setattr(self, name, None)
+        for block in self._blocks:
+            block.close()
+
+    def unlink(self):
+        '''
+        Free the shared memory created by share().
+        '''
+        blocks = self._blocks
+        self.close()
+        for block in blocks:
+            block.unlink()
+        self._blocks = []
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays().values())
@@ -0,0 +1,254 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Parallel variant of the streaming ingest in ingest.py.
+
+Each input file is cut into byte ranges that start
+and end on line boundaries. Worker processes parse
+one range at a time with their own, range-local node
+interner and category tables, and hand back compact
+arrays: the range's node names in order of first
+appearance, int32 local ids for the name columns,
+float64 weights, and int32 codes for the other
+property columns.
+
+The main process merges the ranges in file order:
+each range's local names are interned globally once,
+which yields a local-to-global id array, and its ids
+and codes are translated with one fancy-indexing
+step. Only that merge is sequential; it does one
+dict lookup per distinct name or category of a range,
+plus vectorized array work per row.
+
+The result is an ingest.IngestBuffers, as produced by
+ingest.stream_inputs(), and holds the same graph. Node
+ids can differ from the sequential ingest's for nodes
+that first appear in the links file.
+
+Fields with embedded line breaks inside quotes are
+not supported, since range boundaries are found by
+looking for line breaks.
+'''
+import csv
+import io
+import multiprocessing
+import os
+
+import numpy as np
+
+from netlayout.ingest import (DEFAULT_CHUNK_ROWS, WEIGHT_COLUMN, CategoricalBuffer, GrowableArray,
+                              IngestBuffers, NodeInterner, iter_column_chunks, parse_floats, read_header)
+
+
+# Byte ranges are sized to give each worker process
+# about this many ranges, for load balancing:
+RANGES_PER_PROCESS = 4
+
+# Bounds on the size of one byte range:
+MIN_RANGE_BYTES = 1 << 20
+MAX_RANGE_BYTES = 1 << 26
+
+#-----------------------------
+# split_byte_ranges
+#-----------------------
+
+def split_byte_ranges(path, range_bytes):
+    '''
+    Cut a CSV file, minus its header line, into
+    consecutive (start, stop) byte ranges of about
+    range_bytes bytes, each ending at a line end.
+
+    @param path: file to split
+    @type path: str
+    @param range_bytes: target size of each range
+    @type range_bytes: int
+    @rtype: [(int, int)]
+    '''
+    if range_bytes < 1:
+        raise ValueError("Byte ranges must be at least one byte long; got %s" % range_bytes)
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as fd:
+        fd.readline()
+        start = fd.tell()
+        while start < size:
+            fd.seek(min(start + range_bytes, size))
+            # Extend to the end of the line:
+            fd.readline()
+            stop = fd.tell()
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+#-----------------------------
+# iter_range_chunks
+#-----------------------
+
+def iter_range_chunks(path, start, stop, delimiter=',', chunk_rows=DEFAULT_CHUNK_ROWS):
+    '''
+    Generator over lists of at most chunk_rows parsed
+    CSV rows of one byte range. Blank lines are dropped.
+    '''
+    with open(path, 'rb') as fd:
+        fd.seek(start)
+        data = fd.read(stop - start)
+    reader = csv.reader(io.TextIOWrapper(io.BytesIO(data), newline=''), delimiter=delimiter)
+    chunk = []
+    for row in reader:
+        if not row:
+            continue
+        chunk.append(row)
+        if len(chunk) == chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+#-----------------------------
+# parse_range
+#-----------------------
+
+def parse_range(task):
+    '''
+    Parse one byte range in a worker process.
+
+    @param task: (path, start, stop, delimiter, column_names,
+        num_name_columns, float_columns, skip, chunk_rows); the
+        first num_name_columns columns hold node names, the
+        property columns named in float_columns are parsed
+        as floats, and those named in skip are left out
+    @type task: tuple
+    @return: (names, ids, columns): the range's node names
+        in order of first appearance; one int32 array of
+        local node ids per name column; and per property
+        column either a float64 array, or a (codes, categories)
+        pair
+    @rtype: (np.ndarray, [np.ndarray], dict)
+    '''
+    (path, start, stop, delimiter, column_names, num_name_columns, float_columns, skip, chunk_rows) = task
+    interner = NodeInterner()
+    ids = [GrowableArray(np.int32) for _i in range(num_name_columns)]
+    columns = {}
+    for name in column_names[num_name_columns:]:
+        if name not in skip:
+            columns[name] = GrowableArray(np.float64) if name in float_columns else CategoricalBuffer()
+
+    row_chunks = iter_range_chunks(path, start, stop, delimiter, chunk_rows)
+    for values in iter_column_chunks(row_chunks, len(column_names)):
+        for (column_ids, names) in zip(ids, values):
+            column_ids.extend(interner.intern_many(names))
+        for (name, column_values) in zip(column_names[num_name_columns:], values[num_name_columns:]):
+            if name in skip:
+                continue
+            if name in float_columns:
+                columns[name].extend(parse_floats(column_values))
+            else:
+                columns[name].extend(column_values)
+
+    encoded = {}
+    for (name, column) in columns.items():
+        if name in float_columns:
+            encoded[name] = column.trim()
+        else:
+            encoded[name] = (column.codes.trim(), column.categories())
+    return (interner.names(), [column_ids.trim() for column_ids in ids], encoded)
+
+#-----------------------------
+# parallel_stream_inputs
+#-----------------------
+
+def parallel_stream_inputs(nodes_file, links_file,
+                           delimiter=',',
+                           chunk_rows=DEFAULT_CHUNK_ROWS,
+                           processes=None,
+                           range_bytes=None,
+                           skip=()):
+    '''
+    Parse the nodes file, then the links file, in
+    byte ranges across a pool of worker processes.
+    Takes the same inputs as ingest.stream_inputs().
+
+    @param nodes_file: CSV with node name in first column
+    @type nodes_file: str
+    @param links_file: CSV with source and destination
+        node names in the first two columns
+    @type links_file: str
+    @param delimiter: CSV column delimiter
+    @type delimiter: str
+    @param chunk_rows: rows parsed per chunk within a range
+    @type chunk_rows: int
+    @param processes: number of worker processes; None for
+        one per CPU
+    @type processes: {int | None}
+    @param range_bytes: size of the byte ranges; None to
+        size them by file size and number of processes
+    @type range_bytes: {int | None}
+    @param skip: names of property columns to leave out
+    @type skip: {set | frozenset | tuple}
+    @rtype: ingest.IngestBuffers
+    '''
+    node_property_names = read_header(nodes_file, delimiter)
+    link_property_names = read_header(links_file, delimiter)
+    if len(link_property_names) < 2:
+        raise ValueError("Links file %s needs at least source and destination columns." % links_file)
+    if chunk_rows < 1:
+        raise ValueError("Chunk size must be at least one row; got %s" % chunk_rows)
+    buffers = IngestBuffers(node_property_names, link_property_names, skip)
+    processes = processes or multiprocessing.cpu_count()
+
+    tasks = []
+    # Like stream_inputs(), parse only the link weights as numbers:
+    for (path, column_names, num_name_columns, float_columns) in \
+            ((nodes_file, node_property_names, 1, ()),
+             (links_file, link_property_names, 2, (WEIGHT_COLUMN,))):
+        file_range_bytes = range_bytes
+        if file_range_bytes is None:
+            file_range_bytes = os.path.getsize(path) // (processes * RANGES_PER_PROCESS)
+            file_range_bytes = min(max(file_range_bytes, MIN_RANGE_BYTES), MAX_RANGE_BYTES)
+        for (start, stop) in split_byte_ranges(path, file_range_bytes):
+            tasks.append((path, start, stop, delimiter,
+                          column_names, num_name_columns, float_columns, skip, chunk_rows))
+
+    if processes == 1 or len(tasks) <= 1:
+        for task in tasks:
+            merge_range(buffers, task[5], parse_range(task))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            # Results arrive in task order, nodes file first:
+            for (task, parsed) in zip(tasks, pool.imap(parse_range, tasks)):
+                merge_range(buffers, task[5], parsed)
+    return buffers
+
+#-----------------------------
+# merge_range
+#-----------------------
+
+def merge_range(buffers, num_name_columns, parsed):
+    '''
+    Append one parsed range to the global buffers,
+    translating range-local node ids and codes.
+
+    @param buffers: buffers being filled
+    @type buffers: ingest.IngestBuffers
+    @param num_name_columns: 1 for a nodes file range,
+        2 for a links file range
+    @type num_name_columns: int
+    @param parsed: result of parse_range()
+    @type parsed: tuple
+    '''
+    (names, ids, columns) = parsed
+    global_ids = buffers.interner.intern_many(names)
+    if num_name_columns == 1:
+        buffers.node_rows.extend(global_ids[ids[0]])
+        targets = buffers.node_columns
+    else:
+        buffers.src.extend(global_ids[ids[0]])
+        buffers.dst.extend(global_ids[ids[1]])
+        targets = buffers.link_columns
+    for (name, values) in columns.items():
+        if isinstance(values, tuple):
+            targets[name].extend_encoded(*values)
+        else:
+            targets[name].extend(values)
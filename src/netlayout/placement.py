@@ -0,0 +1,359 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Placement of laid out nodes onto zip codes, so that
+Tableau's map view shows the network's structure.
+
+Layout coordinates are first fitted onto the area
+covered by the candidate zip codes, then every node
+gets the nearest zip code centroid that no other node
+has taken.
+
+Fitting: with fit='bbox', the layout's bounding box is
+stretched linearly onto the zip codes' bounding box.
+With fit='quantile' (the default), each axis is mapped
+by rank, so that nodes spread out like the zip codes
+do: dense where zip codes are dense, instead of piling
+up in the empty West.
+
+Assignment starts greedy by distance: among all (node,
+free zip code) pairs, the closest pair is matched first.
+This runs in a few rounds over a uniform grid index of
+the zip codes. In a round, every unplaced node looks at
+the free zip codes within its current search radius;
+pairs are matched in order of distance, accepting in
+bulk every pair that is the closest one both for its
+node and for its zip code. Nodes that found no free zip
+code in their radius double it for the next round.
+Per-cell counts of free zip codes, summed up as a 2D
+prefix table, bound the pairs examined in a round.
+
+Where nodes are spread out like the zip codes, the
+greedy rounds place nearly all of them. Where many nodes
+crowd one spot, greedy matching degrades to one node at a
+time; whatever the rounds leave is therefore placed by
+balanced k-d bisection instead: nodes and free zip codes
+are split together along the wider axis, at the nodes'
+median, keeping at least as many zip codes as nodes on
+each side, until every part holds one node, which then
+takes the nearest zip code of its part.
+'''
+import numpy as np
+
+
+# Ways of giving nodes zip codes: random draws, or
+# placement by layout position:
+PLACEMENT_MODES = ('random', 'layout')
+
+# Ways of fitting layout coordinates onto the zip code area:
+FIT_MODES = ('quantile', 'bbox')
+
+# Grid cells are sized to hold about this many zip codes:
+ZIPCODES_PER_CELL = 4
+
+# Node/zip code pairs examined per assignment round:
+DEFAULT_MAX_PAIRS = 2 ** 21
+
+# Greedy rounds before the remaining nodes are bisected,
+# and bulk acceptance steps per round:
+DEFAULT_GREEDY_ROUNDS = 4
+MATCH_STEPS = 16
+
+#-----------------------------
+# place_on_zipcodes
+#-----------------------
+
+def place_on_zipcodes(positions, table, rows=None, fit='quantile'):
+    '''
+    Give every node the nearest unused zip code to its
+    fitted layout position.
+
+    @param positions: num_nodes x 2 layout positions
+    @type positions: np.ndarray
+    @param table: zip code reference table
+    @type table: zipcodes.ZipcodeTable
+    @param rows: table rows to choose from, such as a
+        state's slice; None for all
+    @type rows: {np.ndarray | slice | None}
+    @param fit: one of FIT_MODES
+    @type fit: str
+    @return: table row of each node
+    @rtype: np.ndarray
+    '''
+    if fit not in FIT_MODES:
+        raise ValueError("Fit must be one of %s; got '%s'" % (FIT_MODES, fit))
+    candidates = np.arange(len(table))[rows if rows is not None else slice(None)]
+    num_nodes = len(positions)
+    if num_nodes > len(candidates):
+        raise ValueError("Not enough zipcodes (%s) to place %s nodes." % (len(candidates), num_nodes))
+    if num_nodes == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Plane coordinates: longitude shrunk to match latitude
+    # degrees at the candidates' mean latitude:
+    lat = np.asarray(table.lat[candidates])
+    shrink = np.cos(np.radians(lat.mean()))
+    points = np.column_stack([np.asarray(table.long[candidates]) * shrink, lat])
+    targets = fit_positions(np.asarray(positions, dtype=np.float64), points, fit)
+    return candidates[nearest_free_matching(targets, points)]
+
+#-----------------------------
+# fit_positions
+#-----------------------
+
+def fit_positions(positions, points, fit='quantile'):
+    '''
+    Map layout positions into the area covered by points.
+    '''
+    fitted = np.empty_like(positions)
+    for axis in (0, 1):
+        values = positions[:, axis]
+        if fit == 'quantile':
+            ranks = np.argsort(np.argsort(values, kind='stable'), kind='stable')
+            fractions = (ranks + 0.5) / len(values)
+            fitted[:, axis] = np.quantile(points[:, axis], fractions)
+        else:
+            (low, high) = (values.min(), values.max())
+            span = high - low if high > low else 1.0
+            (point_low, point_high) = (points[:, axis].min(), points[:, axis].max())
+            fitted[:, axis] = point_low + (values - low) / span * (point_high - point_low)
+    return fitted
+
+#-----------------------------
+# nearest_free_matching
+#-----------------------
+
+def nearest_free_matching(targets, points,
+                          greedy_rounds=DEFAULT_GREEDY_ROUNDS,
+                          max_pairs=DEFAULT_MAX_PAIRS):
+    '''
+    Greedy distance matching of targets to distinct
+    points, finished by kd_matching().
+
+    @param targets: m x 2 positions to place
+    @type targets: np.ndarray
+    @param points: n x 2 available positions, n >= m
+    @type points: np.ndarray
+    @param greedy_rounds: greedy rounds before bisection
+    @type greedy_rounds: int
+    @param max_pairs: (target, point) pairs examined per round;
+        when more targets are open, the first ones in
+        target order go first
+    @type max_pairs: int
+    @return: point index of each target
+    @rtype: np.ndarray
+    '''
+    grid = _Grid(points)
+    num_targets = len(targets)
+    (target_x, target_y) = grid.cell_of(targets)
+    match = np.full(num_targets, -1, dtype=np.int64)
+    free = np.ones(len(points), dtype=bool)
+    radius = np.ones(num_targets, dtype=np.int64)
+
+    open_targets = np.arange(num_targets)
+    for _round in range(greedy_rounds):
+        if len(open_targets) == 0:
+            break
+        grid.index_free(free)
+        block = grid.block(target_x[open_targets], target_y[open_targets], radius[open_targets])
+        # As many open targets as the pair budget allows:
+        budget = np.searchsorted(np.cumsum(grid.block_counts(*block)), max_pairs, side='right')
+        active = slice(0, max(budget, 1))
+        (pair_targets, pair_points) = grid.free_pairs(*[corner[active] for corner in block])
+        pair_targets = open_targets[active][pair_targets]
+        distance = np.hypot(*(targets[pair_targets] - points[pair_points]).T)
+        # Only pairs within the searched disk are sure to be
+        # at least as close as any point outside of it:
+        within = (distance <= radius[pair_targets] * grid.cell_size) | (radius[pair_targets] >= grid.span)
+        (pair_targets, pair_points, distance) = (pair_targets[within], pair_points[within], distance[within])
+        order = np.lexsort((pair_points, pair_targets, distance))
+        (pair_targets, pair_points) = (pair_targets[order], pair_points[order])
+
+        searched = np.zeros(num_targets, dtype=bool)
+        searched[pair_targets] = True
+        for _step in range(MATCH_STEPS):
+            if len(pair_targets) == 0:
+                break
+            # Pairs that come first for their target and their point:
+            first_for_target = np.zeros(len(pair_targets), dtype=bool)
+            first_for_target[np.unique(pair_targets, return_index=True)[1]] = True
+            first_for_point = np.zeros(len(pair_points), dtype=bool)
+            first_for_point[np.unique(pair_points, return_index=True)[1]] = True
+            accept = first_for_target & first_for_point
+            match[pair_targets[accept]] = pair_points[accept]
+            free[pair_points[accept]] = False
+            remain = (match[pair_targets] < 0) & free[pair_points]
+            (pair_targets, pair_points) = (pair_targets[remain], pair_points[remain])
+
+        # Active targets without any free point in reach search farther:
+        active_targets = open_targets[active]
+        radius[active_targets[~searched[active_targets]]] *= 2
+        open_targets = open_targets[match[open_targets] < 0]
+
+    if len(open_targets):
+        free_points = np.flatnonzero(free)
+        match[open_targets] = free_points[kd_matching(targets[open_targets], points[free_points])]
+    return match
+
+#-----------------------------
+# kd_matching
+#-----------------------
+
+def kd_matching(targets, points):
+    '''
+    Match targets to distinct points by splitting both
+    sets together, k-d tree style, until every part holds
+    a single target; that target takes the nearest point
+    of its part.
+
+    @param targets: m x 2 positions to place
+    @type targets: np.ndarray
+    @param points: n x 2 available positions, n >= m
+    @type points: np.ndarray
+    @return: point index of each target
+    @rtype: np.ndarray
+    '''
+    # Target and point indexes, with the part each belongs to:
+    (target_ids, target_parts) = (np.arange(len(targets)), np.zeros(len(targets), dtype=np.int64))
+    (point_ids, point_parts) = (np.arange(len(points)), np.zeros(len(points), dtype=np.int64))
+    while True:
+        num_parts = target_parts.max() + 1 if len(target_parts) else 0
+        target_counts = np.bincount(target_parts, minlength=num_parts)
+        # Points of parts without targets are of no further use:
+        keep = target_counts[point_parts] > 0
+        (point_ids, point_parts) = (point_ids[keep], point_parts[keep])
+        if np.all(target_counts <= 1):
+            break
+        point_counts = np.bincount(point_parts, minlength=num_parts)
+
+        # Split along the axis where the part's targets spread widest:
+        target_pos = targets[target_ids]
+        low = np.full((num_parts, 2), np.inf)
+        high = np.full((num_parts, 2), -np.inf)
+        np.minimum.at(low, target_parts, target_pos)
+        np.maximum.at(high, target_parts, target_pos)
+        axis = np.argmax(high - low, axis=1)
+
+        # Targets: lower half of each part goes left:
+        coords = target_pos[np.arange(len(target_ids)), axis[target_parts]]
+        order = np.lexsort((coords, target_parts))
+        (target_ids, target_parts, coords) = (target_ids[order], target_parts[order], coords[order])
+        starts = np.concatenate([[0], np.cumsum(target_counts)[:-1]])
+        rank = np.arange(len(target_ids)) - starts[target_parts]
+        left_targets = target_counts // 2
+        goes_left = rank < left_targets[target_parts]
+        # Split value halfway between the two middle targets:
+        splitting = target_counts > 1
+        threshold = np.full(num_parts, np.inf)
+        middle = starts[splitting] + left_targets[splitting]
+        threshold[splitting] = (coords[middle - 1] + coords[middle]) / 2
+
+        # Points: those below the split value go left, but
+        # each side keeps at least as many points as targets:
+        point_pos = points[point_ids]
+        point_coords = point_pos[np.arange(len(point_ids)), axis[point_parts]]
+        order = np.lexsort((point_coords, point_parts))
+        (point_ids, point_parts, point_coords) = (point_ids[order], point_parts[order], point_coords[order])
+        below = np.bincount(point_parts[point_coords < threshold[point_parts]], minlength=num_parts)
+        left_points = np.clip(below, left_targets, point_counts - (target_counts - left_targets))
+        # Parts with one target move to the right as a whole:
+        left_points[~splitting] = 0
+        point_starts = np.concatenate([[0], np.cumsum(point_counts)[:-1]])
+        point_rank = np.arange(len(point_ids)) - point_starts[point_parts]
+        point_goes_left = point_rank < left_points[point_parts]
+
+        target_parts = 2 * target_parts + ~goes_left
+        point_parts = 2 * point_parts + ~point_goes_left
+        # Renumber parts densely; both sides of a split hold
+        # targets, so every point's part is among them:
+        (used_parts, target_parts) = np.unique(target_parts, return_inverse=True)
+        point_parts = np.searchsorted(used_parts, point_parts)
+
+    # One target per part: it takes the part's nearest point:
+    match = np.empty(len(targets), dtype=np.int64)
+    part_target = np.empty(num_parts, dtype=np.int64)
+    part_target[target_parts] = target_ids
+    owners = part_target[point_parts]
+    distance = np.hypot(*(targets[owners] - points[point_ids]).T)
+    order = np.lexsort((distance, point_parts))
+    first = np.unique(point_parts[order], return_index=True)[1]
+    match[owners[order][first]] = point_ids[order][first]
+    return match
+
+# ---------------------------- _Grid -----------
+
+class _Grid(object):
+    '''
+    Uniform grid over a point set, with points sorted
+    by cell (cell_points). index_free() sorts the free
+    points by cell in the same way, with CSR offsets:
+    free points of cell c are
+    free_points[free_offsets[c]:free_offsets[c+1]],
+    and free_totals[x, y] counts the free points in
+    cells [0, x) x [0, y).
+    '''
+
+    def __init__(self, points):
+        self.origin = points.min(axis=0)
+        extent = np.maximum(points.max(axis=0) - self.origin, 1e-9)
+        num_cells = max(len(points) / ZIPCODES_PER_CELL, 1)
+        self.cell_size = np.sqrt(extent[0] * extent[1] / num_cells) or extent.max()
+        self.shape = np.maximum(np.ceil(extent / self.cell_size).astype(np.int64), 1)
+        # Radius in cells beyond which the whole grid is covered:
+        self.span = int(self.shape.max())
+
+        (cell_x, cell_y) = self.cell_of(points)
+        self.cells = cell_x * self.shape[1] + cell_y
+        self.cell_points = np.argsort(self.cells, kind='stable')
+
+    def cell_of(self, positions):
+        cell = np.floor((positions - self.origin) / self.cell_size).astype(np.int64)
+        cell = np.clip(cell, 0, self.shape - 1)
+        return (cell[:, 0], cell[:, 1])
+
+    def index_free(self, free):
+        self.free_points = self.cell_points[free[self.cell_points]]
+        counts = np.bincount(self.cells[self.free_points], minlength=self.shape[0] * self.shape[1])
+        self.free_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.free_offsets[1:])
+        self.free_totals = np.zeros((self.shape[0] + 1, self.shape[1] + 1), dtype=np.int64)
+        self.free_totals[1:, 1:] = counts.reshape(self.shape).cumsum(axis=0).cumsum(axis=1)
+
+    def block(self, cell_x, cell_y, radius):
+        '''
+        Cells within radius of the given cells, clipped to
+        the grid, as (low_x, low_y, high_x, high_y), inclusive.
+        '''
+        return (np.maximum(cell_x - radius, 0),
+                np.maximum(cell_y - radius, 0),
+                np.minimum(cell_x + radius, self.shape[0] - 1),
+                np.minimum(cell_y + radius, self.shape[1] - 1))
+
+    def block_counts(self, low_x, low_y, high_x, high_y):
+        totals = self.free_totals
+        return (totals[high_x + 1, high_y + 1] - totals[low_x, high_y + 1] -
+                totals[high_x + 1, low_y] + totals[low_x, low_y])
+
+    def free_pairs(self, low_x, low_y, high_x, high_y):
+        '''
+        All (query, free point) pairs with the point inside
+        the query's block.
+
+        @return: query positions and point indexes
+        @rtype: (np.ndarray, np.ndarray)
+        '''
+        width_y = high_y - low_y + 1
+        block_sizes = (high_x - low_x + 1) * width_y
+        queries = np.repeat(np.arange(len(low_x)), block_sizes)
+        # Position of each cell within its query's block:
+        within = np.arange(block_sizes.sum()) - np.repeat(np.cumsum(block_sizes) - block_sizes, block_sizes)
+        cells = ((low_x[queries] + within // width_y[queries]) * self.shape[1] +
+                 low_y[queries] + within % width_y[queries])
+
+        starts = self.free_offsets[cells]
+        counts = self.free_offsets[cells + 1] - starts
+        pair_queries = np.repeat(queries, counts)
+        slots = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return (pair_queries, self.free_points[slots])
@@ -0,0 +1,270 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Per-stage instrumentation of the Networker pipeline.
+
+A StageProfiler handed to Networker records one
+StageRecord for each stage that runs:
+
+    cache_load:     graph loaded from the parse cache
+    ingest:         CSV parsing and node name interning
+    build:          CSR graph store construction
+    subgraph:       select_subgraph()
+    initial:        spectral or pivot MDS starting positions
+    layout:         compute_layout() or update_layout()
+    bundle:         bundle_edges()
+    communities:    detect_communities()
+    zipcode_table:  internalize_zipcodes()
+    zipcodes:       assign_zipcodes() or place_zipcodes()
+    export:         export_converted_input() or export_columnar()
+
+Each record holds wall time, rows processed and rows
+per second, and the resident memory at the end of
+the stage along with its change over the stage.
+The process's peak resident memory is recorded as
+well, but it is a lifetime peak: a stage that runs
+after a larger one reports the larger one's peak.
+Layout records also hold the
+number of iterations and the energy after each one,
+reported by layout.spring_layout() through its callback.
+Iterations run in worker processes, as with laid out
+components, are not counted.
+
+Hooks are called with each finished StageRecord, and
+iteration hooks with (stage, iteration, energy) after
+every layout iteration. One stage can be run under
+cProfile, with the statistics dumped to a file that
+pstats or snakeviz read. When that stage runs more
+than once, the file accumulates all of its runs.
+
+Without a profiler, Networker does none of this work;
+the only cost is one test per stage.
+'''
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows:
+    resource = None
+
+
+STAGES = ('cache_load', 'ingest', 'build', 'subgraph', 'initial', 'layout', 'bundle', 'communities', 'zipcode_table', 'zipcodes', 'export')
+
+REPORT_FORMAT_VERSION = 1
+
+#-----------------------------
+# peak_rss_bytes
+#-----------------------
+
+def peak_rss_bytes():
+    '''
+    Peak resident memory of this process so far, or
+    None where the resource module is missing.
+
+    @rtype: {int | None}
+    '''
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS:
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def rss_bytes():
+    '''
+    Current resident memory of this process, or None
+    where /proc is missing.
+
+    @rtype: {int | None}
+    '''
+    try:
+        with open('/proc/self/statm', 'r') as fd:
+            resident_pages = int(fd.read().split()[1])
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+# ---------------------------- StageRecord -----------
+
+class StageRecord(object):
+    '''
+    Counters of one run of one stage:
+
+       - stage:           name from STAGES
+       - seconds:         wall time
+       - rows:            rows read or written, if the stage has rows
+       - rss_bytes:       resident memory at the end of the stage
+       - rss_change_bytes: change of resident memory over the stage
+       - process_peak_rss_bytes: peak resident memory of the process
+                          so far, which may stem from an earlier stage
+       - energies:        for layouts, energy after each iteration
+       - profile_file:    cProfile output of this and all earlier
+                          runs of the stage, if it is profiled
+    '''
+
+    def __init__(self, stage, rows=None):
+        self.stage = stage
+        self.rows = rows
+        self.seconds = None
+        self.rss_bytes = None
+        self.rss_change_bytes = None
+        self.process_peak_rss_bytes = None
+        self.energies = []
+        self.profile_file = None
+
+    @property
+    def iterations(self):
+        return len(self.energies)
+
+    @property
+    def rows_per_second(self):
+        if self.rows is None or not self.seconds:
+            return None
+        return self.rows / self.seconds
+
+    def to_dict(self):
+        return {'stage'           : self.stage,
+                'seconds'         : self.seconds,
+                'rows'            : self.rows,
+                'rows_per_second' : self.rows_per_second,
+                'rss_bytes'       : self.rss_bytes,
+                'rss_change_bytes': self.rss_change_bytes,
+                'process_peak_rss_bytes' : self.process_peak_rss_bytes,
+                'iterations'      : self.iterations if self.stage == 'layout' else None,
+                'energies'        : self.energies if self.stage == 'layout' else None,
+                'profile_file'    : self.profile_file}
+
+    def __repr__(self):
+        return '<StageRecord %s %.3fs>' % (self.stage, self.seconds or 0.0)
+
+# ---------------------------- StageProfiler -----------
+
+class StageProfiler(object):
+    '''
+    Collects a StageRecord per pipeline stage, and
+    passes each to the registered hooks.
+    '''
+
+    def __init__(self, hooks=(), iteration_hooks=(), profile_stage=None, profile_file=None):
+        '''
+        @param hooks: functions(record) called when a stage ends
+        @type hooks: sequence
+        @param iteration_hooks: functions(stage, iteration, energy)
+            called after every layout iteration
+        @type iteration_hooks: sequence
+        @param profile_stage: stage from STAGES to run under
+            cProfile, or None
+        @type profile_stage: {str | None}
+        @param profile_file: where to dump the cProfile
+            statistics, summed over all runs of the stage;
+            default: <profile_stage>.prof
+        @type profile_file: {str | None}
+        '''
+        if profile_stage is not None and profile_stage not in STAGES:
+            raise ValueError("Profiled stage must be one of %s; got '%s'" % (STAGES, profile_stage))
+        self.hooks = list(hooks)
+        self.iteration_hooks = list(iteration_hooks)
+        self.profile_stage = profile_stage
+        self.profile_file = profile_file or (None if profile_stage is None else profile_stage + '.prof')
+        # One profile for all runs of the profiled stage,
+        # so repeated runs add up rather than overwrite:
+        self.profile = None if profile_stage is None else cProfile.Profile()
+        self.records = []
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def add_iteration_hook(self, hook):
+        self.iteration_hooks.append(hook)
+
+    #-----------------------------
+    # stage
+    #-----------------------
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        '''
+        Context manager that times the enclosed code as
+        one run of the given stage. It yields the new
+        StageRecord, whose rows may be filled in once
+        they are known.
+
+        @param name: stage name from STAGES
+        @type name: str
+        @param rows: rows processed, if known up front
+        @type rows: {int | None}
+        '''
+        record = StageRecord(name, rows)
+        profile = self.profile if name == self.profile_stage else None
+        start_rss = rss_bytes()
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile is not None:
+                profile.disable()
+            record.seconds = time.perf_counter() - start
+            record.rss_bytes = rss_bytes()
+            if record.rss_bytes is not None and start_rss is not None:
+                record.rss_change_bytes = record.rss_bytes - start_rss
+            record.process_peak_rss_bytes = peak_rss_bytes()
+            if profile is not None:
+                profile.dump_stats(self.profile_file)
+                record.profile_file = self.profile_file
+            self.records.append(record)
+            for hook in self.hooks:
+                hook(record)
+
+    #-----------------------------
+    # iteration_callback
+    #-----------------------
+
+    def iteration_callback(self, record):
+        '''
+        Layout callback(iteration, energy) that adds each
+        iteration's energy to the given record, and calls
+        the iteration hooks.
+
+        @param record: record of the running layout stage
+        @type record: StageRecord
+        @rtype: callable
+        '''
+        def callback(_iteration, energy):
+            record.energies.append(energy)
+            for hook in self.iteration_hooks:
+                hook(record.stage, record.iterations, energy)
+        return callback
+
+    #-----------------------------
+    # report
+    #-----------------------
+
+    def report(self):
+        '''
+        All records so far, ready for json.dump().
+
+        @rtype: dict
+        '''
+        return {'format_version' : REPORT_FORMAT_VERSION,
+                'total_seconds'  : sum(record.seconds for record in self.records),
+                'process_peak_rss_bytes' : peak_rss_bytes(),
+                'stages'         : [record.to_dict() for record in self.records]}
+
+    def write_report(self, path):
+        with open(path, 'w') as fd:
+            json.dump(self.report(), fd, indent=1)
+
+    def seconds(self, stage):
+        '''
+        Total seconds spent in the given stage.
+        '''
+        return sum(record.seconds for record in self.records if record.stage == stage)
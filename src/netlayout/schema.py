@@ -0,0 +1,173 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Property column schemas: {column name : type}, with
+types from SCHEMA_TYPES:
+
+    str:    dictionary-encoded strings (the default)
+    int:    64-bit integers
+    float:  64-bit floats
+    skip:   column is dropped while parsing
+
+Schemas come from the command line, written as
+
+    age:int,score:float,comment:skip
+
+or are inferred from the first rows of the input
+files. A name applies to the nodes file and the
+links file alike.
+
+Parsing always dictionary encodes; apply_schema() then
+wraps numeric columns into graph_store.TypedColumn
+instances, which only convert the distinct strings
+of a column, and only once the column is read. The
+link 'weight' column is parsed as float regardless.
+'''
+import itertools
+
+from netlayout.graph_store import CategoricalColumn, TypedColumn
+from netlayout.ingest import iter_row_chunks, read_header
+
+
+SCHEMA_TYPES = ('str', 'int', 'float', 'skip')
+
+# Rows read from each file to infer column types:
+DEFAULT_SAMPLE_ROWS = 1000
+
+#-----------------------------
+# parse_schema
+#-----------------------
+
+def parse_schema(spec):
+    '''
+    Turn a 'name:type,name:type,...' string into
+    a schema dict.
+
+    @param spec: schema as given on the command line
+    @type spec: str
+    @rtype: {str : str}
+    '''
+    schema = {}
+    for entry in spec.split(','):
+        if not entry.strip():
+            continue
+        (name, _colon, column_type) = entry.rpartition(':')
+        (name, column_type) = (name.strip(), column_type.strip())
+        if not name or column_type not in SCHEMA_TYPES:
+            raise ValueError("Schema entries must look like name:type, with type one of %s; got '%s'" %
+                             (SCHEMA_TYPES, entry))
+        schema[name] = column_type
+    return schema
+
+#-----------------------------
+# infer_column_type
+#-----------------------
+
+def infer_column_type(values):
+    '''
+    'int' if all non-empty values parse as integers,
+    'float' if they parse as numbers, else 'str'. A
+    column without values is 'str'.
+
+    @param values: sample values of one column
+    @type values: iterable of str
+    @rtype: str
+    '''
+    values = [value for value in values if value != '']
+    if not values:
+        return 'str'
+    for (column_type, convert) in (('int', int), ('float', float)):
+        try:
+            for value in values:
+                convert(value)
+            return column_type
+        except ValueError:
+            pass
+    return 'str'
+
+#-----------------------------
+# infer_schema
+#-----------------------
+
+def infer_schema(path, delimiter=',', num_name_columns=1, sample_rows=DEFAULT_SAMPLE_ROWS):
+    '''
+    Infer the types of a file's property columns from
+    its first sample_rows rows.
+
+    @param path: nodes or links file
+    @type path: str
+    @param delimiter: CSV column delimiter
+    @type delimiter: str
+    @param num_name_columns: leading node name columns,
+        which are not properties: 1 for a nodes file,
+        2 for a links file
+    @type num_name_columns: int
+    @param sample_rows: number of rows to look at
+    @type sample_rows: int
+    @rtype: {str : str}
+    '''
+    names = read_header(path, delimiter)[num_name_columns:]
+    sample = next(iter_row_chunks(path, delimiter, chunk_rows=sample_rows), [])
+    columns = itertools.zip_longest(*[row[num_name_columns:] for row in sample], fillvalue='')
+    schema = {name : 'str' for name in names}
+    for (name, values) in zip(names, columns):
+        schema[name] = infer_column_type(values)
+    return schema
+
+#-----------------------------
+# check_schema
+#-----------------------
+
+def check_schema(schema, columns):
+    '''
+    Raise ValueError unless every entry of the schema
+    names one of the given property columns, and has
+    one of SCHEMA_TYPES.
+
+    @param schema: {name : type}
+    @type schema: dict
+    @param columns: property column names of the input files
+    @type columns: [str]
+    '''
+    for (name, column_type) in schema.items():
+        if name not in columns:
+            raise ValueError("Schema column must be one of %s; got '%s'" % (tuple(columns), name))
+        if column_type not in SCHEMA_TYPES:
+            raise ValueError("Schema type must be one of %s; got '%s'" % (SCHEMA_TYPES, column_type))
+
+#-----------------------------
+# skipped_columns
+#-----------------------
+
+def skipped_columns(schema):
+    return frozenset(name for (name, column_type) in (schema or {}).items() if column_type == 'skip')
+
+#-----------------------------
+# apply_schema
+#-----------------------
+
+def apply_schema(properties, schema):
+    '''
+    Property columns with the types of a schema: 'skip'
+    columns are left out, and dictionary-encoded 'int'
+    and 'float' columns are wrapped as TypedColumn,
+    without decoding them. Other columns are unchanged.
+
+    @param properties: {name : column}, such as
+        GraphStore.node_properties
+    @type properties: dict
+    @param schema: {name : type}
+    @type schema: dict
+    @rtype: dict
+    '''
+    typed = {}
+    for (name, column) in properties.items():
+        column_type = schema.get(name, 'str')
+        if column_type == 'skip':
+            continue
+        if column_type in TypedColumn.DTYPES and type(column) is CategoricalColumn:
+            column = TypedColumn.from_categorical(column, column_type)
+        typed[name] = column
+    return typed
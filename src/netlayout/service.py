@@ -0,0 +1,525 @@
+#!/usr/bin/env python
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Long-running layout service, so that repeated layout
+requests neither start a new interpreter nor re-parse
+their input files.
+
+An asyncio server speaks a minimal HTTP/1.1, over TCP
+or a Unix socket, with JSON bodies:
+
+    POST /layout   {"nodes_file" : ..., "links_file" : ...,
+                    <parse options>, <layout options>}
+    GET  /status
+
+Parse options are PARSE_OPTIONS, as taken by the
+Networker constructor; layout options are LAYOUT_OPTIONS,
+as taken by Networker.compute_layout(). A layout
+response is {"nodes" : [name, ...], "positions" : [[x, y], ...]},
+with header X-Layout-Cache: hit or miss.
+
+Three levels of reuse:
+
+    - Parsed graphs stay in memory, in an LRU cache
+      keyed by the input paths and parse options. An
+      entry is used while the size and modification
+      time of both files are unchanged.
+    - Finished layouts, as encoded response bodies,
+      stay in an LRU cache keyed by the content hash
+      of the input files and all options.
+    - Concurrent requests for the same graph or layout
+      wait for the one job already running.
+
+Parsing and layouts run on a pool of worker threads;
+NumPy releases the interpreter lock in its inner loops.
+At most max_pending jobs are queued or running; beyond
+that, requests are turned away with status 503.
+
+Example:
+
+    python -m netlayout.service --socket /tmp/netlayout.sock
+    curl --unix-socket /tmp/netlayout.sock localhost/layout \\
+         -d '{"nodes_file" : "nodes.csv", "links_file" : "links.csv", "seed" : 1}'
+'''
+import argparse
+import asyncio
+import collections
+import copy
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from netlayout.create_network import Networker
+from netlayout.graph_cache import content_hash
+
+
+PARSE_OPTIONS = ('delimiter', 'merge', 'streaming', 'schema', 'infer_types')
+LAYOUT_OPTIONS = ('method', 'iterations', 'theta', 'initial', 'stop_metric',
+                  'check_every', 'min_improvement', 'components', 'seed')
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 16
+DEFAULT_MAX_LAYOUTS = 64
+DEFAULT_MAX_GRAPHS = 4
+DEFAULT_PORT = 8765
+
+# Largest request body accepted:
+MAX_BODY_BYTES = 1 << 20
+
+STATUS_TEXT = {200 : 'OK',
+               400 : 'Bad Request',
+               404 : 'Not Found',
+               405 : 'Method Not Allowed',
+               413 : 'Payload Too Large',
+               500 : 'Internal Server Error',
+               503 : 'Service Unavailable'}
+
+class ServiceBusy(RuntimeError):
+    '''
+    Raised when max_pending jobs are queued or running.
+    '''
+
+class RequestTooLarge(ValueError):
+    '''
+    Raised for request bodies over MAX_BODY_BYTES.
+    '''
+
+# ---------------------------- LRUCache -----------
+
+class LRUCache(object):
+    '''
+    Dict of at most max_entries items; storing one more
+    evicts the least recently stored or retrieved item.
+    '''
+
+    def __init__(self, max_entries):
+        if max_entries < 1:
+            raise ValueError("Cache must hold at least one entry; got %s" % max_entries)
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        '''
+        @return: the value stored under key, or None
+        '''
+        try:
+            self.entries.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def pop(self, key):
+        return self.entries.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+# ---------------------------- LayoutService -----------
+
+class LayoutService(object):
+    '''
+    Usage:
+
+        service = LayoutService(workers=2)
+        server = await service.start('/tmp/netlayout.sock')
+        await server.serve_forever()
+
+    or, without a server:
+
+        (body, cached) = await service.layout(request)
+    '''
+
+    def __init__(self, workers=DEFAULT_WORKERS,
+                       max_pending=DEFAULT_MAX_PENDING,
+                       max_layouts=DEFAULT_MAX_LAYOUTS,
+                       max_graphs=DEFAULT_MAX_GRAPHS,
+                       cache_dir=None):
+        '''
+        @param workers: worker threads for parsing and layouts
+        @type workers: int
+        @param max_pending: most jobs queued or running at once
+        @type max_pending: int
+        @param max_layouts: finished layouts kept
+        @type max_layouts: int
+        @param max_graphs: parsed graphs kept in memory
+        @type max_graphs: int
+        @param cache_dir: on-disk graph_cache.GraphCache directory
+            for graphs parsed by the service; None to disable
+        @type cache_dir: {str | None}
+        '''
+        self.executor = ThreadPoolExecutor(workers)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache_dir = cache_dir
+        # (paths, parse options) --> (networker, signature, fingerprint):
+        self.graphs = LRUCache(max_graphs)
+        # (fingerprint, options) --> encoded response body:
+        self.layouts = LRUCache(max_layouts)
+        # Futures of the jobs queued or running, by key:
+        self.running = {}
+        self.layouts_computed = 0
+
+    #-----------------------------
+    # layout
+    #-----------------------
+
+    async def layout(self, request):
+        '''
+        Layout of the graph in the request's input files,
+        from the cache if an identical request finished
+        before.
+
+        @param request: nodes_file, links_file, and options
+            from PARSE_OPTIONS and LAYOUT_OPTIONS
+        @type request: dict
+        @return: encoded JSON response body, and whether it
+            came from the cache
+        @rtype: (bytes, bool)
+        @raise ValueError: for unknown or invalid options
+        @raise IOError: for missing input files
+        @raise ServiceBusy: when too many jobs are pending
+        '''
+        (input_files, parse_options, layout_options) = split_request(request)
+        (networker, fingerprint) = await self.graph(input_files, parse_options)
+        key = ('layout', json.dumps([fingerprint, parse_options, layout_options], sort_keys=True))
+        body = self.layouts.get(key)
+        if body is not None:
+            return (body, True)
+        body = await self._once(key, compute_layout, networker, layout_options)
+        if key not in self.layouts:
+            self.layouts_computed += 1
+            self.layouts.put(key, body)
+        return (body, False)
+
+    #-----------------------------
+    # graph
+    #-----------------------
+
+    async def graph(self, input_files, parse_options):
+        '''
+        Networker of the given input files, parsed now,
+        or earlier if the files did not change since.
+
+        @return: the Networker, and the content hash of
+            its input files
+        @rtype: (create_network.Networker, str)
+        '''
+        signature = file_signature(input_files)
+        key = ('graph', json.dumps([signature[0::3], parse_options], sort_keys=True))
+        entry = self.graphs.get(key)
+        if entry is not None and entry[1] == signature:
+            return (entry[0], entry[2])
+        if entry is not None:
+            # Edited since parsed:
+            self.graphs.pop(key)
+        entry = await self._once(key, self._load_graph, input_files, parse_options, signature)
+        self.graphs.put(key, entry)
+        return (entry[0], entry[2])
+
+    def _load_graph(self, input_files, parse_options, signature):
+        # Hash before parsing, so later edits change the fingerprint:
+        fingerprint = ','.join(content_hash(path) for path in input_files)
+        networker = Networker(input_files[0],
+                              input_files[1],
+                              cache_dir=self.cache_dir,
+                              **parse_options)
+        return (networker, signature, fingerprint)
+
+    def _once(self, key, func, *args):
+        '''
+        Run func(*args) on the worker pool, unless a job
+        with the same key is already queued or running;
+        either way, return an awaitable of its result.
+        '''
+        future = self.running.get(key)
+        if future is None:
+            if len(self.running) >= self.max_pending:
+                raise ServiceBusy("%s jobs are pending; try again later." % len(self.running))
+            future = asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+            self.running[key] = future
+            future.add_done_callback(lambda _future: self.running.pop(key, None))
+        # A client that hangs up must not cancel the
+        # job for the others waiting on it:
+        return asyncio.shield(future)
+
+    #-----------------------------
+    # status
+    #-----------------------
+
+    def status(self):
+        return {'workers'          : self.workers,
+                'pending'          : len(self.running),
+                'max_pending'      : self.max_pending,
+                'graphs'           : len(self.graphs),
+                'layouts'          : len(self.layouts),
+                'layouts_computed' : self.layouts_computed,
+                'layout_hits'      : self.layouts.hits,
+                'layout_misses'    : self.layouts.misses}
+
+    #-----------------------------
+    # start
+    #-----------------------
+
+    async def start(self, address):
+        '''
+        Start serving requests.
+
+        @param address: path of a Unix socket, or (host, port)
+        @type address: {str | (str, int)}
+        @rtype: asyncio.AbstractServer
+        '''
+        if isinstance(address, str):
+            return await asyncio.start_unix_server(self.handle, path=address)
+        return await asyncio.start_server(self.handle, address[0], address[1])
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    #-----------------------------
+    # handle
+    #-----------------------
+
+    async def handle(self, reader, writer):
+        '''
+        Answer one HTTP request, and close the connection.
+        '''
+        headers = {}
+        try:
+            (method, path, body) = await read_request(reader)
+            if path not in ('/layout', '/status'):
+                (status, body) = (404, error_body("No such resource: '%s'" % path))
+            elif path == '/status':
+                (status, body) = (200, json.dumps(self.status()).encode('utf-8'))
+            elif method != 'POST':
+                (status, body) = (405, error_body("Layouts must be requested with POST."))
+            else:
+                (body, cached) = await self.layout(json.loads(body.decode('utf-8')))
+                status = 200
+                headers['X-Layout-Cache'] = 'hit' if cached else 'miss'
+        except RequestTooLarge as e:
+            (status, body) = (413, error_body(str(e)))
+        except ServiceBusy as e:
+            (status, body) = (503, error_body(str(e)))
+        except (IOError, OSError) as e:
+            (status, body) = (404, error_body(str(e)))
+        except (ValueError, TypeError) as e:
+            (status, body) = (400, error_body(str(e)))
+        except Exception as e:
+            (status, body) = (500, error_body(repr(e)))
+        try:
+            writer.write(response_bytes(status, body, headers))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+# ------------------ Jobs --------------------
+
+#-----------------------------
+# compute_layout
+#-----------------------
+
+def compute_layout(networker, layout_options):
+    '''
+    Lay out the graph of networker, and encode the
+    response body. Runs in a worker thread; the layout
+    is computed on a shallow copy, so that concurrent
+    jobs share the graph but not the positions.
+
+    @rtype: bytes
+    '''
+    layout_args = dict(layout_options)
+    if layout_args.get('method') == 'multilevel' and 'iterations' in layout_args:
+        # Multilevel layouts take their iteration count per level:
+        layout_args['refine_iterations'] = layout_args.pop('iterations')
+    worker = copy.copy(networker)
+    worker.profiler = None
+    positions = worker.compute_layout(**layout_args)
+    return json.dumps({'nodes'     : worker.graph.node_names.tolist(),
+                       'positions' : positions.tolist()}).encode('utf-8')
+
+#-----------------------------
+# split_request
+#-----------------------
+
+def split_request(request):
+    '''
+    Input files, parse options, and layout options of
+    a layout request.
+
+    @rtype: ([str], dict, dict)
+    @raise ValueError: for missing files and unknown options
+    '''
+    if not isinstance(request, dict):
+        raise ValueError("Layout requests must be JSON objects; got %s" % type(request).__name__)
+    try:
+        input_files = [os.path.abspath(request['nodes_file']), os.path.abspath(request['links_file'])]
+    except KeyError as e:
+        raise ValueError("Layout requests need nodes_file and links_file; missing %s" % e)
+    unknown = set(request) - set(PARSE_OPTIONS) - set(LAYOUT_OPTIONS) - {'nodes_file', 'links_file'}
+    if unknown:
+        raise ValueError("Unknown request options %s; expected some of %s" %
+                         (sorted(unknown), PARSE_OPTIONS + LAYOUT_OPTIONS))
+    parse_options = {name : request[name] for name in PARSE_OPTIONS if name in request}
+    layout_options = {name : request[name] for name in LAYOUT_OPTIONS if name in request}
+    return (input_files, parse_options, layout_options)
+
+def file_signature(input_files):
+    '''
+    Path, size, and modification time of each file,
+    flattened into one list.
+    '''
+    signature = []
+    for path in input_files:
+        stat = os.stat(path)
+        signature += [path, stat.st_size, stat.st_mtime_ns]
+    return signature
+
+# ------------------ HTTP --------------------
+
+async def read_request(reader):
+    '''
+    Method, path, and body of one HTTP request.
+
+    @rtype: (str, str, bytes)
+    '''
+    request_line = (await reader.readline()).decode('latin-1').split()
+    if len(request_line) < 2:
+        raise ValueError("Malformed HTTP request line: '%s'" % ' '.join(request_line))
+    (method, path) = (request_line[0].upper(), request_line[1].split('?')[0])
+    length = 0
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        (name, _sep, value) = line.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise RequestTooLarge("Request bodies are limited to %s bytes; got %s" % (MAX_BODY_BYTES, length))
+    body = await reader.readexactly(length) if length > 0 else b''
+    return (method, path, body)
+
+def response_bytes(status, body, headers=None):
+    lines = ['HTTP/1.1 %s %s' % (status, STATUS_TEXT[status]),
+             'Content-Type: application/json',
+             'Content-Length: %s' % len(body),
+             'Connection: close']
+    lines += ['%s: %s' % item for item in (headers or {}).items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+def error_body(message):
+    return json.dumps({'error' : message}).encode('utf-8')
+
+#-----------------------------
+# call_service
+#-----------------------
+
+async def call_service(address, path, request=None):
+    '''
+    Client side: send one request to a running service.
+
+    @param address: path of a Unix socket, or (host, port)
+    @type address: {str | (str, int)}
+    @param path: '/layout' or '/status'
+    @type path: str
+    @param request: body of a POST request; None for GET
+    @type request: {dict | None}
+    @return: HTTP status, response headers, and decoded body
+    @rtype: (int, dict, dict)
+    '''
+    if isinstance(address, str):
+        (reader, writer) = await asyncio.open_unix_connection(address)
+    else:
+        (reader, writer) = await asyncio.open_connection(address[0], address[1])
+    body = b'' if request is None else json.dumps(request).encode('utf-8')
+    writer.write(('%s %s HTTP/1.1\r\nHost: netlayout\r\nContent-Length: %s\r\n\r\n' %
+                  ('GET' if request is None else 'POST', path, len(body))).encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        (name, _sep, value) = line.partition(':')
+        headers[name.strip()] = value.strip()
+    body = await reader.read()
+    writer.close()
+    return (status, headers, json.loads(body.decode('utf-8')))
+
+#-----------------------------
+# serve
+#-----------------------
+
+async def serve(address, **service_args):
+    service = LayoutService(**service_args)
+    server = await service.start(address)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(prog=os.path.basename(sys.argv[0]), formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--socket',
+                        help='Serve on this Unix socket instead of TCP.',
+                        default=None)
+    parser.add_argument('--host',
+                        help='TCP interface to serve on; default: 127.0.0.1',
+                        default='127.0.0.1')
+    parser.add_argument('--port',
+                        help='TCP port to serve on; default: %s' % DEFAULT_PORT,
+                        type=int,
+                        default=DEFAULT_PORT)
+    parser.add_argument('-w', '--workers',
+                        help='Worker threads for parsing and layouts; default: %s' % DEFAULT_WORKERS,
+                        type=int,
+                        default=DEFAULT_WORKERS)
+    parser.add_argument('--max_pending',
+                        help='Most jobs queued or running before requests are turned\n' +\
+                             'away; default: %s' % DEFAULT_MAX_PENDING,
+                        type=int,
+                        default=DEFAULT_MAX_PENDING)
+    parser.add_argument('--max_layouts',
+                        help='Finished layouts kept in memory; default: %s' % DEFAULT_MAX_LAYOUTS,
+                        type=int,
+                        default=DEFAULT_MAX_LAYOUTS)
+    parser.add_argument('--max_graphs',
+                        help='Parsed graphs kept in memory; default: %s' % DEFAULT_MAX_GRAPHS,
+                        type=int,
+                        default=DEFAULT_MAX_GRAPHS)
+    parser.add_argument('--cache_dir',
+                        help='Directory for caching parsed inputs on disk; default: none',
+                        default=None)
+    args = parser.parse_args();
+    address = args.socket if args.socket is not None else (args.host, args.port)
+    try:
+        asyncio.run(serve(address,
+                          workers=args.workers,
+                          max_pending=args.max_pending,
+                          max_layouts=args.max_layouts,
+                          max_graphs=args.max_graphs,
+                          cache_dir=args.cache_dir))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,311 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Extraction of subgraphs from a GraphStore, so that
+only the part of a network an analyst asks about is
+laid out and exported:
+
+    ego networks:    the nodes up to hops links away from
+                     given center nodes, along leaving,
+                     arriving, or all links (DIRECTIONS)
+    property filter: the links whose property has one of
+                     given values, such as kind=emails
+    time window:     the links whose property lies in
+                     [start, end), such as a timestamp
+
+Filters combine: an ego network over filtered links
+only follows links that pass the filters.
+
+Ego networks grow one hop at a time from a frontier
+of newly reached nodes, whose links are sliced out of
+the CSR offsets and the reverse index of the store
+(GraphStore.out_links() and in_links()). The cost is
+therefore in the links touched, not in the size of the
+whole graph. Property filters on dictionary-encoded
+columns test each distinct value once, and gather the
+result through the codes.
+'''
+import numpy as np
+
+from netlayout.graph_store import CategoricalColumn, GraphStore, TypedColumn
+
+
+DIRECTIONS = ('both', 'out', 'in')
+
+#-----------------------------
+# parse_link_filter
+#-----------------------
+
+def parse_link_filter(specs):
+    '''
+    Turn command line filters of the form
+
+        kind=emails,calls
+
+    into {'kind' : ['emails', 'calls']}. Filters on the
+    same property are merged.
+
+    @param specs: filter strings
+    @type specs: [str]
+    @rtype: {str : [str]}
+    '''
+    link_filter = {}
+    for spec in specs:
+        (name, sep, values) = spec.partition('=')
+        if not sep or not name.strip():
+            raise ValueError("Link filters look like name=value,value,...; got '%s'" % spec)
+        link_filter.setdefault(name.strip(), []).extend(value.strip() for value in values.split(','))
+    return link_filter
+
+#-----------------------------
+# ego_nodes
+#-----------------------
+
+def ego_nodes(graph, centers, hops=1, direction='both', links=None):
+    '''
+    Node ids of the ego network of the given centers.
+
+    @param graph: the graph
+    @type graph: graph_store.GraphStore
+    @param centers: node ids of the center nodes
+    @type centers: sequence
+    @param hops: largest number of links from a center
+    @type hops: int
+    @param direction: one of DIRECTIONS: follow links that
+        leave, arrive at, or touch the reached nodes
+    @type direction: str
+    @param links: boolean mask of the links that may be
+        followed; None for all
+    @type links: {np.ndarray | None}
+    @return: sorted node ids, including the centers
+    @rtype: np.ndarray
+    '''
+    if direction not in DIRECTIONS:
+        raise ValueError("Direction must be one of %s; got '%s'" % (DIRECTIONS, direction))
+    if hops < 0:
+        raise ValueError("Hops must not be negative; got %s" % hops)
+    reached = np.zeros(graph.num_nodes, dtype=bool)
+    frontier = np.unique(np.asarray(centers, dtype=np.int64))
+    reached[frontier] = True
+    for _hop in range(hops):
+        neighbors = []
+        if direction != 'in':
+            positions = graph.out_links(frontier)
+            if links is not None:
+                positions = positions[links[positions]]
+            neighbors.append(graph.dst[positions])
+        if direction != 'out':
+            positions = graph.in_links(frontier)
+            if links is not None:
+                positions = positions[links[positions]]
+            neighbors.append(graph.src[positions])
+        neighbors = np.concatenate(neighbors)
+        frontier = np.unique(neighbors[~reached[neighbors]])
+        if len(frontier) == 0:
+            break
+        reached[frontier] = True
+    return np.flatnonzero(reached)
+
+#-----------------------------
+# match_links
+#-----------------------
+
+def match_links(column, values):
+    '''
+    Boolean mask of the rows of a property column whose
+    value is one of the given ones. Values of typed and
+    numeric columns are compared as numbers.
+
+    @param column: a property column of a GraphStore
+    @type column: {NumericColumn | CategoricalColumn | TypedColumn}
+    @param values: the values to keep, as strings or numbers
+    @type values: sequence
+    @rtype: np.ndarray
+    '''
+    if isinstance(column, TypedColumn):
+        (parsed, valid) = column.parsed_categories()
+        wanted = np.array([_to_number(value, column.column_type) for value in values], dtype=parsed.dtype)
+        # The extra last entry, for missing rows, is never valid:
+        return (valid & np.isin(parsed, wanted))[column.codes]
+    if isinstance(column, CategoricalColumn):
+        categories = np.asarray(column.categories, dtype=str)
+        wanted = np.array([str(value) for value in values], dtype=str)
+        return np.append(np.isin(categories, wanted), False)[column.codes]
+    wanted = np.array([_to_number(value, 'float') for value in values])
+    return np.isin(column.to_array(), wanted)
+
+#-----------------------------
+# window_links
+#-----------------------
+
+def window_links(column, start=None, end=None):
+    '''
+    Boolean mask of the rows of a property column whose
+    value v has start <= v < end. Typed and numeric
+    columns compare numbers, and so do string columns
+    whose values all are numbers. Other string columns
+    compare strings, bounds included, which orders ISO
+    8601 dates and times correctly. String columns with
+    both numbers and other values raise ValueError, as
+    they order neither way. Rows without a value, or
+    with an empty one, are never in the window.
+
+    @param column: a property column of a GraphStore
+    @type column: {NumericColumn | CategoricalColumn | TypedColumn}
+    @param start: least value, or None for no lower bound
+    @type start: {str | float | None}
+    @param end: value just past the window, or None for no
+        upper bound
+    @type end: {str | float | None}
+    @rtype: np.ndarray
+    '''
+    if isinstance(column, TypedColumn):
+        (values, inside) = column.parsed_categories()
+        inside = inside.copy()
+        column_type = column.column_type
+    elif isinstance(column, CategoricalColumn):
+        values = np.asarray(column.categories, dtype=str)
+        column_type = None
+        # Empty fields have no value:
+        inside = values != ''
+        numbers = _as_numbers(values[inside])
+        if numbers is not None and len(numbers):
+            # Numbers parsed without a schema; as strings,
+            # '999' would sort after '2000':
+            values = np.full(len(values), np.nan)
+            values[inside] = numbers
+            column_type = 'float'
+        elif any(_as_numbers([value]) is not None for value in values[inside]):
+            raise ValueError("Property column values are partly numbers, partly not, so window (%s, %s) "
+                             "has no consistent order; give the column's type with --schema or --infer_types."
+                             % (start, end))
+    else:
+        values = column.to_array()
+        inside = ~np.isnan(values)
+        column_type = 'float'
+    if start is not None:
+        inside &= values >= (str(start) if column_type is None else _to_number(start, column_type))
+    if end is not None:
+        inside &= values < (str(end) if column_type is None else _to_number(end, column_type))
+    if isinstance(column, TypedColumn):
+        return inside[column.codes]
+    if isinstance(column, CategoricalColumn):
+        return np.append(inside, False)[column.codes]
+    return inside
+
+def _as_numbers(values):
+    '''
+    The strings as a float array, or None if any of
+    them is not a number.
+    '''
+    try:
+        return np.asarray(values, dtype=str).astype(np.float64)
+    except ValueError:
+        return None
+
+def _to_number(value, column_type):
+    try:
+        return float(value) if column_type == 'float' else int(value)
+    except (ValueError, TypeError):
+        raise ValueError("Value '%s' is not a number, as the %s property column needs." % (value, column_type))
+
+#-----------------------------
+# select_links
+#-----------------------
+
+def select_links(graph, link_filter=None, window=None):
+    '''
+    Boolean mask of the links that pass all of the given
+    filters, or None without filters.
+
+    @param graph: the graph
+    @type graph: graph_store.GraphStore
+    @param link_filter: {link property : values to keep}
+    @type link_filter: {dict | None}
+    @param window: (link property, start, end), with None
+        for an open bound; see window_links()
+    @type window: {(str, object, object) | None}
+    @rtype: {np.ndarray | None}
+    '''
+    links = None
+    filters = [(name, match_links, (values,)) for (name, values) in (link_filter or {}).items()]
+    if window is not None:
+        filters.append((window[0], window_links, tuple(window[1:])))
+    for (name, func, args) in filters:
+        if name not in graph.link_properties:
+            raise ValueError("Link property must be one of %s; got '%s'" % (tuple(graph.link_properties), name))
+        mask = func(graph.link_properties[name], *args)
+        links = mask if links is None else links & mask
+    return links
+
+#-----------------------------
+# extract_subgraph
+#-----------------------
+
+def extract_subgraph(graph, nodes=None, links=None):
+    '''
+    The subgraph of the given nodes and links. With
+    nodes, the links between them are kept, as far as
+    they are in links; without, the given links and
+    their end points are kept.
+
+    The subgraph keeps the CSR order, the weights, the
+    input order of the links, and the node and link
+    properties of the graph. Its node
+    ids are dense again; the second return value maps
+    them back to the node ids of the graph.
+
+    @param graph: the graph
+    @type graph: graph_store.GraphStore
+    @param nodes: ids of the nodes to keep, or None
+    @type nodes: {np.ndarray | None}
+    @param links: boolean mask of the links to keep, or None
+    @type links: {np.ndarray | None}
+    @return: the subgraph, and the graph's node id of
+        each of its nodes
+    @rtype: (graph_store.GraphStore, np.ndarray)
+    '''
+    if nodes is None and links is None:
+        raise ValueError("A subgraph needs nodes, links, or both.")
+    if nodes is not None:
+        node_ids = np.unique(np.asarray(nodes, dtype=np.int64))
+        # Leaving links of the nodes, in CSR order, whose
+        # destination is among the nodes:
+        positions = graph.out_links(node_ids)
+        dst = graph.dst[positions]
+        slots = np.minimum(np.searchsorted(node_ids, dst), max(len(node_ids) - 1, 0))
+        positions = positions[node_ids[slots] == dst] if len(node_ids) else positions
+        if links is not None:
+            positions = positions[links[positions]]
+    else:
+        positions = np.flatnonzero(links)
+        node_ids = np.unique(np.concatenate([graph.src[positions], graph.dst[positions]])).astype(np.int64)
+
+    (missing_weight, input_order) = (None, None)
+    if graph.missing_weight is not None:
+        missing_weight = graph.missing_weight[positions]
+    if graph.input_order is not None:
+        # The graph's input order, restricted to the kept links;
+        # positions are ascending:
+        kept = np.zeros(graph.num_edges, dtype=bool)
+        kept[positions] = True
+        input_order = np.searchsorted(positions, graph.input_order[kept[graph.input_order]])
+
+    src = np.searchsorted(node_ids, graph.src[positions]).astype(np.int32)
+    dst = np.searchsorted(node_ids, graph.dst[positions]).astype(np.int32)
+    indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(node_ids)), out=indptr[1:])
+    subgraph = GraphStore.from_csr(graph.node_names[node_ids],
+                                   src,
+                                   dst,
+                                   graph.weight[positions],
+                                   indptr,
+                                   node_properties={name : column.take(node_ids)
+                                                    for (name, column) in graph.node_properties.items()},
+                                   link_properties={name : column.take(positions)
+                                                    for (name, column) in graph.link_properties.items()},
+                                   missing_weight=missing_weight,
+                                   input_order=input_order)
+    return (subgraph, node_ids)
@@ -0,0 +1,89 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import functools
+import unittest
+
+import numpy as np
+
+from netlayout.barnes_hut import QuadTree, barnes_hut_displacement
+from netlayout.layout import repulsive_displacement, spring_layout
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestBarnesHut(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.pos = np.random.default_rng(7).random((500, 2))
+
+    #-----------------------------
+    # test_quadtree
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_quadtree(self):
+        tree = QuadTree(self.pos)
+        root = tree.levels[0]
+        self.assertEqual(root.counts.tolist(), [500])
+        self.assertTrue(np.allclose([root.com_x[0], root.com_y[0]], self.pos.mean(axis=0)))
+        # Every level accounts for every point, and
+        # the deepest level separates all of them:
+        for level in tree.levels:
+            self.assertEqual(level.counts.sum(), 500)
+        self.assertEqual(tree.levels[-1].counts.max(), 1)
+
+        (parents, children) = tree.child_cells(0, np.array([0]))
+        self.assertEqual(tree.levels[1].counts[children].sum(), 500)
+        self.assertTrue(np.all(parents == 0))
+
+    #-----------------------------
+    # test_accuracy
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_accuracy(self):
+        exact = repulsive_displacement(self.pos, 0.05)
+        # theta of zero opens every cell:
+        self.assertTrue(np.allclose(barnes_hut_displacement(self.pos, 0.05, theta=0.0), exact))
+
+        approx = barnes_hut_displacement(self.pos, 0.05, theta=0.5, batch_size=64)
+        self.assertLess(np.linalg.norm(approx - exact) / np.linalg.norm(exact), 0.01)
+
+    #-----------------------------
+    # test_coinciding_nodes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_coinciding_nodes(self):
+        pos = np.vstack([self.pos[:50], self.pos[:50]])
+        # Duplicates share a deepest-level cell:
+        displacement = barnes_hut_displacement(pos, 0.05, theta=0.0, max_depth=8)
+        self.assertTrue(np.allclose(displacement, repulsive_displacement(pos, 0.05)))
+        self.assertTrue(np.all(np.isfinite(barnes_hut_displacement(pos, 0.05, max_depth=8))))
+
+    #-----------------------------
+    # test_layout
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_layout(self):
+        src = np.arange(99)
+        dst = np.arange(1, 100)
+        pos = spring_layout(src, dst, 100,
+                            iterations=30,
+                            repulsion=functools.partial(barnes_hut_displacement, theta=0.8),
+                            seed=2)
+        self.assertEqual(pos.shape, (100, 2))
+        self.assertTrue(np.all(np.isfinite(pos)))
+        # Linked nodes end up closer than the path's ends:
+        self.assertLess(np.linalg.norm(pos[1:] - pos[:-1], axis=1).mean(),
+                        np.linalg.norm(pos[0] - pos[-1]))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
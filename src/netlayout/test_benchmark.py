@@ -0,0 +1,125 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.benchmark import STAGES, find_regressions, generate_links, run_suite, write_graph_files
+from netlayout.components import connected_components
+from netlayout.zipcodes import ZIPCODE_SPACE
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_benchmark_')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_generate_links
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_generate_links(self):
+        for shape in ('erdos_renyi', 'scale_free'):
+            (src, dst) = generate_links(shape, 500, 2000, seed=1)
+            self.assertEqual(len(src), 2000)
+            self.assertFalse((src == dst).any())
+            self.assertTrue(src.max() < 500 and dst.max() < 500)
+
+        # Scale-free hubs are far above the mean degree:
+        (src, dst) = generate_links('scale_free', 500, 2000, seed=1)
+        self.assertTrue(np.bincount(np.concatenate([src, dst])).max() > 40)
+
+        (src, dst) = generate_links('components', 95, 200, seed=1, component_size=10)
+        self.assertFalse((src == dst).any())
+        (_labels, sizes) = connected_components(src, dst, 95)
+        self.assertEqual(sorted(sizes.tolist()), [5] + [10] * 9)
+
+        # Reproducible:
+        self.assertTrue(np.array_equal(generate_links('erdos_renyi', 50, 100, seed=3)[0],
+                                       generate_links('erdos_renyi', 50, 100, seed=3)[0]))
+        with self.assertRaises(ValueError):
+            generate_links('lattice', 50, 100)
+
+    #-----------------------------
+    # test_write_graph_files
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_write_graph_files(self):
+        (nodes_file, links_file) = write_graph_files(self.tmp_dir, 'erdos_renyi', 20, 50, seed=0)
+        with open(nodes_file, 'r') as fd:
+            rows = list(csv.reader(fd))
+        self.assertEqual(rows[0], ['nodeID', 'role'])
+        self.assertEqual(len(rows), 21)
+        with open(links_file, 'r') as fd:
+            rows = list(csv.reader(fd))
+        self.assertEqual(rows[0], ['src', 'dst', 'weight', 'kind'])
+        self.assertEqual(len(rows), 51)
+
+    #-----------------------------
+    # test_run_suite
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_run_suite(self):
+        report = run_suite(node_counts=(60,), degree=3, iterations=2, work_dir=self.tmp_dir)
+        self.assertEqual([case['name'] for case in report['cases']],
+                         ['erdos_renyi_60', 'scale_free_60', 'components_60'])
+        for case in report['cases']:
+            self.assertEqual(sorted(case['seconds']), sorted(STAGES))
+            self.assertTrue(all(seconds >= 0 for seconds in case['seconds'].values()))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, 'export_nodes.csv')))
+
+    #-----------------------------
+    # test_run_suite_many_nodes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_run_suite_many_nodes(self):
+        # Up to ZIPCODE_SPACE nodes, each gets a zip code;
+        # beyond, zip codes and export are skipped:
+        report = run_suite(shapes=('erdos_renyi',), node_counts=(99500, ZIPCODE_SPACE + 1),
+                           degree=1, iterations=1, work_dir=self.tmp_dir)
+        (fits, too_many) = report['cases']
+        self.assertEqual(sorted(fits['seconds']), sorted(STAGES))
+        self.assertNotIn('skipped', fits)
+        self.assertEqual(sorted(too_many['seconds']), ['build', 'ingest', 'layout'])
+        self.assertEqual(too_many['skipped']['stages'], ['zipcodes', 'export'])
+        self.assertIn(str(ZIPCODE_SPACE), too_many['skipped']['reason'])
+
+    #-----------------------------
+    # test_find_regressions
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_find_regressions(self):
+        baseline = {'cases' : [{'name' : 'a', 'seconds' : {'layout' : 1.0, 'export' : 0.01}}]}
+        report = {'cases' : [{'name' : 'a', 'seconds' : {'layout' : 1.2, 'export' : 0.03}},
+                             {'name' : 'b', 'seconds' : {'layout' : 9.0}}]}
+        # Within tolerance, or too few seconds to count:
+        self.assertEqual(find_regressions(report, baseline), [])
+
+        regressions = find_regressions(report, baseline, tolerance=0.1)
+        self.assertEqual([(regression['case'], regression['stage']) for regression in regressions],
+                         [('a', 'layout')])
+        self.assertAlmostEqual(regressions[0]['ratio'], 1.2)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
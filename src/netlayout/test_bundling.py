@@ -0,0 +1,130 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.bundling import bundle_edges, compatibility, compatible_pairs
+from netlayout.create_network import Networker
+from netlayout.export import write_path_table
+from netlayout.test_zipcodes import write_zipcode_source
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestBundling(unittest.TestCase):
+
+    #-----------------------------
+    # test_compatibility
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_compatibility(self):
+        p0 = np.array([[0.0, 0.0], [0.0, 0.0], [0.0, 0.0], [0.0, 0.0]])
+        p1 = np.array([[1.0, 0.0], [1.0, 0.0], [1.0, 0.0], [1.0, 0.0]])
+        # Same link; perpendicular; far away; zero length:
+        q0 = np.array([[1.0, 0.0], [0.5, -0.5], [0.0, 10.0], [0.3, 0.3]])
+        q1 = np.array([[0.0, 0.0], [0.5, 0.5], [1.0, 10.0], [0.3, 0.3]])
+        scores = compatibility(p0, p1, q0, q1)
+        self.assertAlmostEqual(scores[0], 1.0)
+        self.assertAlmostEqual(scores[1], 0.0)
+        self.assertTrue(0.0 < scores[2] < 0.1)
+        self.assertEqual(scores[3], 0.0)
+
+    #-----------------------------
+    # test_compatible_pairs
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_compatible_pairs(self):
+        rng = np.random.default_rng(3)
+        p0 = rng.random((300, 2))
+        p1 = p0 + rng.normal(size=(300, 2)) * rng.choice([0.02, 0.05, 0.2], (300, 1))
+        (link, partner, score) = compatible_pairs(p0, p1, max_partners=300, max_cell_candidates=300)
+        # The grid finds what comparing all pairs finds:
+        (i, j) = np.triu_indices(300, 1)
+        keep = compatibility(p0[i], p1[i], p0[j], p1[j]) >= 0.6
+        expected = set(zip(i[keep].tolist(), j[keep].tolist()))
+        self.assertTrue(expected)
+        self.assertEqual(set(zip(link.tolist(), partner.tolist())),
+                         expected | {(b, a) for (a, b) in expected})
+        self.assertTrue((np.diff(link) >= 0).all() and (score >= 0.6).all())
+
+        (link, _partner, _score) = compatible_pairs(p0, p1, max_partners=1)
+        self.assertEqual(len(link), len(np.unique(link)))
+
+    #-----------------------------
+    # test_bundle_edges
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_bundle_edges(self):
+        # Links between two clusters, plus a self loop:
+        rng = np.random.default_rng(0)
+        pos = np.vstack([np.column_stack([0.1 * rng.random(20), rng.random(20)]),
+                         np.column_stack([1.0 + 0.1 * rng.random(20), rng.random(20)])])
+        src = np.append(np.arange(20), 0)
+        dst = np.append(np.arange(20, 40), 0)
+        paths = bundle_edges(src, dst, pos, cycles=3, seed=1)
+        self.assertEqual(paths.shape, (21, 9, 2))
+        self.assertTrue(np.allclose(paths[:, 0], pos[src]) and np.allclose(paths[:, -1], pos[dst]))
+        middles = paths[:20, 4, 1]
+        self.assertTrue(middles.std() < 0.2 * pos[:20, 1].std())
+        self.assertTrue(np.allclose(paths[20], pos[0]))
+        with self.assertRaises(ValueError):
+            bundle_edges(src, dst, pos, cycles=0)
+
+    #-----------------------------
+    # test_path_tables
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_path_tables(self):
+        tmp_dir = tempfile.mkdtemp(prefix='netlayout_bundling_')
+        try:
+            paths = np.array([[[0.0, 0.0], [0.5, 0.25], [1.0, 0.0]],
+                              [[1.0, 1.0], [1.5, 1.0], [2.0, 1.0]]], dtype=np.float32)
+            path_file = os.path.join(tmp_dir, 'paths.csv')
+            self.assertEqual(write_path_table(path_file, paths, chunk_rows=1), 6)
+            with open(path_file, 'r') as fd:
+                rows = list(csv.reader(fd))
+            self.assertEqual(rows[0], ['link_id', 'path_order', 'x', 'y'])
+            self.assertEqual(rows[2], ['0', '2', '0.5', '0.25'])
+            self.assertEqual(rows[4], ['1', '1', '1.0', '1.0'])
+
+            (nodes_file, links_file, source) = [os.path.join(tmp_dir, name)
+                                                for name in ('nodes.csv', 'links.csv', 'zips.csv')]
+            with open(nodes_file, 'w') as fd:
+                fd.write('nodeID\n')
+            with open(links_file, 'w') as fd:
+                fd.write('src,dst\nu1,u2\nu2,u3\nu1,u3\n')
+            write_zipcode_source(source)
+            networker = Networker(nodes_file, links_file, streaming=True)
+            with self.assertRaises(ValueError):
+                networker.bundle_edges()
+            networker.compute_layout('spring', iterations=5, seed=1)
+            networker.bundle_edges(cycles=2, seed=1)
+            self.assertEqual(networker.edge_paths.shape, (3, 5, 2))
+            networker.internalize_zipcodes(source, os.path.join(tmp_dir, 'table'))
+            networker.assign_zipcodes(seed=1)
+            written = networker.export_converted_input(os.path.join(tmp_dir, 'out.csv'))
+            self.assertEqual(os.path.basename(written[-1]), 'out_paths.csv')
+            with open(written[-1], 'r') as fd:
+                self.assertEqual(len(fd.readlines()), 1 + 3 * 5)
+            # A new layout drops the paths of the old one:
+            networker.compute_layout('spring', iterations=5, seed=2)
+            self.assertIsNone(networker.edge_paths)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
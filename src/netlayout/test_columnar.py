@@ -0,0 +1,160 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.columnar import pa, write_columns
+from netlayout.create_network import Networker
+from netlayout.graph_store import CategoricalColumn
+from netlayout.test_zipcodes import write_zipcode_source
+
+if pa is not None:
+    import pyarrow.parquet as pq
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_columnar_')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_write_columns
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_write_columns(self):
+        columns = [np.arange(5, dtype=np.int32),
+                   np.array([1.5, np.nan, 3.0, 4.0, 5.0]),
+                   CategoricalColumn.from_values(['x', None, 'y', 'x', 'x'])]
+        for file_format in ('parquet', 'arrow'):
+            path = os.path.join(self.tmp_dir, 'table.' + file_format)
+            self.assertEqual(write_columns(path, ['id', 'value', 'kind'], columns, file_format, chunk_rows=2), 5)
+            table = read_table(path, file_format)
+            self.assertEqual(table.schema.field('id').type, pa.int32())
+            self.assertEqual(table.column('value').to_pylist(), [1.5, None, 3.0, 4.0, 5.0])
+            self.assertTrue(pa.types.is_dictionary(table.schema.field('kind').type))
+            self.assertEqual(table.column('kind').to_pylist(), ['x', None, 'y', 'x', 'x'])
+        with self.assertRaises(ValueError):
+            write_columns(path, ['id'], columns, 'arrow')
+        with self.assertRaises(ValueError):
+            write_columns(path, ['id', 'value', 'kind'], columns, 'hyper')
+
+    #-----------------------------
+    # test_export_columnar
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_export_columnar(self):
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID,role\nuser1,instructor\nuser2,student\nuser3,student\n')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst,weight,kind\n' +
+                     'user1,user2,1.0,emails\n' +
+                     'user3,user1,2.0,\n' +
+                     'user2,user3,0.5,emails\n')
+        networker = Networker(nodes_file, links_file, streaming=True, chunk_rows=2)
+        positions = networker.compute_layout(iterations=10, seed=0)
+        base = os.path.join(self.tmp_dir, 'out')
+        written = networker.export_columnar(base)
+        self.assertEqual(written, [base + '_nodes.parquet', base + '_links.parquet', base + '_paths.parquet'])
+
+        nodes = read_table(written[0], 'parquet')
+        self.assertEqual(nodes.column_names, ['node_id', 'node', 'x', 'y', 'role'])
+        self.assertEqual(nodes.column('node').to_pylist(), ['user1', 'user2', 'user3'])
+        self.assertEqual(nodes.column('x').to_pylist(), positions[:, 0].tolist())
+
+        # Links in input order:
+        links = read_table(written[1], 'parquet')
+        self.assertEqual(links.schema.field('src').type, pa.int32())
+        self.assertEqual(links.column('weight').to_pylist(), [1.0, 2.0, 0.5])
+        self.assertEqual(links.column('kind').to_pylist(), ['emails', '', 'emails'])
+        link_ids = links.column('link_id').to_pylist()
+        self.assertEqual(links.column('src').to_pylist(), networker.graph.src[link_ids].tolist())
+
+        paths = read_table(written[2], 'parquet')
+        self.assertEqual(paths.num_rows, 6)
+        self.assertEqual(paths.column('link_id').to_pylist(), [0, 0, 1, 1, 2, 2])
+        self.assertEqual(paths.column('path_order').to_pylist(), [1, 2] * 3)
+        graph = networker.graph
+        node_ids = paths.column('node_id').to_pylist()
+        self.assertEqual(node_ids[0::2], graph.src.tolist())
+        self.assertEqual(node_ids[1::2], graph.dst.tolist())
+        self.assertEqual(paths.column('y').to_pylist(), positions[node_ids, 1].tolist())
+
+        # With zip codes, in Arrow IPC format:
+        source = os.path.join(self.tmp_dir, 'zip_code_database.csv')
+        write_zipcode_source(source)
+        networker.internalize_zipcodes(source, os.path.join(self.tmp_dir, 'table'))
+        networker.place_zipcodes()
+        written = networker.export_columnar(base, file_format='arrow')
+        nodes = read_table(written[0], 'arrow')
+        self.assertEqual(nodes.column('zipcode').to_pylist(), networker.node_to_zipcode.tolist())
+        self.assertEqual(nodes.column('latitude').to_pylist(),
+                         networker.zipcode_table.lat[networker.node_zipcode_rows].tolist())
+
+        # Bundled links, with node ids only at the ends:
+        networker.bundle_edges(cycles=2, seed=0)
+        paths = read_table(networker.export_columnar(base)[2], 'parquet')
+        self.assertEqual(paths.num_rows, 15)
+        self.assertEqual(paths.column('path_order').to_pylist()[:5], [1, 2, 3, 4, 5])
+        self.assertEqual(paths.column('node_id').to_pylist()[:5], [graph.src[0], None, None, None, graph.dst[0]])
+
+    #-----------------------------
+    # test_export_columnar_input_format
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_export_columnar_input_format(self):
+        # Links in input order, as in the CSV export, and
+        # weights the input did not give are null, parsed
+        # or from the cache:
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID\nuser1\nuser2\nuser3\n')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst,weight,kind\n' +
+                     'user3,user1,2.0,upvotes\n' +
+                     'user1,user2,,emails\n' +
+                     'user2,user3,0.5,emails\n' +
+                     'user1,user3,4.0,\n')
+        base = os.path.join(self.tmp_dir, 'out')
+        for (streaming, cache_dir) in ((True, None), (False, None), (True, self.tmp_dir), (True, self.tmp_dir)):
+            networker = Networker(nodes_file, links_file, streaming=streaming, chunk_rows=3, cache_dir=cache_dir)
+            links = read_table(networker.export_columnar(base, file_format='arrow')[1], 'arrow')
+            names = networker.graph.node_names
+            self.assertEqual([[names[src], names[dst]] for (src, dst) in zip(links.column('src').to_pylist(),
+                                                                               links.column('dst').to_pylist())],
+                             [['user3', 'user1'], ['user1', 'user2'], ['user2', 'user3'], ['user1', 'user3']])
+            self.assertEqual(links.column('weight').to_pylist(), [2.0, None, 0.5, 4.0])
+            self.assertEqual(links.column('kind').to_pylist(), ['upvotes', 'emails', 'emails', ''])
+
+# ------------------ Utilities --------------------
+
+def read_table(path, file_format):
+    if file_format == 'parquet':
+        return pq.read_table(path)
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,131 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.communities import detect_communities, modularity, move_nodes
+from netlayout.create_network import Networker
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestCommunities(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_communities_')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_modularity
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_modularity(self):
+        # Two triangles joined by one link:
+        src = np.array([0, 1, 2, 3, 4, 5, 2])
+        dst = np.array([1, 2, 0, 4, 5, 3, 3])
+        membership = np.array([0, 0, 0, 1, 1, 1])
+        self.assertAlmostEqual(modularity(src, dst, None, membership), 6.0 / 7 - 0.5)
+        self.assertAlmostEqual(modularity(src, dst, None, np.zeros(6, dtype=int)), 0.0)
+        (found, num_communities) = move_nodes(src, dst, np.ones(7), 6, seed=1)
+        self.assertEqual(num_communities, 2)
+        self.assertEqual(len(set(found[:3].tolist())), 1)
+        self.assertEqual(len(set(found[3:].tolist())), 1)
+
+    #-----------------------------
+    # test_hierarchy
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_hierarchy(self):
+        (src, dst, groups) = planted_partition(num_groups=20, group_size=30, seed=0)
+        hierarchy = detect_communities(src, dst, len(groups), seed=1)
+        self.assertTrue(hierarchy.num_levels >= 1)
+        finest = hierarchy.membership(0)
+        top = hierarchy.membership(hierarchy.num_levels - 1)
+        self.assertTrue(modularity(src, dst, None, top) > 0.9 * modularity(src, dst, None, groups))
+        for level in range(hierarchy.num_levels - 1):
+            self.assertTrue(np.array_equal(hierarchy.parents(level)[hierarchy.membership(level)],
+                                           hierarchy.membership(level + 1)))
+        coarsest = hierarchy.levels[-1]
+        self.assertEqual(coarsest['size'].sum(), len(groups))
+        # Links between communities carry the weight of the
+        # links between their members:
+        between = hierarchy.membership(hierarchy.num_levels - 1)
+        self.assertEqual(coarsest['weight'].sum(), (between[src] != between[dst]).sum())
+        self.assertTrue((hierarchy.parents(hierarchy.num_levels - 1) == -1).all())
+
+        pos = np.random.default_rng(2).random((len(groups), 2))
+        (centroids, radii) = hierarchy.positions(0, pos)
+        members = np.flatnonzero(finest == 0)
+        self.assertTrue(np.allclose(centroids[0], pos[members].mean(axis=0)))
+        self.assertAlmostEqual(radii[0], np.sqrt(((pos[members] - centroids[0]) ** 2).sum(axis=1).mean()))
+
+    #-----------------------------
+    # test_networker_views
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_views(self):
+        (src, dst, groups) = planted_partition(num_groups=5, group_size=10, seed=3)
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID\n')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst\n' + ''.join('n%s,n%s\n' % pair for pair in zip(src, dst)))
+        networker = Networker(nodes_file, links_file, streaming=True)
+        with self.assertRaises(ValueError):
+            networker.export_community_views(os.path.join(self.tmp_dir, 'out'))
+        networker.compute_layout('spring', iterations=10, seed=1)
+        hierarchy = networker.detect_communities(seed=1)
+        written = networker.export_community_views(os.path.join(self.tmp_dir, 'out'))
+        self.assertEqual([os.path.basename(path) for path in written[:2]],
+                         ['out_level1_nodes.csv', 'out_level1_links.csv'])
+        self.assertEqual(os.path.basename(written[-1]), 'out_membership.csv')
+
+        rows = read_csv(written[0])
+        self.assertEqual(list(rows[0]), ['community', 'parent', 'size', 'volume', 'x', 'y', 'radius'])
+        self.assertEqual(sum(int(row['size']) for row in rows), len(groups))
+        membership = read_csv(written[-1])
+        self.assertEqual(len(membership), networker.graph.num_nodes)
+        node_id = networker.graph.node_id('n7')
+        self.assertEqual(int(membership[node_id]['community_1']), hierarchy.membership(0)[node_id])
+
+# ------------------ Utilities --------------------
+
+def planted_partition(num_groups, group_size, seed):
+    '''
+    Links of which nine in ten stay within a group.
+    '''
+    rng = np.random.default_rng(seed)
+    num_nodes = num_groups * group_size
+    groups = np.repeat(np.arange(num_groups), group_size)
+    num_links = 6 * num_nodes
+    src = rng.integers(0, num_nodes, num_links)
+    dst = np.where(rng.random(num_links) < 0.9,
+                   groups[src] * group_size + rng.integers(0, group_size, num_links),
+                   rng.integers(0, num_nodes, num_links))
+    keep = src != dst
+    return (src[keep], dst[keep], groups)
+
+def read_csv(path):
+    with open(path, 'r') as fd:
+        return list(csv.DictReader(fd))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,89 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import unittest
+
+import numpy as np
+
+from netlayout.components import _batch_components, connected_components, layout_components
+from netlayout.multilevel import multilevel_layout
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestComponents(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        # Components {0,1,2,3}, {4,5}, {6}, {7,8,9}, in scrambled link order:
+        self.src = np.array([3, 4, 7, 0, 9, 2])
+        self.dst = np.array([2, 5, 8, 1, 8, 1])
+        self.num_nodes = 10
+
+    #-----------------------------
+    # test_connected_components
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_connected_components(self):
+        (labels, sizes) = connected_components(self.src, self.dst, self.num_nodes)
+        self.assertEqual(sizes.tolist(), [4, 3, 2, 1])
+        self.assertEqual(labels.tolist(), [0, 0, 0, 0, 2, 2, 3, 1, 1, 1])
+
+        # A long path needs many hooking rounds:
+        path = np.arange(999)
+        (labels, sizes) = connected_components(path[::-1], path[::-1] + 1, 1000)
+        self.assertEqual(sizes.tolist(), [1000])
+
+    #-----------------------------
+    # test_batches
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_batches(self):
+        self.assertEqual(list(_batch_components([50, 10, 3, 3, 3, 1], 6)),
+                         [(0, 1), (1, 2), (2, 4), (4, 6)])
+
+    #-----------------------------
+    # test_layout_components
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_layout_components(self):
+        pos = layout_components(self.src, self.dst, self.num_nodes,
+                                processes=1, batch_nodes=2, iterations=30, seed=5)
+        self.assertEqual(pos.shape, (self.num_nodes, 2))
+        self.assertAlmostEqual(np.abs(pos).max(), 1.0)
+
+        # Packed bounding boxes do not overlap:
+        (labels, _sizes) = connected_components(self.src, self.dst, self.num_nodes)
+        boxes = [(pos[labels == c].min(axis=0), pos[labels == c].max(axis=0)) for c in range(4)]
+        for first in range(4):
+            for second in range(first + 1, 4):
+                ((low1, high1), (low2, high2)) = (boxes[first], boxes[second])
+                overlap = np.all(low1 <= high2) and np.all(low2 <= high1)
+                self.assertFalse(overlap, "Components %s and %s overlap" % (first, second))
+
+    #-----------------------------
+    # test_process_pool
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_process_pool(self):
+        inline = layout_components(self.src, self.dst, self.num_nodes,
+                                   processes=1, batch_nodes=2, iterations=30, seed=5)
+        pooled = layout_components(self.src, self.dst, self.num_nodes,
+                                   processes=2, batch_nodes=2, iterations=30, seed=5)
+        self.assertTrue(np.allclose(inline, pooled))
+
+        pos = layout_components(self.src, self.dst, self.num_nodes,
+                                layout_func=multilevel_layout,
+                                processes=2, batch_nodes=2, min_nodes=2, seed=5)
+        self.assertTrue(np.all(np.isfinite(pos)))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
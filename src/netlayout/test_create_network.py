@@ -5,37 +5,49 @@ Created on Nov 18, 2017
 '''
 import csv
 import os
+import shutil
+import tempfile
 import unittest
 
-from wheel.signatures import assertTrue
-
-from overlay.build_zipcode_overlay import Networker
+from netlayout.create_network import Networker
+from netlayout.test_zipcodes import write_zipcode_source
 
 
 TEST_ALL = True
 #TEST_ALL = False
 
+# Input and output files of the tests:
+TEST_DIR = tempfile.mkdtemp(prefix='netlayout_overlay_')
+
 class TestZipOverlayer(unittest.TestCase):
 
-    TEST_FILE_ONE_COL  = os.path.join(os.path.dirname(__file__), 'test_one_col.csv')
-    TEST_FILE_TWO_COLS = os.path.join(os.path.dirname(__file__), 'test_two_cols.csv')
-    TEST_FILE_TWO_COLS_EXTRA_COLS = os.path.join(os.path.dirname(__file__), 'test_two_cols_extras.csv')
+    TEST_FILE_ONE_COL  = os.path.join(TEST_DIR, 'test_one_col.csv')
+    TEST_FILE_TWO_COLS = os.path.join(TEST_DIR, 'test_two_cols.csv')
+    TEST_FILE_TWO_COLS_EXTRA_COLS = os.path.join(TEST_DIR, 'test_two_cols_extras.csv')
+    # Nodes file and links file with headers only:
+    TEST_FILE_NO_NODES = os.path.join(TEST_DIR, 'test_no_nodes.csv')
+    TEST_FILE_NO_LINKS = os.path.join(TEST_DIR, 'test_no_links.csv')
+    TEST_ZIPCODE_SOURCE = os.path.join(TEST_DIR, 'zip_code_database.csv')
     
     @classmethod
     def setUpClass(cls):
         super(TestZipOverlayer, cls).setUpClass()
         cls.build_test_files()
-        outfile = os.path.join(os.path.dirname(__file__), 'output_test.csv')
+        outfile = os.path.join(TEST_DIR, 'output_test.csv')
         # Ensure test outfile doesn't exist
         try:
             os.remove(outfile)
         except OSError:
             pass
-        
-        
+    
+    @classmethod
+    def tearDownClass(cls):
+        super(TestZipOverlayer, cls).tearDownClass()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+    
     def setUp(self):
         unittest.TestCase.setUp(self)
-        self.outfile = os.path.join(os.path.dirname(__file__), 'output_test.csv')
+        self.outfile = os.path.join(TEST_DIR, 'output_test.csv')
         
     def tearDown(self):
         unittest.TestCase.tearDown(self)
@@ -51,7 +63,7 @@ class TestZipOverlayer(unittest.TestCase):
 
     @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
     def test_one_col(self):
-        overlayer = Networker(TestZipOverlayer.TEST_FILE_ONE_COL)
+        overlayer = self.make_overlayer(TestZipOverlayer.TEST_FILE_ONE_COL, TestZipOverlayer.TEST_FILE_NO_LINKS)
         node1_zip = overlayer['node1']
         self.assertTrue(self.is_zip(node1_zip))
         
@@ -59,13 +71,29 @@ class TestZipOverlayer(unittest.TestCase):
         node2_zip = overlayer['node2']
         self.assertTrue(self.is_zip(node2_zip))        
 
+    #-----------------------------
+    # test_no_zipcodes_yet
+    #-----------------------    
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_no_zipcodes_yet(self):
+        overlayer = Networker(TestZipOverlayer.TEST_FILE_ONE_COL, TestZipOverlayer.TEST_FILE_NO_LINKS)
+        self.assertFalse('node1' in overlayer)
+        with self.assertRaisesRegex(KeyError, 'assign_zipcodes'):
+            overlayer['node1']
+        
+        overlayer.internalize_zipcodes(TestZipOverlayer.TEST_ZIPCODE_SOURCE, os.path.join(TEST_DIR, 'zipcodes'))
+        overlayer.assign_zipcodes(seed=1)
+        self.assertTrue('node1' in overlayer)
+        self.assertFalse('node9' in overlayer)
+
     #-----------------------------
     # test_inversion
     #-----------------------    
 
     @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
     def test_inversion(self):
-        overlayer = Networker(TestZipOverlayer.TEST_FILE_ONE_COL)
+        overlayer = self.make_overlayer(TestZipOverlayer.TEST_FILE_ONE_COL, TestZipOverlayer.TEST_FILE_NO_LINKS)
         node1_zip = overlayer['node1']
         
         # Get a reverser, and ensure that
@@ -79,18 +107,18 @@ class TestZipOverlayer(unittest.TestCase):
 
     @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
     def test_multi_cols(self):
-        overlayer = Networker(TestZipOverlayer.TEST_FILE_TWO_COLS, columns=[0,1])
+        overlayer = self.make_overlayer(TestZipOverlayer.TEST_FILE_NO_NODES, TestZipOverlayer.TEST_FILE_TWO_COLS)
         node1_zip = overlayer['node1']
-        assertTrue(self.is_zip(node1_zip))
+        self.assertTrue(self.is_zip(node1_zip))
         
         node2_zip = overlayer['node2']
-        assertTrue(self.is_zip(node2_zip))
+        self.assertTrue(self.is_zip(node2_zip))
         
         node3_zip = overlayer['node3']
-        assertTrue(self.is_zip(node3_zip))
+        self.assertTrue(self.is_zip(node3_zip))
         
         node4_zip = overlayer['node4']
-        assertTrue(self.is_zip(node4_zip))
+        self.assertTrue(self.is_zip(node4_zip))
 
     #-----------------------------
     # test_multi_cols_extra_info 
@@ -98,18 +126,18 @@ class TestZipOverlayer(unittest.TestCase):
 
     @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
     def test_multi_cols_extra_info(self):
-        overlayer = Networker(TestZipOverlayer.TEST_FILE_TWO_COLS_EXTRA_COLS, columns=[0,2])
+        overlayer = self.make_overlayer(TestZipOverlayer.TEST_FILE_NO_NODES, TestZipOverlayer.TEST_FILE_TWO_COLS_EXTRA_COLS)
         node1_zip = overlayer['node1']
-        assertTrue(self.is_zip(node1_zip))
+        self.assertTrue(self.is_zip(node1_zip))
         
         node2_zip = overlayer['node2']
-        assertTrue(self.is_zip(node2_zip))
+        self.assertTrue(self.is_zip(node2_zip))
         
         node3_zip = overlayer['node3']
-        assertTrue(self.is_zip(node3_zip))
+        self.assertTrue(self.is_zip(node3_zip))
         
         node4_zip = overlayer['node4']
-        assertTrue(self.is_zip(node4_zip))
+        self.assertTrue(self.is_zip(node4_zip))
         
         # There should be no others:
         self.assertEqual(len(overlayer), 4)
@@ -123,41 +151,43 @@ class TestZipOverlayer(unittest.TestCase):
         '''
         Input will be:
         
-        'node1,Extra,node2'
-        'node3,Extra,node4'
-        'node1,Extra,node4'
+        'node1,node2,Extra'
+        'node3,node4,Extra'
+        'node1,node4,Extra'
         
-        So output must be:
-        'zip1,Extra,zip2'
-        'zip3,Extra,zip4'
-        'zip1,Extra,zip4'
+        So output must be, after the header:
+        'zip1,zip2,Extra'
+        'zip3,zip4,Extra'
+        'zip1,zip4,Extra'
         
         '''
         
         
-        overlayer = Networker(TestZipOverlayer.TEST_FILE_TWO_COLS_EXTRA_COLS, columns=[0,2])
+        overlayer = self.make_overlayer(TestZipOverlayer.TEST_FILE_NO_NODES, TestZipOverlayer.TEST_FILE_TWO_COLS_EXTRA_COLS)
         overlayer.export_converted_input(self.outfile)
         
         with open(self.outfile, 'r') as source_fd:
             nodes_file_reader = csv.reader(source_fd,
                                            delimiter=',',
                                            quotechar='"')
-            exported_line = nodes_file_reader.next()
-            self.assertEqual(exported_line[1], 'Extra')
+            # Skip the header:
+            next(nodes_file_reader)
+            exported_line = next(nodes_file_reader)
+            self.assertEqual(exported_line[2], 'Extra')
             self.assertTrue(self.is_zip(exported_line[0]))
-            self.assertTrue(self.is_zip(exported_line[2]))
+            self.assertTrue(self.is_zip(exported_line[1]))
             zip1 = exported_line[0]
             
-            exported_line = nodes_file_reader.next()
-            self.assertEqual(exported_line[1], 'Extra')
+            exported_line = next(nodes_file_reader)
+            self.assertEqual(exported_line[2], 'Extra')
             self.assertTrue(self.is_zip(exported_line[0]))
-            self.assertTrue(self.is_zip(exported_line[2]))
-            zip4 = exported_line[2]
+            self.assertTrue(self.is_zip(exported_line[1]))
+            zip4 = exported_line[1]
             
-            exported_line = nodes_file_reader.next()
-            self.assertEqual(exported_line[1], 'Extra')
+            exported_line = next(nodes_file_reader)
+            self.assertEqual(exported_line[2], 'Extra')
             self.assertEqual(exported_line[0], zip1)
-            self.assertEqual(exported_line[2], zip4)
+            self.assertEqual(exported_line[1], zip4)
     
     #-----------------------------
     # test_export_two_cols 
@@ -179,24 +209,26 @@ class TestZipOverlayer(unittest.TestCase):
         
         '''
         
-        overlayer = Networker(TestZipOverlayer.TEST_FILE_TWO_COLS, columns=[0,1])
+        overlayer = self.make_overlayer(TestZipOverlayer.TEST_FILE_NO_NODES, TestZipOverlayer.TEST_FILE_TWO_COLS)
         overlayer.export_converted_input(self.outfile)
         
         with open(self.outfile, 'r') as source_fd:
             nodes_file_reader = csv.reader(source_fd,
                                            delimiter=',',
                                            quotechar='"')
-            exported_line = nodes_file_reader.next()
+            # Skip the header:
+            next(nodes_file_reader)
+            exported_line = next(nodes_file_reader)
             self.assertTrue(self.is_zip(exported_line[0]))
             self.assertTrue(self.is_zip(exported_line[1]))
             zip1 = exported_line[0]
             
-            exported_line = nodes_file_reader.next()
+            exported_line = next(nodes_file_reader)
             self.assertTrue(self.is_zip(exported_line[0]))
             self.assertTrue(self.is_zip(exported_line[1]))
             zip4 = exported_line[1]
             
-            exported_line = nodes_file_reader.next()
+            exported_line = next(nodes_file_reader)
             self.assertEqual(exported_line[0], zip1)
             self.assertEqual(exported_line[1], zip4)
 
@@ -220,20 +252,22 @@ class TestZipOverlayer(unittest.TestCase):
         
         '''
         
-        overlayer = Networker(TestZipOverlayer.TEST_FILE_TWO_COLS)
+        overlayer = self.make_overlayer(TestZipOverlayer.TEST_FILE_NO_NODES, TestZipOverlayer.TEST_FILE_TWO_COLS)
         overlayer.export_converted_input(self.outfile)
         
         with open(self.outfile, 'r') as source_fd:
             nodes_file_reader = csv.reader(source_fd,
                                            delimiter=',',
                                            quotechar='"')
-            exported_line = nodes_file_reader.next()
+            # Skip the header:
+            next(nodes_file_reader)
+            exported_line = next(nodes_file_reader)
             self.assertTrue(self.is_zip(exported_line[0]))
 
-            exported_line = nodes_file_reader.next()
+            exported_line = next(nodes_file_reader)
             self.assertTrue(self.is_zip(exported_line[0]))
             
-            exported_line = nodes_file_reader.next()
+            exported_line = next(nodes_file_reader)
             self.assertTrue(self.is_zip(exported_line[0]))
 
     #-----------------------------
@@ -242,14 +276,38 @@ class TestZipOverlayer(unittest.TestCase):
 
     @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
     def test_bad_cols_spec(self):
+        # Columns come from the file headers; there is
+        # no column selection to silently ignore:
+        try:
+            Networker(TestZipOverlayer.TEST_FILE_NO_NODES, TestZipOverlayer.TEST_FILE_TWO_COLS, columns=[0,5])
+            self.fail("Should have TypeError for a columns spec")
+        except TypeError:
+            pass
+        
+    #-----------------------------
+    # test_bad_schema_spec 
+    #-----------------------    
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_bad_schema_spec(self):
         try:
-            Networker(TestZipOverlayer.TEST_FILE_TWO_COLS, columns=[0,5])
-            self.fail("Should have ValueError for bad columns")
+            Networker(TestZipOverlayer.TEST_FILE_NO_NODES, TestZipOverlayer.TEST_FILE_TWO_COLS, schema={'column5' : 'str'})
+            self.fail("Should have ValueError for a schema column the files lack")
         except ValueError:
             pass
         
     
     # ------------------ Utilities --------------------
+    
+    #-----------------------------
+    # make_overlayer
+    #-----------------------
+    
+    def make_overlayer(self, nodes_file, links_file):
+        overlayer = Networker(nodes_file, links_file)
+        overlayer.internalize_zipcodes(TestZipOverlayer.TEST_ZIPCODE_SOURCE, os.path.join(TEST_DIR, 'zipcodes'))
+        overlayer.assign_zipcodes(seed=1)
+        return overlayer
 
     #-----------------------------
     # build_test_files 
@@ -257,20 +315,31 @@ class TestZipOverlayer(unittest.TestCase):
 
     @classmethod
     def build_test_files(cls):
+        write_zipcode_source(cls.TEST_ZIPCODE_SOURCE)
+        
+        with open(cls.TEST_FILE_NO_NODES, 'w') as fd:
+            fd.write('nodeID\n')
+        
+        with open(cls.TEST_FILE_NO_LINKS, 'w') as fd:
+            fd.write('src,dst\n')
+        
         with open(cls.TEST_FILE_ONE_COL, 'w') as fd:
+            fd.write('nodeID\n')
             fd.write('node1\n')
             fd.write('node2\n')
             fd.write('node3\n')
             
         with open(cls.TEST_FILE_TWO_COLS, 'w') as fd:
+            fd.write('src,dst\n')
             fd.write('node1,node2\n')
             fd.write('node3,node4\n')
             fd.write('node1,node4\n')
 
         with open(cls.TEST_FILE_TWO_COLS_EXTRA_COLS, 'w') as fd:
-            fd.write('node1,Extra,node2\n')
-            fd.write('node3,Extra,node4\n')
-            fd.write('node1,Extra,node4\n')
+            fd.write('src,dst,info\n')
+            fd.write('node1,node2,Extra\n')
+            fd.write('node3,node4,Extra\n')
+            fd.write('node1,node4,Extra\n')
             
     #-----------------------------
     # is_zip 
@@ -0,0 +1,199 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.export import GatheredColumn, write_table
+from netlayout.graph_store import CategoricalColumn
+from netlayout.test_zipcodes import write_zipcode_source
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_export_')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_write_table
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_write_table(self):
+        path = os.path.join(self.tmp_dir, 'table.csv')
+        names = np.array(['a', 'b', 'c', 'd', 'e'], dtype=object)
+        columns = [GatheredColumn(names, np.array([4, 3, 2, 1, 0])),
+                   np.array([1.5, np.nan, 3.0, 4.0, 5.0]),
+                   CategoricalColumn.from_values(['x', None, 'y', 'x', 'x'])]
+        # Chunks that do not divide the row count:
+        num_rows = write_table(path, ['name', 'value', 'kind'], columns, chunk_rows=2)
+        self.assertEqual(num_rows, 5)
+        with open(path, 'r') as fd:
+            rows = list(csv.reader(fd))
+        self.assertEqual(rows, [['name', 'value', 'kind'],
+                                ['e', '1.5', 'x'],
+                                ['d', '', ''],
+                                ['c', '3.0', 'y'],
+                                ['b', '4.0', 'x'],
+                                ['a', '5.0', 'x']])
+        with self.assertRaises(ValueError):
+            write_table(path, ['name'], columns)
+
+    #-----------------------------
+    # test_export_converted_input
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_export_converted_input(self):
+        source = os.path.join(self.tmp_dir, 'zip_code_database.csv')
+        write_zipcode_source(source)
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID,role\nuser1,instructor\nuser2,student\nuser3,student\n')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst,weight,kind\n' +
+                     'user1,user2,1.0,emails\n' +
+                     'user3,user1,2.0,\n' +
+                     'user2,user3,0.5,emails\n')
+        networker = Networker(nodes_file, links_file, streaming=True, chunk_rows=2)
+        outfile = os.path.join(self.tmp_dir, 'out.csv')
+        with self.assertRaises(ValueError):
+            networker.export_converted_input(outfile)
+        networker.internalize_zipcodes(source, os.path.join(self.tmp_dir, 'table'))
+        networker.assign_zipcodes(seed=2)
+        networker.compute_layout(iterations=10, seed=0)
+        written = networker.export_converted_input(outfile)
+        self.assertEqual(written, [outfile,
+                                   os.path.join(self.tmp_dir, 'out_nodes.csv'),
+                                   os.path.join(self.tmp_dir, 'out_geo.csv')])
+
+        reverser = networker.get_overlay_reverser()
+        with open(outfile, 'r') as fd:
+            links = list(csv.reader(fd))
+        self.assertEqual(links[0], ['src', 'dst', 'weight', 'kind'])
+        self.assertEqual(sorted((reverser[src], reverser[dst], weight, kind)
+                                for (src, dst, weight, kind) in links[1:]),
+                         [('user1', 'user2', '1.0', 'emails'),
+                          ('user2', 'user3', '0.5', 'emails'),
+                          ('user3', 'user1', '2.0', '')])
+
+        with open(written[1], 'r') as fd:
+            nodes = list(csv.reader(fd))
+        self.assertEqual(nodes[0], ['nodeID', 'role', 'x', 'y'])
+        user1 = [row for row in nodes[1:] if reverser[row[0]] == 'user1'][0]
+        self.assertEqual(user1[1], 'instructor')
+        self.assertEqual([float(coord) for coord in user1[2:]],
+                         networker.positions[networker.graph.node_id('user1')].tolist())
+
+        with open(written[2], 'r') as fd:
+            geo = list(csv.reader(fd))
+        self.assertEqual(len(geo), 4)
+        table = networker.zipcode_table
+        for (zipcode, lat, long) in geo[1:]:
+            row = np.flatnonzero(table.zipcodes == int(zipcode))[0]
+            self.assertEqual((float(lat), float(long)), (table.lat[row], table.long[row]))
+
+    #-----------------------------
+    # test_export_input_format
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_export_input_format(self):
+        # Links in input order rather than by source node,
+        # missing weights left empty, and node properties
+        # in nodes file order, parsed or from the cache:
+        source = os.path.join(self.tmp_dir, 'zip_code_database.csv')
+        write_zipcode_source(source)
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID,role,dob\nuser1,instructor,1982-9-4\nuser2,student,2005-10-1\nuser3,student,\n')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst,weight,kind\n' +
+                     'user3,user1,2.0,upvotes\n' +
+                     'user1,user2,,emails\n' +
+                     'user2,user3,0.5,emails\n' +
+                     'user1,user3,4.0,\n')
+        outfile = os.path.join(self.tmp_dir, 'out.csv')
+        for (streaming, cache_dir) in ((True, None), (False, None), (True, self.tmp_dir), (True, self.tmp_dir)):
+            networker = Networker(nodes_file, links_file, streaming=streaming, chunk_rows=3, cache_dir=cache_dir)
+            networker.internalize_zipcodes(source, os.path.join(self.tmp_dir, 'table'))
+            networker.assign_zipcodes(seed=2)
+            networker.export_converted_input(outfile)
+            reverser = networker.get_overlay_reverser()
+            with open(outfile, 'r') as fd:
+                links = list(csv.reader(fd))
+            self.assertEqual([[reverser[src], reverser[dst], weight, kind] for (src, dst, weight, kind) in links[1:]],
+                             [['user3', 'user1', '2.0', 'upvotes'],
+                              ['user1', 'user2', '', 'emails'],
+                              ['user2', 'user3', '0.5', 'emails'],
+                              ['user1', 'user3', '4.0', '']])
+            with open(os.path.join(self.tmp_dir, 'out_nodes.csv'), 'r') as fd:
+                self.assertEqual(next(csv.reader(fd)), ['nodeID', 'role', 'dob'])
+        # The last run read the cache:
+        self.assertIsInstance(networker.graph.input_order, np.memmap)
+
+    #-----------------------------
+    # test_export_link_columns
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_export_link_columns(self):
+        # The links table has the columns of the links file,
+        # with a weight column only where it has one, or
+        # where merging computed the weights:
+        source = os.path.join(self.tmp_dir, 'zip_code_database.csv')
+        write_zipcode_source(source)
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        outfile = os.path.join(self.tmp_dir, 'out.csv')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID\n')
+        for (link_rows, merge, expected) in ((['from,to,kind', 'user2,user1,emails', 'user1,user2,upvotes'],
+                                              None,
+                                              [['from', 'to', 'kind'],
+                                               ['user2', 'user1', 'emails'],
+                                               ['user1', 'user2', 'upvotes']]),
+                                             (['src,dst,kind,weight', 'user2,user1,emails,', 'user1,user2,,3.0'],
+                                              None,
+                                              [['src', 'dst', 'kind', 'weight'],
+                                               ['user2', 'user1', 'emails', ''],
+                                               ['user1', 'user2', '', '3.0']]),
+                                             (['src,dst,kind', 'user1,user2,emails', 'user1,user2,upvotes'],
+                                              'count',
+                                              [['src', 'dst', 'weight', 'kind'],
+                                               ['user1', 'user2', '2.0', 'emails']])):
+            with open(links_file, 'w') as fd:
+                fd.write('\n'.join(link_rows) + '\n')
+            for streaming in (True, False):
+                networker = Networker(nodes_file, links_file, streaming=streaming, merge=merge)
+                networker.internalize_zipcodes(source, os.path.join(self.tmp_dir, 'table'))
+                networker.assign_zipcodes(seed=2)
+                networker.export_converted_input(outfile)
+                reverser = networker.get_overlay_reverser()
+                with open(outfile, 'r') as fd:
+                    links = list(csv.reader(fd))
+                self.assertEqual(links[0], expected[0])
+                self.assertEqual([[reverser[row[0]], reverser[row[1]]] + row[2:] for row in links[1:]],
+                                 expected[1:])
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,180 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.graph_store import MISSING_CODE, CategoricalColumn, GraphStore
+from netlayout.ingest import EdgeListBuilder, stream_inputs
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestGraphStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestGraphStore, cls).setUpClass()
+        cls.tmp_dir = tempfile.mkdtemp(prefix='netlayout_store_')
+        cls.nodes_file = os.path.join(cls.tmp_dir, 'nodes.csv')
+        cls.links_file = os.path.join(cls.tmp_dir, 'links.csv')
+        cls.build_test_files()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestGraphStore, cls).tearDownClass()
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    #-----------------------------
+    # test_csr
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_csr(self):
+        store = GraphStore.from_ingest(stream_inputs(self.nodes_file, self.links_file))
+        self.assertEqual(store.num_nodes, 4)
+        self.assertEqual(store.num_edges, 5)
+
+        user1 = store.node_id('user1')
+        user3 = store.node_id('user3')
+        self.assertEqual(store.node_names[store.out_neighbors(user1)].tolist(), ['user2', 'user3'])
+        self.assertEqual(store.node_names[store.out_neighbors(user3)].tolist(), ['user1'])
+        self.assertEqual(store.out_degree().tolist(), [2, 1, 1, 1])
+        self.assertEqual(store.degree().tolist(), [4, 2, 3, 1])
+
+        # Link properties travel with the CSR order:
+        user3_edges = store.out_edges(user3)
+        self.assertEqual(store.weight[user3_edges].tolist(), [2.0])
+        self.assertEqual(store.link_properties['type'][user3_edges.start], 'upvotes')
+
+        # Batch lookups of leaving and arriving links:
+        both = [user1, user3]
+        self.assertEqual(sorted(store.out_links(both).tolist()),
+                         np.flatnonzero(np.isin(store.src, both)).tolist())
+        self.assertEqual(sorted(store.in_links(both).tolist()),
+                         np.flatnonzero(np.isin(store.dst, both)).tolist())
+        self.assertEqual(store.in_links([]).tolist(), [])
+
+    #-----------------------------
+    # test_node_properties
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_node_properties(self):
+        store = GraphStore.from_ingest(stream_inputs(self.nodes_file, self.links_file))
+        # Repeated node row: the last one wins:
+        self.assertEqual(store.node_property(store.node_id('user2'), 'role'), 'instructor')
+        self.assertEqual(store.node_property(store.node_id('user1'), 'role'), 'student')
+        # Link end point without a nodes file row:
+        self.assertIsNone(store.node_property(store.node_id('user4'), 'role'))
+        self.assertEqual(store.node_properties['role'].codes[store.node_id('user4')], MISSING_CODE)
+        self.assertEqual(len(store.node_properties['role'].categories), 2)
+
+    #-----------------------------
+    # test_from_edge_list
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_from_edge_list(self):
+        builder = EdgeListBuilder()
+        builder.add_edge('a', 'b', {'weight' : '2.5', 'type' : 'x'})
+        builder.add_edge('c', 'a', {'type' : 'y'})
+        builder.add_edge('a', 'b', {'weight' : '1.5', 'type' : 'z'})
+        nodes_dict = {'a' : {'role' : 'r1'}, 'd' : {}}
+        store = GraphStore.from_edge_list(builder, nodes_dict)
+        self.assertEqual(store.node_names.tolist(), ['a', 'b', 'c', 'd'])
+        # Parallel a->b links are both kept:
+        self.assertEqual(store.src.tolist(), [0, 0, 2])
+        self.assertEqual(store.dst.tolist(), [1, 1, 0])
+        # Missing weight defaults to 1.0:
+        self.assertTrue(np.array_equal(store.weight, [2.5, 1.5, 1.0]))
+        self.assertEqual(store.link_properties['type'].to_array().tolist(), ['x', 'z', 'y'])
+        self.assertEqual(store.node_properties['role'].to_array().tolist(), ['r1', None, None, None])
+
+    #-----------------------------
+    # test_merge
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_merge(self):
+        names = np.array(['a', 'b', 'c'], dtype=object)
+        src = [1, 0, 0, 1, 0]
+        dst = [2, 1, 1, 2, 2]
+        weight = [1.0, 2.0, 5.0, 3.0, 4.0]
+        kinds = {'type' : CategoricalColumn.from_values(['p', 'q', 'r', 's', 't'])}
+
+        store = GraphStore(names, src, dst, weight, link_properties=kinds, merge='sum')
+        self.assertEqual(list(zip(store.src.tolist(), store.dst.tolist())), [(0, 1), (0, 2), (1, 2)])
+        self.assertEqual(store.weight.tolist(), [7.0, 4.0, 4.0])
+        # First link of each group supplies the properties:
+        self.assertEqual(store.link_properties['type'].to_array().tolist(), ['q', 't', 'p'])
+        self.assertEqual(store.indptr.tolist(), [0, 2, 3, 3])
+
+        store = GraphStore(names, src, dst, weight, merge='max')
+        self.assertEqual(store.weight.tolist(), [5.0, 4.0, 3.0])
+
+        store = GraphStore(names, src, dst, weight, merge='count')
+        self.assertEqual(store.weight.tolist(), [2.0, 1.0, 2.0])
+
+        with self.assertRaises(ValueError):
+            GraphStore(names, src, dst, weight, merge='mean')
+
+    #-----------------------------
+    # test_networker_keeps_parallel_links
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_keeps_parallel_links(self):
+        links_file = os.path.join(self.tmp_dir, 'parallel_links.csv')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst,weight\n')
+            fd.write('user1,user2,1.0\n')
+            fd.write('user1,user3,2.0\n')
+            fd.write('user1,user2,3.0\n')
+
+        for streaming in (False, True):
+            networker = Networker(self.nodes_file, links_file, streaming=streaming)
+            self.assertEqual(networker.graph.num_edges, 3)
+            self.assertEqual(networker.src_property_name, 'src')
+
+            networker = Networker(self.nodes_file, links_file, streaming=streaming, merge='sum')
+            graph = networker.graph
+            self.assertEqual(graph.num_edges, 2)
+            user1_links = graph.out_edges(graph.node_id('user1'))
+            self.assertEqual(graph.node_names[graph.dst[user1_links]].tolist(), ['user2', 'user3'])
+            self.assertEqual(graph.weight[user1_links].tolist(), [4.0, 2.0])
+
+    # ------------------ Utilities --------------------
+
+    #-----------------------------
+    # build_test_files
+    #-----------------------
+
+    @classmethod
+    def build_test_files(cls):
+        with open(cls.nodes_file, 'w') as fd:
+            fd.write('nodeID,role\n')
+            fd.write('user1,student\n')
+            fd.write('user2,student\n')
+            fd.write('user2,instructor\n')
+            fd.write('user3,student\n')
+
+        with open(cls.links_file, 'w') as fd:
+            fd.write('src,dst,weight,type\n')
+            fd.write('user3,user1,2.0,upvotes\n')
+            fd.write('user1,user2,1.0,responds_to\n')
+            fd.write('user2,user3,4.0,responds_to\n')
+            fd.write('user1,user3,6.0,upvotes\n')
+            fd.write('user4,user1,1.0,responds_to\n')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,130 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.graph_store import GraphStore
+from netlayout.incremental import GraphDiff, LayoutSnapshot, expand_neighborhood, incremental_layout
+from netlayout.layout import spring_layout
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestIncremental(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_incremental_')
+        # Path a-b-c-d-e-f:
+        self.names = ['a', 'b', 'c', 'd', 'e', 'f']
+        self.old_graph = GraphStore(np.array(self.names, dtype=object), [0, 1, 2, 3, 4], [1, 2, 3, 4, 5])
+        self.old_pos = spring_layout(self.old_graph.src, self.old_graph.dst, 6, seed=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_snapshot
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_snapshot(self):
+        path = os.path.join(self.tmp_dir, 'layout.snapshot')
+        LayoutSnapshot.from_graph(self.old_graph, self.old_pos).save(path)
+        self.assertTrue(os.path.exists(path))
+        snapshot = LayoutSnapshot.load(path)
+        self.assertEqual(snapshot.node_names.tolist(), self.names)
+        self.assertEqual(snapshot.src.tolist(), [0, 1, 2, 3, 4])
+        self.assertTrue(np.array_equal(snapshot.positions, self.old_pos))
+
+    #-----------------------------
+    # test_diff
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_diff(self):
+        snapshot = LayoutSnapshot.from_graph(self.old_graph, self.old_pos)
+        # Node 'c' removed; new node 'g' linked to 'f'; new link a-f.
+        # Node order differs from the snapshot:
+        graph = GraphStore(np.array(['f', 'e', 'd', 'b', 'a', 'g'], dtype=object),
+                           [4, 2, 1, 5, 4],
+                           [3, 1, 0, 0, 0])
+        diff = GraphDiff(snapshot, graph)
+        self.assertEqual(diff.old_id.tolist(), [5, 4, 3, 1, 0, -1])
+        self.assertEqual(diff.new_nodes.tolist(), [False] * 5 + [True])
+        self.assertEqual(diff.num_removed_nodes, 1)
+        self.assertEqual(diff.num_added_links, 2)
+        self.assertEqual(diff.num_removed_links, 2)
+        # f, a gained links, b and d lost theirs to c, g is new:
+        changed = [graph.node_names[node] for node in np.flatnonzero(diff.changed)]
+        self.assertEqual(sorted(changed), ['a', 'b', 'd', 'f', 'g'])
+
+        path_src = np.array([0, 1, 2, 3])
+        path_dst = np.array([1, 2, 3, 4])
+        start = np.array([True, False, False, False, False])
+        self.assertEqual(expand_neighborhood(path_src, path_dst, start, 2).tolist(),
+                         [True, True, True, False, False])
+
+    #-----------------------------
+    # test_incremental_layout
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_incremental_layout(self):
+        snapshot = LayoutSnapshot.from_graph(self.old_graph, self.old_pos)
+        # New node 'g' hangs off 'f':
+        graph = GraphStore(np.array(self.names + ['g'], dtype=object), [0, 1, 2, 3, 4, 5], [1, 2, 3, 4, 5, 6])
+        (pos, diff) = incremental_layout(graph, snapshot, hops=1, seed=3)
+        self.assertEqual(pos.shape, (7, 2))
+        # Changed f and g, plus f's neighbor e:
+        self.assertEqual(diff.affected.tolist(), [False] * 4 + [True] * 3)
+        # Pinned nodes keep their positions; the new one is near its neighbor:
+        self.assertTrue(np.array_equal(pos[:4], self.old_pos[:4]))
+        extent = np.ptp(self.old_pos, axis=0).max()
+        self.assertLess(np.linalg.norm(pos[6] - pos[5]), extent)
+
+        (pos, diff) = incremental_layout(graph, snapshot, pin=False, seed=3)
+        self.assertFalse(np.array_equal(pos[:4], self.old_pos[:4]))
+        self.assertTrue(np.all(np.isfinite(pos)))
+
+    #-----------------------------
+    # test_networker_update
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_update(self):
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        snapshot_file = os.path.join(self.tmp_dir, 'layout.snapshot')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID\nuser1\nuser2\nuser3\nuser4\n')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst,weight\nuser1,user2,1.0\nuser2,user3,2.0\n')
+        networker = Networker(nodes_file, links_file, streaming=True)
+        with self.assertRaises(ValueError):
+            networker.save_layout_snapshot(snapshot_file)
+        old_pos = networker.compute_layout(iterations=20, seed=1)
+        networker.save_layout_snapshot(snapshot_file)
+
+        with open(links_file, 'a') as fd:
+            fd.write('user3,user4,1.0\n')
+        networker = Networker(nodes_file, links_file, streaming=True)
+        pos = networker.update_layout(snapshot_file, seed=1)
+        self.assertIs(pos, networker.positions)
+        # Only user3 and user4 changed; user1 is two links away:
+        self.assertTrue(np.array_equal(pos[networker.graph.node_id('user1')],
+                                       old_pos[0]))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,107 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.initial import initial_positions, maxmin_pivots, pivot_mds_layout, spectral_layout
+from netlayout.metrics import sampled_stress
+from netlayout.profiling import StageProfiler
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestInitial(unittest.TestCase):
+
+    #-----------------------------
+    # test_maxmin_pivots
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_maxmin_pivots(self):
+        # Two paths, 0..9 and 10..19:
+        src = np.concatenate([np.arange(9), np.arange(10, 19)])
+        dst = src + 1
+        (pivots, distances) = maxmin_pivots(src, dst, 20, num_pivots=4, seed=1)
+        self.assertEqual(distances.shape, (20, 4))
+        self.assertEqual(len(set(pivots.tolist())), 4)
+        # Both paths get pivots, and path ends come first:
+        self.assertTrue((pivots < 10).any() and (pivots >= 10).any())
+        self.assertTrue(set(pivots[1:3].tolist()) & {0, 9, 10, 19})
+        self.assertEqual(distances[pivots[0], 0], 0)
+
+    #-----------------------------
+    # test_pivot_mds
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_pivot_mds(self):
+        (src, dst, num_nodes) = grid_graph(20)
+        pos = pivot_mds_layout(src, dst, num_nodes, num_pivots=10, seed=1)
+        self.assertEqual(pos.shape, (num_nodes, 2))
+        self.assertTrue(pos.min() >= 0.0 and pos.max() <= 1.0 + 1e-2)
+        random_pos = initial_positions('random', src, dst, num_nodes, seed=1)
+        self.assertTrue(sampled_stress(src, dst, num_nodes, pos, seed=0) <
+                        0.2 * sampled_stress(src, dst, num_nodes, random_pos, seed=0))
+
+    #-----------------------------
+    # test_spectral
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_spectral(self):
+        # The second eigenvector of a path orders its nodes:
+        src = np.arange(49)
+        pos = spectral_layout(src, src + 1, 50, seed=3)
+        along = np.argmax(np.abs([np.corrcoef(pos[:, axis], np.arange(50))[0, 1] for axis in range(2)]))
+        self.assertTrue(abs(np.corrcoef(pos[:, along], np.arange(50))[0, 1]) > 0.95)
+
+        (src, dst, num_nodes) = grid_graph(20)
+        pos = initial_positions('spectral', src, dst, num_nodes, seed=1)
+        self.assertTrue(sampled_stress(src, dst, num_nodes, pos, seed=0) < 0.1)
+        with self.assertRaises(ValueError):
+            initial_positions('circle', src, dst, num_nodes)
+
+    #-----------------------------
+    # test_networker_initial
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_initial(self):
+        tmp_dir = tempfile.mkdtemp(prefix='netlayout_initial_')
+        try:
+            nodes_file = os.path.join(tmp_dir, 'nodes.csv')
+            links_file = os.path.join(tmp_dir, 'links.csv')
+            with open(nodes_file, 'w') as fd:
+                fd.write('nodeID\n')
+            with open(links_file, 'w') as fd:
+                fd.write('src,dst\n' + ''.join('n%s,n%s\n' % (i, i + 1) for i in range(30)))
+            profiler = StageProfiler()
+            networker = Networker(nodes_file, links_file, streaming=True, profiler=profiler)
+            networker.compute_layout('barnes_hut', initial='pivot_mds', iterations=5, seed=1)
+            self.assertEqual([record.stage for record in profiler.records][-2:], ['initial', 'layout'])
+            self.assertEqual(networker.positions.shape, (31, 2))
+            with self.assertRaises(ValueError):
+                networker.compute_layout('multilevel', initial='spectral')
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+# ------------------ Utilities --------------------
+
+def grid_graph(side):
+    ids = np.arange(side * side).reshape(side, side)
+    src = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    dst = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    return (src, dst, side * side)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,133 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.layout import attractive_displacement, repulsive_displacement, spring_layout
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestLayout(unittest.TestCase):
+
+    #-----------------------------
+    # test_repulsion_tiles
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_repulsion_tiles(self):
+        pos = np.random.default_rng(1).random((37, 2))
+        k = 0.3
+        # Brute force, one pair at a time:
+        expected = np.zeros_like(pos)
+        for i in range(len(pos)):
+            for j in range(len(pos)):
+                delta = pos[i] - pos[j]
+                distance = max(np.linalg.norm(delta), 0.01)
+                expected[i] += delta * k * k / distance ** 2
+        # Tiles of one row, several rows, and everything at once:
+        for max_tile_pairs in (1, 37 * 5, 10 ** 6):
+            self.assertTrue(np.allclose(repulsive_displacement(pos, k, max_tile_pairs), expected))
+
+    #-----------------------------
+    # test_attraction
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_attraction(self):
+        pos = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 2.0]])
+        src = np.array([0, 0, 0])
+        dst = np.array([1, 2, 1])
+        weight = np.array([1.0, 0.5, 1.0])
+        displacement = attractive_displacement(pos, src, dst, weight, k=1.0)
+        # Node 0 pulled toward 1 by two links of force 1, toward 2 by 0.5 * 4:
+        self.assertTrue(np.allclose(displacement[0], [2.0, 2.0]))
+        self.assertTrue(np.allclose(displacement[1], [-2.0, 0.0]))
+        self.assertTrue(np.allclose(displacement[2], [0.0, -2.0]))
+
+    #-----------------------------
+    # test_clusters
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_clusters(self):
+        # Two 10-cliques joined by a single link:
+        (src, dst) = self.two_cliques(10)
+        pos = spring_layout(src, dst, 20, iterations=100, seed=3)
+        self.assertEqual(pos.shape, (20, 2))
+        self.assertTrue(np.all(np.isfinite(pos)))
+        self.assertAlmostEqual(np.abs(pos).max(), 1.0)
+
+        within = np.linalg.norm(pos[:10, None] - pos[None, :10], axis=2).mean()
+        across = np.linalg.norm(pos[:10, None] - pos[None, 10:], axis=2).mean()
+        self.assertLess(within, across)
+
+        # Same seed, same layout:
+        self.assertTrue(np.array_equal(pos, spring_layout(src, dst, 20, iterations=100, seed=3)))
+
+    #-----------------------------
+    # test_options
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_options(self):
+        (src, dst) = self.two_cliques(5)
+        pos = spring_layout(src, dst, 10, cooling='exponential', max_tile_pairs=7, scale=None, seed=0)
+        self.assertTrue(np.all(np.isfinite(pos)))
+        self.assertEqual(spring_layout(src, dst, 1).shape, (1, 2))
+        with self.assertRaises(ValueError):
+            spring_layout(src, dst, 10, cooling='sudden')
+
+    #-----------------------------
+    # test_networker_layout
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_layout(self):
+        tmp_dir = tempfile.mkdtemp(prefix='netlayout_layout_')
+        try:
+            nodes_file = os.path.join(tmp_dir, 'nodes.csv')
+            links_file = os.path.join(tmp_dir, 'links.csv')
+            with open(nodes_file, 'w') as fd:
+                fd.write('nodeID\nuser1\nuser2\nuser3\n')
+            with open(links_file, 'w') as fd:
+                fd.write('src,dst,weight\nuser1,user2,1.0\nuser2,user3,2.0\n')
+            networker = Networker(nodes_file, links_file, streaming=True)
+            pos = networker.compute_layout(iterations=20, seed=1)
+            self.assertIs(pos, networker.positions)
+            self.assertEqual(pos.shape, (3, 2))
+            pos = networker.compute_layout('barnes_hut', theta=0.7, iterations=20, seed=1)
+            self.assertTrue(np.all(np.isfinite(pos)))
+            pos = networker.compute_layout('multilevel', min_nodes=2, seed=1)
+            self.assertEqual(pos.shape, (3, 2))
+            pos = networker.compute_layout(components=True, processes=1, seed=1)
+            self.assertEqual(pos.shape, (3, 2))
+            with self.assertRaises(ValueError):
+                networker.compute_layout('circular')
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # ------------------ Utilities --------------------
+
+    #-----------------------------
+    # two_cliques
+    #-----------------------
+
+    def two_cliques(self, size):
+        pairs = [(i, j) for i in range(size) for j in range(i + 1, size)]
+        pairs += [(i + size, j + size) for (i, j) in pairs]
+        pairs.append((0, size))
+        return (np.array([pair[0] for pair in pairs]), np.array([pair[1] for pair in pairs]))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,134 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import unittest
+
+import numpy as np
+
+from netlayout.layout import spring_layout
+from netlayout.metrics import EarlyStopping, StressSample, bfs_distances, count_crossings, \
+    edge_length_variance, layout_metrics, neighborhood_preservation, undirected_csr
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestMetrics(unittest.TestCase):
+
+    #-----------------------------
+    # test_bfs_distances
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_bfs_distances(self):
+        # Path 0-1-2-3 with links in both directions,
+        # a self loop, and node 4 on its own:
+        (indptr, indices) = undirected_csr(np.array([1, 1, 3, 2]), np.array([0, 2, 2, 2]), 5)
+        self.assertEqual(bfs_distances(indptr, indices, 0).tolist(), [0, 1, 2, 3, -1])
+        self.assertEqual(bfs_distances(indptr, indices, 2).tolist(), [2, 1, 0, 1, -1])
+
+    #-----------------------------
+    # test_stress
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_stress(self):
+        (src, dst) = path_graph(20)
+        sample = StressSample(src, dst, 20, num_sources=5, num_targets=20, seed=1)
+        line = np.column_stack([np.arange(20.0), np.zeros(20)])
+        # Distances match hop counts, at any scale:
+        self.assertAlmostEqual(sample.stress(line), 0.0)
+        self.assertAlmostEqual(sample.stress(line * 0.01), 0.0)
+        folded = line.copy()
+        folded[10:, 0] = 19 - folded[10:, 0]
+        folded[10:, 1] = 1.0
+        self.assertTrue(sample.stress(folded) > 0.1)
+
+    #-----------------------------
+    # test_edge_length_variance
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_edge_length_variance(self):
+        (src, dst) = path_graph(4)
+        pos = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [1.0, 4.0]])
+        # Lengths 1, 1, 3:
+        self.assertAlmostEqual(edge_length_variance(src, dst, pos), (8.0 / 9) / (25.0 / 9))
+        self.assertAlmostEqual(edge_length_variance(src, dst, pos * 3), (8.0 / 9) / (25.0 / 9))
+        self.assertEqual(edge_length_variance(src, dst, pos[[0, 1, 1, 1]] * 0), 0.0)
+
+    #-----------------------------
+    # test_count_crossings
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_count_crossings(self):
+        pos = np.array([[0.0, 0.0], [1.0, 1.0], [0.0, 1.0], [1.0, 0.0], [2.0, 2.0]])
+        # The diagonals cross; links 0-1 and 1-4 only touch:
+        self.assertEqual(count_crossings(np.array([0, 2, 1]), np.array([1, 3, 4]), pos), 1.0)
+
+        rng = np.random.default_rng(4)
+        (src, dst) = (rng.integers(0, 100, 300), rng.integers(0, 100, 300))
+        pos = rng.random((100, 2))
+        self.assertEqual(count_crossings(src, dst, pos), brute_force_crossings(src, dst, pos))
+        # Sampling estimates are in the right range:
+        estimate = count_crossings(src, dst, pos, max_pairs=2000, seed=1)
+        self.assertTrue(0.5 < estimate / brute_force_crossings(src, dst, pos) < 2.0)
+
+    #-----------------------------
+    # test_neighborhood_preservation
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_neighborhood_preservation(self):
+        (src, dst) = path_graph(30)
+        line = np.column_stack([np.arange(30.0), np.zeros(30)])
+        self.assertEqual(neighborhood_preservation(src, dst, 30, line, seed=1), 1.0)
+        shuffled = line[np.random.default_rng(2).permutation(30)]
+        self.assertTrue(neighborhood_preservation(src, dst, 30, shuffled, seed=1) < 0.5)
+        self.assertEqual(sorted(layout_metrics(src, dst, 30, line, seed=1)),
+                         ['crossings', 'edge_length', 'neighborhood', 'stress'])
+        with self.assertRaises(ValueError):
+            layout_metrics(src, dst, 30, line, metrics=['beauty'])
+
+    #-----------------------------
+    # test_early_stopping
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_early_stopping(self):
+        (src, dst) = path_graph(40)
+        stop = EarlyStopping(src, dst, 40, metric='stress', check_every=5, min_improvement=0.5)
+        spring_layout(src, dst, 40, iterations=200, tolerance=0.0, seed=1, stop=stop)
+        self.assertTrue(2 <= len(stop.history) < 40)
+        self.assertEqual([iteration for (iteration, _value) in stop.history][:2], [4, 9])
+        # Layouts of other graphs, such as coarse levels, are left alone:
+        self.assertFalse(stop(4, np.zeros((10, 2))))
+        with self.assertRaises(ValueError):
+            EarlyStopping(src, dst, 40, metric='beauty')
+
+# ------------------ Utilities --------------------
+
+def path_graph(num_nodes):
+    return (np.arange(num_nodes - 1), np.arange(1, num_nodes))
+
+def brute_force_crossings(src, dst, pos):
+    count = 0
+    for i in range(len(src)):
+        for j in range(i + 1, len(src)):
+            ends = {src[i], dst[i], src[j], dst[j]}
+            if src[i] == dst[i] or src[j] == dst[j] or len(ends) < 4:
+                continue
+            (a, b, c, d) = (pos[src[i]], pos[dst[i]], pos[src[j]], pos[dst[j]])
+            if side(a, b, c) * side(a, b, d) < 0 and side(c, d, a) * side(c, d, b) < 0:
+                count += 1
+    return count
+
+def side(p, q, r):
+    return np.sign((q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0]))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
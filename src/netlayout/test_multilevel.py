@@ -0,0 +1,98 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import unittest
+
+import numpy as np
+
+from netlayout.multilevel import build_hierarchy, coarsen, heavy_edge_matching, multilevel_layout
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestMultilevel(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        # 20 x 20 grid:
+        self.side = 20
+        ids = np.arange(self.side * self.side).reshape(self.side, self.side)
+        self.src = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+        self.dst = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+        self.num_nodes = self.side * self.side
+
+    #-----------------------------
+    # test_matching
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_matching(self):
+        # Path 0-1-2-3 with a heavy middle link, plus isolated node 4:
+        src = np.array([0, 1, 2])
+        dst = np.array([1, 2, 3])
+        weight = np.array([1.0, 5.0, 1.0])
+        (mapping, num_coarse) = heavy_edge_matching(src, dst, weight, 5, seed=0)
+        self.assertEqual(mapping[1], mapping[2])
+        # Ends join a matched neighbor; isolated node stays alone:
+        self.assertEqual(mapping[0], mapping[1])
+        self.assertEqual(mapping[3], mapping[2])
+        self.assertEqual(num_coarse, 2)
+        self.assertNotEqual(mapping[4], mapping[0])
+
+    #-----------------------------
+    # test_coarsen
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_coarsen(self):
+        src = np.array([0, 0, 1, 2, 3])
+        dst = np.array([1, 2, 3, 3, 2])
+        weight = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        mapping = np.array([0, 0, 1, 1])
+        (coarse_src, coarse_dst, coarse_weight) = coarsen(src, dst, weight, mapping, 2)
+        # Links within groups vanish, the rest are summed:
+        self.assertEqual(coarse_src.tolist(), [0])
+        self.assertEqual(coarse_dst.tolist(), [1])
+        self.assertEqual(coarse_weight.tolist(), [5.0])
+
+    #-----------------------------
+    # test_hierarchy
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_hierarchy(self):
+        levels = build_hierarchy(self.src, self.dst, None, self.num_nodes, min_nodes=20, seed=0)
+        sizes = [level['num_nodes'] for level in levels]
+        self.assertGreater(len(levels), 2)
+        self.assertTrue(all(coarse < fine for (fine, coarse) in zip(sizes, sizes[1:])))
+        self.assertLessEqual(sizes[-1], 20)
+        for (fine, coarse) in zip(levels, levels[1:]):
+            self.assertEqual(len(fine['mapping']), fine['num_nodes'])
+            self.assertEqual(fine['mapping'].max() + 1, coarse['num_nodes'])
+        self.assertNotIn('mapping', levels[-1])
+
+    #-----------------------------
+    # test_layout
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_layout(self):
+        pos = multilevel_layout(self.src, self.dst, self.num_nodes, min_nodes=20, seed=4)
+        self.assertEqual(pos.shape, (self.num_nodes, 2))
+        self.assertTrue(np.all(np.isfinite(pos)))
+        self.assertAlmostEqual(np.abs(pos).max(), 1.0)
+        # Layout distances follow grid distances:
+        rng = np.random.default_rng(0)
+        first  = rng.integers(0, self.num_nodes, 1000)
+        second = rng.integers(0, self.num_nodes, 1000)
+        grid_distance = (np.abs(first // self.side - second // self.side) +
+                         np.abs(first % self.side - second % self.side))
+        layout_distance = np.linalg.norm(pos[first] - pos[second], axis=1)
+        self.assertGreater(np.corrcoef(grid_distance, layout_distance)[0, 1], 0.5)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,174 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import multiprocessing
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.node_index import NodeIndex, hash_name, hash_names
+from netlayout.test_zipcodes import write_zipcode_source
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestNodeIndex(unittest.TestCase):
+
+    #-----------------------------
+    # test_hashes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_hashes(self):
+        names = ['', 'a', 'ab', 'ba', 'user1', 'Zürich €']
+        (hashes, check_hashes) = hash_names(names)
+        self.assertEqual(list(zip(hashes.tolist(), check_hashes.tolist())),
+                         [hash_name(name) for name in names])
+        self.assertEqual(len(set(hashes.tolist())), len(names))
+        # Chunked hashing agrees with hashing all at once:
+        many = ['n%s' % i for i in range(70000)]
+        self.assertEqual(hash_names(many)[0][-1], hash_name(many[-1])[0])
+        self.assertEqual(hash_names(np.array(many[:5]))[1].tolist(), [hash_name(name)[1] for name in many[:5]])
+
+    #-----------------------------
+    # test_hash_long_names
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_hash_long_names(self):
+        # A few long names among many short ones do not
+        # widen the chunks of the short ones:
+        names = ['n%s' % i for i in range(65536)]
+        names[3] = 'x' * 2000
+        names[40000] = 'y' * 5000
+        tracemalloc.start()
+        try:
+            (hashes, check_hashes) = hash_names(names)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 64 * 2**20)
+        for i in (0, 3, 4, 40000, 65535):
+            self.assertEqual((int(hashes[i]), int(check_hashes[i])), hash_name(names[i]))
+
+    #-----------------------------
+    # test_lookup
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_lookup(self):
+        names = ['n%s' % i for i in range(1000)]
+        index = NodeIndex.from_names(names)
+        queries = ['n7', 'n999', 'n0', 'n7']
+        self.assertEqual(index.lookup(queries).tolist(), [7, 999, 0, 7])
+        self.assertEqual(index.lookup_one('n42'), 42)
+        self.assertEqual(index.lookup(['n1', 'nope'], missing=-1).tolist(), [1, -1])
+        self.assertEqual(index.contains(['n1', 'nope']).tolist(), [True, False])
+        self.assertTrue('n5' in index and 'n1000' not in index)
+        with self.assertRaises(KeyError):
+            index.lookup(['n1', 'nope'])
+        with self.assertRaises(KeyError):
+            index.lookup_one('nope')
+
+    #-----------------------------
+    # test_colliding_hashes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_colliding_hashes(self):
+        # Three names with the same first hash, told
+        # apart by their check hashes:
+        index = NodeIndex(np.array([5, 9, 9, 9, 12], dtype=np.uint64),
+                          np.array([1, 2, 3, 4, 5], dtype=np.uint64),
+                          np.array([10, 11, 12, 13, 14], dtype=np.int32))
+        found = index._find(np.array([9, 9, 9, 9, 12], dtype=np.uint64),
+                            np.array([4, 2, 3, 7, 5], dtype=np.uint64))
+        self.assertEqual(found.tolist(), [3, 1, 2, -1, 4])
+
+    #-----------------------------
+    # test_zipcodes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_zipcodes(self):
+        index = NodeIndex.from_names(['a', 'b', 'c'])
+        index.set_zipcodes(np.array([94305, -1, 501]), 100000)
+        self.assertEqual(index.zipcodes_of(['c', 'a', 'b']).tolist(), [501, 94305, -1])
+        self.assertEqual(index.nodes_of(['00501', '94305', '12345', '-3']).tolist(), [2, 0, -1, -1])
+        with self.assertRaises(ValueError):
+            index.set_zipcodes(np.array([1, 2]), 100000)
+
+    #-----------------------------
+    # test_shared
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_shared(self):
+        names = ['n%s' % i for i in range(500)]
+        index = NodeIndex.from_names(names)
+        index.set_zipcodes(np.arange(500) * 2, 100000)
+        spec = index.share()
+        try:
+            with multiprocessing.get_context('spawn').Pool(1) as pool:
+                (ids, zipcodes) = pool.apply(lookup_in_shared, (spec, ['n3', 'n499']))
+            self.assertEqual(ids, [3, 499])
+            self.assertEqual(zipcodes, [6, 998])
+            # The sharing process now uses the shared copies:
+            self.assertEqual(index.lookup(['n3']).tolist(), [3])
+        finally:
+            index.unlink()
+
+    #-----------------------------
+    # test_networker_batches
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_batches(self):
+        tmp_dir = tempfile.mkdtemp(prefix='netlayout_index_')
+        try:
+            (nodes_file, links_file, source) = [os.path.join(tmp_dir, name)
+                                                for name in ('nodes.csv', 'links.csv', 'zips.csv')]
+            with open(nodes_file, 'w') as fd:
+                fd.write('nodeID\n')
+            with open(links_file, 'w') as fd:
+                fd.write('src,dst\nu1,u2\nu2,u3\n')
+            write_zipcode_source(source)
+            networker = Networker(nodes_file, links_file, streaming=True)
+            networker.internalize_zipcodes(source, os.path.join(tmp_dir, 'table'))
+            networker.assign_zipcodes(seed=1)
+
+            zipcodes = networker.zipcodes_of(['u3', 'u1'])
+            self.assertEqual(zipcodes.tolist(), [networker['u3'], networker['u1']])
+            self.assertEqual(networker.zipcodes_of(['u1', 'u9'], missing='').tolist()[1], '')
+            with self.assertRaises(KeyError):
+                networker.zipcodes_of(['u9'])
+
+            reverser = networker.get_overlay_reverser()
+            self.assertEqual(reverser.nodes_of(zipcodes).tolist(), ['u3', 'u1'])
+            self.assertEqual(reverser.nodes_of(['99999'], missing='').tolist(), [''])
+            with self.assertRaises(KeyError):
+                reverser.nodes_of(['99999'])
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+# ------------------ Utilities --------------------
+
+def lookup_in_shared(spec, names):
+    index = NodeIndex.attach(spec)
+    try:
+        ids = index.lookup(names)
+        return (ids.tolist(), index.zipcodes[ids].tolist())
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,126 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.ingest import stream_inputs
+from netlayout.parallel_ingest import parallel_stream_inputs, split_byte_ranges
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestParallelIngest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestParallelIngest, cls).setUpClass()
+        cls.tmp_dir = tempfile.mkdtemp(prefix='netlayout_parallel_ingest_')
+        cls.nodes_file = os.path.join(cls.tmp_dir, 'nodes.csv')
+        cls.links_file = os.path.join(cls.tmp_dir, 'links.csv')
+        cls.build_test_files()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestParallelIngest, cls).tearDownClass()
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    #-----------------------------
+    # test_byte_ranges
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_byte_ranges(self):
+        with open(self.links_file, 'rb') as fd:
+            content = fd.read()
+        header_end = content.index(b'\n') + 1
+        ranges = split_byte_ranges(self.links_file, 100)
+        self.assertGreater(len(ranges), 5)
+        self.assertEqual(ranges[0][0], header_end)
+        self.assertEqual(ranges[-1][1], len(content))
+        for ((_start, stop), (next_start, _next_stop)) in zip(ranges, ranges[1:]):
+            self.assertEqual(stop, next_start)
+            self.assertEqual(content[stop - 1:stop], b'\n')
+
+    #-----------------------------
+    # test_parallel_stream_inputs
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_parallel_stream_inputs(self):
+        expected = stream_inputs(self.nodes_file, self.links_file)
+        for processes in (1, 3):
+            buffers = parallel_stream_inputs(self.nodes_file,
+                                             self.links_file,
+                                             chunk_rows=7,
+                                             processes=processes,
+                                             range_bytes=64)
+            names = buffers.interner.names()
+            # Nodes file order is kept:
+            self.assertEqual(names[buffers.node_rows.view()].tolist(),
+                             expected.interner.names()[expected.node_rows.view()].tolist())
+            self.assertEqual(sorted(names.tolist()), sorted(expected.interner.names().tolist()))
+            self.assertEqual(decode_links(buffers), decode_links(expected))
+            role = buffers.node_columns['role']
+            self.assertEqual(role.categories()[role.codes.view()].tolist(),
+                             ['instructor'] + ['student'] * 9)
+
+    #-----------------------------
+    # test_networker_parallel
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_parallel(self):
+        serial = Networker(self.nodes_file, self.links_file, streaming=True).graph
+        parallel = Networker(self.nodes_file, self.links_file, streaming=True, parse_processes=2).graph
+        self.assertEqual(parallel.num_edges, serial.num_edges)
+        self.assertTrue(np.allclose(np.sort(parallel.weight), np.sort(serial.weight)))
+        self.assertEqual(parallel.node_property(parallel.node_id('user0'), 'role'), 'instructor')
+
+    # ------------------ Utilities --------------------
+
+    #-----------------------------
+    # build_test_files
+    #-----------------------
+
+    @classmethod
+    def build_test_files(cls):
+        rng = np.random.default_rng(0)
+        with open(cls.nodes_file, 'w') as fd:
+            fd.write('nodeID,role\n')
+            fd.write('user0,instructor\n')
+            for i in range(1, 10):
+                fd.write('user%s,student\n' % i)
+
+        # Links also reach nodes missing from the nodes file:
+        with open(cls.links_file, 'w') as fd:
+            fd.write('src,dst,weight,type\n')
+            for i in range(200):
+                (src, dst) = rng.integers(0, 30, 2)
+                weight = '' if i % 17 == 0 else '%.1f' % rng.random()
+                fd.write('user%s,user%s,%s,%s\n' % (src, dst, weight, ('responds_to', 'upvotes', '')[i % 3]))
+                if i % 50 == 0:
+                    fd.write('\n')
+
+def decode_links(buffers):
+    '''
+    Links as sorted (src name, dst name, weight, type) tuples.
+    '''
+    names = buffers.interner.names()
+    link_type = buffers.link_columns['type']
+    return sorted(zip(names[buffers.src.view()].tolist(),
+                      names[buffers.dst.view()].tolist(),
+                      np.nan_to_num(buffers.link_columns['weight'].view(), nan=-1.0).tolist(),
+                      link_type.categories()[link_type.codes.view()].tolist()))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
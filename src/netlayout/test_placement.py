@@ -0,0 +1,126 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.placement import fit_positions, kd_matching, nearest_free_matching, place_on_zipcodes
+from netlayout.test_zipcodes import write_zipcode_source
+from netlayout.zipcodes import ZipcodeTable
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestPlacement(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.rng = np.random.default_rng(0)
+
+    #-----------------------------
+    # test_greedy_matching
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_greedy_matching(self):
+        targets = self.rng.random((60, 2))
+        points = self.rng.random((90, 2))
+        match = nearest_free_matching(targets, points)
+        self.assertEqual(len(set(match.tolist())), 60)
+
+        # Same as matching the closest remaining pair, one at a time:
+        distance = np.hypot(*(targets[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+        expected = {}
+        used = set()
+        for flat in np.argsort(distance, axis=None, kind='stable'):
+            (target, point) = divmod(flat, len(points))
+            if target not in expected and point not in used:
+                expected[target] = point
+                used.add(point)
+        self.assertEqual(match.tolist(), [expected[target] for target in range(60)])
+
+    #-----------------------------
+    # test_crowded_matching
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_crowded_matching(self):
+        # All targets on one spot; greedy rounds give up early:
+        targets = np.full((500, 2), 0.5)
+        points = self.rng.random((600, 2))
+        match = nearest_free_matching(targets, points, greedy_rounds=1, max_pairs=1000)
+        self.assertEqual(len(set(match.tolist())), 500)
+
+        match = kd_matching(self.rng.random((300, 2)), points)
+        self.assertEqual(len(set(match.tolist())), 300)
+        # Each side of a split keeps enough points:
+        match = kd_matching(np.array([[0.0, 0.0], [0.1, 0.0], [0.2, 0.0]]),
+                            np.array([[5.0, 5.0], [5.1, 5.0], [-5.0, 0.0]]))
+        self.assertEqual(sorted(match.tolist()), [0, 1, 2])
+
+    #-----------------------------
+    # test_fit
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_fit(self):
+        positions = np.array([[0.0, 0.0], [1.0, 2.0], [2.0, 1.0]])
+        points = np.array([[10.0, 20.0], [12.0, 22.0], [30.0, 21.0]])
+        fitted = fit_positions(positions, points, 'bbox')
+        self.assertEqual(fitted.tolist(), [[10.0, 20.0], [20.0, 22.0], [30.0, 21.0]])
+        # Quantile fit keeps the order along each axis:
+        fitted = fit_positions(positions, points, 'quantile')
+        self.assertEqual(np.argsort(fitted[:, 0]).tolist(), [0, 1, 2])
+        self.assertEqual(np.argsort(fitted[:, 1]).tolist(), [0, 2, 1])
+
+    #-----------------------------
+    # test_place_zipcodes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_place_zipcodes(self):
+        tmp_dir = tempfile.mkdtemp(prefix='netlayout_placement_')
+        try:
+            source = os.path.join(tmp_dir, 'zip_code_database.csv')
+            write_zipcode_source(source)
+            table = ZipcodeTable.open(source, os.path.join(tmp_dir, 'table'))
+            # West and east end of the layout land on the
+            # West and East Coast:
+            positions = np.array([[-1.0, 0.0], [1.0, 0.5], [0.9, 0.4]])
+            rows = place_on_zipcodes(positions, table, fit='bbox')
+            states = table.states[table.state_codes[rows]].tolist()
+            self.assertEqual(states[0], 'CA')
+            self.assertNotIn('CA', states[1:])
+            rows = place_on_zipcodes(positions, table, rows=table.state_rows('NY'))
+            self.assertTrue(np.all(table.states[table.state_codes[rows]] == 'NY'))
+            with self.assertRaises(ValueError):
+                place_on_zipcodes(np.zeros((3, 2)), table, rows=table.state_rows('VT'))
+
+            nodes_file = os.path.join(tmp_dir, 'nodes.csv')
+            links_file = os.path.join(tmp_dir, 'links.csv')
+            with open(nodes_file, 'w') as fd:
+                fd.write('nodeID\nuser1\nuser2\nuser3\n')
+            with open(links_file, 'w') as fd:
+                fd.write('src,dst,weight\nuser1,user2,1.0\nuser2,user3,1.0\n')
+            networker = Networker(nodes_file, links_file, streaming=True)
+            networker.internalize_zipcodes(source, os.path.join(tmp_dir, 'table'))
+            with self.assertRaises(ValueError):
+                networker.place_zipcodes()
+            networker.compute_layout(iterations=10, seed=0)
+            zipcodes = networker.place_zipcodes(state='CA')
+            self.assertEqual(len(set(zipcodes.tolist())), 3)
+            self.assertEqual(networker.get_overlay_reverser()[networker['user1']], 'user1')
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
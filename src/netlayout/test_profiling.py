@@ -0,0 +1,146 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import json
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.layout import spring_layout
+from netlayout.profiling import StageProfiler
+from netlayout.test_zipcodes import write_zipcode_source
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_profiling_')
+        self.nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        self.links_file = os.path.join(self.tmp_dir, 'links.csv')
+        self.zipcode_source = os.path.join(self.tmp_dir, 'zip_code_database.csv')
+        write_zipcode_source(self.zipcode_source)
+        with open(self.nodes_file, 'w') as fd:
+            fd.write('nodeID,role\nuser1,instructor\nuser2,student\nuser3,student\n')
+        with open(self.links_file, 'w') as fd:
+            fd.write('src,dst,weight\n' +
+                     'user1,user2,1.0\n' +
+                     'user3,user1,2.0\n' +
+                     'user2,user3,0.5\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_layout_callback
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_layout_callback(self):
+        energies = []
+        spring_layout(np.array([0, 1, 2]), np.array([1, 2, 0]), 4,
+                      iterations=7,
+                      tolerance=0.0,
+                      seed=1,
+                      callback=lambda iteration, energy: energies.append((iteration, energy)))
+        self.assertEqual([iteration for (iteration, _energy) in energies], list(range(7)))
+        self.assertTrue(all(energy > 0 for (_iteration, energy) in energies))
+
+    #-----------------------------
+    # test_networker_stages
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_stages(self):
+        for streaming in (True, False):
+            finished = []
+            iterations = []
+            profiler = StageProfiler(hooks=[finished.append],
+                                     iteration_hooks=[lambda *args: iterations.append(args)])
+            networker = Networker(self.nodes_file, self.links_file,
+                                  streaming=streaming,
+                                  profiler=profiler)
+            networker.compute_layout('spring', iterations=5, tolerance=0.0, seed=1)
+            networker.internalize_zipcodes(self.zipcode_source, os.path.join(self.tmp_dir, 'table'))
+            networker.assign_zipcodes(seed=1)
+            networker.export_converted_input(os.path.join(self.tmp_dir, 'out.csv'))
+
+            self.assertEqual([record.stage for record in finished],
+                             ['ingest', 'build', 'layout', 'zipcode_table', 'zipcodes', 'export'])
+            self.assertEqual(finished, profiler.records)
+            (ingest, layout) = (finished[0], finished[2])
+            self.assertEqual(ingest.rows, 6)
+            self.assertTrue(ingest.rows_per_second > 0)
+            self.assertEqual(layout.iterations, 5)
+            self.assertEqual([args[:2] for args in iterations], [('layout', i) for i in range(1, 6)])
+            if finished[0].process_peak_rss_bytes is not None:
+                self.assertTrue(finished[-1].process_peak_rss_bytes >= finished[0].process_peak_rss_bytes > 0)
+            if finished[0].rss_bytes is not None:
+                self.assertTrue(all(record.rss_bytes > 0 for record in finished))
+
+        report_file = os.path.join(self.tmp_dir, 'profile.json')
+        profiler.write_report(report_file)
+        with open(report_file, 'r') as fd:
+            report = json.load(fd)
+        self.assertEqual(report['stages'][2]['iterations'], 5)
+        self.assertEqual(len(report['stages'][2]['energies']), 5)
+        self.assertIsNone(report['stages'][0]['energies'])
+
+    #-----------------------------
+    # test_stage_memory
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_stage_memory(self):
+        profiler = StageProfiler()
+        with profiler.stage('build'):
+            kept = np.ones((64 << 20) // 8)
+        with profiler.stage('export'):
+            pass
+        (large, small) = profiler.records
+        if large.rss_bytes is None:
+            self.skipTest("Resident memory is not available on this platform")
+        # The small stage reports its own change, not
+        # the large stage's allocation:
+        self.assertTrue(large.rss_change_bytes > (48 << 20))
+        self.assertTrue(abs(small.rss_change_bytes) < (8 << 20))
+        self.assertTrue(small.process_peak_rss_bytes > large.rss_change_bytes)
+        self.assertEqual(profiler.report()['stages'][0]['rss_change_bytes'], large.rss_change_bytes)
+        del kept
+
+    #-----------------------------
+    # test_cprofile_stage
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_cprofile_stage(self):
+        profile_file = os.path.join(self.tmp_dir, 'layout.prof')
+        profiler = StageProfiler(profile_stage='layout', profile_file=profile_file)
+        networker = Networker(self.nodes_file, self.links_file, streaming=True, profiler=profiler)
+        self.assertFalse(os.path.exists(profile_file))
+        networker.compute_layout('spring', iterations=3)
+        self.assertEqual(profiler.records[-1].profile_file, profile_file)
+        stats = pstats.Stats(profile_file)
+        self.assertTrue(any(function == 'spring_layout' for (_file, _line, function) in stats.stats))
+        # A second run adds to the first:
+        networker.compute_layout('spring', iterations=3)
+        stats = pstats.Stats(profile_file)
+        calls = [stats.stats[key][1] for key in stats.stats if key[2] == 'spring_layout']
+        self.assertEqual(calls, [2])
+        with self.assertRaises(ValueError):
+            StageProfiler(profile_stage='parsing')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
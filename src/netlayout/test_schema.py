@@ -0,0 +1,124 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.graph_store import CategoricalColumn, TypedColumn
+from netlayout.schema import apply_schema, infer_schema, parse_schema
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestSchema(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_schema_')
+        self.nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        self.links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(self.nodes_file, 'w') as fd:
+            fd.write('nodeID,role,age,score\n' +
+                     'user1,instructor,41,0.5\n' +
+                     'user2,student,19,\n' +
+                     'user3,student,,2\n')
+        with open(self.links_file, 'w') as fd:
+            fd.write('src,dst,weight,kind,count\n' +
+                     'user1,user2,1.0,emails,3\n' +
+                     'user3,user1,2.0,,n/a\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_parse_schema
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_parse_schema(self):
+        self.assertEqual(parse_schema('age:int, score:float,kind:skip,'),
+                         {'age' : 'int', 'score' : 'float', 'kind' : 'skip'})
+        with self.assertRaises(ValueError):
+            parse_schema('age:integer')
+        with self.assertRaises(ValueError):
+            parse_schema('age')
+
+    #-----------------------------
+    # test_infer_schema
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_infer_schema(self):
+        self.assertEqual(infer_schema(self.nodes_file),
+                         {'role' : 'str', 'age' : 'int', 'score' : 'float'})
+        self.assertEqual(infer_schema(self.links_file, num_name_columns=2),
+                         {'weight' : 'float', 'kind' : 'str', 'count' : 'str'})
+        # Only the sampled rows count:
+        self.assertEqual(infer_schema(self.links_file, num_name_columns=2, sample_rows=1)['count'], 'int')
+
+    #-----------------------------
+    # test_typed_column
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_typed_column(self):
+        categorical = CategoricalColumn.from_values(['3', None, '12', 'x', '3'])
+        column = apply_schema({'n' : categorical, 'm' : categorical}, {'n' : 'int', 'm' : 'skip'})['n']
+        self.assertIsInstance(column, TypedColumn)
+        self.assertIs(column.codes, categorical.codes)
+        # Nothing decoded yet:
+        self.assertIsNone(column._values)
+        self.assertEqual(column[2], 12)
+        self.assertIsNone(column._values)
+
+        self.assertEqual(column.to_array().dtype, np.int64)
+        self.assertEqual(column.to_array().tolist(), [3, 0, 12, 0, 3])
+        self.assertEqual(column.missing().tolist(), [False, True, False, True, False])
+        part = column.take(np.array([4, 3]))
+        self.assertIs(part.parsed_categories(), column.parsed_categories())
+
+        floats = TypedColumn.from_categorical(categorical, 'float')
+        self.assertTrue(np.array_equal(floats.to_array(), [3.0, np.nan, 12.0, np.nan, 3.0], equal_nan=True))
+        with self.assertRaises(ValueError):
+            TypedColumn.from_categorical(categorical, 'date')
+
+    #-----------------------------
+    # test_networker_schema
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_schema(self):
+        for streaming in (True, False):
+            networker = Networker(self.nodes_file, self.links_file,
+                                  streaming=streaming,
+                                  schema={'kind' : 'skip', 'count' : 'int'},
+                                  infer_types=True)
+            graph = networker.graph
+            self.assertEqual(sorted(graph.link_properties), ['count'])
+            self.assertEqual(graph.node_property(graph.node_id('user1'), 'age'), 41)
+            score = graph.node_properties['score'].to_array()
+            self.assertEqual(score.dtype, np.float64)
+            self.assertTrue(np.isnan(score[graph.node_id('user2')]))
+            self.assertIsInstance(graph.node_properties['role'], CategoricalColumn)
+            self.assertNotIsInstance(graph.node_properties['role'], TypedColumn)
+            count = graph.link_properties['count']
+            self.assertEqual(count.missing().sum(), 1)
+
+        # Columns the files do not have, and unknown types:
+        with self.assertRaisesRegex(ValueError, "got 'colour'"):
+            Networker(self.nodes_file, self.links_file, schema={'colour' : 'int'})
+        with self.assertRaisesRegex(ValueError, "got 'date'"):
+            Networker(self.nodes_file, self.links_file, schema={'count' : 'date'})
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
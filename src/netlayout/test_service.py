@@ -0,0 +1,144 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from netlayout.service import LRUCache, LayoutService, ServiceBusy, call_service
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestService(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_service_')
+        self.nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        self.links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(self.nodes_file, 'w') as fd:
+            fd.write('nodeID,role\nu1,instructor\n')
+        with open(self.links_file, 'w') as fd:
+            fd.write('src,dst\nu1,u2\nu2,u3\nu3,u1\nu3,u4\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_lru_cache
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_lru_cache(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        # 'b' is now the least recently used:
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((len(cache), cache.hits, cache.misses), (2, 1, 1))
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+    #-----------------------------
+    # test_layout_requests
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_layout_requests(self):
+        address = os.path.join(self.tmp_dir, 'service.sock')
+        request = {'nodes_file' : self.nodes_file,
+                   'links_file' : self.links_file,
+                   'streaming'  : True,
+                   'iterations' : 5,
+                   'seed'       : 1}
+
+        async def run():
+            service = LayoutService(workers=2, max_layouts=2)
+            server = await service.start(address)
+            try:
+                # Two at once compute one layout:
+                replies = await asyncio.gather(call_service(address, '/layout', request),
+                                               call_service(address, '/layout', request))
+                (status, headers, first) = replies[0]
+                self.assertEqual(status, 200)
+                self.assertEqual(headers['X-Layout-Cache'], 'miss')
+                self.assertEqual(replies[1][2], first)
+                self.assertEqual(first['nodes'], ['u1', 'u2', 'u3', 'u4'])
+                self.assertEqual(len(first['positions']), 4)
+
+                (status, headers, again) = await call_service(address, '/layout', request)
+                self.assertEqual(headers['X-Layout-Cache'], 'hit')
+                self.assertEqual(again, first)
+
+                # Other options, another layout of the same parsed graph:
+                (status, headers, _other) = await call_service(address, '/layout', dict(request, seed=2))
+                self.assertEqual(headers['X-Layout-Cache'], 'miss')
+                (status, _headers, state) = await call_service(address, '/status')
+                self.assertEqual((state['graphs'], state['layouts'], state['layouts_computed']), (1, 2, 2))
+
+                # An edited links file is parsed again:
+                with open(self.links_file, 'a') as fd:
+                    fd.write('u4,u5\n')
+                (status, headers, edited) = await call_service(address, '/layout', request)
+                self.assertEqual(headers['X-Layout-Cache'], 'miss')
+                self.assertEqual(len(edited['nodes']), 5)
+                # ...and the oldest layout was evicted:
+                (status, _headers, state) = await call_service(address, '/layout', dict(request, seed=3))
+                self.assertEqual(len(service.layouts), 2)
+
+                (status, _headers, reply) = await call_service(address, '/layout', dict(request, colour='red'))
+                self.assertEqual(status, 400)
+                self.assertIn('colour', reply['error'])
+                (status, _headers, reply) = await call_service(address, '/layout', dict(request, method='circle'))
+                self.assertEqual(status, 400)
+                (status, _headers, reply) = await call_service(address, '/layout',
+                                                               dict(request, nodes_file=self.nodes_file + '.gone'))
+                self.assertEqual(status, 404)
+                (status, _headers, reply) = await call_service(address, '/positions')
+                self.assertEqual(status, 404)
+            finally:
+                server.close()
+                await server.wait_closed()
+                service.close()
+
+        asyncio.run(run())
+
+    #-----------------------------
+    # test_bounded_queue
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_bounded_queue(self):
+        release = threading.Event()
+
+        async def run():
+            service = LayoutService(workers=1, max_pending=2)
+            try:
+                first = service._once('a', release.wait)
+                again = service._once('a', release.wait)
+                second = service._once('b', release.wait)
+                self.assertEqual(service.status()['pending'], 2)
+                with self.assertRaises(ServiceBusy):
+                    service._once('c', release.wait)
+                release.set()
+                self.assertEqual(await asyncio.gather(first, again, second), [True, True, True])
+                self.assertEqual(service.status()['pending'], 0)
+            finally:
+                service.close()
+
+        asyncio.run(run())
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
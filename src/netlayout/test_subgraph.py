@@ -0,0 +1,175 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.benchmark import generate_links
+from netlayout.create_network import Networker
+from netlayout.graph_store import CategoricalColumn, GraphStore, NumericColumn, TypedColumn
+from netlayout.incremental import expand_neighborhood
+from netlayout.subgraph import ego_nodes, extract_subgraph, match_links, parse_link_filter, select_links, window_links
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+class TestSubgraph(unittest.TestCase):
+
+    #-----------------------------
+    # test_ego_nodes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_ego_nodes(self):
+        (src, dst) = generate_links('scale_free', 500, 1500, seed=4)
+        graph = GraphStore(np.array(['n%s' % i for i in range(500)], dtype=object), src, dst)
+        centers = np.array([3, 17])
+        for hops in (0, 1, 2):
+            mask = np.zeros(500, dtype=bool)
+            mask[centers] = True
+            expected = np.flatnonzero(expand_neighborhood(graph.src, graph.dst, mask, hops))
+            self.assertEqual(ego_nodes(graph, centers, hops).tolist(), expected.tolist())
+
+        # Along leaving links only, and along some links only:
+        leaving = ego_nodes(graph, [3], 1, direction='out')
+        self.assertEqual(leaving.tolist(), sorted({3} | set(graph.out_neighbors(3).tolist())))
+        links = graph.dst != graph.out_neighbors(3)[0]
+        self.assertNotIn(graph.out_neighbors(3)[0], ego_nodes(graph, [3], 1, direction='out', links=links))
+        with self.assertRaises(ValueError):
+            ego_nodes(graph, [3], 1, direction='sideways')
+
+    #-----------------------------
+    # test_link_filters
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_link_filters(self):
+        kinds = CategoricalColumn.from_values(['emails', 'calls', None, 'emails', 'visits'])
+        self.assertEqual(match_links(kinds, ['emails', 'visits']).tolist(), [True, False, False, True, True])
+        counts = TypedColumn.from_categorical(CategoricalColumn.from_values(['1', '2', None, 'x', '2']), 'int')
+        self.assertEqual(match_links(counts, ['2']).tolist(), [False, True, False, False, True])
+        with self.assertRaises(ValueError):
+            match_links(counts, ['two'])
+
+        days = CategoricalColumn.from_values(['2026-01-05', '2026-02-01', None, '2026-01-31T23:00', '2025-12-31'])
+        self.assertEqual(window_links(days, '2026-01-01', '2026-02-01').tolist(), [True, False, False, True, False])
+        self.assertEqual(window_links(days, end='2026-01-01').tolist(), [False, False, False, False, True])
+        # Bounds that look like numbers compare as strings too:
+        self.assertEqual(window_links(days, '2026', '2027').tolist(), [True, True, False, True, False])
+        self.assertEqual(window_links(days, 2026).tolist(), [True, True, False, True, False])
+        times = NumericColumn(np.array([1.0, 5.0, np.nan, 10.0]))
+        self.assertEqual(window_links(times, 2, 10).tolist(), [False, True, False, False])
+        scores = TypedColumn.from_categorical(CategoricalColumn.from_values(['0.5', None, '3']), 'float')
+        self.assertEqual(window_links(scores, start=1).tolist(), [False, False, True])
+        # Untyped numbers of different lengths compare as numbers:
+        stamps = CategoricalColumn.from_values(['999', '1500', '20000', None])
+        self.assertEqual(window_links(stamps, '100', '2000').tolist(), [True, True, False, False])
+        graph = GraphStore(np.array(['a', 'b'], dtype=object), [0, 0, 1], [1, 1, 0],
+                           link_properties={'ts' : CategoricalColumn.from_values(['999', '1500', '20000'])})
+        self.assertEqual(select_links(graph, window=('ts', '100', '2000')).tolist(), [True, True, False])
+        # Empty values are missing, not a mix of numbers and others:
+        stamps = CategoricalColumn.from_values(['999', '', '20000'])
+        self.assertEqual(window_links(stamps, end='2000').tolist(), [True, False, False])
+        for bounds in ((1, 10), ('a', 'z')):
+            with self.assertRaisesRegex(ValueError, '--schema'):
+                window_links(CategoricalColumn.from_values(['5', 'n/a']), *bounds)
+
+        self.assertEqual(parse_link_filter(['kind=emails, calls', 'kind=visits', 'lab=x']),
+                         {'kind' : ['emails', 'calls', 'visits'], 'lab' : ['x']})
+        with self.assertRaises(ValueError):
+            parse_link_filter(['emails'])
+
+    #-----------------------------
+    # test_extract_subgraph
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_extract_subgraph(self):
+        (src, dst) = generate_links('erdos_renyi', 200, 800, seed=2)
+        names = np.array(['n%s' % i for i in range(200)], dtype=object)
+        graph = GraphStore(names, src, dst,
+                           weight=np.arange(800, dtype=float),
+                           node_properties={'rank' : NumericColumn(np.arange(200) * 10)},
+                           link_properties={'kind' : CategoricalColumn.from_values(['a', 'b'] * 400)})
+        nodes = np.arange(0, 200, 3)
+        links = match_links(graph.link_properties['kind'], ['a'])
+        (subgraph, node_ids) = extract_subgraph(graph, nodes=nodes, links=links)
+        self.assertEqual(node_ids.tolist(), nodes.tolist())
+        kept = np.isin(graph.src, nodes) & np.isin(graph.dst, nodes) & links
+        self.assertEqual(subgraph.num_edges, kept.sum())
+        self.assertEqual(subgraph.weight.tolist(), graph.weight[kept].tolist())
+        self.assertEqual(names[node_ids[subgraph.src]].tolist(), names[graph.src[kept]].tolist())
+        self.assertEqual(names[node_ids[subgraph.dst]].tolist(), names[graph.dst[kept]].tolist())
+        self.assertEqual(set(subgraph.link_properties['kind'].to_array().tolist()), {'a'})
+        self.assertEqual(subgraph.node_property(subgraph.node_id('n6'), 'rank'), 60)
+        self.assertTrue(np.array_equal(subgraph.indptr, GraphStore(subgraph.node_names, subgraph.src,
+                                                                   subgraph.dst).indptr))
+
+        # Links alone bring their end points:
+        kept = graph.weight < 3
+        (subgraph, node_ids) = extract_subgraph(graph, links=kept)
+        self.assertEqual(subgraph.num_edges, 3)
+        self.assertEqual(node_ids.tolist(), sorted(set(graph.src[kept].tolist()) | set(graph.dst[kept].tolist())))
+        with self.assertRaises(ValueError):
+            extract_subgraph(graph)
+
+    #-----------------------------
+    # test_networker_subgraph
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_subgraph(self):
+        tmp_dir = tempfile.mkdtemp(prefix='netlayout_subgraph_')
+        try:
+            nodes_file = os.path.join(tmp_dir, 'nodes.csv')
+            links_file = os.path.join(tmp_dir, 'links.csv')
+            with open(nodes_file, 'w') as fd:
+                fd.write('nodeID,role\nu1,instructor\nu2,student\n')
+            with open(links_file, 'w') as fd:
+                fd.write('src,dst,kind,day\n' +
+                         'u1,u2,emails,2026-01-02\n' +
+                         'u2,u3,calls,2026-01-03\n' +
+                         'u3,u4,emails,2026-01-04\n' +
+                         'u4,u5,emails,2026-02-01\n' +
+                         'u6,u1,calls,2026-01-05\n')
+            networker = Networker(nodes_file, links_file, streaming=True, cache_dir=os.path.join(tmp_dir, 'cache'))
+            networker.compute_layout(iterations=5, seed=1)
+            subgraph = networker.select_subgraph(centers=['u1'], hops=1)
+            self.assertEqual(sorted(subgraph.node_names.tolist()), ['u1', 'u2', 'u6'])
+            self.assertIsNone(networker.positions)
+            self.assertEqual(networker.full_graph.num_nodes, 6)
+            self.assertEqual(networker.full_graph.node_names[networker.subgraph_nodes].tolist(),
+                             subgraph.node_names.tolist())
+            self.assertEqual(networker.compute_layout(iterations=5, seed=1).shape, (3, 2))
+            self.assertEqual(subgraph.node_property(subgraph.node_id('u1'), 'role'), 'instructor')
+
+            # Two hops along emails in January:
+            subgraph = networker.select_subgraph(centers=['u2'],
+                                                 hops=2,
+                                                 link_filter={'kind' : ['emails']},
+                                                 window=('day', '2026-01-01', '2026-02-01'))
+            self.assertEqual(sorted(subgraph.node_names.tolist()), ['u1', 'u2'])
+            subgraph = networker.select_subgraph(link_filter={'kind' : ['emails']})
+            self.assertEqual(subgraph.num_edges, 3)
+            with self.assertRaises(ValueError):
+                networker.select_subgraph(link_filter={'colour' : ['red']})
+            with self.assertRaises(KeyError):
+                networker.select_subgraph(centers=['nobody'])
+
+            # The reverse index comes from the cache:
+            cached = Networker(nodes_file, links_file, streaming=True, cache_dir=os.path.join(tmp_dir, 'cache'))
+            self.assertIsInstance(cached.graph.in_csr[0], np.memmap)
+            self.assertEqual(sorted(cached.select_subgraph(centers=['u1']).node_names.tolist()), ['u1', 'u2', 'u6'])
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
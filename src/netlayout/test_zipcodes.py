@@ -0,0 +1,185 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from netlayout.create_network import Networker
+from netlayout.zipcodes import ZIPCODE_SPACE, ZipcodeSampler, ZipcodeTable
+
+
+TEST_ALL = True
+#TEST_ALL = False
+
+ZIPCODE_HEADER = ('zip,type,decommissioned,primary_city,acceptable_cities,unacceptable_cities,' +
+                  'state,county,timezone,area_codes,world_region,country,latitude,longitude,' +
+                  'irs_estimated_population\n')
+
+class TestZipcodes(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmp_dir = tempfile.mkdtemp(prefix='netlayout_zipcodes_')
+        self.source = os.path.join(self.tmp_dir, 'zip_code_database.csv')
+        self.table_dir = os.path.join(self.tmp_dir, 'table')
+        write_zipcode_source(self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        unittest.TestCase.tearDown(self)
+
+    #-----------------------------
+    # test_compile
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_compile(self):
+        table = ZipcodeTable.open(self.source, self.table_dir)
+        # Military, coordinate-less, and malformed rows are dropped:
+        self.assertEqual(len(table), 12)
+        self.assertIsInstance(table.zipcodes, np.memmap)
+        self.assertEqual(table.states.tolist(), ['CA', 'NY', 'VT'])
+        self.assertEqual(table.state_offsets.tolist(), [0, 6, 10, 12])
+        # Sorted by state, then county:
+        self.assertEqual(table.zipcode_strings(table.state_rows('VT')).tolist(), ['05001', '05002'])
+        ny_counties = table.counties[table.county_codes[table.state_rows('NY')]]
+        self.assertEqual(ny_counties.tolist(), ['Kings County'] * 2 + ['Queens County'] * 2)
+        self.assertEqual(np.diff(table.county_offsets).tolist(), [3, 3, 2, 2, 2])
+        with self.assertRaises(KeyError):
+            table.state_rows('TX')
+
+        # Unchanged source: mapped, not recompiled:
+        manifest = os.path.join(self.table_dir, 'manifest.json')
+        compiled_at = os.stat(manifest).st_mtime_ns
+        ZipcodeTable.open(self.source, self.table_dir)
+        self.assertEqual(os.stat(manifest).st_mtime_ns, compiled_at)
+
+        # No database is shipped; one must be given:
+        with self.assertRaisesRegex(ValueError, 'zipcode_source'):
+            ZipcodeTable.open(None, self.table_dir)
+        with self.assertRaisesRegex(ValueError, 'does not exist'):
+            ZipcodeTable.open(self.source + '.gone', self.table_dir)
+
+    #-----------------------------
+    # test_sampler
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_sampler(self):
+        table = ZipcodeTable.open(self.source, self.table_dir)
+        sampler = ZipcodeSampler(table, seed=1)
+        rows = sampler.draw(3, state='CA')
+        self.assertTrue(np.all(table.state_codes[rows] == table.state_code('CA')))
+        rows = np.concatenate([rows, sampler.draw(9)])
+        # Every zip code drawn exactly once:
+        self.assertEqual(sorted(rows.tolist()), list(range(12)))
+        self.assertEqual(sampler.remaining().tolist(), [0, 0, 0])
+        with self.assertRaises(ValueError):
+            sampler.draw(1)
+
+        # Same seed, same draws:
+        first = ZipcodeSampler(table, seed=7).draw(5)
+        self.assertEqual(first.tolist(), ZipcodeSampler(table, seed=7).draw(5).tolist())
+
+    #-----------------------------
+    # test_networker_zipcodes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_networker_zipcodes(self):
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID\nuser1\nuser2\n')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst,weight\nuser1,user2,1.0\n')
+        networker = Networker(nodes_file, links_file)
+        networker.internalize_zipcodes(self.source, self.table_dir, seed=3)
+        zipcodes = [networker.get_next_zipcode() for _i in range(12)]
+        self.assertEqual(len(set(zipcodes)), 12)
+        self.assertTrue(all(len(zipcode) == 5 for zipcode in zipcodes))
+
+    #-----------------------------
+    # test_assign_zipcodes
+    #-----------------------
+
+    @unittest.skipIf(not TEST_ALL, "Temporarily disabled")
+    def test_assign_zipcodes(self):
+        nodes_file = os.path.join(self.tmp_dir, 'nodes.csv')
+        links_file = os.path.join(self.tmp_dir, 'links.csv')
+        with open(nodes_file, 'w') as fd:
+            fd.write('nodeID\nuser1\nuser2\nuser3\nuser4\n')
+        with open(links_file, 'w') as fd:
+            fd.write('src,dst,weight\nuser1,user2,1.0\n')
+        networker = Networker(nodes_file, links_file, streaming=True)
+        networker.internalize_zipcodes(self.source, self.table_dir)
+        zipcodes = networker.assign_zipcodes(seed=5)
+        self.assertEqual(len(set(zipcodes.tolist())), 4)
+        self.assertEqual(networker['user3'], zipcodes[networker.graph.node_id('user3')])
+        self.assertEqual(networker.assign_zipcodes(seed=5).tolist(), zipcodes.tolist())
+
+        reverser = networker.get_overlay_reverser()
+        self.assertEqual(reverser[networker['user2']], 'user2')
+        self.assertEqual(len(reverser), 4)
+        self.assertEqual(sorted(reverser), sorted(zipcodes.tolist()))
+        with self.assertRaises(KeyError):
+            reverser['00000']
+        # Negative numbers are not counted from the end:
+        zip_to_node = np.full(ZIPCODE_SPACE, -1)
+        zip_to_node[99999] = 0
+        reverser = Networker.OverlayReverser(zip_to_node, np.array(['user1'], dtype=object))
+        self.assertEqual(reverser['99999'], 'user1')
+        for key in ('-1', '100000', 'x'):
+            with self.assertRaises(KeyError):
+                reverser[key]
+
+        zipcodes = networker.assign_zipcodes(state='CA', seed=1)
+        self.assertTrue(all(zipcode[0] == '9' for zipcode in zipcodes))
+        # NY has four zip codes; all of them are used:
+        zipcodes = networker.assign_zipcodes(state_weights={'NY' : 1.0})
+        self.assertEqual(sorted(zipcodes.tolist()), ['11101', '11102', '11201', '11205'])
+        # Weights spill over when a state runs out:
+        zipcodes = networker.assign_zipcodes(state_weights={'VT' : 100.0, 'NY' : 1.0})
+        self.assertEqual(sum(zipcode.startswith('05') for zipcode in zipcodes), 2)
+        with self.assertRaises(ValueError):
+            networker.assign_zipcodes(state='VT')
+
+# ------------------ Utilities --------------------
+
+def write_zipcode_source(path):
+    '''
+    Small zip code database: 6 zip codes in two
+    CA counties, 4 in two NY counties, 2 in VT, plus
+    a military one, one without coordinates, and two
+    with malformed zip codes.
+    '''
+    rows = [('90001', 'STANDARD', 'CA', 'Los Angeles County', '33.97', '-118.25'),
+            ('94105', 'STANDARD', 'CA', 'San Francisco County', '37.79', '-122.40'),
+            ('90002', 'STANDARD', 'CA', 'Los Angeles County', '33.95', '-118.25'),
+            ('94107', 'PO BOX', 'CA', 'San Francisco County', '37.77', '-122.39'),
+            ('90003', 'STANDARD', 'CA', 'Los Angeles County', '33.96', '-118.27'),
+            ('94110', 'STANDARD', 'CA', 'San Francisco County', '37.75', '-122.42'),
+            ('11201', 'STANDARD', 'NY', 'Kings County', '40.69', '-73.99'),
+            ('11101', 'STANDARD', 'NY', 'Queens County', '40.75', '-73.94'),
+            ('11205', 'STANDARD', 'NY', 'Kings County', '40.69', '-73.97'),
+            ('11102', 'STANDARD', 'NY', 'Queens County', '40.77', '-73.93'),
+            ('05002', 'STANDARD', 'VT', 'Windsor County', '43.68', '-72.32'),
+            ('05001', 'STANDARD', 'VT', 'Windsor County', '43.67', '-72.38'),
+            ('09001', 'MILITARY', 'AE', '', '', ''),
+            ('11999', 'UNIQUE', 'NY', 'Kings County', '', ''),
+            ('9O210', 'STANDARD', 'CA', 'Los Angeles County', '34.09', '-118.41'),
+            ('123456', 'STANDARD', 'NY', 'Kings County', '40.68', '-73.95')]
+    with open(path, 'w') as fd:
+        fd.write(ZIPCODE_HEADER)
+        for (zipcode, zip_type, state, county, lat, long) in rows:
+            fd.write('%s,%s,0,City,,,%s,"%s",,,NA,US,%s,%s,1000\n' % (zipcode, zip_type, state, county, lat, long))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
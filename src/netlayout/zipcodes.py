@@ -0,0 +1,345 @@
+'''
+Created on Oct 18, 2026
+
+@author: paepcke
+
+Zip code reference table, compiled once from the
+zip code database CSV into memory-mappable arrays.
+
+The source is the zip code database CSV with one row
+per zip code, whose columns include the ones below.
+It is not shipped with the package; its path must be
+given, or set as ZIPCODE_SOURCE.
+
+    zip,type,...,state,county,...,latitude,longitude,...
+
+Military zip codes, and rows without coordinates, are
+dropped. The remaining rows are sorted by state, then
+county, so each state's and each county's zip codes
+form one contiguous block of rows; state_offsets and
+county_offsets hold the block boundaries (like the
+CSR offsets of graph_store.GraphStore).
+
+The compiled table is a directory of .npy files plus a
+manifest that records size and mtime of the source it
+was built from. ZipcodeTable.open() recompiles when
+the source changes, and otherwise maps the arrays.
+
+ZipcodeSampler draws zip codes without replacement in
+O(1) per zip code: every state's block of rows is
+shuffled once, and draws advance a cursor through it.
+'''
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from netlayout.graph_cache import DEFAULT_CACHE_DIR
+
+
+# Site-wide default path of the zip code database CSV;
+# there is none unless set:
+ZIPCODE_SOURCE = None
+DEFAULT_TABLE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'zipcodes')
+
+# Columns of the zip code source CSV:
+ZIP_INDEX    = 0
+ZIP_TYPE     = 1
+STATE_INDEX  = 6
+COUNTY_INDEX = 7
+LAT_INDEX    = 12
+LONG_INDEX   = 13
+
+# Five-digit zip codes are below this; size of
+# arrays indexed by zip code:
+ZIPCODE_SPACE = 100000
+
+MANIFEST_NAME = 'manifest.json'
+
+# Bump when the table layout changes:
+TABLE_FORMAT_VERSION = 1
+
+# ---------------------------- ZipcodeTable -----------
+
+class ZipcodeTable(object):
+    '''
+    Zip codes with their state, county, and location,
+    sorted by state and county. Attributes, one entry
+    per row:
+
+       - zipcodes:       int32 zip codes
+       - state_codes:    int32 index into states
+       - county_codes:   int32 index into counties
+       - lat, long:      float64 coordinates
+
+    and
+
+       - states, counties: object arrays of names
+       - state_offsets:    rows of state s are state_offsets[s]:state_offsets[s+1]
+       - county_offsets:   likewise for the (state, county) blocks
+    '''
+
+    ARRAY_NAMES = ('zipcodes', 'state_codes', 'county_codes', 'lat', 'long',
+                   'states', 'counties', 'state_offsets', 'county_offsets')
+
+    def __init__(self, arrays):
+        for name in ZipcodeTable.ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+
+    #-----------------------------
+    # open
+    #-----------------------
+
+    @classmethod
+    def open(cls, source=None, table_dir=DEFAULT_TABLE_DIR, delimiter=','):
+        '''
+        Map the compiled table, compiling it first if it
+        is missing or older than the source.
+
+        @param source: zip code database CSV; default:
+            ZIPCODE_SOURCE
+        @type source: {str | None}
+        @param table_dir: directory of the compiled table
+        @type table_dir: str
+        @param delimiter: delimiter of the source CSV
+        @type delimiter: str
+        @rtype: ZipcodeTable
+        '''
+        source = source or ZIPCODE_SOURCE
+        if source is None:
+            raise ValueError("No zip code database given; pass the path of a zip code database CSV " +
+                             "(--zipcode_source on the command line).")
+        if not os.path.isfile(source):
+            raise ValueError("Zip code database '%s' does not exist." % source)
+        stat = os.stat(source)
+        signature = {'version'  : TABLE_FORMAT_VERSION,
+                     'source'   : os.path.abspath(source),
+                     'size'     : stat.st_size,
+                     'mtime_ns' : stat.st_mtime_ns}
+        try:
+            with open(os.path.join(table_dir, MANIFEST_NAME), 'r') as fd:
+                up_to_date = json.load(fd) == signature
+        except (IOError, OSError, ValueError):
+            up_to_date = False
+        if not up_to_date:
+            cls.compile(source, table_dir, signature, delimiter)
+        return cls.load(table_dir)
+
+    @classmethod
+    def load(cls, table_dir):
+        arrays = {name : np.load(os.path.join(table_dir, name + '.npy'), mmap_mode='r')
+                  for name in ZipcodeTable.ARRAY_NAMES}
+        # Name tables are small; keep them as Python strings:
+        arrays['states'] = np.array(arrays['states'].tolist(), dtype=object)
+        arrays['counties'] = np.array(arrays['counties'].tolist(), dtype=object)
+        return cls(arrays)
+
+    #-----------------------------
+    # compile
+    #-----------------------
+
+    @classmethod
+    def compile(cls, source, table_dir, signature=None, delimiter=','):
+        '''
+        Parse the zip code source CSV into the arrays
+        of a table directory, replacing any earlier one.
+        Rows with a malformed zip code, latitude, or
+        longitude are skipped.
+        '''
+        (zipcodes, states, counties, lat, long) = ([], [], [], [], [])
+        with open(source, 'r') as source_fd:
+            reader = csv.reader(source_fd, delimiter=delimiter, quotechar='"')
+            # Discard header of zip codes dataset:
+            next(reader)
+            for line in reader:
+                if len(line) <= LONG_INDEX or line[ZIP_TYPE] == 'MILITARY':
+                    # No lat/long for military zip codes:
+                    continue
+                try:
+                    zipcode = int(line[ZIP_INDEX])
+                    (the_lat, the_long) = (float(line[LAT_INDEX]), float(line[LONG_INDEX]))
+                except ValueError:
+                    continue
+                if not 0 <= zipcode < ZIPCODE_SPACE:
+                    # Would not fit arrays indexed by zip code:
+                    continue
+                zipcodes.append(zipcode)
+                states.append(line[STATE_INDEX])
+                counties.append(line[COUNTY_INDEX])
+                lat.append(the_lat)
+                long.append(the_long)
+
+        (state_names, state_codes) = np.unique(np.array(states, dtype=str), return_inverse=True)
+        (county_names, county_codes) = np.unique(np.array(counties, dtype=str), return_inverse=True)
+        order = np.lexsort((np.array(zipcodes), county_codes, state_codes))
+        state_codes = state_codes[order].astype(np.int32)
+        county_codes = county_codes[order].astype(np.int32)
+
+        state_offsets = np.zeros(len(state_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(state_codes, minlength=len(state_names)), out=state_offsets[1:])
+        block_starts = np.flatnonzero(np.diff(state_codes) | np.diff(county_codes)) + 1
+        county_offsets = np.concatenate([[0], block_starts, [len(order)]]).astype(np.int64)
+
+        arrays = {'zipcodes'       : np.array(zipcodes, dtype=np.int32)[order],
+                  'state_codes'    : state_codes,
+                  'county_codes'   : county_codes,
+                  'lat'            : np.array(lat)[order],
+                  'long'           : np.array(long)[order],
+                  'states'         : state_names,
+                  'counties'       : county_names,
+                  'state_offsets'  : state_offsets,
+                  'county_offsets' : county_offsets}
+
+        parent_dir = os.path.dirname(os.path.abspath(table_dir))
+        if not os.path.isdir(parent_dir):
+            os.makedirs(parent_dir)
+        tmp_dir = tempfile.mkdtemp(prefix='.zipcodes_', dir=parent_dir)
+        try:
+            for (name, array) in arrays.items():
+                np.save(os.path.join(tmp_dir, name + '.npy'), array)
+            with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w') as fd:
+                json.dump(signature or {}, fd)
+            if os.path.exists(table_dir):
+                shutil.rmtree(table_dir)
+            os.rename(tmp_dir, table_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    # ------------------------- Lookups --------------
+
+    def __len__(self):
+        return len(self.zipcodes)
+
+    @property
+    def num_states(self):
+        return len(self.states)
+
+    def state_code(self, state):
+        '''
+        Index of a state name such as 'CA'. Raises
+        KeyError for unknown states.
+        '''
+        code = np.searchsorted(self.states, state)
+        if code == len(self.states) or self.states[code] != state:
+            raise KeyError(state)
+        return int(code)
+
+    def state_rows(self, state):
+        '''
+        Slice of the rows of the given state.
+        '''
+        code = self.state_code(state)
+        return slice(self.state_offsets[code], self.state_offsets[code + 1])
+
+    def zipcode_strings(self, rows):
+        '''
+        Five-digit zip code strings of the given rows.
+        '''
+        return np.char.zfill(np.asarray(self.zipcodes[rows]).astype(str), 5)
+
+# ---------------------------- ZipcodeSampler -----------
+
+class ZipcodeSampler(object):
+    '''
+    Draws rows of a ZipcodeTable at random, never
+    returning the same row twice. Without a state,
+    each draw first picks one of the states that have
+    zip codes left, uniformly or by given state weights,
+    then a zip code within it.
+    '''
+
+    def __init__(self, table, seed=None):
+        self.table = table
+        self.rng = np.random.default_rng(seed)
+        # Shuffle within each state block; the state
+        # blocks stay where they are:
+        keys = self.rng.random(len(table))
+        self._pool = np.lexsort((keys, table.state_codes))
+        self._used = np.zeros(table.num_states, dtype=np.int64)
+
+    def remaining(self):
+        '''
+        Number of undrawn zip codes of each state.
+        '''
+        return np.diff(self.table.state_offsets) - self._used
+
+    #-----------------------------
+    # draw
+    #-----------------------
+
+    def draw(self, count=1, state=None, weights=None):
+        '''
+        Draw count table rows without replacement.
+
+        @param count: number of rows to draw
+        @type count: int
+        @param state: state to draw from, such as 'CA';
+            None for any state
+        @type state: {str | None}
+        @param weights: relative chance of picking each state,
+            as {state : weight}; states not given are never
+            picked. None picks states uniformly.
+        @type weights: {dict | None}
+        @return: table row indexes
+        @rtype: np.ndarray
+        '''
+        if state is not None:
+            weights = {state : 1.0}
+        state_weights = self.state_weights(weights)
+        capacity = self.remaining()[state_weights > 0].sum()
+        if count > capacity:
+            where = 'the US' if state is None else state
+            raise ValueError("Not enough zipcodes in %s to cover this dataset." % where)
+        return self._take(self._split(count, state_weights))
+
+    def state_weights(self, weights=None):
+        '''
+        Array of state weights, indexed by state code,
+        from a {state : weight} dict or None.
+        '''
+        if weights is None:
+            return np.ones(self.table.num_states)
+        state_weights = np.zeros(self.table.num_states)
+        for (state, weight) in weights.items():
+            if weight < 0:
+                raise ValueError("State weights must not be negative; got %s for %s" % (weight, state))
+            state_weights[self.table.state_code(state)] = weight
+        return state_weights
+
+    def _split(self, count, state_weights):
+        '''
+        Number of draws from each state when drawing
+        count times, each time from a state chosen by
+        weight among those that still have zip codes left.
+        '''
+        remaining = self.remaining()
+        per_state = np.zeros(len(remaining), dtype=np.int64)
+        while count > 0:
+            open_states = np.flatnonzero((remaining > per_state) & (state_weights > 0))
+            chances = state_weights[open_states] / state_weights[open_states].sum()
+            picks = self.rng.multinomial(count, chances)
+            # States picked more often than they have zip codes
+            # left give the excess back to the next round:
+            granted = np.minimum(picks, remaining[open_states] - per_state[open_states])
+            per_state[open_states] += granted
+            count -= int(granted.sum())
+        return per_state
+
+    def _take(self, per_state):
+        '''
+        Advance each state's cursor by its count; return
+        the rows passed over, in random order.
+        '''
+        states = np.flatnonzero(per_state)
+        starts = self.table.state_offsets[states] + self._used[states]
+        counts = per_state[states]
+        # Positions starts[i] .. starts[i] + counts[i] - 1, for all i:
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        self._used[states] += counts
+        rows = self._pool[positions]
+        self.rng.shuffle(rows)
+        return rows